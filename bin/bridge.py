@@ -14,7 +14,7 @@ from typing import Optional
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from impact_bridge.timers import create_timer, get_supported_timers, get_timer_info
+from impact_bridge.timers import TimerHub, create_timer, get_supported_timers, get_timer_info
 from impact_bridge.ws.encode import TimerEventEncoder
 
 logger = logging.getLogger(__name__)
@@ -24,21 +24,23 @@ class BridgeApplication:
     """Main bridge application with timer adapter support."""
     
     def __init__(self):
-        self.timer_adapter = None
+        self.timer_hub = None
+        self.loop = None
         self.running = False
-        self.event_encoder = None
+        self.event_encoders = {}
         
     async def run(self, args):
         """Run the bridge application."""
         self.running = True
+        self.loop = asyncio.get_running_loop()
         
         # Setup signal handlers
         for sig in (signal.SIGTERM, signal.SIGINT):
             signal.signal(sig, self._signal_handler)
         
         try:
-            # Create and configure timer adapter
-            await self._setup_timer(args)
+            # Create and configure timer adapters
+            await self._setup_timers(args)
             
             # Start event processing
             await self._process_events()
@@ -51,65 +53,67 @@ class BridgeApplication:
         finally:
             await self._cleanup()
     
-    async def _setup_timer(self, args):
-        """Setup timer adapter based on CLI arguments."""
-        timer_type = args.timer
-        logger.info(f"Setting up {timer_type} timer adapter")
+    async def _setup_timers(self, args):
+        """Setup timer adapters from --timer-spec, or the single-timer CLI arguments."""
+        if args.timer_spec:
+            specs = args.timer_spec
+        else:
+            config = {}
+            if args.serial:
+                config['port'] = args.serial
+            if args.ble:
+                config['mac_address'] = args.ble
+            if args.sim:
+                config['simulator'] = True
+            if args.baud:
+                config['baud'] = args.baud
+            specs = [(args.timer, args.timer, config)]
         
-        # Build connection config
-        config = {}
+        self.timer_hub = TimerHub()
+        for timer_id, timer_type, config in specs:
+            logger.info(f"Setting up {timer_type} timer adapter as {timer_id}")
+            adapter = create_timer(timer_type, **config)
+            await adapter.connect(**config)
+            self.timer_hub.add(timer_id, adapter)
+            self.event_encoders[timer_id] = TimerEventEncoder(timer_type)
         
-        if args.serial:
-            config['port'] = args.serial
-        if args.ble:
-            config['mac_address'] = args.ble
-        if args.sim:
-            config['simulator'] = True
-        if args.baud:
-            config['baud'] = args.baud
-        
-        # Create timer adapter
-        self.timer_adapter = create_timer(timer_type, **config)
-        self.event_encoder = TimerEventEncoder(timer_type)
-        
-        # Connect to timer
-        await self.timer_adapter.connect(**config)
-        await self.timer_adapter.start()
-        
-        logger.info(f"Timer adapter {timer_type} started successfully")
+        await self.timer_hub.start()
+        logger.info(f"Timer adapters started: {', '.join(self.event_encoders)}")
     
     async def _process_events(self):
         """Process timer events and emit to WebSocket/logging."""
         logger.info("Starting event processing...")
         
-        async for event in self.timer_adapter.events:
+        async for item in self.timer_hub.events:
             if not self.running:
                 break
+            event = item.event
             
             # Encode event for WebSocket
-            encoded = self.event_encoder.encode_json(event)
+            encoded = self.event_encoders[item.timer_id].encode_json(event)
             
             # Log event (structured logging)
             event_data = {
                 'component': 'timer',
-                'adapter': self.timer_adapter.name,
+                'adapter': self.timer_hub.timers[item.timer_id].name,
+                'timer_id': item.timer_id,
                 'event': event.__class__.__name__,
                 'timestamp_ms': event.timestamp_ms,
                 'encoded': encoded
             }
             
-            logger.info(f"Timer event: {event.__class__.__name__}", extra=event_data)
+            logger.info(f"Timer event [{item.timer_id}]: {event.__class__.__name__}", extra=event_data)
             
             # TODO: Emit to WebSocket clients
             # TODO: Update metrics
             
     async def _cleanup(self):
         """Cleanup resources."""
-        if self.timer_adapter:
+        if self.timer_hub:
             try:
-                await self.timer_adapter.stop()
+                await self.timer_hub.stop()
             except Exception as e:
-                logger.error(f"Error stopping timer adapter: {e}")
+                logger.error(f"Error stopping timer adapters: {e}")
         
         logger.info("Bridge cleanup complete")
     
@@ -117,6 +121,36 @@ class BridgeApplication:
         """Handle shutdown signals."""
         logger.info(f"Received signal {signum}")
         self.running = False
+        # End the merged event stream so _process_events returns even when all timers are quiet
+        if self.timer_hub and self.loop:
+            self.loop.call_soon_threadsafe(lambda: self.loop.create_task(self.timer_hub.stop()))
+
+
+TIMER_SPEC_KEYS = {'serial': 'port', 'port': 'port', 'ble': 'mac_address', 'mac': 'mac_address',
+                   'baud': 'baud', 'sim': 'simulator', 'sim_port': 'sim_port'}
+
+
+def parse_timer_spec(spec: str):
+    """Parse ``ID=TYPE[,key=value...]`` into (timer_id, timer_type, connection config)."""
+    head, *options = spec.split(',')
+    timer_id, _, timer_type = head.partition('=')
+    if not timer_id or timer_type not in get_supported_timers():
+        raise argparse.ArgumentTypeError(f"Invalid timer spec {spec!r}: expected ID=TYPE[,key=value...]")
+    config = {}
+    for option in options:
+        key, _, value = option.partition('=')
+        if key not in TIMER_SPEC_KEYS:
+            raise argparse.ArgumentTypeError(f"Unknown timer option {key!r} in {spec!r}")
+        if key == 'sim':
+            config['simulator'] = value.lower() not in ('0', 'false', 'no')
+        elif key in ('baud', 'sim_port'):
+            try:
+                config[TIMER_SPEC_KEYS[key]] = int(value)
+            except ValueError:
+                raise argparse.ArgumentTypeError(f"Timer option {key!r} in {spec!r} must be an integer")
+        else:
+            config[TIMER_SPEC_KEYS[key]] = value
+    return timer_id, timer_type, config
 
 
 def create_parser():
@@ -137,6 +171,9 @@ Examples:
   
   # SpecialPie simulator (UDP)
   %(prog)s --timer specialpie --sim
+  
+  # Several timers on neighbouring bays, merged into one event stream
+  %(prog)s --timer-spec bay1=amg,ble=AA:BB:CC:DD:EE:FF --timer-spec bay2=specialpie,serial=/dev/ttyACM0
         """
     )
     
@@ -149,6 +186,15 @@ Examples:
         help=f'Timer type ({", ".join(supported_timers)})'
     )
     
+    parser.add_argument(
+        '--timer-spec',
+        action='append',
+        type=parse_timer_spec,
+        metavar='ID=TYPE[,key=value...]',
+        help='Add a timer (repeatable); keys: serial, ble, baud, sim, sim_port. '
+             'Replaces --timer and the connection options'
+    )
+    
     # Connection options
     connection_group = parser.add_argument_group('Connection options')
     connection_group.add_argument(
@@ -273,7 +319,14 @@ def main():
     
     # Validate connection arguments
     connection_count = sum([bool(args.serial), bool(args.ble), bool(args.sim)])
-    if connection_count == 0:
+    if args.timer_spec:
+        timer_ids = [timer_id for timer_id, _, _ in args.timer_spec]
+        duplicates = sorted({timer_id for timer_id in timer_ids if timer_ids.count(timer_id) > 1})
+        if duplicates:
+            parser.error(f"Timer ids in --timer-spec must be unique: {', '.join(duplicates)}")
+        if connection_count:
+            parser.error("--timer-spec cannot be combined with --serial, --ble or --sim")
+    elif connection_count == 0:
         parser.error("Must specify one connection type: --serial, --ble, or --sim")
     elif connection_count > 1:
         parser.error("Can only specify one connection type")
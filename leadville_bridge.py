@@ -28,37 +28,16 @@ import sqlite3
 from pathlib import Path
 
 # Setup dual logging - both to console and file
+from impact_bridge.log_setup import setup_logging, add_handler, LazyHex, LogSampler
+
 def setup_dual_logging():
-    """Setup logging to both console and dedicated log files"""
-    # Create logs directory if it doesn't exist
-    log_dir = Path(__file__).parent / 'logs' / 'console'
-    log_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Create console log file with timestamp
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    console_log_file = log_dir / f'bridge_console_{timestamp}.log'
-    
-    # Setup root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter('[%(asctime)s] %(levelname)s: %(message)s', datefmt='%H:%M:%S')
-    console_handler.setFormatter(console_formatter)
-    
-    # File handler for complete console log
-    file_handler = logging.FileHandler(console_log_file)
-    file_handler.setLevel(logging.INFO)
-    file_formatter = logging.Formatter('[%(asctime)s] %(levelname)s: %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
-    file_handler.setFormatter(file_formatter)
+    """Setup logging to both console and dedicated log files.
     
-    # Add handlers to root logger
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
-    
-    return console_log_file
+    Handlers run on a background QueueListener; the console log rotates by
+    size and old files are gzipped in the background.
+    """
+    log_dir = Path(__file__).parent / 'logs' / 'console'
+    return setup_logging('bridge', log_dir=log_dir, level=logging.INFO)
 
 # Initialize dual logging
 console_log_path = setup_dual_logging()
@@ -70,10 +49,10 @@ try:
     # parse_5561 available to preserve existing behavior used throughout the
     # bridge. The verbose parser can persist parsed frames for analysis.
     try:
-        from impact_bridge.ble.wtvb_parse import scan_and_parse, parse_flag61_frame, parse_wtvb32_frame  # type: ignore
+        from impact_bridge.ble.wtvb_parse import parse_flag61_frame, parse_wtvb32_frame  # type: ignore
     except Exception:
         # If the ble package import style isn't available, try the flat import
-        from impact_bridge.wtvb_parse import scan_and_parse, parse_flag61_frame, parse_wtvb32_frame  # type: ignore
+        from impact_bridge.wtvb_parse import parse_flag61_frame, parse_wtvb32_frame  # type: ignore
 
     # Import the simple parser under the expected name so existing code keeps working
     try:
@@ -83,9 +62,18 @@ try:
         from impact_bridge.wtvb_parse_simple import parse_5561
     from impact_bridge.shot_detector import ShotDetector
     from impact_bridge.timing_calibration import RealTimeTimingCalibrator
+    from impact_bridge.timer_clock import TimerClock
+    from impact_bridge.ble.amg_parse import decode_amg_frame
     from impact_bridge.enhanced_impact_detection import EnhancedImpactDetector
     from impact_bridge.statistical_timing_calibration import statistical_calibrator
     from impact_bridge.dev_config import dev_config
+    from impact_bridge.sample_pipeline import SamplePipeline, LiveChartBuffer, SampleDbLogger, GatedSampleLogger, MqttTelemetryConsumer
+    from impact_bridge.telemetry_batch import TelemetryBatcher
+    from impact_bridge.match_aggregator import EVENT_KINDS as MATCH_EVENT_KINDS, MatchEventPublisher
+    from impact_bridge.sync_journal import SyncForwarder, SyncJournal
+    from impact_bridge.flight_recorder import FlightRecorder, KIND_DETECTOR, KIND_CORRELATOR, KIND_MARK
+    from impact_bridge.assignment_reconciler import AssignmentWatcher, diff_assignments
+    from impact_bridge.stream_watchdog import StreamWatchdog, STATE_STALLED
     print("✓ Successfully imported all impact bridge components")
     COMPONENTS_AVAILABLE = True
 except Exception as e:
@@ -116,6 +104,8 @@ class LeadVilleBridge:
     
     def __init__(self):
         self.logger = logger
+        # At most one line per high-frequency key (BT50 notifications) every 5s
+        self.log_sampler = LogSampler(self.logger, interval=5.0)
         
         # Initialize database for Bridge-assigned sensor lookups
         try:
@@ -160,6 +150,25 @@ class LeadVilleBridge:
         self.current_string_number = 1
         self.enhanced_impact_counter = 0
         
+        # Flight recorder and timer clock (set up with the components)
+        self.flight_recorder = None
+        self.timer_clock = None
+        self._trace_mac = None  # Sensor whose block the detectors are processing
+        
+        # Assignment hot-reload (set up once devices are connected)
+        self.assignment_watcher = None
+        self.match_publisher = None
+        self.sync_journal = None
+        self.sync_forwarder = None
+        self._last_reconcile = 0.0
+        self._reconcile_task = None  # Single-flight: at most one reconcile pass at a time
+        
+        # Stream watchdog: silent-sensor detection and targeted reconnects
+        self.stream_watchdog = None
+        self._watchdog_task = None
+        self._health_mqtt = None
+        self._reconnecting = {}  # Sensor MAC -> reconnect task
+        
         # Initialize components if available
         if COMPONENTS_AVAILABLE:
             self._initialize_components()
@@ -208,6 +217,10 @@ class LeadVilleBridge:
         self.logger.info(f"Expected delay: 1035ms")
         self.logger.info(f"Correlation window: 1520.0ms")
         self.logger.info(f"Delay tolerance: ±663ms")
+        # Shot times from the AMG timer's own clock instead of BLE arrival
+        if dev_config.is_timer_clock_enabled():
+            self.timer_clock = TimerClock()
+            self.logger.info("Timer clock reconstruction enabled")
         
         # 4. Development configuration display block
         self.logger.info("============================================================")
@@ -244,6 +257,64 @@ class LeadVilleBridge:
         # Shot detector (initialized after calibration)
         self.shot_detector = None
         
+        # 6. Flight recorder: recent raw/parsed/detector/correlator records, dumped on anomalies
+        if dev_config.is_flight_recorder_enabled():
+            self.flight_recorder = FlightRecorder(
+                Path(__file__).parent / 'logs' / 'flight_recorder',
+                seconds=dev_config.get_flight_recorder_seconds(),
+                min_dump_interval=dev_config.get_flight_recorder_min_dump_interval()
+            )
+            self.timing_calibrator.on_decision = self._on_correlator_decision
+            if self.enhanced_impact_detector:
+                self.enhanced_impact_detector.trace = self._detector_tracer('enhanced')
+            self.logger.info(f"Flight recorder: last {self.flight_recorder.seconds}s per device")
+        
+        # 7. Stream watchdog: per-sensor notification intervals, stalls flagged within a few periods
+        if dev_config.is_stream_watchdog_enabled():
+            self.stream_watchdog = StreamWatchdog(**dev_config.get_stream_watchdog_settings())
+            self.logger.info(f"Stream watchdog: stall after {self.stream_watchdog.stall_periods:g} periods "
+                             f"(min {self.stream_watchdog.min_stall_ns / 1e6:.0f}ms)")
+        
+        # 8. BT50 sample pipeline: decode once, fan out to consumers
+        self._setup_sample_pipeline()
+        
+        # 9. Store-and-forward journal: results survive offline mode until the head node has them
+        if dev_config.is_sync_enabled():
+            self.sync_journal = SyncJournal(str(Path(__file__).parent / dev_config.get_sync_journal_path()))
+            self.timing_calibrator.on_decision = self._on_correlator_decision
+            self.logger.info(f"Sync journal: {self.sync_journal.path} (last seq {self.sync_journal.last_seq}, "
+                             f"acked {self.sync_journal.acked_seq})")
+        
+    def _setup_sample_pipeline(self):
+        """Create the BT50 sample pipeline and register its consumers"""
+        self.sample_pipeline = SamplePipeline()
+        self.live_chart = LiveChartBuffer(capacity=dev_config.get_live_chart_samples())
+        
+        # Gated capture only persists windows around impacts and during strings
+        if dev_config.get_capture_mode() == 'gated':
+            sample_logger = GatedSampleLogger(pre_ms=dev_config.get_capture_pre_ms(),
+                                              post_ms=dev_config.get_capture_post_ms())
+            self.sample_capture = sample_logger.capture
+        else:
+            sample_logger = SampleDbLogger()
+            self.sample_capture = None
+        
+        # Registered first so a block is buffered before the detectors trigger on it
+        self.sample_pipeline.register_consumer('sample_logger', sample_logger,
+                                               enabled=dev_config.is_sample_logging_enabled())
+        if self.flight_recorder:
+            self.sample_pipeline.register_consumer('flight_recorder', self.flight_recorder.record_block)
+        self.sample_pipeline.register_consumer('shot_detector', self._consume_shot_detection)
+        self.sample_pipeline.register_consumer('enhanced_impact', self._consume_enhanced_impacts,
+                                               enabled=self.enhanced_impact_detector is not None)
+        self.sample_pipeline.register_consumer('live_chart', self.live_chart,
+                                               enabled=dev_config.is_live_chart_enabled())
+        # MQTT telemetry is attached (and enabled) in run() once the broker is reachable
+        
+        consumers = ", ".join(f"{name}{'' if enabled else ' (off)'}"
+                              for name, enabled in self.sample_pipeline.list_consumers().items())
+        self.logger.info(f"Sample pipeline consumers: {consumers}")
+        
     def _setup_detailed_logging(self):
         """Setup comprehensive debug and main event logging"""
         timestamp = datetime.now()
@@ -257,13 +328,42 @@ class LeadVilleBridge:
         debug_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         debug_handler.setFormatter(debug_formatter)
         
-        # Add debug handler to root logger
-        root_logger = logging.getLogger()
-        root_logger.addHandler(debug_handler)
-        root_logger.setLevel(logging.DEBUG)
+        # Add debug handler to the background logging listener
+        add_handler(debug_handler)
+        logging.getLogger().setLevel(logging.DEBUG)
         
         self.logger.info(f"Debug logging enabled: {debug_file}")
     
+    def _detector_tracer(self, detector_name):
+        """Detector trace hook recording state transitions for the current sensor"""
+        def trace(event, detail):
+            mac = self._trace_mac or "BT50"
+            self.flight_recorder.record_event(mac, KIND_DETECTOR, f"{detector_name}.{event}", detail)
+            if event == 'timeout':
+                self.flight_recorder.trigger('detector_timeout', mac)
+        return trace
+    
+    def _on_correlator_decision(self, event, detail):
+        """Correlator hook: record decisions, dump when a shot goes uncorrelated"""
+        if event in ('correlated', 'uncorrelated'):
+            self._emit_event('correlation', {'decision': event, 'detail': detail,
+                                             'string_number': self.current_string_number})
+        if not self.flight_recorder:
+            return
+        self.flight_recorder.record_event('correlator', KIND_CORRELATOR, event, detail)
+        if event == 'uncorrelated':
+            self.logger.warning(f"Uncorrelated shot: {detail}")
+            self.flight_recorder.trigger('uncorrelated_shot')
+    
+    def _on_ble_disconnect(self, client):
+        """BleakClient disconnected_callback"""
+        if not self.running:
+            return  # Expected during cleanup
+        self.logger.warning(f"BLE device disconnected: {client.address}")
+        if self.flight_recorder:
+            self.flight_recorder.record_event(client.address, KIND_MARK, 'disconnected')
+            self.flight_recorder.trigger('ble_disconnect', client.address)
+    
     def get_bridge_assigned_devices(self):
         """Get MAC addresses of devices assigned to this Bridge"""
         try:
@@ -467,9 +567,13 @@ class LeadVilleBridge:
             if self.enhanced_impact_detector:
                 self.enhanced_impact_detector.reset()
             
+            # Hand the baseline to the sample pipeline
+            self.sample_pipeline.clear_baselines()
+            self.sample_pipeline.set_default_baseline(self.baseline_x, self.baseline_y, self.baseline_z)
+            
             # Switch to normal notification handler
             await self.bt50_client.stop_notify(BT50_SENSOR_UUID)
-            await self.bt50_client.start_notify(BT50_SENSOR_UUID, self.bt50_notification_handler)
+            await self.bt50_client.start_notify(BT50_SENSOR_UUID, self._make_bt50_handler(self.bt50_client.address))
             
             self.logger.info("📝 Status: Sensor 12:E3 - Listening")
             self.logger.info("BT50 sensor and impact notifications enabled")
@@ -480,23 +584,30 @@ class LeadVilleBridge:
             self.logger.error(f"Calibration failed: {e}")
             return False
             
-    async def perform_multi_sensor_calibration(self):
-        """Perform automatic startup calibration for multiple BT50 sensors"""
+    async def perform_multi_sensor_calibration(self, clients=None):
+        """Perform automatic startup calibration for multiple BT50 sensors
+        
+        ``clients`` limits calibration to those sensors (newly assigned while
+        running); baselines of the other sensors are left untouched.
+        """
+        partial = clients is not None
+        clients = list(clients) if partial else self.bt50_clients
         self.logger.info("🎯 Starting multi-sensor automatic calibration...")
         self.logger.info(f"Calibration: {self.sensor_target_count} samples per sensor, auto=True")
         self.logger.info("================================")
         print("🎯 Performing multi-sensor startup calibration...")
         print("📋 Please ensure ALL sensors are STATIONARY during calibration")
-        print(f"⏱️  Collecting {self.sensor_target_count} samples from {len(self.bt50_clients)} sensors...")
+        print(f"⏱️  Collecting {self.sensor_target_count} samples from {len(clients)} sensors...")
         
         # Reset multi-sensor calibration state
         self.per_sensor_calibration = {}
-        self.sensor_baselines = {}
+        if not partial:
+            self.sensor_baselines = {}
         self.collecting_calibration = True
         
         # Initialize calibration storage for each connected sensor
         connected_sensor_macs = []
-        for i, client in enumerate(self.bt50_clients):
+        for i, client in enumerate(clients):
             # Get sensor MAC from the client
             sensor_mac = client.address
             connected_sensor_macs.append(sensor_mac)
@@ -510,7 +621,7 @@ class LeadVilleBridge:
         
         try:
             # Start calibration notifications on all connected sensors with individual handlers
-            for i, client in enumerate(self.bt50_clients):
+            for i, client in enumerate(clients):
                 sensor_mac = client.address
                 # Create a closure to capture the sensor_mac for each handler
                 def create_calibration_handler(mac):
@@ -521,7 +632,7 @@ class LeadVilleBridge:
                 handler = create_calibration_handler(sensor_mac)
                 await client.start_notify(BT50_SENSOR_UUID, handler)
             
-            self.logger.debug(f"Calibration notifications enabled on {len(self.bt50_clients)} sensors")
+            self.logger.debug(f"Calibration notifications enabled on {len(clients)} sensors")
             
             # Wait for calibration to complete on all sensors
             start_time = time.time()
@@ -602,9 +713,13 @@ class LeadVilleBridge:
                 sensor_id = sensor_mac[-5:].replace(":", "")
                 self.logger.info(f"Sensor {sensor_id} calibrated: X={baseline_x:.1f}, Y={baseline_y:.1f}, Z={baseline_z:.1f}")
             
-            # Set compatibility values from first sensor for legacy code
-            if connected_sensor_macs and calibrated_count > 0:
-                first_sensor_baseline = self.sensor_baselines[connected_sensor_macs[0]]
+            # Set compatibility values from first sensor for legacy code; a
+            # partial run sets them when no sensor was calibrated before
+            # (none assigned at startup, or startup calibration failed)
+            set_legacy = not partial or self.shot_detector is None
+            if set_legacy and calibrated_count > 0:
+                first_mac = next(mac for mac in connected_sensor_macs if mac in self.sensor_baselines)
+                first_sensor_baseline = self.sensor_baselines[first_mac]
                 self.baseline_x = first_sensor_baseline["baseline_x"]
                 self.baseline_y = first_sensor_baseline["baseline_y"] 
                 self.baseline_z = first_sensor_baseline["baseline_z"]
@@ -631,16 +746,27 @@ class LeadVilleBridge:
                     sensor_id = sensor_mac[-5:].replace(":", "")
                     self.logger.info(f"📊 Sensor {sensor_id}: X={baseline['baseline_x']:.1f}, Y={baseline['baseline_y']:.1f}, Z={baseline['baseline_z']:.1f}")
             
-            # Reset enhanced impact detector if available
-            if self.enhanced_impact_detector:
+            # Reset enhanced impact detector if available (not mid-session)
+            if self.enhanced_impact_detector and not partial:
                 self.enhanced_impact_detector.reset()
             
-            # Switch to normal notification handlers on all sensors
-            for client in self.bt50_clients:
+            # Hand per-sensor baselines to the sample pipeline
+            if not partial:
+                self.sample_pipeline.clear_baselines()
+            if set_legacy and self.baseline_x is not None:
+                self.sample_pipeline.set_default_baseline(self.baseline_x, self.baseline_y, self.baseline_z)
+            for sensor_mac in connected_sensor_macs:
+                baseline = self.sensor_baselines.get(sensor_mac)
+                if baseline:
+                    self.sample_pipeline.set_baseline(sensor_mac, baseline["baseline_x"],
+                                                      baseline["baseline_y"], baseline["baseline_z"])
+            
+            # Switch to normal notification handlers on the calibrated sensors
+            for client in clients:
                 await client.stop_notify(BT50_SENSOR_UUID)
-                await client.start_notify(BT50_SENSOR_UUID, self.bt50_notification_handler)
+                await client.start_notify(BT50_SENSOR_UUID, self._make_bt50_handler(client.address))
             
-            self.logger.info(f"📝 Status: All {len(self.bt50_clients)} sensors - Listening")
+            self.logger.info(f"📝 Status: All {len(clients)} sensors - Listening")
             self.logger.info("Multi-sensor BT50 and impact notifications enabled")
             self.logger.info("-----------------------------🎯Bridge ready for String🎯-----------------------------")
             return True
@@ -818,9 +944,13 @@ class LeadVilleBridge:
             if self.enhanced_impact_detector:
                 self.enhanced_impact_detector.reset()
             
+            # Hand the baseline to the sample pipeline
+            self.sample_pipeline.clear_baselines()
+            self.sample_pipeline.set_default_baseline(self.baseline_x, self.baseline_y, self.baseline_z)
+            
             # Switch to normal notification handler
             await self.bt50_client.stop_notify(BT50_SENSOR_UUID)
-            await self.bt50_client.start_notify(BT50_SENSOR_UUID, self.bt50_notification_handler)
+            await self.bt50_client.start_notify(BT50_SENSOR_UUID, self._make_bt50_handler(self.bt50_client.address))
             
             self.logger.info("📝 Status: Sensor 12:E3 - Listening")
             self.logger.info("BT50 sensor and impact notifications enabled")
@@ -832,59 +962,56 @@ class LeadVilleBridge:
             return False
             
     async def amg_notification_handler(self, characteristic, data):
+        received_ns = time.monotonic_ns()
         hex_data = data.hex()
-        self.logger.debug(f"AMG notification: {hex_data}")
+        self.logger.debug("AMG notification: %s", hex_data)
+        if self.flight_recorder and self.amg_client:
+            self.flight_recorder.record_raw(self.amg_client.address, data)
         
-        # Try to use the new sophisticated parser for rich data extraction
-        try:
-            from impact_bridge.ble.amg_parse import parse_amg_timer_data, format_amg_event
-            parsed_data = parse_amg_timer_data(data)
-            
-            if parsed_data:
-                # Log the rich parsed information
-                formatted_event = format_amg_event(parsed_data)
-                self.logger.debug(f"AMG Enhanced: {formatted_event}")
-                
-                # Continue with existing logic but with parsed data available
-                # This allows us to log rich data while maintaining existing behavior
-                
-        except (ImportError, Exception) as e:
-            self.logger.debug(f"Enhanced AMG parsing not available: {e}")
-            parsed_data = None
+        # Decode once; the frame also serves as the parsed dict for persistence
+        frame = decode_amg_frame(data)
+        parsed_data = frame if frame is not None and frame.is_status else None
+        if parsed_data:
+            self.logger.debug("AMG Enhanced: %s", frame)
         
         # Process AMG timer frames (shots, start/stop beeps) - original logic
-        if len(data) >= 2:
-            frame_header = data[0]
-            frame_type = data[1]
-            
+        if frame is not None:
             # Log ALL AMG frames for analysis
-            self.logger.info(f"🔍 AMG Frame: {hex_data} (header={frame_header:02X}, type={frame_type:02X})")
+            self.logger.info(f"🔍 AMG Frame: {hex_data} (header={frame.type_id:02X}, type={frame.state:02X})")
             
             # Handle START beep (0x0105)
-            if frame_header == 0x01 and frame_type == 0x05:
+            if frame.event == 'START':
                 self.start_beep_time = datetime.now()
+                if self.timer_clock:
+                    self.start_beep_time = self._timer_clock_datetime(self.timer_clock.start_string(received_ns))
                 # Extract string number if available
-                string_number = data[13] if len(data) >= 14 else self.current_string_number
+                string_number = data[13] if frame.is_status else self.current_string_number
                 self.current_string_number = string_number
                 self.logger.info(f"📝 Status: Timer DC:1A - -------Start Beep ------- String #{string_number} at {self.start_beep_time.strftime('%H:%M:%S.%f')[:-3]}")
+                if getattr(self, 'sample_capture', None):
+                    self.sample_capture.start_string(string_number, time.time_ns())
                 # persist timer START event to capture DB (best-effort)
                 try:
-                    self._persist_timer_event(event_type='START', raw_hex=hex_data, split_seconds=None, split_cs=None, parsed_data=parsed_data)
+                    self._persist_timer_event(event_type='START', raw_hex=hex_data, split_seconds=None, split_cs=None, parsed_data=parsed_data,
+                                              ts_ns=int(self.start_beep_time.timestamp() * 1e9))
                 except Exception:
                     self.logger.debug("Failed to persist timer START event")
                 
             # Handle SHOT event (0x0103)
-            elif frame_header == 0x01 and frame_type == 0x03 and len(data) >= 14:
+            elif frame.event == 'SHOT' and frame.is_status:
                 shot_time = datetime.now()
                 self.shot_counter += 1
                 
                 # Extract timer data
-                time_cs = (data[4] << 8) | data[5]
-                split_cs = (data[6] << 8) | data[7]  
-                first_cs = (data[8] << 8) | data[9]
+                time_cs = frame.time_cs
+                split_cs = frame.split_cs
+                first_cs = frame.first_cs
                 
                 timer_split_seconds = split_cs / 100.0
                 first_seconds = first_cs / 100.0
+                if self.timer_clock:
+                    # time_cs is the timer's own time since the start beep
+                    shot_time = self._timer_clock_datetime(self.timer_clock.observe(time_cs / 100.0, received_ns))
                 
                 # Calculate split time from previous shot
                 shot_split_seconds = 0.0
@@ -895,26 +1022,29 @@ class LeadVilleBridge:
                 
                 self.previous_shot_time = shot_time
                 
-                # Record shot for timing correlation (skip if method doesn't exist)
-                if self.timing_calibrator and hasattr(self.timing_calibrator, 'record_shot'):
-                    self.timing_calibrator.record_shot(shot_time, self.shot_counter, self.current_string_number)
+                # Record shot for timing correlation
+                if self.timing_calibrator:
+                    self.timing_calibrator.add_shot_event(shot_time, self.shot_counter,
+                                                          f"AMG_TIMER:string{self.current_string_number}")
                 # persist timer SHOT event to capture DB (best-effort)
                 try:
-                    self._persist_timer_event(event_type='SHOT', raw_hex=hex_data, split_seconds=timer_split_seconds, split_cs=split_cs, parsed_data=parsed_data)
+                    self._persist_timer_event(event_type='SHOT', raw_hex=hex_data, split_seconds=timer_split_seconds, split_cs=split_cs, parsed_data=parsed_data,
+                                              ts_ns=int(shot_time.timestamp() * 1e9))
                 except Exception:
                     self.logger.debug("Failed to persist timer SHOT event")
                     
             # Handle STOP beep (0x0108)
-            elif frame_header == 0x01 and frame_type == 0x08:
+            elif frame.event == 'STOP':
                 reception_timestamp = datetime.now()
                 
                 # Extract string data
-                if len(data) >= 14:
+                if frame.is_status:
                     string_number = data[13]
-                    time_cs = (data[4] << 8) | data[5]
+                    time_cs = frame.time_cs
                     timer_seconds = time_cs / 100.0
                 else:
                     string_number = self.current_string_number
+                    time_cs = None
                     timer_seconds = 0
                     
                 # Calculate total info
@@ -925,6 +1055,13 @@ class LeadVilleBridge:
                     
                 self.logger.info(f"� Status: Timer DC:1A - Stop Beep for String #{string_number} at {reception_timestamp.strftime('%H:%M:%S.%f')[:-3]}{total_info}")
                 
+                if getattr(self, 'sample_capture', None):
+                    self.sample_capture.stop_string(time.time_ns())
+                
+                if self.timer_clock and self.timer_clock.active:
+                    self.timer_clock.end_string()
+                    self.logger.debug(f"Timer clock: {self.timer_clock.stats()}")
+                
                 # Reset for next string  
                 self.start_beep_time = None
                 self.impact_counter = 0
@@ -944,12 +1081,27 @@ class LeadVilleBridge:
                 except Exception:
                     self.logger.debug("Failed to persist unknown AMG event")
 
-    def _persist_timer_event(self, event_type: str, raw_hex: str = None, split_seconds: float = None, split_cs: int = None, parsed_data: dict = None):
+    def _timer_clock_datetime(self, host_ns: int) -> datetime:
+        """Wall-clock datetime of a monotonic ``host_ns`` from the timer clock"""
+        return datetime.now() - timedelta(microseconds=(time.monotonic_ns() - host_ns) / 1000)
+
+    def _persist_timer_event(self, event_type: str, raw_hex: str = None, split_seconds: float = None, split_cs: int = None, parsed_data: dict = None,
+                             ts_ns: int = None):
         """Best-effort persist of timer event into the capture DB (db/leadville_runtime.db).
 
         This is intentionally lightweight and synchronous; it avoids coupling to the
         capture process queue and uses WAL mode for safe concurrent writes.
+        ``ts_ns`` is the event time on the timer clock (arrival time if omitted).
         """
+        if ts_ns is None:
+            ts_ns = time.time_ns()
+        if event_type != 'UNKNOWN':
+            self._emit_event('timer', {
+                'event_type': event_type,
+                'split_seconds': split_seconds,
+                'string_number': self.current_string_number,
+                'current_shot': (parsed_data or {}).get('current_shot'),
+            }, ts_ns=ts_ns)
         try:
             # Force the exact database path to avoid any resolution issues
             db_path = Path("/home/jrwest/projects/LeadVille/db/leadville_runtime.db")
@@ -986,7 +1138,6 @@ class LeadVilleBridge:
                 )
                 """
             )
-            ts_ns = int(time.time() * 1e9)
             # Extract structured data for hybrid schema
             current_shot = None
             total_shots = None
@@ -1000,7 +1151,7 @@ class LeadVilleBridge:
                 total_shots = parsed_data.get('total_shots')
                 current_round = parsed_data.get('current_round')
                 string_total_time = parsed_data.get('current_time')
-                parsed_json = json.dumps(parsed_data)
+                parsed_json = json.dumps(dict(parsed_data))
             
             cur.execute(
                 """INSERT INTO timer_events 
@@ -1018,142 +1169,137 @@ class LeadVilleBridge:
             self.logger.debug(f"Timer event persistence failed: {e}")
             pass
                 
-    async def bt50_notification_handler(self, characteristic, data):
+    def _make_bt50_handler(self, sensor_mac):
+        """Create a notification handler bound to one BT50 sensor"""
+        watchdog = self.stream_watchdog
+        async def handler(characteristic, data):
+            if watchdog is not None:
+                watchdog.note(sensor_mac, time.monotonic_ns())
+            await self.bt50_notification_handler(characteristic, data, sensor_mac=sensor_mac)
+        return handler
+    
+    async def bt50_notification_handler(self, characteristic, data, sensor_mac=None):
         """Handle BT50 sensor notifications with impact detection"""
         if not COMPONENTS_AVAILABLE or not self.calibration_complete:
             return
             
         try:
-            # Persist verbose parsed frames for offline analysis if sample logging
-            # is enabled (this writes to db/leadville_runtime.db)
+            # Decode once, correct baseline in place and fan out to the
+            # registered consumers (detectors, sample logger, live chart, MQTT)
+            if sensor_mac is None:
+                sensor_mac = self.bt50_client.address if self.bt50_client else "BT50"
+            self.log_sampler.debug("raw notification", "BT50 %s notification: %s", sensor_mac, LazyHex(data))
+            if self.flight_recorder:
+                self.flight_recorder.record_raw(sensor_mac, data)
+            self.sample_pipeline.process(sensor_mac, data)
+        except Exception as e:
+            self.log_sampler.log("bt50 processing failed", logging.ERROR, "BT50 processing failed: %s", e)
+    
+    def _consume_shot_detection(self, block):
+        """Sample pipeline consumer: legacy X-axis shot detection"""
+        if not self.shot_detector:
+            return
+        
+        self._trace_mac = block.sensor_mac
+        if self.flight_recorder and self.shot_detector.trace is None:
+            self.shot_detector.trace = self._detector_tracer('shot')
+        
+        detected_shots = self.shot_detector.process_samples(block.values[:, 0], block.ts_ns)
+        
+        for shot in detected_shots:
+            self.impact_counter += 1
+            shot_time = datetime.fromtimestamp(shot.timestamp)
+            
+            # Calculate time from string start
+            time_from_start = 0.0
+            if self.start_beep_time:
+                time_from_start = (shot_time - self.start_beep_time).total_seconds()
+            
+            # Calculate time from last shot
+            time_from_shot = 0.0
+            if self.previous_shot_time:
+                time_from_shot = (shot_time - self.previous_shot_time).total_seconds()
+            
+            self.logger.info(f"💥 String {self.current_string_number}, Impact #{self.impact_counter} - Time {time_from_start:.2f}s, Shot->Impact {time_from_shot:.3f}s, Peak {shot.max_deviation:.0f}g")
+            
+            # Persist the raw window around this impact
+            if self.sample_capture:
+                self.sample_capture.trigger(block.sensor_mac, int(shot.timestamp * 1e9),
+                                            f"impact:{self.current_string_number}.{self.impact_counter}")
+            
+            self._emit_event('impact', {
+                'sensor_mac': block.sensor_mac,
+                'impact_number': self.impact_counter,
+                'string_number': self.current_string_number,
+                'peak_g': float(shot.max_deviation),
+            }, ts_ns=int(shot.timestamp * 1e9))
+            
+            # Record impact for timing correlation
+            if self.timing_calibrator:
+                self.timing_calibrator.add_impact_event(shot_time, float(shot.max_deviation), block.sensor_mac)
+            
+            # Log impact to database
             try:
-                write_db = False
-                if hasattr(self, 'dev_config') and self.dev_config:
-                    # dev_config may expose a sample logging toggle
-                    if hasattr(self.dev_config, 'is_sample_logging_enabled'):
-                        write_db = self.dev_config.is_sample_logging_enabled()
-                    elif hasattr(self.dev_config, 'should_log_all_samples'):
-                        write_db = self.dev_config.should_log_all_samples()
-
-                # scan_and_parse is non-blocking and quick; it will write rows when
-                # enabled. Wrap in its own try to avoid breaking detection on DB errors.
-                try:
-                    scan_and_parse(data, write_db=write_db)
-                except Exception as e:
-                    self.logger.debug(f"Verbose parser DB write failed: {e}")
-            except Exception:
-                # If verbose parser not available, ignore and continue
-                pass
-
-            # Parse sensor data using the simple parser (returns scaled vx/vy/vz)
-            result = parse_5561(data)
-            if not result or not result['samples']:
-                return
-            
-            # Apply baseline correction to samples using scaled values like TinTown
-            corrected_samples = []
-            for sample in result['samples']:
-                corrected_sample = sample.copy()
-                corrected_sample['vx_corrected'] = sample['vx'] - self.baseline_x
-                corrected_sample['vy_corrected'] = sample['vy'] - self.baseline_y  
-                corrected_sample['vz_corrected'] = sample['vz'] - self.baseline_z
-                corrected_samples.append(corrected_sample)
+                db_path = os.path.join(os.path.dirname(__file__), "leadville.db")
+                conn = sqlite3.connect(db_path)
+                cursor = conn.cursor()
                 
-            # Process samples for shot detection
-            if self.shot_detector:
-                detected_shots = []
-                for corrected_sample in corrected_samples:
-                    shot_event = self.shot_detector.process_sample(corrected_sample['vx_corrected'], corrected_sample.get('timestamp'))
-                    if shot_event:
-                        detected_shots.append(shot_event)
+                sensor_mac = block.sensor_mac.replace(':', '').upper()
                 
-                for shot in detected_shots:
-                    self.impact_counter += 1
-                    
-                    # Calculate time from string start
-                    time_from_start = 0.0
-                    if self.start_beep_time:
-                        time_from_start = (shot.timestamp - self.start_beep_time).total_seconds()
-                    
-                    # Calculate time from last shot
-                    time_from_shot = 0.0
-                    if self.previous_shot_time:
-                        time_from_shot = (shot.timestamp - self.previous_shot_time).total_seconds()
-                    
-                    self.logger.info(f"💥 String {self.current_string_number}, Impact #{self.impact_counter} - Time {time_from_start:.2f}s, Shot->Impact {time_from_shot:.3f}s, Peak {shot.peak_magnitude:.0f}g")
-                    
-                    # Record impact for timing correlation
-                    if self.timing_calibrator:
-                        self.timing_calibrator.record_impact(shot.timestamp, shot.peak_magnitude)
-                    
-                    # Log impact to database
-                    try:
-                        db_path = os.path.join(os.path.dirname(__file__), "leadville.db")
-                        conn = sqlite3.connect(db_path)
-                        cursor = conn.cursor()
-                        
-                        # Get sensor MAC from characteristic  
-                        sensor_mac = characteristic.service.device.address.replace(':', '').upper()
-                        
-                        cursor.execute("""
-                            INSERT INTO sensor_events (ts_utc, sensor_id, magnitude, features_json, created_at)
-                            VALUES (?, ?, ?, ?, ?)
-                        """, (
-                            shot.timestamp.isoformat(),
-                            sensor_mac,
-                            shot.max_deviation,
-                            json.dumps({
-                                'impact_counter': self.impact_counter,
-                                'string_number': self.current_string_number,
-                                'time_from_start': time_from_start,
-                                'time_from_shot': time_from_shot,
-                                'duration_samples': shot.duration_samples,
-                                'x_values': shot.x_values
-                            }),
-                            datetime.now().isoformat()
-                        ))
-                        
-                        conn.commit()
-                        conn.close()
-                        self.logger.debug(f"💾 Impact logged to database: sensor={sensor_mac}, magnitude={shot.max_deviation}")
-                        
-                    except Exception as db_error:
-                        self.logger.error(f"Failed to log impact to database: {db_error}")
-            
-            # Enhanced impact detection (if enabled)
-            if self.enhanced_impact_detector:
-                enhanced_impacts = []
-                for corrected_sample in corrected_samples:
-                    # Calculate magnitude from corrected values
-                    magnitude = (corrected_sample['vx_corrected']**2 + corrected_sample['vy_corrected']**2 + corrected_sample['vz_corrected']**2)**0.5
-                    timestamp = datetime.fromtimestamp(corrected_sample.get('timestamp', time.time()))
-                    raw_values = [sample['vx'], sample['vy'], sample['vz']]
-                    corrected_values = [corrected_sample['vx_corrected'], corrected_sample['vy_corrected'], corrected_sample['vz_corrected']]
-                    
-                    impact_event = self.enhanced_impact_detector.process_sample(
-                        timestamp, raw_values, corrected_values, magnitude
-                    )
-                    if impact_event:
-                        enhanced_impacts.append(impact_event)
+                cursor.execute("""
+                    INSERT INTO sensor_events (ts_utc, sensor_id, magnitude, features_json, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (
+                    shot_time.isoformat(),
+                    sensor_mac,
+                    shot.max_deviation,
+                    json.dumps({
+                        'impact_counter': self.impact_counter,
+                        'string_number': self.current_string_number,
+                        'time_from_start': time_from_start,
+                        'time_from_shot': time_from_shot,
+                        'duration_samples': shot.duration_samples,
+                        'x_values': shot.x_values
+                    }),
+                    datetime.now().isoformat()
+                ))
                 
-                for impact in enhanced_impacts:
-                    # Calculate time from string start
-                    time_from_start = 0.0
-                    if self.start_beep_time:
-                        time_from_start = (impact.onset_timestamp - self.start_beep_time).total_seconds()
-                    
-                    # Calculate time from last shot
-                    time_from_shot = 0.0
-                    if self.previous_shot_time:
-                        time_from_shot = (impact.onset_timestamp - self.previous_shot_time).total_seconds()
-                    
-                    impact_number = getattr(self, 'enhanced_impact_counter', 0) + 1
-                    setattr(self, 'enhanced_impact_counter', impact_number)
-                    
-                    self.logger.info(f"💥 String {self.current_string_number}, Enhanced Impact #{impact_number} - Time {time_from_start:.2f}s, Shot->Impact {time_from_shot:.3f}s, Peak {impact.peak_magnitude:.0f}g")
-                    
-        except Exception as e:
-            self.logger.error(f"BT50 processing failed: {e}")
+                conn.commit()
+                conn.close()
+                self.logger.debug(f"💾 Impact logged to database: sensor={sensor_mac}, magnitude={shot.max_deviation}")
+                
+            except Exception as db_error:
+                self.logger.error(f"Failed to log impact to database: {db_error}")
+    
+    def _consume_enhanced_impacts(self, block):
+        """Sample pipeline consumer: onset-timed enhanced impact detection"""
+        if not self.enhanced_impact_detector:
+            return
+        
+        self._trace_mac = block.sensor_mac
+        enhanced_impacts = self.enhanced_impact_detector.process_samples(
+            block.ts_ns, block.values, block.magnitude(), block.raw * block.scale
+        )
+        
+        for impact in enhanced_impacts:
+            # Calculate time from string start
+            time_from_start = 0.0
+            if self.start_beep_time:
+                time_from_start = (impact.onset_timestamp - self.start_beep_time).total_seconds()
+            
+            # Calculate time from last shot
+            time_from_shot = 0.0
+            if self.previous_shot_time:
+                time_from_shot = (impact.onset_timestamp - self.previous_shot_time).total_seconds()
+            
+            impact_number = getattr(self, 'enhanced_impact_counter', 0) + 1
+            setattr(self, 'enhanced_impact_counter', impact_number)
+            
+            self.logger.info(f"💥 String {self.current_string_number}, Enhanced Impact #{impact_number} - Time {time_from_start:.2f}s, Shot->Impact {time_from_shot:.3f}s, Peak {impact.peak_magnitude:.0f}g")
+            
+            if self.sample_capture:
+                self.sample_capture.trigger(block.sensor_mac, int(impact.window.ts_ns[0]),
+                                            f"impact:{self.current_string_number}.e{impact_number}")
             
     async def reset_ble(self):
         """Reset BLE connections before starting"""
@@ -1239,16 +1385,7 @@ class LeadVilleBridge:
         
         # Connect AMG Timer if assigned
         if timer_mac:
-            try:
-                self.logger.info(f"Connecting to assigned timer: {timer_mac}")
-                self.amg_client = BleakClient(timer_mac)
-                await self.amg_client.connect()
-                await self.amg_client.start_notify(AMG_TIMER_UUID, self.amg_notification_handler)
-                self.logger.info(f"📝 Status: Timer {timer_mac[-5:]} - Connected")
-                self.logger.info("AMG timer and shot notifications enabled")
-                
-            except Exception as e:
-                self.logger.error(f"AMG timer connection failed: {e}")
+            await self._connect_timer(timer_mac)
         else:
             self.logger.warning("No timer assigned to this Bridge")
             
@@ -1259,27 +1396,9 @@ class LeadVilleBridge:
             connected_count = 0
             
             for i, sensor_mac in enumerate(sensor_macs):
-                target_num = i + 1
-                sensor_id = sensor_mac[-5:].replace(":", "")
-                
-                try:
-                    self.logger.info(f"Connecting to BT50 sensor - Target {target_num} ({sensor_id})...")
-                    self.logger.info(f"Target {target_num} MAC: {sensor_mac}")
-                    
-                    client = BleakClient(sensor_mac)
-                    await client.connect()
-                    self.bt50_clients.append(client)
+                client = await self._connect_sensor(sensor_mac, i + 1)
+                if client:
                     connected_count += 1
-                    
-                    # Use first sensor as primary for compatibility with legacy code
-                    if i == 0:
-                        self.bt50_client = client
-                    
-                    self.logger.info(f"📝 Status: Sensor {sensor_id} - Connected (Target {target_num})")
-                    
-                except Exception as e:
-                    self.logger.error(f"BT50 sensor {sensor_mac} connection failed: {e}")
-                    continue
             
             if connected_count > 0:
                 self.logger.info(f"📝 Status: {connected_count}/{len(sensor_macs)} BT50 sensors connected")
@@ -1295,15 +1414,244 @@ class LeadVilleBridge:
                     
         else:
             self.logger.warning("No BT50 sensors assigned to this Bridge")
+        
+        # Watch the assignment file from here on
+        if COMPONENTS_AVAILABLE and dev_config.is_assignment_hot_reload_enabled():
+            self.assignment_watcher = AssignmentWatcher()
+            self.assignment_watcher.prime(assigned_devices)
+            self._last_reconcile = time.monotonic()
+    
+    async def _connect_timer(self, timer_mac):
+        """Connect the AMG timer and enable shot notifications"""
+        try:
+            self.logger.info(f"Connecting to assigned timer: {timer_mac}")
+            self.amg_client = BleakClient(timer_mac, disconnected_callback=self._on_ble_disconnect)
+            await self.amg_client.connect()
+            await self.amg_client.start_notify(AMG_TIMER_UUID, self.amg_notification_handler)
+            self.logger.info(f"📝 Status: Timer {timer_mac[-5:]} - Connected")
+            self.logger.info("AMG timer and shot notifications enabled")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"AMG timer connection failed: {e}")
+            return False
+    
+    async def _connect_sensor(self, sensor_mac, target_num):
+        """Connect one BT50 sensor and add it to ``bt50_clients`` (no notifications yet)"""
+        sensor_id = sensor_mac[-5:].replace(":", "")
+        try:
+            self.logger.info(f"Connecting to BT50 sensor - Target {target_num} ({sensor_id})...")
+            self.logger.info(f"Target {target_num} MAC: {sensor_mac}")
+            
+            client = BleakClient(sensor_mac, disconnected_callback=self._on_ble_disconnect)
+            await client.connect()
+            self.bt50_clients.append(client)
+            
+            # Use first sensor as primary for compatibility with legacy code
+            if self.bt50_client is None or self.bt50_client not in self.bt50_clients:
+                self.bt50_client = client
+            
+            self.logger.info(f"📝 Status: Sensor {sensor_id} - Connected (Target {target_num})")
+            return client
+            
+        except Exception as e:
+            self.logger.error(f"BT50 sensor {sensor_mac} connection failed: {e}")
+            return None
+    
+    async def _disconnect_sensor(self, client):
+        """Stop notifications, disconnect and forget one BT50 sensor"""
+        sensor_mac = client.address
+        if client in self.bt50_clients:
+            self.bt50_clients.remove(client)
+        if self.bt50_client is client:
+            self.bt50_client = self.bt50_clients[0] if self.bt50_clients else None
+        try:
+            if client.is_connected:
+                try:
+                    await client.stop_notify(BT50_SENSOR_UUID)
+                except Exception:
+                    pass  # Notifications may not have been started
+                await client.disconnect()
+        except Exception as e:
+            self.logger.warning(f"BT50 sensor {sensor_mac} disconnect failed: {e}")
+        self.sensor_baselines.pop(sensor_mac, None)
+        self.sample_pipeline.remove_baseline(sensor_mac)
+        if self.stream_watchdog:
+            self.stream_watchdog.forget(sensor_mac)
+        self.logger.info(f"📝 Status: Sensor {sensor_mac[-5:].replace(':', '')} - Disconnected (unassigned)")
+    
+    async def reconcile_assignments(self, desired):
+        """Connect/disconnect only the devices that differ from ``desired``.
+        
+        Sensors that stay assigned keep their connection and calibrated
+        baseline; newly assigned sensors are calibrated on their own (or reuse
+        the baseline from earlier in this session after a dropped link).
+        """
+        # Clients whose link dropped count as not connected
+        for client in [c for c in self.bt50_clients if not c.is_connected]:
+            self.bt50_clients.remove(client)
+            if self.bt50_client is client:
+                self.bt50_client = self.bt50_clients[0] if self.bt50_clients else None
+        
+        current_timer = self.amg_client.address if self.amg_client and self.amg_client.is_connected else None
+        diff = diff_assignments(current_timer, [c.address for c in self.bt50_clients], desired)
+        if diff.empty:
+            return diff
+        self.logger.info(f"🔄 Reconciling assignments: {diff.summary()}")
+        
+        # Unassigned sensors first: free their BLE slots and baselines
+        for client in [c for c in self.bt50_clients if c.address.upper() in diff.disconnect_sensors]:
+            await self._disconnect_sensor(client)
+        
+        if diff.timer_change:
+            if self.amg_client:
+                try:
+                    if self.amg_client.is_connected:
+                        await self.amg_client.disconnect()
+                except Exception as e:
+                    self.logger.warning(f"AMG timer disconnect failed: {e}")
+                self.amg_client = None
+            if diff.timer_change[1]:
+                await self._connect_timer(diff.timer_change[1])
+        
+        new_clients = []
+        for sensor_mac in diff.connect_sensors:
+            if sensor_mac.upper() in self._reconnecting:
+                continue  # The stream watchdog is already bringing it back
+            client = await self._connect_sensor(sensor_mac, desired['sensors'].index(sensor_mac) + 1)
+            if not client:
+                continue
+            if sensor_mac in self.sensor_baselines:
+                # Reconnect after a dropped link: baseline from this session still applies
+                await client.start_notify(BT50_SENSOR_UUID, self._make_bt50_handler(client.address))
+            else:
+                new_clients.append(client)
+        
+        if new_clients:
+            await asyncio.sleep(1.0)  # Let connections stabilize
+            if not await self.perform_multi_sensor_calibration(new_clients):
+                # Drop them so the next reconcile pass retries from scratch
+                self.logger.error(f"❌ Calibration of {len(new_clients)} newly assigned sensor(s) failed")
+                self.collecting_calibration = False
+                for client in new_clients:
+                    await self._disconnect_sensor(client)
+        
+        self.logger.info(f"📝 Status: {len(self.bt50_clients)}/{len(desired['sensors'])} BT50 sensors connected")
+        return diff
+    
+    def _poll_assignments(self):
+        """Main-loop hook: apply assignment file changes, retry missing devices.
+        
+        Reconciling connects and calibrates sensors, which takes seconds, so it
+        runs as its own task; the main loop never waits for it.
+        """
+        desired = self.assignment_watcher.poll()
+        now = time.monotonic()
+        if desired is not None:
+            self.logger.info(f"📥 Assignment change: timer={desired['timer']}, sensors={len(desired['sensors'])}")
+        if self._reconcile_task and not self._reconcile_task.done():
+            if desired is not None:
+                self._last_reconcile = 0.0  # Apply it as soon as the running pass ends
+            return
+        if desired is None:
+            if now - self._last_reconcile < dev_config.get_assignment_reconcile_interval():
+                return
+            desired = self.assignment_watcher.desired
+        self._last_reconcile = now
+        self._reconcile_task = asyncio.create_task(self._run_reconcile(desired))
+    
+    async def _run_reconcile(self, desired):
+        try:
+            await self.reconcile_assignments(desired)
+        except Exception as e:
+            self.logger.error(f"Assignment reconciliation failed: {e}")
+    
+    async def _watch_streams(self):
+        """Stream watchdog task: flag silent sensors, reconnect only those"""
+        interval = dev_config.get_stream_watchdog_check_interval()
+        status_dir = Path(__file__).parent / 'logs'
+        last_write_ns = 0
+        while self.running:
+            await asyncio.sleep(interval)
+            now_ns = time.monotonic_ns()
+            try:
+                transitions = self.stream_watchdog.check(now_ns)
+                for transition in transitions:
+                    self._on_stream_health(transition)
+                for sensor_mac in self.stream_watchdog.due_reconnects(now_ns):
+                    if sensor_mac.upper() not in self._reconnecting:
+                        self.stream_watchdog.note_reconnect(sensor_mac, now_ns)
+                        self._reconnecting[sensor_mac.upper()] = asyncio.create_task(self._reconnect_sensor(sensor_mac))
+                # Admin API snapshot: on every transition, otherwise every 5s
+                if transitions or now_ns - last_write_ns >= 5_000_000_000:
+                    self.stream_watchdog.write_status(status_dir, now_ns, datetime.now().isoformat())
+                    last_write_ns = now_ns
+            except Exception as e:
+                self.logger.error(f"Stream watchdog check failed: {e}")
+    
+    def _on_stream_health(self, transition):
+        """Log, record and publish one stream health transition"""
+        sensor_mac = transition['device_id']
+        sensor_id = sensor_mac[-5:].replace(":", "")
+        if transition['state'] == STATE_STALLED:
+            self.logger.warning(f"⚠️ Sensor {sensor_id} silent for {transition['gap_ms']}ms "
+                                f"(expected every {transition['expected_period_ms']}ms), "
+                                f"detected {transition['time_to_detect_ms']}ms after the missed notification")
+        else:
+            self.logger.info(f"✓ Sensor {sensor_id} streaming again, recovered {transition['time_to_recover_ms']}ms "
+                             f"after detection")
+        if self.flight_recorder:
+            self.flight_recorder.record_event(sensor_mac, KIND_MARK, f"stream_{transition['state']}")
+            if transition['state'] == STATE_STALLED:
+                self.flight_recorder.trigger('stream_stall', sensor_mac)
+        if self._health_mqtt is not None:
+            try:
+                self._health_mqtt.publish_device_health(sensor_mac, transition)
+            except Exception as e:
+                self.logger.debug(f"Stream health publish failed: {e}")
+    
+    async def _reconnect_sensor(self, sensor_mac):
+        """Reconnect one silent sensor, keeping its calibrated baseline"""
+        try:
+            client = next((c for c in self.bt50_clients if c.address.upper() == sensor_mac.upper()), None)
+            target_num = self.bt50_clients.index(client) + 1 if client else len(self.bt50_clients) + 1
+            self.logger.warning(f"🔄 Reconnecting silent sensor {sensor_mac[-5:].replace(':', '')} (Target {target_num})")
+            if client:
+                self.bt50_clients.remove(client)
+                if self.bt50_client is client:
+                    self.bt50_client = self.bt50_clients[0] if self.bt50_clients else None
+                try:
+                    if client.is_connected:
+                        await client.disconnect()
+                except Exception as e:
+                    self.logger.warning(f"BT50 sensor {sensor_mac} disconnect failed: {e}")
+            client = await self._connect_sensor(sensor_mac, target_num)
+            if client:
+                await client.start_notify(BT50_SENSOR_UUID, self._make_bt50_handler(client.address))
+        except Exception as e:
+            self.logger.error(f"BT50 sensor {sensor_mac} reconnect failed: {e}")
+        finally:
+            self._reconnecting.pop(sensor_mac.upper(), None)
             
     async def cleanup(self):
         """Clean up connections and save data"""
         self.logger.info("Cleaning up connections...")
+        self.running = False  # Disconnects from here on are expected
         
-        # Save calibration data
-        if self.timing_calibrator:
-            self.timing_calibrator.save_calibration()
-            
+        if self._watchdog_task:
+            self._watchdog_task.cancel()
+        if self._reconcile_task:
+            self._reconcile_task.cancel()
+        for task in list(self._reconnecting.values()):
+            task.cancel()
+        if self.match_publisher:
+            self.match_publisher.stop()
+        if self.sync_forwarder:
+            self.sync_forwarder.stop()
+        if self.sync_journal:
+            self.sync_journal.close()
+        
+        # Save calibration data (the timing calibrator saves learned delays itself)
         if self.statistical_calibrator:
             self.statistical_calibrator.save_data()
             
@@ -1315,6 +1663,32 @@ class LeadVilleBridge:
         else:
             self.logger.info("Shot detector not initialized - no statistics available")
             
+        self.log_sampler.flush()
+        
+        # Report per-stage sample pipeline CPU time
+        if getattr(self, 'sample_pipeline', None):
+            pipeline_stats = self.sample_pipeline.get_stats()
+            self.logger.info(f"Sample pipeline: {pipeline_stats['blocks_processed']} notifications processed")
+            for stage, stats in pipeline_stats['stages'].items():
+                if stats['calls']:
+                    self.logger.info(f"  {stage}: {stats['samples']} samples, avg {stats['avg_us']}us, "
+                                     f"max {stats['max_us']}us, errors {stats['errors']}")
+        if getattr(self, 'sample_capture', None):
+            capture_stats = self.sample_capture.get_stats()
+            self.logger.info(f"Gated capture: persisted {capture_stats['persisted']}/{capture_stats['seen']} blocks "
+                             f"in {capture_stats['windows']} windows ({capture_stats['reduction_pct']}% not written)")
+        if self.stream_watchdog:
+            health = self.stream_watchdog.snapshot(time.monotonic_ns())
+            self.logger.info(f"Stream watchdog: {health['stalls']} stalls, {health['reconnects']} targeted reconnects")
+            for sensor_mac, stats in health['devices'].items():
+                if stats['stalls']:
+                    self.logger.info(f"  {sensor_mac}: time to detect {stats['time_to_detect_ms']}, "
+                                     f"time to recover {stats['time_to_recover_ms']}")
+        if self.flight_recorder:
+            recorder_stats = self.flight_recorder.get_stats()
+            self.logger.info(f"Flight recorder: {recorder_stats['dumps']} dumps "
+                             f"({recorder_stats['coalesced']} triggers coalesced), last: {recorder_stats['last_dump']}")
+            
         # Report timing correlation statistics
         if self.timing_calibrator:
             timing_stats = self.timing_calibrator.get_correlation_stats()
@@ -1346,6 +1720,73 @@ class LeadVilleBridge:
             
         self.logger.info("Cleanup complete")
         
+    async def _attach_mqtt_telemetry(self):
+        """Connect MQTT and enable the telemetry consumer when configured"""
+        if not dev_config.is_mqtt_telemetry_enabled():
+            return
+        try:
+            from impact_bridge.mqtt_client import init_mqtt
+            mqtt_client = await init_mqtt()
+            if dev_config.get_mqtt_telemetry_mode() == 'batch':
+                consumer = TelemetryBatcher(mqtt_client, window_ms=dev_config.get_mqtt_telemetry_batch_ms())
+            else:
+                consumer = MqttTelemetryConsumer(mqtt_client)
+            self.sample_pipeline.register_consumer('mqtt_telemetry', consumer, enabled=mqtt_client.connected)
+        except Exception as e:
+            self.logger.warning(f"MQTT telemetry unavailable: {e}")
+        
+    async def _attach_match_events(self):
+        """Publish timer/impact events for the match aggregator when configured"""
+        if not dev_config.is_match_events_enabled():
+            return
+        try:
+            from impact_bridge.mqtt_client import init_mqtt
+            mqtt_client = await init_mqtt()
+            self.match_publisher = MatchEventPublisher(mqtt_client, dev_config.get_bridge_id())
+            self.match_publisher.start()
+            self.logger.info(f"Match events enabled as bridge '{self.match_publisher.bridge_id}'")
+        except Exception as e:
+            self.logger.warning(f"Match events unavailable: {e}")
+    
+    async def _attach_stream_watchdog(self):
+        """Start the stream watchdog task; publish its transitions over MQTT when configured"""
+        if not self.stream_watchdog:
+            return
+        if dev_config.is_stream_watchdog_mqtt_enabled():
+            try:
+                from impact_bridge.mqtt_client import init_mqtt
+                mqtt_client = await init_mqtt()
+                self._health_mqtt = mqtt_client if mqtt_client.connected else None
+            except Exception as e:
+                self.logger.warning(f"Stream health MQTT unavailable: {e}")
+        self._watchdog_task = asyncio.create_task(self._watch_streams())
+    
+    def _emit_event(self, kind: str, data: dict, ts_ns: int = None):
+        """Journal a result for the head node and publish it to the match aggregator"""
+        if ts_ns is None:
+            ts_ns = time.time_ns()
+        if self.sync_journal is not None:
+            try:
+                self.sync_journal.append(kind, data, ts_ns)
+            except Exception as e:
+                self.logger.error(f"Sync journal append failed: {e}")
+        if self.match_publisher is not None and kind in MATCH_EVENT_KINDS:
+            try:
+                self.match_publisher.publish(kind, data, ts_ns)
+            except Exception as e:
+                self.logger.debug(f"Match event publish failed: {e}")
+    
+    def _attach_sync_forwarder(self):
+        """Ship the journal to the head node whenever it is reachable"""
+        head_url = dev_config.get_sync_head_url()
+        if self.sync_journal is None or not head_url:
+            return
+        self.sync_forwarder = SyncForwarder(self.sync_journal, head_url, dev_config.get_bridge_id(),
+                                            batch_size=dev_config.get_sync_batch_size(),
+                                            interval_s=dev_config.get_sync_interval_s())
+        self.sync_forwarder.start()
+        self.logger.info(f"Sync forwarder: {head_url} as bridge '{self.sync_forwarder.bridge_id}'")
+        
     async def run(self):
         """Main run loop"""
         self.running = True
@@ -1358,6 +1799,12 @@ class LeadVilleBridge:
         try:
             await self.connect_devices()
             
+            if COMPONENTS_AVAILABLE:
+                await self._attach_mqtt_telemetry()
+                await self._attach_match_events()
+                self._attach_sync_forwarder()
+                await self._attach_stream_watchdog()
+            
             if COMPONENTS_AVAILABLE and self.calibration_complete:
                 print("\n=== AUTOMATIC CALIBRATION BRIDGE WITH SHOT DETECTION ===")
                 print("✨ Dynamic baseline calibration - establishes fresh zero on every startup")
@@ -1370,6 +1817,13 @@ class LeadVilleBridge:
             # Main operation loop
             while self.running:
                 await asyncio.sleep(1.0)
+                self.log_sampler.tick()
+                if self.flight_recorder:
+                    # Shots whose correlation window closed without an impact
+                    self.timing_calibrator.expire_uncorrelated()
+                    self.flight_recorder.check_requests()
+                if self.assignment_watcher:
+                    self._poll_assignments()
                 
         except KeyboardInterrupt:
             print("\nStopping LeadVille Bridge...")
@@ -10,7 +10,7 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 import logging
 
-from .database.session import get_db_session
+from .database.access import DatabaseAccess, get_leadville_db
 from .database.models import Sensor
 from .amg_commander_handler import amg_manager
 
@@ -18,15 +18,19 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/admin/amg", tags=["AMG Commander Timers"])
 
 @router.get("/timers")
-async def get_amg_timers(db: Session = Depends(get_db_session)):
+async def get_amg_timers(database: DatabaseAccess = Depends(get_leadville_db)):
     """Get all paired AMG Commander timers"""
     try:
-        # Get AMG timers from database (those with AMG vendor or type timer)
-        timers = db.query(Sensor).filter(
-            (Sensor.label.ilike('%AMG%')) | 
-            (Sensor.label.ilike('%COMMANDER%')) |
-            (Sensor.calib.contains({"vendor": "AMG Labs"}))
-        ).all()
+        def _query(db: Session):
+            # Get AMG timers from database (those with AMG vendor or type timer)
+            timers = db.query(Sensor).filter(
+                (Sensor.label.ilike('%AMG%')) | 
+                (Sensor.label.ilike('%COMMANDER%')) |
+                (Sensor.calib.contains({"vendor": "AMG Labs"}))
+            ).all()
+            return timers
+        
+        timers = await database.read_orm(_query)
         
         timer_data = []
         for timer in timers:
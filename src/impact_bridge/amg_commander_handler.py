@@ -10,6 +10,8 @@ from datetime import datetime
 from typing import Optional, Dict, Any, List, Callable
 from bleak import BleakClient
 
+from .ble.amg_parse import SEQUENCE_TYPES, AmgFrame, decode_amg_frame
+
 logger = logging.getLogger(__name__)
 
 
@@ -202,38 +204,29 @@ class AmgCommanderHandler:
         except Exception as e:
             logger.debug(f"AMG device info read error: {e}")
     
-    def _convert_time_data(self, byte1: int, byte2: int) -> float:
-        """Convert AMG time data from 2 bytes to seconds"""
-        value = 256 * byte1 + byte2
-        if byte2 <= 0:
-            value += 256
-        return value / 100.0  # Convert centiseconds to seconds
-    
-    async def _parse_screen_data(self, bytes_data: bytes):
+    async def _parse_screen_data(self, frame: AmgFrame):
         """Parse screen/display data from REQ SCREEN HEX response"""
         try:
-            if len(bytes_data) < 3:
+            if len(frame.data) < 3:
                 return
             
             # Basic screen data structure (reverse engineered)
             screen_info = {
                 'timestamp': datetime.utcnow(),
-                'command_type': bytes_data[0],
-                'data_length': bytes_data[1] if len(bytes_data) > 1 else 0,
-                'raw_data': ' '.join(f'{b:02x}' for b in bytes_data),
+                'command_type': frame.type_id,
+                'data_length': frame.data[1],
+                'raw_data': frame.data.hex(' '),
                 'parsed_fields': {}
             }
             
-            # Try to extract meaningful screen information
-            if len(bytes_data) >= 8:
-                # Extract potential display values
-                screen_info['parsed_fields']['field1'] = self._convert_time_data(bytes_data[2], bytes_data[3])
-                screen_info['parsed_fields']['field2'] = self._convert_time_data(bytes_data[4], bytes_data[5])
-                screen_info['parsed_fields']['field3'] = self._convert_time_data(bytes_data[6], bytes_data[7])
+            # Extract potential display values
+            if frame.screen_cs:
+                for n, value_cs in enumerate(frame.screen_cs, 1):
+                    screen_info['parsed_fields'][f'field{n}'] = value_cs / 100.0
             
             self.screen_data = screen_info
-            logger.info(f"AMG Screen data updated: {len(bytes_data)} bytes")
-            logger.debug(f"AMG Screen content: {screen_info['raw_data']}")
+            logger.info(f"AMG Screen data updated: {len(frame.data)} bytes")
+            logger.debug("AMG Screen content: %s", screen_info['raw_data'])
             
             if self.on_screen_update:
                 try:
@@ -254,92 +247,61 @@ class AmgCommanderHandler:
             return
         
         try:
-            bytes_data = bytes(data)
-            
-            # Log raw data for debugging
-            hex_str = ' '.join(f'{b:02x}' for b in bytes_data)
-            logger.debug(f"AMG notification: {hex_str}")
-            
-            if len(bytes_data) < 2:
+            # One decode per notification (see ble/amg_parse), shared with the bridge and adapter
+            frame = decode_amg_frame(data)
+            if frame is None:
                 return
+            logger.debug("AMG notification: %r", frame)
             
-            # Parse according to Denis Zhadan's protocol analysis
-            command_type = bytes_data[0]
-            
-            if 10 <= command_type <= 26:
+            if frame.type_id in SEQUENCE_TYPES:
                 # Shot sequence data
-                shot_count = bytes_data[1]
-                if command_type == 10:
+                if frame.type_id == 10:
                     self.shot_sequence.clear()  # First line of data
-                
-                # Extract shot times
-                for i in range(1, shot_count + 1):
-                    if (i * 2 + 1) < len(bytes_data):
-                        shot_time = self._convert_time_data(bytes_data[i * 2], bytes_data[i * 2 + 1])
-                        self.shot_sequence.append(shot_time)
+                self.shot_sequence.extend(frame.shot_times)
                 
                 logger.info(f"AMG shot sequence updated: {len(self.shot_sequence)} shots")
                 
-            elif command_type == 2:
+            elif frame.type_id == 2:
                 # Screen/display data response (REQ SCREEN HEX)
-                await self._parse_screen_data(bytes_data)
+                await self._parse_screen_data(frame)
                 
-            elif command_type == 1:
-                # Timer events
-                event_type = bytes_data[1] if len(bytes_data) > 1 else 0
+            elif frame.event == 'START':
+                logger.info("AMG Timer started")
+                if self.on_timer_start:
+                    await self.on_timer_start({'timestamp': datetime.utcnow(), 'device': self.mac_address})
+            
+            elif frame.event == 'STOP':
+                # Timer stop/waiting
+                logger.info("AMG Timer stopped")
+                if self.on_string_stop:
+                    await self.on_string_stop({
+                        'timestamp': datetime.utcnow(),
+                        'total_shots': len(self.shot_sequence),
+                        'shots': self.shot_sequence.copy(),
+                        'device': self.mac_address
+                    })
+            
+            elif frame.event == 'SHOT' and frame.is_status:
+                # Real-time shot data
+                self.time_now = frame.current_time
+                self.time_split = frame.split_time
+                self.time_first = frame.first_shot_time
                 
-                if event_type == 5:
-                    # Timer start
-                    logger.info("AMG Timer started")
-                    if self.on_timer_start:
-                        await self.on_timer_start({'timestamp': datetime.utcnow(), 'device': self.mac_address})
+                shot_event = {
+                    'timestamp': datetime.utcnow(),
+                    'time_now': self.time_now,
+                    'time_split': self.time_split,
+                    'time_first': self.time_first,
+                    'unknown_field': frame.second_shot_time,  # Additional data field
+                    'series_batch': frame.current_round,      # Series/batch information
+                    'device': self.mac_address,
+                    'raw_data': frame.data.hex(' ')
+                }
                 
-                elif event_type == 8:
-                    # Timer stop/waiting
-                    logger.info("AMG Timer stopped")
-                    if self.on_string_stop:
-                        await self.on_string_stop({
-                            'timestamp': datetime.utcnow(),
-                            'total_shots': len(self.shot_sequence),
-                            'shots': self.shot_sequence.copy(),
-                            'device': self.mac_address
-                        })
+                logger.info(f"AMG Shot: {self.time_now:.2f}s (split: {self.time_split:.2f}s, batch: {frame.current_round})")
                 
-                elif event_type == 3 and len(bytes_data) >= 14:
-                    # Real-time shot data
-                    # bytes[4..5] - current time
-                    # bytes[6..7] - split time  
-                    # bytes[8..9] - first shot time
-                    # bytes[10..11] - unknown field (environmental data?)
-                    # bytes[12..13] - series/batch info
-                    
-                    self.time_now = self._convert_time_data(bytes_data[4], bytes_data[5])
-                    self.time_split = self._convert_time_data(bytes_data[6], bytes_data[7])
-                    self.time_first = self._convert_time_data(bytes_data[8], bytes_data[9])
-                    
-                    # Extract additional fields
-                    unknown_field = None
-                    series_batch = None
-                    if len(bytes_data) >= 12:
-                        unknown_field = self._convert_time_data(bytes_data[10], bytes_data[11])
-                    if len(bytes_data) >= 14:
-                        series_batch = self._convert_time_data(bytes_data[12], bytes_data[13])
-                    
-                    shot_event = {
-                        'timestamp': datetime.utcnow(),
-                        'time_now': self.time_now,
-                        'time_split': self.time_split,
-                        'time_first': self.time_first,
-                        'unknown_field': unknown_field,  # Additional data field
-                        'series_batch': series_batch,    # Series/batch information
-                        'device': self.mac_address,
-                        'raw_data': hex_str
-                    }
-                    
-                    logger.info(f"AMG Shot: {self.time_now:.2f}s (split: {self.time_split:.2f}s, batch: {series_batch})")
-                    
-                    if self.on_shot:
-                        await self.on_shot(shot_event)
+                if self.on_shot:
+                    await self.on_shot(shot_event)
         
         except Exception as e:
             logger.error(f"AMG notification handler error: {e}")
@@ -0,0 +1,145 @@
+"""Hot-reload of bridge device assignments.
+
+The backend's admin API writes ``config/bridge_device_config.json`` (timer MAC
+plus the assigned sensor MACs) after every assignment change. The bridge used
+to read it only at startup. ``AssignmentWatcher`` notices changes to that file
+(stat per poll, content parsed only when size/mtime change) and
+``diff_assignments`` compares the desired devices with the ones the bridge
+currently has connected, so the bridge can connect/disconnect just the
+changed devices and keep the calibrated baselines of the others.
+
+The file is the notification channel: the backend replaces it atomically
+(``write_assignment_file``), so a reader never sees a half-written file.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ASSIGNMENT_FILE = Path("config/bridge_device_config.json")
+
+
+def normalize_assignments(config: Dict[str, Any]) -> Dict[str, Any]:
+    """``{"timer": mac or None, "sensors": [mac, ...]}`` with upper-case MACs, no duplicates"""
+    timer = config.get("timer") or None
+    sensors: List[str] = []
+    for mac in config.get("sensors") or []:
+        if mac and mac.upper() not in sensors:
+            sensors.append(mac.upper())
+    return {"timer": timer.upper() if timer else None, "sensors": sensors}
+
+
+def read_assignment_file(path: Path) -> Optional[Dict[str, Any]]:
+    """Parsed and normalized assignments, or None if missing/invalid"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable assignment file {path}: {e}")
+        return None
+    if not isinstance(config, dict) or "timer" not in config or "sensors" not in config:
+        logger.warning(f"Ignoring assignment file {path}: missing 'timer'/'sensors'")
+        return None
+    return normalize_assignments(config)
+
+
+def write_assignment_file(path: Path, config: Dict[str, Any]) -> None:
+    """Atomically replace the assignment file (temp file + rename)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(config, f, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+@dataclass
+class AssignmentDiff:
+    """What the bridge has to change to reach the desired assignments"""
+    connect_sensors: List[str] = field(default_factory=list)
+    disconnect_sensors: List[str] = field(default_factory=list)
+    keep_sensors: List[str] = field(default_factory=list)
+    timer_change: Optional[Tuple[Optional[str], Optional[str]]] = None  # (current, desired)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.connect_sensors or self.disconnect_sensors or self.timer_change)
+
+    def summary(self) -> str:
+        parts = []
+        if self.connect_sensors:
+            parts.append(f"+{len(self.connect_sensors)} sensor(s)")
+        if self.disconnect_sensors:
+            parts.append(f"-{len(self.disconnect_sensors)} sensor(s)")
+        if self.timer_change:
+            parts.append(f"timer {self.timer_change[0]} -> {self.timer_change[1]}")
+        parts.append(f"{len(self.keep_sensors)} unchanged")
+        return ", ".join(parts)
+
+
+def diff_assignments(current_timer: Optional[str], current_sensors: Iterable[str],
+                     desired: Dict[str, Any]) -> AssignmentDiff:
+    """Diff the connected devices against the desired assignments"""
+    current = [mac.upper() for mac in current_sensors]
+    wanted = desired["sensors"]
+    diff = AssignmentDiff(
+        connect_sensors=[mac for mac in wanted if mac not in current],
+        disconnect_sensors=[mac for mac in current if mac not in wanted],
+        keep_sensors=[mac for mac in wanted if mac in current],
+    )
+    timer = current_timer.upper() if current_timer else None
+    if timer != desired["timer"]:
+        diff.timer_change = (timer, desired["timer"])
+    return diff
+
+
+class AssignmentWatcher:
+    """Detects changes to the assignment file between polls"""
+
+    def __init__(self, path: Path = DEFAULT_ASSIGNMENT_FILE) -> None:
+        self.path = Path(path)
+        self._stamp: Optional[Tuple[int, int]] = None
+        self.desired: Optional[Dict[str, Any]] = None
+        self.reloads = 0
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def prime(self, desired: Dict[str, Any]) -> None:
+        """Record the assignments the bridge started with"""
+        self.desired = normalize_assignments(desired)
+        self._stamp = self._stat()
+
+    def poll(self) -> Optional[Dict[str, Any]]:
+        """New desired assignments if the file changed since the last poll"""
+        stamp = self._stat()
+        if stamp is None or stamp == self._stamp:
+            return None
+        self._stamp = stamp
+        desired = read_assignment_file(self.path)
+        if desired is None or desired == self.desired:
+            return None
+        self.desired = desired
+        self.reloads += 1
+        return desired
@@ -5,10 +5,12 @@ Provides JWT-based authentication with role-based access control
 
 from ..database.models import User, UserSession, Role
 from .auth import AuthService, require_auth, require_role
+from .session_cache import SessionCache, get_session_cache
 from .utils import hash_password, verify_password, generate_token, verify_token
 
 __all__ = [
     'User', 'UserSession', 'Role', 'AuthService',
+    'SessionCache', 'get_session_cache',
     'require_auth', 'require_role',
     'hash_password', 'verify_password', 'generate_token', 'verify_token'
 ]
\ No newline at end of file
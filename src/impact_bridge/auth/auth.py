@@ -3,26 +3,33 @@ Authentication service and decorators
 JWT-based authentication with role-based access control
 """
 
+import logging
+import secrets
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Tuple, Union
 from functools import wraps
 
 from flask import request, jsonify, g, current_app
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from ..database.models import User, UserSession, Role
 from .utils import (
     verify_token, generate_token, generate_session_jti,
-    hash_password, verify_password, create_default_admin
+    hash_password, verify_password, create_default_admin,
+    hash_password_bounded, verify_password_bounded
 )
+from .session_cache import SessionCache, get_session_cache
 from ..database import get_database_session
 
+logger = logging.getLogger(__name__)
+
 
 class AuthService:
     """Authentication service for LeadVille Impact Bridge"""
     
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, cache: Optional[SessionCache] = None):
         self.db = db_session
+        self.cache = cache or get_session_cache()
     
     def authenticate_user(
         self,
@@ -32,30 +39,54 @@ class AuthService:
         user_agent: Optional[str] = None
     ) -> Dict[str, Any]:
         """Authenticate user and create session"""
+        user, error = self._find_login_user(username)
+        if error:
+            return error
+        
+        # bcrypt runs on the bounded password pool
+        if not verify_password_bounded(password, user.password_hash):
+            return self._login_failed(user)
         
-        # Find user
+        refresh_token = secrets.token_urlsafe(32)
+        refresh_token_hash = hash_password_bounded(refresh_token)
+        return self._create_session(user, refresh_token, refresh_token_hash, ip_address, user_agent)
+    
+    def _find_login_user(self, username: str) -> Tuple[Optional[User], Optional[Dict[str, Any]]]:
+        """Active, unlocked user for a login attempt, or the error response"""
         user = self.db.query(User).filter(
             User.username == username,
             User.is_active == True
         ).first()
         
         if not user:
-            return {"success": False, "error": "Invalid credentials"}
+            return None, {"success": False, "error": "Invalid credentials"}
         
         # Check if account is locked
         if user.is_locked():
-            return {
+            return None, {
                 "success": False,
                 "error": "Account locked due to too many failed attempts",
                 "locked_until": user.locked_until.isoformat() if user.locked_until else None
             }
         
-        # Verify password
-        if not user.verify_password(password):
-            user.increment_failed_attempts()
-            self.db.commit()
-            return {"success": False, "error": "Invalid credentials"}
-        
+        return user, None
+    
+    def _login_failed(self, user: User) -> Dict[str, Any]:
+        user.increment_failed_attempts()
+        self.db.commit()
+        # Cached sessions must see a lockout
+        self.cache.invalidate_user(user.id)
+        return {"success": False, "error": "Invalid credentials"}
+    
+    def _create_session(
+        self,
+        user: User,
+        refresh_token: str,
+        refresh_token_hash: str,
+        ip_address: Optional[str],
+        user_agent: Optional[str]
+    ) -> Dict[str, Any]:
+        """Persist a new session for an authenticated user and issue tokens"""
         # Clear failed attempts on successful authentication
         user.clear_failed_attempts()
         
@@ -68,14 +99,14 @@ class AuthService:
             token_jti=session_jti,
             ip_address=ip_address,
             user_agent=user_agent,
-            expires_at=expires_at
+            expires_at=expires_at,
+            refresh_token_hash=refresh_token_hash
         )
         
-        # Generate refresh token
-        refresh_token = user_session.generate_refresh_token()
-        
         self.db.add(user_session)
         self.db.commit()
+        # Cached sessions of this user still hold the old lockout/last login
+        self.cache.invalidate_user(user.id)
         
         # Generate JWT tokens
         access_token = generate_token(
@@ -110,7 +141,8 @@ class AuthService:
         
         user_session = None
         for session in sessions:
-            if session.verify_refresh_token(refresh_token) and session.is_active():
+            if (session.is_active() and session.refresh_token_hash
+                    and verify_password_bounded(refresh_token, session.refresh_token_hash)):
                 user_session = session
                 break
         
@@ -148,6 +180,7 @@ class AuthService:
         if session:
             session.revoke()
             self.db.commit()
+            self.cache.revoke(session_jti, session.expires_at)
             return True
         
         return False
@@ -158,19 +191,38 @@ class AuthService:
         if not payload:
             return None
         
-        # Verify session is still active
-        session = self.db.query(UserSession).filter(
-            UserSession.token_jti == payload["session_jti"]
-        ).first()
-        
-        if not session or not session.is_active():
+        session_jti = payload["session_jti"]
+        if self.cache.is_revoked(session_jti):
             return None
         
-        # Update activity and return user
-        session.update_activity()
-        self.db.commit()
-        
-        return session.user
+        cached = self.cache.get(session_jti)
+        if cached:
+            user = cached.user
+        else:
+            # Verify session is still active
+            session = self.db.query(UserSession).options(
+                joinedload(UserSession.user)
+            ).filter(
+                UserSession.token_jti == session_jti
+            ).first()
+            
+            if not session or not session.is_active() or not session.user.is_active:
+                return None
+            
+            # Detach the (fully loaded) user so it can be shared across requests
+            user = session.user
+            self.db.expunge(user)
+            self.cache.put(session, user)
+        
+        # Activity is written back in batches, not once per request
+        self.cache.record_activity(session_jti)
+        if self.cache.flush_due():
+            try:
+                self.cache.flush_activity(self.db)
+            except Exception as e:
+                logger.warning(f"Session activity flush failed: {e}")
+        
+        return user
     
     def create_user(
         self,
@@ -194,7 +246,7 @@ class AuthService:
             role=role,
             created_by=created_by_id
         )
-        user.set_password(password)
+        user.password_hash = hash_password_bounded(password)
         
         self.db.add(user)
         self.db.commit()
@@ -0,0 +1,166 @@
+"""
+In-process cache of active sessions for the authenticated request path.
+
+Verifying a request used to cost a ``UserSession`` query plus an activity
+UPDATE and commit on the SQLite database the bridge is writing to. The cache
+keeps recently verified sessions (LRU, bounded, entries live for ``ttl``
+seconds and never past the session's own expiry), a revocation set filled by
+``AuthService.revoke_session`` and the latest activity timestamp per session,
+which is written back in one batched UPDATE every ``flush_interval`` seconds.
+
+Revocations and user changes made by another process reach this process when
+the cached entry expires (at most ``ttl`` seconds).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import bindparam
+from sqlalchemy.orm import Session
+
+from ..database.models import User, UserSession
+
+
+@dataclass
+class CachedSession:
+    """Verified session state; ``user`` is detached from its DB session"""
+    token_jti: str
+    user: User
+    expires_at: datetime
+    cached_at: float
+
+
+class SessionCache:
+    """LRU + TTL cache of verified sessions with batched activity writes"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0, flush_interval: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self._entries: "OrderedDict[str, CachedSession]" = OrderedDict()
+        self._revoked: Dict[str, datetime] = {}  # jti -> session expiry (pruned after)
+        self._activity: Dict[str, datetime] = {}  # jti -> latest activity, not yet written
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+
+    def get(self, token_jti: str) -> Optional[CachedSession]:
+        """Cached session if still valid; None on miss, expiry or revocation"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token_jti)
+            if entry is None:
+                self.misses += 1
+                return None
+            if now - entry.cached_at >= self.ttl or entry.expires_at <= datetime.utcnow():
+                del self._entries[token_jti]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token_jti)
+            self.hits += 1
+            return entry
+
+    def put(self, session: UserSession, user: User) -> None:
+        with self._lock:
+            if session.token_jti in self._revoked:
+                return
+            self._entries[session.token_jti] = CachedSession(
+                token_jti=session.token_jti,
+                user=user,
+                expires_at=session.expires_at,
+                cached_at=time.monotonic(),
+            )
+            self._entries.move_to_end(session.token_jti)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def is_revoked(self, token_jti: str) -> bool:
+        return token_jti in self._revoked
+
+    def revoke(self, token_jti: str, expires_at: Optional[datetime] = None) -> None:
+        """Drop the session and refuse to re-cache it until it would have expired"""
+        with self._lock:
+            entry = self._entries.pop(token_jti, None)
+            if expires_at is None:
+                expires_at = entry.expires_at if entry else datetime.utcnow()
+            self._revoked[token_jti] = expires_at
+            self._activity.pop(token_jti, None)
+            now = datetime.utcnow()
+            for jti in [j for j, exp in self._revoked.items() if exp <= now and j != token_jti]:
+                del self._revoked[jti]
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Forget cached sessions of a user (role or password changes)"""
+        with self._lock:
+            for jti in [j for j, e in self._entries.items() if e.user.id == user_id]:
+                del self._entries[jti]
+
+    def record_activity(self, token_jti: str) -> None:
+        with self._lock:
+            self._activity[token_jti] = datetime.utcnow()
+
+    def flush_due(self) -> bool:
+        return bool(self._activity) and time.monotonic() - self._last_flush >= self.flush_interval
+
+    def flush_activity(self, db: Session) -> int:
+        """Write pending activity timestamps in one transaction; returns rows queued"""
+        with self._lock:
+            pending, self._activity = self._activity, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+        try:
+            table = UserSession.__table__
+            db.execute(
+                table.update()
+                .where(table.c.token_jti == bindparam('jti'))
+                .values(last_activity_at=bindparam('ts')),
+                [{'jti': jti, 'ts': ts} for jti, ts in pending.items()],
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Keep the newest timestamps for the next attempt
+            with self._lock:
+                for jti, ts in pending.items():
+                    self._activity.setdefault(jti, ts)
+            raise
+        self.flushes += 1
+        return len(pending)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._revoked.clear()
+            self._activity.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'revoked': len(self._revoked),
+            'pending_activity': len(self._activity),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'flushes': self.flushes,
+        }
+
+
+_session_cache: Optional[SessionCache] = None
+_session_cache_lock = threading.Lock()
+
+
+def get_session_cache() -> SessionCache:
+    """Process-wide session cache shared by all AuthService instances"""
+    global _session_cache
+    with _session_cache_lock:
+        if _session_cache is None:
+            _session_cache = SessionCache()
+        return _session_cache
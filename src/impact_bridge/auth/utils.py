@@ -5,7 +5,9 @@ Password hashing, JWT token generation and verification
 
 import hashlib
 import secrets
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 
@@ -19,6 +21,11 @@ JWT_ALGORITHM = "HS256"
 JWT_ACCESS_TOKEN_EXPIRE_MINUTES = 30
 JWT_REFRESH_TOKEN_EXPIRE_DAYS = 7
 
+# bcrypt is deliberately slow; at most this many hashes run at once
+PASSWORD_HASH_WORKERS = 2
+_password_executor: Optional[ThreadPoolExecutor] = None
+_password_executor_lock = threading.Lock()
+
 
 def get_jwt_secret() -> str:
     """Get or generate JWT secret key"""
@@ -47,6 +54,27 @@ def verify_password(password: str, password_hash: str) -> bool:
         return False
 
 
+def get_password_executor() -> ThreadPoolExecutor:
+    """Bounded thread pool for bcrypt hashing and verification"""
+    global _password_executor
+    with _password_executor_lock:
+        if _password_executor is None:
+            _password_executor = ThreadPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+            )
+        return _password_executor
+
+
+def hash_password_bounded(password: str) -> str:
+    """hash_password() on the bounded pool (blocks the calling thread only)"""
+    return get_password_executor().submit(hash_password, password).result()
+
+
+def verify_password_bounded(password: str, password_hash: str) -> bool:
+    """verify_password() on the bounded pool (blocks the calling thread only)"""
+    return get_password_executor().submit(verify_password, password, password_hash).result()
+
+
 def generate_token(
     user_id: int,
     username: str,
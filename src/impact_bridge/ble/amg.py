@@ -8,7 +8,7 @@ import time
 from typing import Callable, Optional, Dict, Any
 
 from bleak import BleakClient, BleakError
-from .amg_parse import parse_amg_timer_data, format_amg_event
+from .amg_parse import decode_amg_frame, format_amg_event
 
 
 logger = logging.getLogger(__name__)
@@ -56,7 +56,7 @@ class AmgClient:
         self._on_notification = callback
     
     def set_parsed_data_callback(self, callback: Callable[[Dict[str, Any]], None]) -> None:
-        """Set callback for parsed AMG data. Callback receives parsed dict."""
+        """Set callback for parsed AMG data. Callback receives the AmgFrame (a read-only parsed mapping)."""
         self._on_parsed_data = callback
     
     def set_connect_callback(self, callback: Callable[[], None]) -> None:
@@ -207,9 +207,10 @@ class AmgClient:
             self._on_notification(data)
         
         # Parse AMG data using the new parser
-        parsed_data = parse_amg_timer_data(data)
+        frame = decode_amg_frame(data)
+        parsed_data = frame if frame is not None and frame.is_status else None
         if parsed_data:
-            logger.debug(f"AMG parsed: {format_amg_event(parsed_data)}")
+            logger.debug("AMG parsed: %s", parsed_data)
             
             # Call parsed data callback if set
             if self._on_parsed_data:
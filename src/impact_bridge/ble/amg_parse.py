@@ -3,7 +3,7 @@ AMG Timer Data Parser
 Based on analysis of DenisZhadan/AmgLabCommander and ankitaios24/AMG-Commander-Bluetooth
 
 Hex data structure for AMG timers:
-- bytes[0]: Type/State identifier  
+- bytes[0]: Type/State identifier
 - bytes[1]: Shot state (3=active, 5=start, 8=stopped)
 - bytes[2]: Current shot number
 - bytes[3]: Total shots
@@ -12,10 +12,24 @@ Hex data structure for AMG timers:
 - bytes[8-9]: First shot time (2 bytes, big-endian)
 - bytes[10-11]: Second shot time (2 bytes, big-endian)
 - bytes[12-13]: Current round/series (2 bytes, big-endian)
+
+Type 2 frames answer REQ SCREEN HEX (display fields at bytes[2-7]); types
+10-26 carry the shot sequence: bytes[1] is the shot count, then one 2-byte
+time per shot. All times are centiseconds.
+
+``decode_amg_frame`` is the one decoder for these frames. The 14-byte status
+layout is a ``struct.Struct`` compiled at import, extra per-type fields come
+from a type-id dispatch table, and display strings (``raw_hex``,
+``event_detail``) are only built when read. The resulting ``AmgFrame`` is
+shared by the bridge, the timer adapter, the Commander handler and the
+WebSocket encoder; it is also a read-only mapping with the keys of the
+``parse_amg_timer_data`` dict.
 """
 
+import struct
+from collections.abc import Mapping
 from enum import IntEnum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,113 +40,199 @@ class ShotState(IntEnum):
     START = 5
     STOPPED = 8
 
+# type, state, shot, total shots, current, split, first, second, round
+STATUS_FRAME = struct.Struct('>BBBBHHHHH')
+SCREEN_FIELDS = struct.Struct('>HHH')
+SEQUENCE_TYPES = range(10, 27)
+
+# Timer events carried by type 1 frames, by state byte
+TIMER_EVENTS = {ShotState.START: 'START', ShotState.ACTIVE: 'SHOT', ShotState.STOPPED: 'STOP'}
+
+_STATES = {state.value: state for state in ShotState}
+_SEQUENCE_LAYOUTS: Dict[int, struct.Struct] = {}
+
 def convert_time_bytes(byte1: int, byte2: int) -> float:
     """
     Convert two bytes to time value in seconds
     Based on Java implementation: value = 256 * value1 + value2; return value / 100.0
+    (Java's signed-byte correction does not apply to Python's unsigned bytes)
+    """
+    return ((byte1 << 8) | byte2) / 100.0  # Convert to seconds with centisecond precision
+
+
+class AmgFrame(Mapping):
+    """One decoded AMG notification"""
+
+    __slots__ = ('data', 'type_id', 'state', 'current_shot', 'total_shots', 'time_cs', 'split_cs',
+                 'first_cs', 'second_cs', 'current_round', 'shot_times_cs', 'screen_cs')
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.type_id = data[0]
+        self.shot_times_cs: Tuple[int, ...] = ()
+        self.screen_cs: Optional[Tuple[int, int, int]] = None
+        if len(data) >= STATUS_FRAME.size:
+            (_, self.state, self.current_shot, self.total_shots, self.time_cs, self.split_cs,
+             self.first_cs, self.second_cs, self.current_round) = STATUS_FRAME.unpack_from(data)
+        else:
+            self.state = data[1]
+            self.current_shot = self.total_shots = self.time_cs = self.split_cs = None
+            self.first_cs = self.second_cs = self.current_round = None
+
+    @property
+    def is_status(self) -> bool:
+        """Long enough for the 14-byte status layout"""
+        return self.time_cs is not None
+
+    @property
+    def event(self) -> Optional[str]:
+        """'START', 'SHOT' or 'STOP' for timer event frames, else None"""
+        return TIMER_EVENTS.get(self.state) if self.type_id == 1 else None
+
+    @property
+    def shot_state(self) -> ShotState:
+        return _STATES.get(self.state, ShotState.ACTIVE)
+
+    @property
+    def current_time(self) -> Optional[float]:
+        return self.time_cs / 100.0 if self.time_cs is not None else None
+
+    @property
+    def split_time(self) -> Optional[float]:
+        return self.split_cs / 100.0 if self.split_cs is not None else None
+
+    @property
+    def first_shot_time(self) -> Optional[float]:
+        return self.first_cs / 100.0 if self.first_cs is not None else None
+
+    @property
+    def second_shot_time(self) -> Optional[float]:
+        return self.second_cs / 100.0 if self.second_cs is not None else None
+
+    @property
+    def shot_times(self) -> Tuple[float, ...]:
+        """Shot sequence frames: the times they carry, in seconds"""
+        return tuple(cs / 100.0 for cs in self.shot_times_cs)
+
+    @property
+    def raw_hex(self) -> str:
+        return self.data.hex().upper()
+
+    @property
+    def event_detail(self) -> str:
+        current_time = self.current_time or 0.0
+        if self.state == ShotState.START:
+            return "Timer Started"
+        if self.state == ShotState.STOPPED:
+            return "Timer Stopped"
+        if self.type_id == 1 and self.state == ShotState.ACTIVE:
+            return f"Shot {self.current_shot}: {current_time:.2f}s"
+        if self.type_id in SEQUENCE_TYPES:
+            return f"Shot Sequence {self.current_shot}/{self.total_shots}: {current_time:.2f}s"
+        return f"Timer Active: {current_time:.2f}s"  # Unknown states count as active
+
+    # Read-only mapping with the parse_amg_timer_data keys
+    def __getitem__(self, key: str) -> Any:
+        return _FIELDS[key](self)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_FIELDS)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {key: getter(self) for key, getter in _FIELDS.items()}
+
+    def __str__(self) -> str:
+        return format_amg_event(self)
+
+    def __repr__(self) -> str:
+        return f"AmgFrame({self.raw_hex})"
+
+
+_FIELDS = {
+    'type_id': lambda f: f.type_id,
+    'shot_state': lambda f: f.shot_state.name,
+    'shot_state_raw': lambda f: f.state,
+    'current_shot': lambda f: f.current_shot,
+    'total_shots': lambda f: f.total_shots,
+    'current_time': lambda f: f.current_time,
+    'split_time': lambda f: f.split_time,
+    'first_shot_time': lambda f: f.first_shot_time,
+    'second_shot_time': lambda f: f.second_shot_time,
+    'current_round': lambda f: f.current_round,
+    'event_type': lambda f: "String",
+    'event_detail': lambda f: f.event_detail,
+    'raw_hex': lambda f: f.raw_hex,
+}
+
+
+def _decode_screen(frame: AmgFrame, data: bytes) -> None:
+    if len(data) >= 2 + SCREEN_FIELDS.size:
+        frame.screen_cs = SCREEN_FIELDS.unpack_from(data, 2)
+
+
+def _decode_sequence(frame: AmgFrame, data: bytes) -> None:
+    count = min(data[1], (len(data) - 2) // 2)
+    layout = _SEQUENCE_LAYOUTS.get(count)
+    if layout is None:
+        layout = _SEQUENCE_LAYOUTS[count] = struct.Struct(f'>{count}H')
+    frame.shot_times_cs = layout.unpack_from(data, 2)
+
+
+# Extra fields by type id; every frame of 14+ bytes also gets the status layout
+_DECODERS = {2: _decode_screen, **{type_id: _decode_sequence for type_id in SEQUENCE_TYPES}}
+
+
+def decode_amg_frame(data: bytes) -> Optional[AmgFrame]:
     """
-    value = (byte1 << 8) | byte2  # Big-endian 16-bit value
-    if byte2 < 0:  # Handle signed byte conversion
-        value += 256
-    return value / 100.0  # Convert to seconds with centisecond precision
+    Decode an AMG notification of any type
+
+    Returns:
+        AmgFrame, or None for notifications shorter than two bytes
+    """
+    if len(data) < 2:
+        return None
+    data = bytes(data)
+    frame = AmgFrame(data)
+    decoder = _DECODERS.get(data[0])
+    if decoder is not None:
+        decoder(frame, data)
+    return frame
 
 def parse_amg_timer_data(data: bytes) -> Optional[Dict[str, Any]]:
     """
     Parse AMG timer hex data into structured format
-    
+
     Args:
         data: Raw bytes from AMG timer notification
-        
+
     Returns:
         Dict with parsed timer data or None if invalid
     """
-    if len(data) < 14:
-        logger.warning(f"AMG data too short: {len(data)} bytes, need at least 14")
-        return None
-    
-    try:
-        # Convert bytes to list for easier access
-        bytes_list = list(data)
-        
-        # Parse header
-        type_id = bytes_list[0]
-        shot_state_raw = bytes_list[1]
-        
-        # Validate shot state
-        try:
-            shot_state = ShotState(shot_state_raw)
-        except ValueError:
-            logger.warning(f"Unknown shot state: {shot_state_raw}")
-            shot_state = ShotState.ACTIVE  # Default
-        
-        # Parse shot data
-        current_shot = bytes_list[2]
-        total_shots = bytes_list[3]
-        
-        # Parse time values (2-byte big-endian each)
-        current_time = convert_time_bytes(bytes_list[4], bytes_list[5])
-        split_time = convert_time_bytes(bytes_list[6], bytes_list[7])
-        first_shot_time = convert_time_bytes(bytes_list[8], bytes_list[9])
-        second_shot_time = convert_time_bytes(bytes_list[10], bytes_list[11])
-        current_round = (bytes_list[12] << 8) | bytes_list[13]
-        
-        # Determine event type based on state and data
-        event_type = "String"  # Default to String for timer events
-        
-        if shot_state == ShotState.START:
-            event_detail = "Timer Started"
-        elif shot_state == ShotState.STOPPED:
-            event_detail = "Timer Stopped"
-        elif shot_state == ShotState.ACTIVE:
-            if type_id == 1 and shot_state_raw == 3:
-                event_detail = f"Shot {current_shot}: {current_time:.2f}s"
-            elif 10 <= type_id <= 26:
-                event_detail = f"Shot Sequence {current_shot}/{total_shots}: {current_time:.2f}s"
-            else:
-                event_detail = f"Timer Active: {current_time:.2f}s"
-        else:
-            event_detail = f"State {shot_state_raw}: {current_time:.2f}s"
-        
-        result = {
-            'type_id': type_id,
-            'shot_state': shot_state.name,
-            'shot_state_raw': shot_state_raw,
-            'current_shot': current_shot,
-            'total_shots': total_shots,
-            'current_time': current_time,
-            'split_time': split_time,
-            'first_shot_time': first_shot_time,
-            'second_shot_time': second_shot_time,
-            'current_round': current_round,
-            'event_type': event_type,
-            'event_detail': event_detail,
-            'raw_hex': data.hex().upper()
-        }
-        
-        logger.debug(f"Parsed AMG data: {result}")
-        return result
-        
-    except Exception as e:
-        logger.error(f"Error parsing AMG data: {e}, hex: {data.hex()}")
+    if len(data) < STATUS_FRAME.size:
+        logger.debug(f"AMG data too short: {len(data)} bytes, need at least {STATUS_FRAME.size}")
         return None
+    return decode_amg_frame(data).as_dict()
 
-def format_amg_event(parsed_data: Dict[str, Any]) -> str:
+def format_amg_event(parsed_data: Mapping) -> str:
     """
     Format parsed AMG data into human-readable string for logging
-    
+
     Args:
-        parsed_data: Result from parse_amg_timer_data()
-        
+        parsed_data: AmgFrame or result from parse_amg_timer_data()
+
     Returns:
         Formatted string description
     """
     if not parsed_data:
         return "Invalid AMG data"
-    
+
     state = parsed_data['shot_state']
     current_time = parsed_data['current_time']
     event_detail = parsed_data['event_detail']
-    
+
     if state == 'START':
         return f"Timer Started (Round {parsed_data['current_round']})"
     elif state == 'STOPPED':
@@ -147,7 +247,7 @@ def test_amg_parser():
     """Test AMG parser with sample data"""
     # Example hex data (would need real data to test properly)
     test_data = bytes.fromhex("010300010502004000300020001000")  # 14 bytes
-    
+
     result = parse_amg_timer_data(test_data)
     if result:
         print(f"Parsed: {result}")
@@ -156,4 +256,4 @@ def test_amg_parser():
         print("Failed to parse test data")
 
 if __name__ == "__main__":
-    test_amg_parser()
\ No newline at end of file
+    test_amg_parser()
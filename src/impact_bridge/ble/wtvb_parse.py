@@ -53,6 +53,10 @@ def _ensure_db(path: Path = DB_PATH) -> None:
             )
             """
         )
+        # Event-gated capture tags each persisted window (impact/string id)
+        cur.execute("PRAGMA table_info(bt50_samples)")
+        if 'window_tag' not in [r[1] for r in cur.fetchall()]:
+            cur.execute("ALTER TABLE bt50_samples ADD COLUMN window_tag TEXT")
         conn.commit()
     finally:
         conn.close()
@@ -94,6 +98,32 @@ def _write_db_row(data: Dict, frame_hex: str, parser: str = "flag61", path: Path
         conn.close()
 
 
+def write_db_rows(rows: List[Tuple], path: Path = DB_PATH, window_tag: Optional[str] = None) -> None:
+    """Insert many ``bt50_samples`` rows in a single transaction.
+
+    Each row is ``(ts_ns, frame_hex, parser, vx, vy, vz, angle_x, angle_y,
+    angle_z, temp_raw, disp_x, disp_y, disp_z, freq_x, freq_y, freq_z)``.
+    ``window_tag`` labels rows persisted by event-gated capture.
+    """
+    if not rows:
+        return
+    _ensure_db(path)
+    conn = sqlite3.connect(path)
+    try:
+        conn.executemany(
+            """
+            INSERT INTO bt50_samples (
+                ts_ns, frame_hex, parser, vx, vy, vz, angle_x, angle_y, angle_z,
+                temp_raw, disp_x, disp_y, disp_z, freq_x, freq_y, freq_z, window_tag
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [(*row, window_tag) for row in rows],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
 def _i16_le_from_bytes(b: bytes) -> int:
     return struct.unpack('<h', b)[0]
 
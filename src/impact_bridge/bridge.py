@@ -230,6 +230,7 @@ class Bridge:
                 "bt50_connected": sum(1 for c in self.bt50_clients if c.is_connected),
                 "bt50_total": len(self.config.sensors),
                 "detector_status": self.detector.get_all_status(),
+                "log_buffer": self.logger.buffer_stats(),
             }
             
             self.logger.status("Bridge status", status_data)
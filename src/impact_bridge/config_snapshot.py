@@ -0,0 +1,139 @@
+"""
+Versioned in-memory snapshot of the bridge/stage/target/sensor configuration.
+
+The admin UI re-fetches bridge and stage configuration after every
+drag-and-drop change. Instead of rebuilding those responses from several ORM
+queries per request, ``ConfigSnapshot`` loads the whole configuration graph
+once per version (one pass on a read-only connection), renders each response
+once, and keeps the serialized JSON with a content ETag. Requests carrying a
+matching ``If-None-Match`` get a bodyless 304.
+
+``invalidate()`` bumps the version and drops the graph; the backend calls it
+after every successful write through the admin API. Writes made by other
+processes (the bridge updating ``last_seen``/battery) are picked up when the
+snapshot is older than ``max_age`` seconds.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+logger = logging.getLogger(__name__)
+
+Render = Callable[[Any], Tuple[int, Dict[str, Any]]]
+
+
+@dataclass
+class CachedResponse:
+    """Rendered response for one snapshot version"""
+    status_code: int
+    body: bytes
+    etag: str
+    version: int
+
+
+class ConfigSnapshot:
+    """Configuration graph plus rendered responses, rebuilt per version"""
+
+    def __init__(self, loader: Callable[[], Awaitable[Any]], max_age: float = 10.0):
+        self.loader = loader  # async () -> graph
+        self.max_age = max_age
+        self.version = 0
+        self._graph: Any = None
+        self._graph_version = -1
+        self._built_at = 0.0
+        self._responses: Dict[str, CachedResponse] = {}
+        self._lock = asyncio.Lock()
+        self.builds = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def invalidate(self, reason: str = "") -> int:
+        """Mark the snapshot stale; returns the new version"""
+        self.version += 1
+        self._graph = None
+        self._responses.clear()
+        if reason:
+            logger.debug(f"Config snapshot v{self.version}: {reason}")
+        return self.version
+
+    def _fresh(self) -> bool:
+        return (self._graph is not None and self._graph_version == self.version
+                and time.monotonic() - self._built_at < self.max_age)
+
+    async def graph(self) -> Any:
+        """Current configuration graph, loading it if stale"""
+        if self._fresh():
+            return self._graph
+        async with self._lock:
+            if self._fresh():
+                return self._graph
+            if self._graph_version == self.version:
+                # Aged out rather than invalidated
+                self._responses.clear()
+            version = self.version
+            graph = await self.loader()
+            self.builds += 1
+            if version == self.version:
+                self._graph = graph
+                self._graph_version = version
+                self._built_at = time.monotonic()
+            return graph
+
+    async def render(self, key: str, render: Render) -> CachedResponse:
+        """Cached rendering of ``key``; ``render(graph)`` returns (status, content)"""
+        cached = self._responses.get(key)
+        if cached is not None and cached.version == self.version and self._fresh():
+            self.hits += 1
+            return cached
+        self.misses += 1
+        version = self.version
+        status_code, content = render(await self.graph())
+        body = json.dumps(content, separators=(",", ":")).encode("utf-8")
+        cached = CachedResponse(
+            status_code=status_code,
+            body=body,
+            etag='"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"',
+            version=version,
+        )
+        if version == self.version:
+            self._responses[key] = cached
+        return cached
+
+    async def respond(self, request: Request, key: str, render: Render) -> Response:
+        """JSON response with ETag; 304 when the client already has it"""
+        cached = await self.render(key, render)
+        headers = {"ETag": cached.etag, "Cache-Control": "no-cache",
+                   "X-Config-Version": str(cached.version)}
+        if cached.status_code == 200 and _etag_matches(request.headers.get("if-none-match"), cached.etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=cached.body, status_code=cached.status_code,
+                        media_type="application/json", headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "builds": self.builds,
+            "responses": len(self._responses),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in header.split(",")]
+    return etag in tags or f"W/{etag}" in tags
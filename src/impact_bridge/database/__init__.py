@@ -8,6 +8,7 @@ Based on GitHub issue #4 implementation.
 from .models import *
 from .database import DatabaseSession, get_database_session, init_database
 from .crud import DatabaseCRUD
+from .access import DatabaseAccess, get_database, get_leadville_db, get_runtime_db, close_databases
 
 __all__ = [
     # Models
@@ -15,6 +16,8 @@ __all__ = [
     'Run', 'Shooter', 'Note', 'User', 'UserSession', 'Role',
     # Database
     'DatabaseSession', 'get_database_session', 'init_database',
+    # Pooled access for API endpoints
+    'DatabaseAccess', 'get_database', 'get_leadville_db', 'get_runtime_db', 'close_databases',
     # CRUD
     'DatabaseCRUD'
 ]
\ No newline at end of file
@@ -0,0 +1,312 @@
+"""
+Pooled, non-blocking SQLite access for the FastAPI endpoints.
+
+Each database gets one writer connection (WAL, ``synchronous=NORMAL``) driven
+by a single-thread executor, so writes are serialized without holding a lock
+on the event loop, and a small pool of read-only connections (``mode=ro`` URI,
+``PRAGMA query_only``, memory-mapped I/O) driven by a bounded reader executor
+with one connection per worker thread. Endpoints ``await`` the work instead of
+running sqlite calls on the event loop:
+
+    db: DatabaseAccess = Depends(get_leadville_db)
+    rows = await db.fetchall("SELECT ...", (arg,))
+    await db.write(lambda conn: conn.execute("UPDATE ...", (arg,)))
+    result = await db.read_orm(lambda session: session.query(Model).all())
+
+``write()`` functions run inside ``BEGIN IMMEDIATE`` / ``COMMIT`` (rolled back
+on exceptions) and must not commit themselves. Since the whole transaction is
+the function, it is retried with backoff when another process holds the write
+lock past ``busy_timeout``. ORM helpers run on SQLAlchemy engines that reuse
+the same connection settings and executors; ORM write transactions also start
+with ``BEGIN IMMEDIATE`` so a read-then-write never has to upgrade its lock.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_READERS = 4
+DEFAULT_MMAP_SIZE = 64 * 1024 * 1024
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_BUSY_RETRIES = 4
+BUSY_BACKOFF_S = 0.02
+
+
+def is_busy_error(exc: BaseException) -> bool:
+    """True for SQLite lock contention errors (``database is locked``/``busy``)"""
+    message = str(exc).lower()
+    return isinstance(exc, sqlite3.OperationalError) and ("locked" in message or "busy" in message)
+
+
+class DatabaseAccess:
+    """Writer connection plus read-only connection pool for one SQLite file"""
+
+    def __init__(self, path: Path, readers: int = DEFAULT_READERS,
+                 mmap_size: int = DEFAULT_MMAP_SIZE,
+                 busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+                 busy_retries: int = DEFAULT_BUSY_RETRIES):
+        self.path = Path(path).resolve()
+        self.readers = readers
+        self.mmap_size = mmap_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.busy_retries = busy_retries
+
+        self._read_executor = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="db-read")
+        self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+        self._local = threading.local()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._read_engine = None
+        self._write_engine = None
+        self._read_sessions: Optional[sessionmaker] = None
+        self._write_sessions: Optional[sessionmaker] = None
+        self._closed = False
+
+        self.reads = 0
+        self.writes = 0
+        self.write_errors = 0
+        self.busy_retried = 0
+        self.max_write_ms = 0.0
+
+    # Connections ---------------------------------------------------------
+
+    def _connect_writer(self, row_factory: bool = True) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=self.busy_timeout_ms / 1000,
+                               isolation_level=None, check_same_thread=False)
+        if row_factory:
+            conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def _connect_reader(self, row_factory: bool = True) -> sqlite3.Connection:
+        # The writer creates the file and the WAL/-shm files read-only
+        # connections need, so make sure it exists first
+        self._writer_connection()
+        conn = sqlite3.connect(f"{self.path.as_uri()}?mode=ro", uri=True,
+                               timeout=self.busy_timeout_ms / 1000, check_same_thread=False)
+        if row_factory:
+            conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def _writer_connection(self) -> sqlite3.Connection:
+        with self._lock:
+            writer = self._writer
+        if writer is None:
+            writer = self._connect_writer()
+            with self._lock:
+                if self._writer is None:
+                    self._writer = writer
+                else:
+                    self._connections.remove(writer)
+                    writer.close()
+                    writer = self._writer
+        return writer
+
+    def _reader_connection(self) -> sqlite3.Connection:
+        """Read-only connection owned by the current reader thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect_reader()
+        return conn
+
+    # Raw sqlite ----------------------------------------------------------
+
+    def _run_read(self, fn: Callable[..., T], args: Sequence[Any]) -> T:
+        self.reads += 1
+        return fn(self._reader_connection(), *args)
+
+    def _run_write(self, fn: Callable[..., T], args: Sequence[Any]) -> T:
+        conn = self._writer_connection()
+        start = time.perf_counter()
+        for attempt in range(self.busy_retries + 1):
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    result = fn(conn, *args)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    raise
+                break
+            except sqlite3.OperationalError as e:
+                if not is_busy_error(e) or attempt == self.busy_retries:
+                    self.write_errors += 1
+                    raise
+                self.busy_retried += 1
+                time.sleep(BUSY_BACKOFF_S * (2 ** attempt) * (0.5 + random.random()))
+            except BaseException:
+                self.write_errors += 1
+                raise
+        self.writes += 1
+        self.max_write_ms = max(self.max_write_ms, (time.perf_counter() - start) * 1000)
+        return result
+
+    async def read(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(conn, *args)`` on a pooled read-only connection"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._read_executor, self._run_read, fn, args)
+
+    async def write(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(conn, *args)`` in a transaction on the writer connection"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._write_executor, self._run_write, fn, args)
+
+    async def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        return await self.read(lambda conn: conn.execute(sql, params).fetchall())
+
+    async def fetchone(self, sql: str, params: Sequence[Any] = ()) -> Optional[sqlite3.Row]:
+        return await self.read(lambda conn: conn.execute(sql, params).fetchone())
+
+    async def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Single write statement; returns the affected row count"""
+        return await self.write(lambda conn: conn.execute(sql, params).rowcount)
+
+    # SQLAlchemy ORM ------------------------------------------------------
+
+    def _sessions(self, readonly: bool) -> sessionmaker:
+        with self._lock:
+            if self._read_sessions is None:
+                self._read_engine = create_engine(
+                    "sqlite://", creator=lambda: self._connect_reader(row_factory=False),
+                    poolclass=QueuePool, pool_size=self.readers, max_overflow=0)
+                self._write_engine = create_engine(
+                    "sqlite://", creator=lambda: self._connect_writer(row_factory=False),
+                    poolclass=QueuePool, pool_size=1, max_overflow=0)
+                # The driver runs in autocommit mode (isolation_level=None);
+                # take the write lock when the ORM transaction starts
+                event.listen(self._write_engine, "begin",
+                             lambda conn: conn.exec_driver_sql("BEGIN IMMEDIATE"))
+                self._read_sessions = sessionmaker(bind=self._read_engine)
+                self._write_sessions = sessionmaker(bind=self._write_engine, expire_on_commit=False)
+            return self._read_sessions if readonly else self._write_sessions
+
+    def _run_orm(self, fn: Callable[[Session], T], readonly: bool) -> T:
+        session = self._sessions(readonly)()
+        try:
+            result = fn(session)
+            if not readonly:
+                session.commit()
+            return result
+        except BaseException:
+            session.rollback()
+            if not readonly:
+                self.write_errors += 1
+            raise
+        finally:
+            session.close()
+
+    async def read_orm(self, fn: Callable[[Session], T]) -> T:
+        """Run ``fn(session)`` on a read-only ORM session"""
+        loop = asyncio.get_running_loop()
+        self.reads += 1
+        return await loop.run_in_executor(self._read_executor, self._run_orm, fn, True)
+
+    async def write_orm(self, fn: Callable[[Session], T]) -> T:
+        """Run ``fn(session)`` on the writer and commit (rolled back on errors)"""
+        loop = asyncio.get_running_loop()
+        self.writes += 1
+        return await loop.run_in_executor(self._write_executor, self._run_orm, fn, False)
+
+    # Lifecycle -----------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "readers": self.readers,
+            "connections": len(self._connections),
+            "reads": self.reads,
+            "writes": self.writes,
+            "write_errors": self.write_errors,
+            "busy_retried": self.busy_retried,
+            "max_write_ms": round(self.max_write_ms, 2),
+        }
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._read_executor.shutdown(wait=True)
+        self._write_executor.shutdown(wait=True)
+        for engine in (self._read_engine, self._write_engine):
+            if engine is not None:
+                engine.dispose()
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._writer = None
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+
+_databases: Dict[Path, DatabaseAccess] = {}
+_databases_lock = threading.Lock()
+
+
+def leadville_db_path() -> Path:
+    return PROJECT_ROOT / "db" / "leadville.db"
+
+
+def runtime_db_path() -> Path:
+    """Capture/runtime DB written by the bridge (``CAPTURE_DB_PATH`` overrides)"""
+    env_db = os.environ.get("CAPTURE_DB_PATH")
+    if env_db:
+        return Path(env_db)
+    return PROJECT_ROOT / "db" / "leadville_runtime.db"
+
+
+def get_database(path: Path, **kwargs: Any) -> DatabaseAccess:
+    """Process-wide DatabaseAccess for ``path``"""
+    key = Path(path).resolve()
+    with _databases_lock:
+        db = _databases.get(key)
+        if db is None or db._closed:
+            db = _databases[key] = DatabaseAccess(key, **kwargs)
+        return db
+
+
+async def get_leadville_db() -> DatabaseAccess:
+    """FastAPI dependency: configuration database (leadville.db)"""
+    return get_database(leadville_db_path())
+
+
+async def get_runtime_db() -> DatabaseAccess:
+    """FastAPI dependency: capture/runtime database"""
+    return get_database(runtime_db_path())
+
+
+def close_databases() -> None:
+    with _databases_lock:
+        databases = list(_databases.values())
+        _databases.clear()
+    for db in databases:
+        db.close()
@@ -7,12 +7,14 @@ Provides high-level database operations for all entities.
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+from sqlalchemy import and_, or_, desc, asc, text
+from sqlalchemy.exc import OperationalError
 
 from .models import (
     Node, Sensor, Target, Stage, Match, TimerEvent, SensorEvent, 
     Run, Shooter, Note
 )
+from .stats import COUNTERS, STATS_TABLE
 
 
 class NodeCRUD:
@@ -241,7 +243,15 @@ class DatabaseCRUD:
     
     @staticmethod
     def get_system_stats(session: Session) -> Dict[str, Any]:
-        """Get system statistics"""
+        """Get system statistics from the trigger-maintained counters"""
+        try:
+            stats = dict(session.execute(text(f"SELECT name, row_count FROM {STATS_TABLE}")).all())
+        except OperationalError:
+            stats = {}  # Counters not installed in this database
+        if all(name in stats for name in COUNTERS):
+            return {name: stats[name] for name in COUNTERS}
+        
+        # Fallback: count (full scans on the event tables)
         stats = {
             'nodes': session.query(Node).count(),
             'sensors': session.query(Sensor).count(),
@@ -13,6 +13,7 @@ from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
 from .models import Base
+from .stats import install_stats_triggers
 from ..config import DatabaseConfig
 
 
@@ -70,8 +71,14 @@ class DatabaseSession:
         )
     
     def create_tables(self):
-        """Create all database tables"""
+        """Create all database tables (plus the maintained stats counters)"""
         Base.metadata.create_all(bind=self.engine)
+        raw = self.engine.raw_connection()
+        try:
+            install_stats_triggers(raw.driver_connection)
+            raw.commit()
+        finally:
+            raw.close()
     
     def drop_tables(self):
         """Drop all database tables (use with caution!)"""
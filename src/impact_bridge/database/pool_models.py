@@ -3,7 +3,7 @@ Device Pool Management Models
 Implements temporary device assignment system for shared BLE device resources.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, CheckConstraint, Index, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, CheckConstraint, Index, Text, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -107,6 +107,8 @@ class DeviceLease(Base):
         Index('idx_lease_device', 'device_id'),
         Index('idx_lease_session', 'session_id'),
         Index('idx_lease_active', 'device_id', 'released_at'),  # For finding active leases
+        Index('uq_lease_device_active', 'device_id', unique=True,
+              sqlite_where=text('released_at IS NULL')),  # At most one open lease per device
         Index('idx_lease_leased_at', 'leased_at'),
     )
 
@@ -0,0 +1,131 @@
+"""
+Maintained row counters for system statistics
+
+``get_system_stats`` used to run a COUNT(*) per table, which is a full scan
+of ``sensor_events``/``timer_events`` once they hold a season of history.
+The counters live in a one-row-per-counter ``table_stats`` table kept up to
+date by AFTER INSERT/DELETE (and status UPDATE) triggers, so every writer -
+backend, bridge capture, migrations - maintains them without code changes
+and reading them is a single small SELECT.
+
+``reconcile_stats`` recounts everything and corrects drift (e.g. rows removed
+by ``INSERT OR REPLACE``, which does not fire delete triggers); the backend
+runs it periodically. All functions take a sqlite3 connection and expect the
+caller to own the transaction.
+"""
+
+import asyncio
+import logging
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+STATS_TABLE = "table_stats"
+STATS_RECONCILE_INTERVAL_S = 3600
+
+# counter name -> (table, row condition or None); {row} is NEW/OLD or the table
+COUNTERS = {
+    'nodes': ('nodes', None),
+    'sensors': ('sensors', None),
+    'targets': ('targets', None),
+    'matches': ('matches', None),
+    'runs': ('runs', None),
+    'timer_events': ('timer_events', None),
+    'sensor_events': ('sensor_events', None),
+    'active_runs': ('runs', "{row}.status = 'active'"),
+}
+
+
+def _table_exists(conn, table: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone() is not None
+
+
+def _count(conn, table: str, condition) -> int:
+    where = f" WHERE {condition.format(row=table)}" if condition else ""
+    return conn.execute(f"SELECT COUNT(*) FROM {table}{where}").fetchone()[0]
+
+
+def _trigger_sql(name: str, table: str, condition) -> list:
+    bump = f"UPDATE {STATS_TABLE} SET row_count = row_count {{op}} 1 WHERE name = '{name}';"
+    if not condition:
+        return [
+            f"CREATE TRIGGER IF NOT EXISTS trg_stats_{name}_insert AFTER INSERT ON {table} "
+            f"BEGIN {bump.format(op='+')} END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_stats_{name}_delete AFTER DELETE ON {table} "
+            f"BEGIN {bump.format(op='-')} END",
+        ]
+    new, old = condition.format(row='NEW'), condition.format(row='OLD')
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS trg_stats_{name}_insert AFTER INSERT ON {table} "
+        f"WHEN {new} BEGIN {bump.format(op='+')} END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_stats_{name}_delete AFTER DELETE ON {table} "
+        f"WHEN {old} BEGIN {bump.format(op='-')} END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_stats_{name}_update AFTER UPDATE ON {table} "
+        f"WHEN ({new}) IS NOT ({old}) BEGIN "
+        f"UPDATE {STATS_TABLE} SET row_count = row_count + (CASE WHEN {new} THEN 1 ELSE -1 END) "
+        f"WHERE name = '{name}'; END",
+    ]
+
+
+def install_stats_triggers(conn) -> int:
+    """Create the counter table and triggers (idempotent); returns counters seeded.
+
+    A counter is seeded with one COUNT(*) the first time it is installed.
+    """
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {STATS_TABLE} (
+            name VARCHAR(50) PRIMARY KEY,
+            row_count INTEGER NOT NULL,
+            reconciled_at DATETIME
+        )
+    """)
+    seeded = 0
+    for name, (table, condition) in COUNTERS.items():
+        if not _table_exists(conn, table):
+            continue
+        for sql in _trigger_sql(name, table, condition):
+            conn.execute(sql)
+        if conn.execute(f"SELECT 1 FROM {STATS_TABLE} WHERE name = ?", (name,)).fetchone() is None:
+            conn.execute(
+                f"INSERT INTO {STATS_TABLE} (name, row_count, reconciled_at) VALUES (?, ?, CURRENT_TIMESTAMP)",
+                (name, _count(conn, table, condition))
+            )
+            seeded += 1
+    return seeded
+
+
+def read_stats(conn) -> Dict[str, int]:
+    """Current counter values (O(1) in table sizes)"""
+    return {name: row_count for name, row_count in
+            conn.execute(f"SELECT name, row_count FROM {STATS_TABLE}").fetchall()}
+
+
+def reconcile_stats(conn) -> Dict[str, int]:
+    """Recount every counter and fix it; returns {name: drift} for counters that were off"""
+    drift = {}
+    current = read_stats(conn)
+    for name, (table, condition) in COUNTERS.items():
+        if name not in current:
+            continue
+        actual = _count(conn, table, condition)
+        if actual != current[name]:
+            drift[name] = current[name] - actual
+        conn.execute(
+            f"UPDATE {STATS_TABLE} SET row_count = ?, reconciled_at = CURRENT_TIMESTAMP WHERE name = ?",
+            (actual, name)
+        )
+    return drift
+
+
+async def run_stats_reconciler(database, interval_s: float = STATS_RECONCILE_INTERVAL_S) -> None:
+    """Periodic reconciliation on a DatabaseAccess writer (runs until cancelled)"""
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            drift = await database.write(reconcile_stats)
+            if drift:
+                logger.warning(f"Stats counters drifted, corrected: {drift}")
+        except Exception as e:
+            logger.error(f"Stats reconciliation failed: {e}")
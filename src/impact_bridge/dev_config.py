@@ -120,6 +120,92 @@ class DevConfig:
     def is_confidence_logging_enabled(self) -> bool:
         return self.config.get('enhanced_impact', {}).get('confidence_logging', True)
     
+    # Sample Pipeline Configuration
+    def is_live_chart_enabled(self) -> bool:
+        return self.config.get('sample_pipeline', {}).get('live_chart', True)
+    
+    def get_live_chart_samples(self) -> int:
+        return self.config.get('sample_pipeline', {}).get('live_chart_samples', 500)
+    
+    def is_mqtt_telemetry_enabled(self) -> bool:
+        return self.config.get('sample_pipeline', {}).get('mqtt_telemetry', False)
+    
+    def get_mqtt_telemetry_mode(self) -> str:
+        """'batch' publishes packed per-sensor windows (QoS 0), 'summary' one JSON per notification"""
+        return self.config.get('sample_pipeline', {}).get('mqtt_telemetry_mode', 'batch')
+    
+    def get_mqtt_telemetry_batch_ms(self) -> float:
+        return self.config.get('sample_pipeline', {}).get('mqtt_telemetry_batch_ms', 50)
+    
+    # Match Events (multi-bridge aggregation)
+    def is_match_events_enabled(self) -> bool:
+        return self.config.get('match_events', {}).get('enabled', False)
+    
+    def get_bridge_id(self) -> str:
+        """Identity on bridge/{bridge_id}/... topics (defaults to the hostname)"""
+        import socket
+        return self.config.get('match_events', {}).get('bridge_id') or socket.gethostname()
+    
+    # Store-and-forward sync to the head node
+    def is_sync_enabled(self) -> bool:
+        return self.config.get('sync', {}).get('enabled', False)
+    
+    def get_sync_head_url(self) -> str:
+        return self.config.get('sync', {}).get('head_url', '')
+    
+    def get_sync_journal_path(self) -> str:
+        return self.config.get('sync', {}).get('journal_path', 'db/sync_journal.db')
+    
+    def get_sync_interval_s(self) -> float:
+        return self.config.get('sync', {}).get('interval_s', 5.0)
+    
+    def get_sync_batch_size(self) -> int:
+        return self.config.get('sync', {}).get('batch_size', 500)
+    
+    def get_capture_mode(self) -> str:
+        """'gated' persists only impact/string windows, 'all' every sample"""
+        return self.config.get('sample_pipeline', {}).get('capture_mode', 'gated')
+    
+    def get_capture_pre_ms(self) -> float:
+        return self.config.get('sample_pipeline', {}).get('capture_pre_ms', 500)
+    
+    def get_capture_post_ms(self) -> float:
+        return self.config.get('sample_pipeline', {}).get('capture_post_ms', 500)
+    
+    # Flight Recorder (in-memory debug ring, dumped on anomalies)
+    def is_flight_recorder_enabled(self) -> bool:
+        return self.config.get('flight_recorder', {}).get('enabled', True)
+    
+    def get_flight_recorder_seconds(self) -> float:
+        return self.config.get('flight_recorder', {}).get('seconds', 30)
+    
+    def get_flight_recorder_min_dump_interval(self) -> float:
+        return self.config.get('flight_recorder', {}).get('min_dump_interval_s', 10)
+    
+    # Stream watchdog (stall detection and targeted reconnect per BT50)
+    def is_stream_watchdog_enabled(self) -> bool:
+        return self.config.get('stream_watchdog', {}).get('enabled', True)
+    
+    def get_stream_watchdog_settings(self) -> dict:
+        """StreamWatchdog keyword arguments (stall_periods, min_stall_ms, ...)"""
+        settings = dict(self.config.get('stream_watchdog', {}))
+        for key in ('enabled', 'check_interval_ms', 'mqtt'):
+            settings.pop(key, None)
+        return settings
+    
+    def get_stream_watchdog_check_interval(self) -> float:
+        return self.config.get('stream_watchdog', {}).get('check_interval_ms', 50) / 1000.0
+    
+    def is_stream_watchdog_mqtt_enabled(self) -> bool:
+        return self.config.get('stream_watchdog', {}).get('mqtt', True)
+    
+    # Assignment hot-reload
+    def is_assignment_hot_reload_enabled(self) -> bool:
+        return self.config.get('assignments', {}).get('hot_reload', True)
+    
+    def get_assignment_reconcile_interval(self) -> float:
+        return self.config.get('assignments', {}).get('reconcile_interval_s', 15)
+    
     # Timing Calibration Configuration
     def is_enhanced_timing_enabled(self) -> bool:
         return self.config.get('timing_calibration', {}).get('enhanced_mode', True)
@@ -127,6 +213,9 @@ class DevConfig:
     def get_timing_learning_rate(self) -> float:
         return self.config.get('timing_calibration', {}).get('learning_rate', 0.1)
     
+    def is_timer_clock_enabled(self) -> bool:
+        return self.config.get('timing_calibration', {}).get('timer_clock', True)
+    
     def is_validation_logging_enabled(self) -> bool:
         return self.config.get('timing_calibration', {}).get('validation_logging', True)
     
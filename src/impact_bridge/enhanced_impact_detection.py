@@ -4,15 +4,35 @@ Enhanced Impact Detection with Onset Timing
 
 This module improves impact detection by identifying the START of impact events,
 not just peak magnitude, providing more accurate timing correlation.
+
+Sample history lives in a preallocated ring of NumPy columns (timestamp, raw,
+corrected, magnitude) so memory per detector is constant. Blocks are
+written with slice assignments when the history is read; single samples stay
+Python rows until then. Impact events own a copy of their samples.
 """
 
+from collections import deque
+from itertools import islice
 from datetime import datetime, timedelta
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Iterable, List, Optional, Sequence
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+
+def _datetimes_to_ns(timestamps: Iterable[datetime]) -> np.ndarray:
+    """Convert datetimes to integer epoch nanoseconds (microsecond precision)"""
+    seconds = np.array([timestamp.timestamp() for timestamp in timestamps], dtype=np.float64)
+    return np.round(seconds * 1e6).astype(np.int64) * 1000
+
+
+def _ns_to_datetime(ts_ns: int) -> datetime:
+    return datetime.fromtimestamp(ts_ns / 1e9)
+
+
 @dataclass
 class SamplePoint:
     """Individual sensor sample with timestamp"""
@@ -20,6 +40,226 @@ class SamplePoint:
     raw_values: List[int]  # [x, y, z] raw values
     corrected_values: List[float]  # [x, y, z] baseline-corrected values
     magnitude: float
+
+
+class SampleWindow:
+    """Contiguous run of samples as parallel column views.
+
+    Windows returned by SampleRing are views into the ring storage (unless
+    they straddle its end) and are only valid until the ring wraps over them;
+    use copy() to keep one around.
+    """
+
+    __slots__ = ("start_seq", "ts_ns", "raw", "corrected", "magnitude")
+
+    def __init__(self, start_seq: int, ts_ns: np.ndarray, raw: np.ndarray,
+                 corrected: np.ndarray, magnitude: np.ndarray):
+        self.start_seq = start_seq
+        self.ts_ns = ts_ns
+        self.raw = raw
+        self.corrected = corrected
+        self.magnitude = magnitude
+
+    def __len__(self) -> int:
+        return len(self.ts_ns)
+
+    def timestamp(self, index: int) -> datetime:
+        return _ns_to_datetime(int(self.ts_ns[index]))
+
+    def peak_index(self) -> int:
+        """Index of the highest magnitude sample (first one on ties)"""
+        return int(self.magnitude.argmax())
+
+    def onset_index(self, threshold: float) -> int:
+        """Index of the first sample at or above threshold, -1 if none"""
+        above = self.magnitude >= threshold
+        index = int(above.argmax())
+        return index if above[index] else -1
+
+    def point(self, index: int) -> SamplePoint:
+        return SamplePoint(
+            timestamp=self.timestamp(index),
+            raw_values=self.raw[index].tolist(),
+            corrected_values=self.corrected[index].tolist(),
+            magnitude=float(self.magnitude[index])
+        )
+
+    def points(self, start: int = 0, stop: Optional[int] = None) -> List[SamplePoint]:
+        """Materialize SamplePoint objects for a slice of the window"""
+        return [self.point(i) for i in range(*slice(start, stop).indices(len(self)))]
+
+    def copy(self) -> "SampleWindow":
+        return SampleWindow(self.start_seq, self.ts_ns.copy(), self.raw.copy(),
+                            self.corrected.copy(), self.magnitude.copy())
+
+    def slice(self, start: int, stop: int) -> "SampleWindow":
+        return SampleWindow(self.start_seq + start, self.ts_ns[start:stop], self.raw[start:stop],
+                            self.corrected[start:stop], self.magnitude[start:stop])
+
+    @staticmethod
+    def join(windows: Sequence["SampleWindow"]) -> "SampleWindow":
+        """New window holding consecutive ``windows`` in order"""
+        return SampleWindow(windows[0].start_seq, np.concatenate([w.ts_ns for w in windows]),
+                            np.concatenate([w.raw for w in windows]),
+                            np.concatenate([w.corrected for w in windows]),
+                            np.concatenate([w.magnitude for w in windows]))
+
+
+def _rows_window(start_seq: int, timestamps: Iterable[datetime], rows: Iterable[tuple]) -> SampleWindow:
+    """Window converted from per-sample rows (see ``SampleRing.append``)"""
+    values = np.array(list(rows), dtype=np.float64).reshape(-1, 7)
+    return SampleWindow(start_seq, _datetimes_to_ns(timestamps), values[:, 0:3], values[:, 3:6], values[:, 6])
+
+
+class SampleRing:
+    """Fixed-capacity ring of samples stored as parallel NumPy columns.
+
+    Columns share one preallocated (capacity, 8) buffer: timestamp (int64
+    view), raw x/y/z, corrected x/y/z and magnitude. Writes are deferred until
+    a window is read: ``extend()`` queues the block's arrays (callers must not
+    modify them afterwards) and ``append()`` keeps single samples as Python
+    rows, converted only when they are read or a block follows. ``flush()``
+    writes the queue with one slice assignment per column (two when it
+    wraps); queued samples that newer ones have already pushed out of the
+    ring are dropped without being written. Samples are addressed by a
+    monotonically increasing sequence number.
+    """
+
+    __slots__ = ("capacity", "_data", "ts_ns", "raw", "corrected", "magnitude",
+                 "total", "_written", "_queue", "_queued", "_rows_ts", "_rows")
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._data = np.zeros((capacity, 8), dtype=np.float64)
+        self.ts_ns = self._data.view(np.int64)[:, 0]
+        self.raw = self._data[:, 1:4]
+        self.corrected = self._data[:, 4:7]
+        self.magnitude = self._data[:, 7]
+        self.total = 0  # Sequence number of the next sample
+        self._written = 0  # Samples before this sequence number are in the buffer
+        self._queue: Deque[tuple] = deque()  # (ts_ns, raw, corrected, magnitude) blocks
+        self._queued = 0
+        self._rows_ts: Deque[datetime] = deque(maxlen=capacity)
+        self._rows: Deque[tuple] = deque(maxlen=capacity)  # (raw x/y/z, corrected x/y/z, magnitude)
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    @property
+    def oldest(self) -> int:
+        """Sequence number of the oldest sample still held"""
+        return max(0, self.total - self.capacity)
+
+    def clear(self) -> None:
+        self.total = self._written = self._queued = 0
+        self._queue.clear()
+        self._rows_ts.clear()
+        self._rows.clear()
+
+    def append(self, timestamp: datetime, raw: Sequence[float], corrected: Sequence[float],
+               magnitude: float) -> int:
+        """Store one sample and return its sequence number"""
+        self._rows_ts.append(timestamp)
+        self._rows.append((*raw, *corrected, magnitude))
+        seq = self.total
+        self.total = seq + 1
+        return seq
+
+    def extend(self, ts_ns: np.ndarray, raw: np.ndarray, corrected: np.ndarray,
+               magnitude: np.ndarray) -> int:
+        """Store a block of samples and return the sequence number of the first"""
+        if self._rows:
+            self._queue_rows()
+        first = self.total
+        n = len(ts_ns)
+        self.total = first + n
+        self._queue.append((ts_ns, raw, corrected, magnitude))
+        self._queued += n
+        # Drop whole blocks the ring would overwrite before anyone reads them
+        while self._queued - len(self._queue[0][0]) >= self.capacity:
+            skipped = len(self._queue.popleft()[0])
+            self._queued -= skipped
+            self._written += skipped
+        return first
+
+    def _queue_rows(self) -> None:
+        first = self.total - len(self._rows)
+        if len(self._rows) == self.capacity:
+            # Everything before the rows is overwritten (the deques may have dropped some)
+            self._queue.clear()
+            self._queued = 0
+            self._written = first
+        window = _rows_window(first, self._rows_ts, self._rows)
+        self._rows_ts.clear()
+        self._rows.clear()
+        self.total = first  # extend() counts them again
+        self.extend(window.ts_ns, window.raw, window.corrected, window.magnitude)
+
+    def flush(self) -> None:
+        """Write queued samples to the buffer"""
+        if self._rows:
+            self._queue_rows()
+        while self._queue:
+            self._write(*self._queue.popleft())
+        self._queued = 0
+
+    def _write(self, ts_ns: np.ndarray, raw: np.ndarray, corrected: np.ndarray,
+               magnitude: np.ndarray) -> None:
+        n = len(ts_ns)
+        cap = self.capacity
+        if n > cap:
+            # Only the newest samples fit
+            self._written += n - cap
+            ts_ns, raw, corrected, magnitude = ts_ns[-cap:], raw[-cap:], corrected[-cap:], magnitude[-cap:]
+            n = cap
+        start = self._written % cap
+        stop = start + n
+        if stop <= cap:
+            self.ts_ns[start:stop] = ts_ns
+            self.raw[start:stop] = raw
+            self.corrected[start:stop] = corrected
+            self.magnitude[start:stop] = magnitude
+        else:
+            split = cap - start
+            self.ts_ns[start:] = ts_ns[:split]
+            self.raw[start:] = raw[:split]
+            self.corrected[start:] = corrected[:split]
+            self.magnitude[start:] = magnitude[:split]
+            rest = n - split
+            self.ts_ns[:rest] = ts_ns[split:]
+            self.raw[:rest] = raw[split:]
+            self.corrected[:rest] = corrected[split:]
+            self.magnitude[:rest] = magnitude[split:]
+        self._written += n
+
+    def window(self, start_seq: int, end_seq: int) -> SampleWindow:
+        """Samples [start_seq, end_seq): a view, or a copy if they straddle the buffer end"""
+        if start_seq < self.oldest or end_seq > self.total or start_seq > end_seq:
+            raise IndexError(f"samples {start_seq}..{end_seq} not in ring "
+                             f"({self.oldest}..{self.total})")
+        first_row = self.total - len(self._rows)
+        if start_seq >= first_row:
+            # Only single samples not yet written: convert just those
+            stop = end_seq - first_row
+            return _rows_window(start_seq, islice(self._rows_ts, start_seq - first_row, stop),
+                                islice(self._rows, start_seq - first_row, stop))
+        if end_seq > self._written:
+            self.flush()
+        i = start_seq % self.capacity
+        j = i + (end_seq - start_seq)
+        if j <= self.capacity:
+            return SampleWindow(start_seq, self.ts_ns[i:j], self.raw[i:j],
+                                self.corrected[i:j], self.magnitude[i:j])
+        rows = np.concatenate((self._data[i:], self._data[:j - self.capacity]))
+        return SampleWindow(start_seq, rows.view(np.int64)[:, 0], rows[:, 1:4], rows[:, 4:7], rows[:, 7])
+
+    def lookback(self, count: int) -> SampleWindow:
+        """The newest ``count`` samples"""
+        count = min(count, len(self))
+        return self.window(self.total - count, self.total)
+
     
 @dataclass
 class ImpactEvent:
@@ -32,153 +272,270 @@ class ImpactEvent:
     sample_count: int          # Number of samples in impact sequence
     confidence: float          # Detection confidence (0.0-1.0)
     
-    # Sample progression for analysis
-    onset_samples: List[SamplePoint]   # Samples leading to onset detection
-    peak_samples: List[SamplePoint]    # Samples around peak
+    # Full impact sequence (onset through end sample), copied out of the
+    # detector's ring when the event is created
+    window: SampleWindow = field(repr=False, compare=False)
+
+    @property
+    def onset_samples(self) -> List[SamplePoint]:
+        """Samples leading to onset detection"""
+        return self.window.points(0, 3)
+
+    @property
+    def peak_samples(self) -> List[SamplePoint]:
+        """Samples around peak (full sequence)"""
+        return self.window.points()
+
     
 class EnhancedImpactDetector:
     """Enhanced impact detection with onset timing"""
     
     def __init__(self, threshold: float = 150.0, onset_threshold: float = 30.0, 
-                 lookback_samples: int = 10, minimum_duration_samples: int = 3):
+                 lookback_samples: int = 10, minimum_duration_samples: int = 3,
+                 max_impact_samples: int = 256):
         self.threshold = threshold  # Peak detection threshold
         self.onset_threshold = onset_threshold  # Onset detection threshold (lower)
         self.lookback_samples = lookback_samples  # How far to look back for onset
         self.minimum_duration_samples = minimum_duration_samples
+        self.max_impact_samples = max(2, max_impact_samples)  # Longer impacts are discarded
         
         # Sample history for onset detection
-        self.sample_history: List[SamplePoint] = []
         self.max_history = 20  # Keep last N samples
+        self.ring = SampleRing(max(self.max_history, lookback_samples) + self.max_impact_samples)
         
         # Impact state tracking
         self.in_impact = False
-        self.current_impact_samples: List[SamplePoint] = []
-        self.impact_start_index = -1
+        self.impact_start_seq = -1
+        self._impact_parts: List[SampleWindow] = []  # Earlier blocks of an impact in progress
+        self.suppressed = False  # Overlong impact discarded, wait for return below onset
+
+        # Optional state-transition hook: trace(event, detail)
+        self.trace: Optional[Callable[[str, str], None]] = None
         
         logger.info(f"Enhanced impact detector initialized:")
         logger.info(f"  Peak threshold: {threshold}g")
         logger.info(f"  Onset threshold: {onset_threshold}g") 
         logger.info(f"  Lookback samples: {lookback_samples}")
         
+    @property
+    def sample_history(self) -> List[SamplePoint]:
+        """Last ``max_history`` samples as SamplePoint objects (materialized on access)"""
+        return self.ring.lookback(self.max_history).points()
+
+    def recent_window(self, count: Optional[int] = None) -> SampleWindow:
+        """The newest samples (default ``lookback_samples``), valid until the ring wraps"""
+        return self.ring.lookback(self.lookback_samples if count is None else count)
+
     def reset(self):
         """Reset detector state (clear history and current impact)"""
-        self.sample_history.clear()
-        self.current_impact_samples.clear()
+        self.ring.clear()
         self.in_impact = False
-        self.impact_start_index = -1
+        self.impact_start_seq = -1
+        self._impact_parts.clear()
+        self.suppressed = False
         logger.debug("Enhanced impact detector state reset")
         
     def process_sample(self, timestamp: datetime, raw_values: List[int], 
                       corrected_values: List[float], magnitude: float) -> Optional[ImpactEvent]:
         """Process a new sample and detect impact events with onset timing"""
         
-        # Create sample point
-        sample = SamplePoint(
-            timestamp=timestamp,
-            raw_values=raw_values.copy(),
-            corrected_values=corrected_values.copy(),
-            magnitude=magnitude
-        )
-        
         # Add to history (always maintain sample history)
-        self.sample_history.append(sample)
-        if len(self.sample_history) > self.max_history:
-            self.sample_history.pop(0)
+        seq = self.ring.append(timestamp, raw_values, corrected_values, magnitude)
         
-        # Impact detection logic: Look for ONSET first, not peak!
-        if not self.in_impact:
-            # Check for impact ONSET (lower threshold)
-            if magnitude >= self.onset_threshold:
-                return self._start_impact_detection(sample)
-        else:
-            # Already in impact, continue tracking
-            self.current_impact_samples.append(sample)
-            
-            # Check for impact end (return to baseline)
+        if self.suppressed:
+            # Ignore the rest of a discarded overlong impact
             if magnitude < self.onset_threshold:
-                return self._end_impact_detection(sample)
+                self.suppressed = False
+        elif not self.in_impact:
+            # Impact detection logic: Look for ONSET first, not peak!
+            if magnitude >= self.onset_threshold:
+                self._start_impact_detection(seq, magnitude, timestamp)
+        elif magnitude < self.onset_threshold:
+            # Impact end (return to baseline)
+            return self._end_impact_detection(self.ring.window(self.impact_start_seq, seq + 1))
+        elif seq - self.impact_start_seq + 1 >= self.max_impact_samples:
+            self._discard_overlong_impact()
         
         return None
     
-    def _start_impact_detection(self, onset_sample: SamplePoint) -> Optional[ImpactEvent]:
-        """Start impact detection when onset threshold is crossed"""
-        self.in_impact = True
-        self.current_impact_samples = [onset_sample]  # Start with onset sample
+    def process_samples(self, timestamps_ns: np.ndarray, corrected_values: np.ndarray,
+                        magnitudes: Optional[np.ndarray] = None,
+                        raw_values: Optional[np.ndarray] = None) -> List[ImpactEvent]:
+        """Process a block of samples and return completed impact events.
+        
+        Produces the same events as calling process_sample() per sample with
+        ``datetime.fromtimestamp(ts_ns / 1e9)`` timestamps. Onset runs are
+        found vectorized, impacts are cut from the block itself (joined with
+        earlier blocks for one carried over), then the block is queued to the
+        ring in one go. Impact state carries over between blocks.
+        
+        Args:
+            timestamps_ns: Integer nanosecond timestamps, shape (n,)
+            corrected_values: Baseline-corrected X/Y/Z, shape (n, 3)
+            magnitudes: Per-sample magnitude (computed from corrected if None)
+            raw_values: Raw X/Y/Z, shape (n, 3) (defaults to corrected values)
+        """
+        ts_ns = np.asarray(timestamps_ns)
+        n = len(ts_ns)
+        if n == 0:
+            return []
+        corrected = np.asarray(corrected_values)
+        raw = corrected if raw_values is None else np.asarray(raw_values)
+        if magnitudes is None:
+            magnitudes = np.sqrt(np.einsum("ij,ij->i", corrected, corrected))
+        mags = np.asarray(magnitudes)
+        
+        # Fast path: quiet block and no impact in progress
+        if not (self.in_impact or self.suppressed) and max(mags.tolist()) < self.onset_threshold:
+            self.ring.extend(ts_ns, raw, corrected, mags)
+            return []
+        
+        base = self.ring.total
+        block = SampleWindow(base, ts_ns, raw, corrected, mags)
         
-        # Record the index of the onset sample in history
-        self.impact_start_index = len(self.sample_history) - 1
+        above = mags >= self.onset_threshold
+        edges = np.diff(above.astype(np.int8), prepend=0, append=0)
+        run_starts = np.flatnonzero(edges == 1).tolist()
+        run_ends = np.flatnonzero(edges == -1).tolist()
         
-        logger.debug(f"🎯 Impact onset detected: {onset_sample.magnitude:.1f}g at "
-                    f"{onset_sample.timestamp.strftime('%H:%M:%S.%f')[:-3]}")
+        events: List[ImpactEvent] = []
         
-        return None  # Don't return event yet, continue tracking until end
+        # An impact (or discarded overlong impact) carried over from the previous block
+        if self.in_impact or self.suppressed:
+            if run_starts and run_starts[0] == 0:
+                end = run_ends.pop(0)
+                run_starts.pop(0)
+            else:
+                end = 0
+            if self.suppressed:
+                if end < n:
+                    self.suppressed = False
+            else:
+                self._track_run(block, end, events)
+        
+        for start, end in zip(run_starts, run_ends):
+            self._start_impact_detection(base + start, float(mags[start]), _ns_to_datetime(int(ts_ns[start])))
+            self._track_run(block, end, events)
+        
+        self.ring.extend(ts_ns, raw, corrected, mags)
+        return events
     
+    def _track_run(self, block: SampleWindow, end: int, events: List[ImpactEvent]) -> None:
+        """Follow the current impact through a run of above-onset samples ending at block index ``end``"""
+        base = block.start_seq
+        overflow_index = self.impact_start_seq + self.max_impact_samples - 1 - base
+        if overflow_index < end:
+            self._discard_overlong_impact()
+            if end < len(block):
+                self.suppressed = False
+        elif end < len(block):
+            event = self._end_impact_detection(self._impact_window(block, end + 1))
+            if event:
+                events.append(event)
+        else:
+            # Continues into the next block
+            self._impact_parts.append(block.slice(max(0, self.impact_start_seq - base), len(block)))
 
-    
-    def _end_impact_detection(self, end_sample: SamplePoint) -> Optional[ImpactEvent]:
-        """End impact detection and create impact event"""
+    def _impact_window(self, block: SampleWindow, stop: int) -> SampleWindow:
+        """Samples of the current impact up to block index ``stop``"""
+        base = block.start_seq
+        if self.impact_start_seq >= base:
+            return block.slice(self.impact_start_seq - base, stop)
+        parts = self._impact_parts
+        if parts and parts[0].start_seq == self.impact_start_seq:
+            return SampleWindow.join(parts + [block.slice(0, stop)])
+        # Started on the per-sample path: the ring holds its beginning
+        return SampleWindow.join([self.ring.window(self.impact_start_seq, base), block.slice(0, stop)])
+
+    def _start_impact_detection(self, onset_seq: int, magnitude: float, timestamp: datetime) -> None:
+        """Start impact detection when onset threshold is crossed"""
+        self.in_impact = True
+        self.impact_start_seq = onset_seq
+        self._impact_parts.clear()
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"🎯 Impact onset detected: {magnitude:.1f}g at "
+                        f"{timestamp.strftime('%H:%M:%S.%f')[:-3]}")
+        if self.trace:
+            self.trace('onset', f"{magnitude:.1f}g")
+        
+    def _discard_overlong_impact(self) -> None:
+        logger.debug(f"Impact exceeded {self.max_impact_samples} samples above onset threshold, discarding")
+        if self.trace:
+            self.trace('timeout', f"samples>={self.max_impact_samples}")
         self.in_impact = False
+        self.impact_start_seq = -1
+        self._impact_parts.clear()
+        self.suppressed = True
         
-        if len(self.current_impact_samples) < self.minimum_duration_samples:
+    def _end_impact_detection(self, window: SampleWindow) -> Optional[ImpactEvent]:
+        """End impact detection and create impact event from its samples (onset first)"""
+        self.in_impact = False
+        self.impact_start_seq = -1
+        self._impact_parts.clear()
+        sample_count = len(window)
+    
+        if sample_count < self.minimum_duration_samples:
             logger.debug("Impact too short, discarding")
-            self.current_impact_samples.clear()
+            if self.trace:
+                self.trace('too_short', f"samples={sample_count}")
             return None
         
-        # Onset is the FIRST sample in the sequence (when we started recording)
-        onset_sample = self.current_impact_samples[0]
-        
         # Peak is the HIGHEST magnitude sample in the sequence
-        peak_sample = max(self.current_impact_samples, key=lambda s: s.magnitude)
+        peak_index = window.peak_index()
+        onset_magnitude = float(window.magnitude[0])
+        peak_magnitude = float(window.magnitude[peak_index])
         
         # Validate that we have a proper impact (peak should be above detection threshold)
-        if peak_sample.magnitude < self.threshold:
-            logger.debug(f"Peak magnitude {peak_sample.magnitude:.1f}g below threshold {self.threshold}g, discarding")
-            self.current_impact_samples.clear()
+        if peak_magnitude < self.threshold:
+            logger.debug(f"Peak magnitude {peak_magnitude:.1f}g below threshold {self.threshold}g, discarding")
+            if self.trace:
+                self.trace('below_peak', f"{peak_magnitude:.1f}g")
             return None
         
         # Calculate impact metrics
-        duration_ms = (end_sample.timestamp - onset_sample.timestamp).total_seconds() * 1000
-        confidence = self._calculate_confidence(onset_sample, peak_sample, len(self.current_impact_samples))
+        onset_timestamp = window.timestamp(0)
+        peak_timestamp = window.timestamp(peak_index)
+        duration_ms = (window.timestamp(sample_count - 1) - onset_timestamp).total_seconds() * 1000
+        confidence = self._calculate_confidence(onset_magnitude, peak_magnitude, sample_count)
+        if self.trace:
+            self.trace('impact', f"peak={peak_magnitude:.1f}g samples={sample_count} confidence={confidence:.2f}")
         
         # Create impact event with correct timing order
         impact = ImpactEvent(
-            onset_timestamp=onset_sample.timestamp,    # FIRST sample (onset)
-            peak_timestamp=peak_sample.timestamp,      # HIGHEST sample (peak)
-            onset_magnitude=onset_sample.magnitude,
-            peak_magnitude=peak_sample.magnitude,
+            onset_timestamp=onset_timestamp,    # FIRST sample (onset)
+            peak_timestamp=peak_timestamp,      # HIGHEST sample (peak)
+            onset_magnitude=onset_magnitude,
+            peak_magnitude=peak_magnitude,
             duration_ms=duration_ms,
-            sample_count=len(self.current_impact_samples),
+            sample_count=sample_count,
             confidence=confidence,
-            onset_samples=self.current_impact_samples[:3],  # First few samples
-            peak_samples=self.current_impact_samples        # Full sequence
+            window=window.copy()  # Outlives the ring slots (and caller blocks) it came from
         )
         
         # Validate timing order
-        onset_to_peak_ms = (peak_sample.timestamp - onset_sample.timestamp).total_seconds() * 1000
+        onset_to_peak_ms = (peak_timestamp - onset_timestamp).total_seconds() * 1000
         
         # Store impact details for consolidated logging in main bridge
         impact._onset_to_peak_ms = onset_to_peak_ms
         impact._duration_ms = duration_ms
-        impact._sample_count = len(self.current_impact_samples)
+        impact._sample_count = sample_count
         impact._confidence = confidence
         
-        self.current_impact_samples.clear()
-        self.impact_start_index = -1
-        
         return impact
     
-    def _calculate_confidence(self, onset_sample: SamplePoint, peak_sample: SamplePoint, sample_count: int) -> float:
+    def _calculate_confidence(self, onset_magnitude: float, peak_magnitude: float, sample_count: int) -> float:
         """Calculate detection confidence based on signal characteristics"""
         
         # Base confidence from magnitude ratio
-        magnitude_ratio = peak_sample.magnitude / max(onset_sample.magnitude, 1.0)
+        magnitude_ratio = peak_magnitude / max(onset_magnitude, 1.0)
         magnitude_confidence = min(magnitude_ratio / 5.0, 1.0)  # 5x increase = 100% confidence
         
         # Duration confidence (prefer impacts with reasonable duration)
         duration_confidence = min(sample_count / 6.0, 1.0)  # 6+ samples = 100% confidence
         
         # Signal strength confidence
-        strength_confidence = min(peak_sample.magnitude / (self.threshold * 1.5), 1.0)
+        strength_confidence = min(peak_magnitude / (self.threshold * 1.5), 1.0)
         
         # Combined confidence
         confidence = (magnitude_confidence * 0.4 + duration_confidence * 0.3 + strength_confidence * 0.3)
@@ -0,0 +1,154 @@
+"""
+Event-gated raw capture.
+
+Raw motion data is only analytically useful around impacts and while a timer
+string is running. EventGatedCapture keeps a short per-sensor pre-trigger ring
+in memory and only hands items to its sink when:
+
+- a detector fires (``trigger``): the last ``pre_ms`` of that sensor plus the
+  next ``post_ms`` are released, tagged with the impact id
+- a string is active (``start_string`` .. ``stop_string``): everything is
+  released for all sensors, tagged with the string id, including the
+  pre-trigger window before START and ``post_ms`` after STOP
+
+Everything else ages out of the ring and is never written.
+"""
+
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# sink(sensor_mac, items, tag)
+CaptureSink = Callable[[str, List[Any], str], None]
+
+
+@dataclass
+class CaptureStats:
+    """Counters for gated capture"""
+    seen: int = 0        # Items fed
+    persisted: int = 0   # Items handed to the sink
+    expired: int = 0     # Items aged out of the pre-trigger ring
+    windows: int = 0     # Trigger/string windows opened
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['reduction_pct'] = round(100.0 * (1 - self.persisted / self.seen), 1) if self.seen else 0.0
+        return data
+
+
+class EventGatedCapture:
+    """Per-sensor pre-trigger ring that persists only windows around events.
+
+    Items are opaque to the capture (frames, sample blocks, row tuples); each is
+    fed with the sensor it came from and its timestamp in nanoseconds.
+    """
+
+    def __init__(self, sink: CaptureSink, pre_ms: float = 500.0, post_ms: float = 500.0,
+                 max_items: int = 2048):
+        self.sink = sink
+        self.pre_ns = int(pre_ms * 1e6)
+        self.post_ns = int(post_ms * 1e6)
+        self.max_items = max_items  # Hard cap per sensor ring, whatever the timestamps
+
+        self._rings: Dict[str, Deque[Tuple[int, Any]]] = {}
+        self._post_windows: Dict[str, Tuple[int, str]] = {}  # sensor -> (until_ns, tag)
+        self._string_tag: Optional[str] = None
+        self._string_post: Optional[Tuple[int, str]] = None  # (until_ns, tag) after STOP
+        self.stats = CaptureStats()
+
+    @property
+    def string_active(self) -> bool:
+        return self._string_tag is not None
+
+    def feed(self, sensor_mac: str, ts_ns: int, item: Any) -> bool:
+        """Offer one item; returns True if it was persisted immediately"""
+        self.stats.seen += 1
+        tag = self._active_tag(sensor_mac, ts_ns)
+        if tag is not None:
+            self._emit(sensor_mac, [item], tag)
+            return True
+
+        ring = self._rings.get(sensor_mac)
+        if ring is None:
+            ring = self._rings[sensor_mac] = deque()
+        ring.append((ts_ns, item))
+        cutoff = ts_ns - self.pre_ns
+        while ring and (ring[0][0] < cutoff or len(ring) > self.max_items):
+            ring.popleft()
+            self.stats.expired += 1
+        return False
+
+    def trigger(self, sensor_mac: str, ts_ns: int, tag: str) -> None:
+        """A detector fired: release the pre-trigger window and open a post window"""
+        self.stats.windows += 1
+        self._flush_ring(sensor_mac, ts_ns - self.pre_ns, tag)
+        until_ns = ts_ns + self.post_ns
+        current = self._post_windows.get(sensor_mac)
+        if current is None or current[0] < until_ns:
+            self._post_windows[sensor_mac] = (until_ns, tag)
+        logger.debug(f"Capture window {tag} for {sensor_mac}")
+
+    def start_string(self, string_id: Any, ts_ns: int) -> None:
+        """Timer START: release every sensor's pre-trigger window and capture until STOP"""
+        tag = f"string:{string_id}"
+        self.stats.windows += 1
+        self._string_tag = tag
+        self._string_post = None
+        for sensor_mac in list(self._rings):
+            self._flush_ring(sensor_mac, ts_ns - self.pre_ns, tag)
+
+    def stop_string(self, ts_ns: int) -> None:
+        """Timer STOP: keep capturing for ``post_ms`` then fall back to gating"""
+        if self._string_tag is None:
+            return
+        self._string_post = (ts_ns + self.post_ns, self._string_tag)
+        self._string_tag = None
+
+    def clear(self) -> None:
+        for ring in self._rings.values():
+            self.stats.expired += len(ring)
+            ring.clear()
+        self._post_windows.clear()
+        self._string_tag = None
+        self._string_post = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.to_dict()
+        stats['buffered'] = sum(len(ring) for ring in self._rings.values())
+        stats['string_active'] = self.string_active
+        return stats
+
+    def _active_tag(self, sensor_mac: str, ts_ns: int) -> Optional[str]:
+        """Tag of the window ``ts_ns`` falls in (impact windows win over strings)"""
+        window = self._post_windows.get(sensor_mac)
+        if window is not None:
+            if ts_ns <= window[0]:
+                return window[1]
+            del self._post_windows[sensor_mac]
+        if self._string_tag is not None:
+            return self._string_tag
+        if self._string_post is not None:
+            if ts_ns <= self._string_post[0]:
+                return self._string_post[1]
+            self._string_post = None
+        return None
+
+    def _flush_ring(self, sensor_mac: str, since_ns: int, tag: str) -> None:
+        ring = self._rings.get(sensor_mac)
+        if not ring:
+            return
+        items = [item for ts_ns, item in ring if ts_ns >= since_ns]
+        self.stats.expired += len(ring) - len(items)
+        ring.clear()
+        if items:
+            self._emit(sensor_mac, items, tag)
+
+    def _emit(self, sensor_mac: str, items: List[Any], tag: str) -> None:
+        self.stats.persisted += len(items)
+        try:
+            self.sink(sensor_mac, items, tag)
+        except Exception as e:
+            logger.error(f"Capture sink failed for {sensor_mac} ({tag}): {e}")
@@ -1,19 +1,26 @@
-"""Structured event logging for main operational events."""
+"""Structured event logging for main operational events.
+
+CSV and NDJSON records go through a ``BufferedLogSink`` (see ``log_sink``),
+so logging an event never touches the disk on the caller's thread.
+"""
 
 from __future__ import annotations
 
-import csv
-import json
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, TextIO, Union
+from typing import Any, Dict, Optional, Union
+
+from .log_sink import BufferedLogSink, get_default_sink
+
+CSV_HEADER = ["Datetime", "Type", "Device", "DeviceID", "DevicePosition", "Details"]
 
 
 class StructuredEventLogger:
     """Logger for structured events in CSV and NDJSON formats."""
     
-    def __init__(self, log_dir: str, debug_dir: str, file_prefix: str = "bridge") -> None:
+    def __init__(self, log_dir: str, debug_dir: str, file_prefix: str = "bridge",
+                 sink: Optional[BufferedLogSink] = None) -> None:
         self.log_dir = Path(log_dir)
         self.debug_dir = Path(debug_dir)
         self.file_prefix = file_prefix
@@ -29,11 +36,17 @@ class StructuredEventLogger:
         self._shots_detected = 0
         self._impacts_detected = 0
         
-        # File handles
-        self._main_csv: Optional[TextIO] = None
-        self._main_ndjson: Optional[TextIO] = None
-        self._debug_ndjson: Optional[TextIO] = None
-        self._current_date: Optional[str] = None
+        # Output streams (daily rotation resolved by the sink's writer thread)
+        self._sink = sink or get_default_sink()
+        self._debug_sessions: Dict[str, str] = {}
+        self._main_csv = self._sink.stream(
+            lambda date: self.log_dir / "main" / f"{self.file_prefix}_main_{date}.csv",
+            header=CSV_HEADER,
+        )
+        self._main_ndjson = self._sink.stream(
+            lambda date: self.log_dir / "main" / f"{self.file_prefix}_main_{date}.ndjson"
+        )
+        self._debug_ndjson = self._sink.stream(self._debug_path)
         
         # Device position mappings
         self._device_positions = {
@@ -44,47 +57,12 @@ class StructuredEventLogger:
             "C:1A": "Bay 1",     # Alternative format for AMG (old 4-char format)
         }
         
-        # Initialize log files
-        self._rotate_if_needed()
-    
-    def _rotate_if_needed(self) -> None:
-        """Rotate log files if date has changed."""
-        current_date = datetime.now().strftime("%Y%m%d")
-        
-        if self._current_date != current_date:
-            # Close existing files
-            if self._main_csv:
-                self._main_csv.close()
-            if self._main_ndjson:
-                self._main_ndjson.close()
-            if self._debug_ndjson:
-                self._debug_ndjson.close()
-            
-            # Open new files for current date
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Main CSV file (structured events)
-            csv_filename = f"{self.file_prefix}_main_{current_date}.csv"
-            csv_path = self.log_dir / "main" / csv_filename
-            csv_path.parent.mkdir(parents=True, exist_ok=True)
-            self._main_csv = csv_path.open("a", encoding="utf-8", newline="")
-            
-            # Write CSV header if file is empty
-            if csv_path.stat().st_size == 0:
-                csv_writer = csv.writer(self._main_csv)
-                csv_writer.writerow(["Datetime", "Type", "Device", "DeviceID", "DevicePosition", "Details"])
-            
-            # Main NDJSON file (structured events)
-            ndjson_filename = f"{self.file_prefix}_main_{current_date}.ndjson"
-            ndjson_path = self.log_dir / "main" / ndjson_filename
-            self._main_ndjson = ndjson_path.open("a", encoding="utf-8", buffering=1)
-            
-            # Debug NDJSON file (raw device signals)
-            debug_filename = f"{self.file_prefix}_debug_{timestamp}.ndjson"
-            debug_path = self.debug_dir / debug_filename
-            self._debug_ndjson = debug_path.open("a", encoding="utf-8", buffering=1)
-            
-            self._current_date = current_date
+    def _debug_path(self, date: str) -> Path:
+        """Debug NDJSON file (raw device signals): one per session and day."""
+        session = self._debug_sessions.get(date)
+        if session is None:
+            session = self._debug_sessions[date] = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return self.debug_dir / f"{self.file_prefix}_debug_{session}.ndjson"
     
     def _format_datetime(self, dt: Optional[datetime] = None) -> str:
         """Format datetime in the required format: 9/9/25 8:44:01.22am"""
@@ -108,16 +86,12 @@ class StructuredEventLogger:
     
     def _write_main_event(self, event_type: str, device: str, device_id: str, details: str) -> None:
         """Write event to both CSV and NDJSON main logs."""
-        self._rotate_if_needed()
-        
         datetime_str = self._format_datetime()
         device_position = self._get_device_position(device_id)
         
         # Write to CSV
         if self._main_csv:
-            csv_writer = csv.writer(self._main_csv)
-            csv_writer.writerow([datetime_str, event_type, device, device_id, device_position, details])
-            self._main_csv.flush()
+            self._main_csv.write_row([datetime_str, event_type, device, device_id, device_position, details])
         
         # Write to NDJSON
         if self._main_ndjson:
@@ -131,9 +105,7 @@ class StructuredEventLogger:
                 "timestamp_iso": datetime.now().isoformat(),
                 "seq": self._seq
             }
-            json.dump(record, self._main_ndjson, separators=(",", ":"))
-            self._main_ndjson.write("\n")
-            self._main_ndjson.flush()
+            self._main_ndjson.write_record(record)
         
         self._seq += 1
     
@@ -148,9 +120,7 @@ class StructuredEventLogger:
                 "data": data,
                 "seq": self._seq
             }
-            json.dump(record, self._debug_ndjson, separators=(",", ":"))
-            self._debug_ndjson.write("\n")
-            self._debug_ndjson.flush()
+            self._debug_ndjson.write_record(record)
         
         self._seq += 1
     
@@ -247,8 +217,12 @@ class StructuredEventLogger:
         """Log connection-related events."""
         self._write_debug_raw(device, device_id, f"connection_{event}", data)
     
+    def buffer_stats(self) -> Dict[str, Any]:
+        """Fill level and write statistics of the underlying sink."""
+        return self._sink.stats()
+    
     def close(self) -> None:
-        """Close all log files."""
+        """Flush and close all log files."""
         if self._main_csv:
             self._main_csv.close()
             self._main_csv = None
@@ -239,6 +239,9 @@ class EventStreamer:
                 elif topic == 'bridge/status':
                     await self.broadcast_event('status', payload)
                     
+                elif topic.startswith('device/') and topic.endswith('/health'):
+                    await self.send_health_status(topic.split('/')[1], payload)
+                    
             except Exception as e:
                 logger.error(f"Error handling MQTT message {topic}: {e}")
         
@@ -248,6 +251,7 @@ class EventStreamer:
             mqtt_client.subscribe('timer/events', handle_mqtt_message)
             mqtt_client.subscribe('run/+/events', handle_mqtt_message)
             mqtt_client.subscribe('bridge/status', handle_mqtt_message)
+            mqtt_client.subscribe('device/+/health', handle_mqtt_message)
     
     async def start_periodic_tasks(self):
         """Start periodic tasks like status updates and client cleanup"""
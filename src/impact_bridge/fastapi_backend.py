@@ -3,12 +3,14 @@ LeadVille FastAPI Backend (initial scaffold)
 Mirrors Flask API structure for health and logs endpoints, CORS, and log parsing.
 """
 
-from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi import Depends, FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 from pathlib import Path
 from datetime import datetime
+import asyncio
 import os
 import json
 import glob
@@ -22,45 +24,40 @@ logger = logging.getLogger(__name__)
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.impact_bridge.assignment_reconciler import DEFAULT_ASSIGNMENT_FILE, write_assignment_file
+from src.impact_bridge.config_snapshot import ConfigSnapshot
+from src.impact_bridge.database.access import (
+    DatabaseAccess, close_databases, get_leadville_db, get_runtime_db,
+)
+from src.impact_bridge.database.stats import read_stats, run_stats_reconciler
+
 # Database helper functions
-def get_db_connection():
-    """Get database connection with row factory"""
-    import sqlite3
-    from pathlib import Path
+def _read_bridge_assignments(conn, bridge_id: int):
+    """Bridge configuration row and target assignments (runs on a reader)"""
+    cursor = conn.execute("""
+        SELECT bc.timer_address, bc.stage_config_id, sc.name as stage_name
+        FROM bridge_configurations bc
+        LEFT JOIN stage_configs sc ON bc.stage_config_id = sc.id
+        WHERE bc.bridge_id = ?
+    """, (bridge_id,))
+    bridge_config = cursor.fetchone()
     
-    db_path = Path("db/leadville.db")
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
-    return conn
+    # Get sensor assignments with target information
+    cursor = conn.execute("""
+        SELECT target_number, sensor_address, sensor_label
+        FROM bridge_target_assignments 
+        WHERE bridge_id = ?
+        ORDER BY target_number
+    """, (bridge_id,))
+    return bridge_config, cursor.fetchall()
 
 async def _update_json_config_from_db(bridge_id: int):
     """Update JSON config file from database (dual-write strategy)"""
-    import json
-    from pathlib import Path
-    
     try:
-        with get_db_connection() as conn:
-            # Get bridge configuration including stage info
-            cursor = conn.execute("""
-                SELECT bc.timer_address, bc.stage_config_id, sc.name as stage_name
-                FROM bridge_configurations bc
-                LEFT JOIN stage_configs sc ON bc.stage_config_id = sc.id
-                WHERE bc.bridge_id = ?
-            """, (bridge_id,))
-            bridge_config = cursor.fetchone()
-            
-            timer_address = bridge_config['timer_address'] if bridge_config else None
-            stage_config_id = bridge_config['stage_config_id'] if bridge_config else None
-            stage_name = bridge_config['stage_name'] if bridge_config else None
-            
-            # Get sensor assignments with target information
-            cursor = conn.execute("""
-                SELECT target_number, sensor_address, sensor_label
-                FROM bridge_target_assignments 
-                WHERE bridge_id = ?
-                ORDER BY target_number
-            """, (bridge_id,))
-            assignments = cursor.fetchall()
+        db = await get_leadville_db()
+        bridge_config, assignments = await db.read(_read_bridge_assignments, bridge_id)
+        
+        timer_address = bridge_config['timer_address'] if bridge_config else None
         
         # Build sensor assignments dict for new unified format
         sensors_dict = {}
@@ -80,13 +77,8 @@ async def _update_json_config_from_db(bridge_id: int):
             "sensors": sensor_addresses
         }
         
-        # Create config directory if it doesn't exist
-        config_dir = Path("config")
-        config_dir.mkdir(exist_ok=True)
-        
-        config_file = config_dir / "bridge_device_config.json"
-        with open(config_file, 'w') as f:
-            json.dump(config_data, f, indent=2)
+        # Atomic replace: the running bridge watches this file for changes
+        write_assignment_file(DEFAULT_ASSIGNMENT_FILE, config_data)
             
         logger.info(f"Updated JSON config from database: {config_data}")
         
@@ -138,6 +130,14 @@ except Exception as e:
     logger.error(f"❌ Failed to include Device Pool API routes: {e}")
     # Continue without pool routes for now
 
+# Include bridge store-and-forward sync routes (head node)
+try:
+    from src.impact_bridge.sync_api import router as sync_router
+    app.include_router(sync_router)
+    logger.info("✅ Bridge Sync API routes included")
+except Exception as e:
+    logger.error(f"❌ Failed to include Bridge Sync API routes: {e}")
+
 # Include SpecialPie timer management routes
 try:
     from src.impact_bridge.specialpie_api import router as specialpie_router
@@ -197,73 +197,34 @@ def get_logs(limit: int = 100):
     logs = fetch_logs(limit)
     return JSONResponse(content=logs)
 
+SHOT_LOG_QUERY = """
+    SELECT 
+        log_id,
+        record_type,
+        event_time,
+        device_id,
+        event_type,
+        current_shot,
+        split_seconds,
+        string_total_time,
+        sensor_mac,
+        impact_magnitude
+    FROM shot_log 
+    ORDER BY ts_ns DESC 
+    LIMIT ?
+"""
+
 @app.get("/api/shot-log")
-def get_shot_log(limit: int = 100):
+async def get_shot_log(limit: int = 100, db: DatabaseAccess = Depends(get_runtime_db)):
     """Get combined timer events and sensor impacts from shot_log database view"""
     try:
-        import sqlite3
-        from pathlib import Path
-
-        # Determine capture DB path candidates and prefer an explicit env var
-        project_root = Path(__file__).parent.parent.parent
-        candidates = []
-        env_db = os.environ.get('CAPTURE_DB_PATH')
-        if env_db:
-            candidates.append(Path(env_db))
-        # Preferred project location
-            # Preferred canonical location inside the project and explicit override via env var.
-            candidates.append(project_root / 'db' / 'leadville_runtime.db')
-            # Also allow explicit override via CAPTURE_DB_PATH environment variable (checked above).
-        
-            # Legacy locations removed
-
-        db_path = None
-        # Try candidates in order and log what we check
-        for candidate in candidates:
-            try:
-                exists = candidate.exists()
-            except Exception as e:
-                exists = False
-                logger.debug(f"Error checking path {candidate}: {e}")
-            logger.info(f"Checking capture DB candidate: {candidate} exists={exists}")
-            if exists:
-                db_path = candidate
-                break
-
-        if db_path is None:
-            logger.warning(f"No capture DB found among candidates: {candidates}")
+        # Capture DB: CAPTURE_DB_PATH or <project>/db/leadville_runtime.db
+        if not db.path.exists():
+            logger.warning(f"No capture DB found at {db.path}")
             return JSONResponse(content={"error": "Database not found", "logs": []}, status_code=404)
 
-        # Log basic file info for diagnostics
-        try:
-            st = db_path.stat()
-            logger.info(f"Using capture DB: {db_path} size={st.st_size} mtime={st.st_mtime}")
-        except Exception:
-            logger.info(f"Using capture DB: {db_path} (stat unavailable)")
-
-        # Open database connection (read-only is fine for API reads)
-        conn = sqlite3.connect(str(db_path))
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT 
-                log_id,
-                record_type,
-                event_time,
-                device_id,
-                event_type,
-                current_shot,
-                split_seconds,
-                string_total_time,
-                sensor_mac,
-                impact_magnitude
-            FROM shot_log 
-            ORDER BY ts_ns DESC 
-            LIMIT ?
-        """, (limit,))
-
-        rows = cursor.fetchall()
-        conn.close()
+        # Read-only pooled connection, off the event loop
+        rows = await db.fetchall(SHOT_LOG_QUERY, (limit,))
 
         # Convert to list of dictionaries
         logs = []
@@ -396,13 +357,22 @@ def switch_network_mode(request: NetworkRequest):
                 status_code=500
             )
 
+async def _database_counters(db: DatabaseAccess):
+    """Row counters from the maintained stats table (None if unavailable)"""
+    try:
+        return await db.read(read_stats)
+    except Exception as e:
+        logger.warning(f"Database counters unavailable: {e}")
+        return None
+
 @app.get("/api/admin/system")
-def get_system_stats():
+async def get_system_stats(db: DatabaseAccess = Depends(get_leadville_db)):
     """Get system monitoring statistics"""
     try:
         from src.impact_bridge.system_monitor import SystemMonitor
         monitor = SystemMonitor()
-        stats = monitor.get_system_stats()
+        stats = await run_in_threadpool(monitor.get_system_stats)
+        stats['database'] = await _database_counters(db)
         return JSONResponse(content=stats)
     except Exception as e:
         return JSONResponse(
@@ -456,6 +426,43 @@ async def restart_bridge_service():
             status_code=500
         )
 
+@app.post("/api/admin/flight-recorder/dump")
+def request_flight_recorder_dump(reason: str = "api"):
+    """Ask the running bridge to dump its flight recorder (picked up within ~1s)"""
+    from src.impact_bridge.flight_recorder import request_dump
+    try:
+        request = request_dump(project_root / "logs" / "flight_recorder", reason)
+        return JSONResponse(content={
+            "status": "dump_requested",
+            "request_file": str(request),
+            "timestamp": datetime.now().isoformat()
+        })
+    except OSError as e:
+        return JSONResponse(
+            content={"error": f"Failed to request flight recorder dump: {str(e)}"},
+            status_code=500
+        )
+
+@app.get("/api/admin/flight-recorder/dumps")
+def list_flight_recorder_dumps(limit: int = 20):
+    """Most recent flight recorder dumps written by the bridge"""
+    dump_dir = project_root / "logs" / "flight_recorder"
+    dumps = sorted(dump_dir.glob("flight_*.ndjson"), reverse=True)[:limit] if dump_dir.exists() else []
+    return JSONResponse(content={
+        "dumps": [{"name": p.name, "size_bytes": p.stat().st_size,
+                   "modified": datetime.fromtimestamp(p.stat().st_mtime).isoformat()} for p in dumps]
+    })
+
+@app.get("/api/admin/stream-health")
+def get_stream_health():
+    """Per-sensor notification stream health from the bridge's watchdog"""
+    from src.impact_bridge.stream_watchdog import read_status
+    status = read_status(project_root / "logs")
+    if status is None:
+        return JSONResponse(content={"error": "No stream health published (bridge not running or watchdog disabled)"},
+                            status_code=404)
+    return JSONResponse(content=status)
+
 @app.get("/api/admin/ble")
 def get_ble_quality():
     """Get BLE connection quality and status"""
@@ -993,91 +1000,158 @@ def get_node_info():
             status_code=500
         )
 
-@app.get("/api/admin/bridge/config")
-async def get_bridge_config():
-    """Get the current bridge device configuration from database"""
+def _load_config_graph(session) -> Dict[str, Any]:
+    """Load leagues, stages, targets, sensors and bridge assignments in one pass"""
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.orm import joinedload
+    from src.impact_bridge.database.models import League, StageConfig, Sensor
+    from src.impact_bridge.device_manager import device_manager
+    
+    leagues = {
+        league.id: {
+            "id": league.id,
+            "name": league.name,
+            "abbreviation": league.abbreviation,
+            "description": league.description
+        }
+        for league in session.query(League).all()
+    }
+    
+    # Sensors assigned to target configs, keyed by target config
+    sensor_by_target_config = {
+        sensor.target_config_id: {
+            "id": sensor.id,
+            "hw_addr": sensor.hw_addr,
+            "label": sensor.label,
+            "last_seen": sensor.last_seen.isoformat() if sensor.last_seen else None,
+            "battery": sensor.battery,
+            "rssi": sensor.rssi
+        }
+        for sensor in session.query(Sensor).filter(Sensor.target_config_id.isnot(None)).all()
+    }
+    
+    stages = {}
+    stages_by_league: Dict[int, List[int]] = {}
+    for stage in session.query(StageConfig).options(joinedload(StageConfig.target_configs)).all():
+        stages[stage.id] = {
+            "id": stage.id,
+            "name": stage.name,
+            "description": stage.description,
+            "league_id": stage.league_id,
+            "targets": [
+                {
+                    "id": target.id,
+                    "target_number": target.target_number,
+                    "shape": target.shape,
+                    "type": target.type,
+                    "category": target.category,
+                    "distance_feet": target.distance_feet,
+                    "offset_feet": target.offset_feet,
+                    "height_feet": target.height_feet,
+                    "sensor": sensor_by_target_config.get(target.id)
+                }
+                for target in sorted(stage.target_configs, key=lambda t: t.target_number)
+            ]
+        }
+        stages_by_league.setdefault(stage.league_id, []).append(stage.id)
+    
+    bridges: Dict[int, Dict[str, Any]] = {}
     try:
-        # Get bridge configuration from database
-        with get_db_connection() as conn:
-            cursor = conn.execute("""
-                SELECT bc.bridge_id, bc.stage_config_id, bc.timer_address,
-                       sc.name as stage_name
-                FROM bridge_configurations bc
-                LEFT JOIN stage_configs sc ON bc.stage_config_id = sc.id
-                WHERE bc.bridge_id = 1
-            """)
-            bridge_config = cursor.fetchone()
-            
-            if not bridge_config:
-                return JSONResponse(
-                    content={"error": "Bridge configuration not found"},
-                    status_code=404
-                )
-            
-            # Get target assignments
-            cursor = conn.execute("""
-                SELECT target_number, sensor_address, sensor_label
-                FROM bridge_target_assignments
-                WHERE bridge_id = 1
-                ORDER BY target_number
-            """)
-            target_assignments = cursor.fetchall()
-        
-        # Get paired device information for status
-        from src.impact_bridge.device_manager import device_manager
-        paired_devices = device_manager.get_paired_devices()
-        device_lookup = {device['address']: device for device in paired_devices}
-        
-        # Build timer response
-        timer_address = bridge_config['timer_address']
-        timer_info = {
-            "address": timer_address,
-            "status": "configured" if timer_address else "not_configured",
-            "device_info": device_lookup.get(timer_address) if timer_address else None
+        for row in session.execute(text("""
+            SELECT bc.bridge_id, bc.stage_config_id, bc.timer_address,
+                   sc.name as stage_name
+            FROM bridge_configurations bc
+            LEFT JOIN stage_configs sc ON bc.stage_config_id = sc.id
+        """)).mappings():
+            bridges[row['bridge_id']] = dict(row, assignments=[])
+        for row in session.execute(text("""
+            SELECT bridge_id, target_number, sensor_address, sensor_label
+            FROM bridge_target_assignments
+            ORDER BY bridge_id, target_number
+        """)).mappings():
+            if row['bridge_id'] in bridges:
+                bridges[row['bridge_id']]['assignments'].append(dict(row))
+    except OperationalError as e:
+        logger.warning(f"Bridge configuration tables unavailable: {e}")
+    
+    return {
+        "leagues": leagues,
+        "stages": stages,
+        "stages_by_league": stages_by_league,
+        "bridges": bridges,
+        # Paired device information for status
+        "paired_devices": device_manager.get_paired_devices(),
+    }
+
+async def _load_config_snapshot():
+    db = await get_leadville_db()
+    return await db.read_orm(_load_config_graph)
+
+config_snapshot = ConfigSnapshot(_load_config_snapshot)
+
+@app.middleware("http")
+async def invalidate_config_snapshot(request: Request, call_next):
+    """Any successful write through the admin API starts a new config version"""
+    response = await call_next(request)
+    if (request.method in ("POST", "PUT", "PATCH", "DELETE")
+            and request.url.path.startswith("/api/admin/") and response.status_code < 400):
+        config_snapshot.invalidate(f"{request.method} {request.url.path}")
+    return response
+
+def _render_bridge_config(graph, bridge_id: int = 1):
+    bridge_config = graph["bridges"].get(bridge_id)
+    if not bridge_config:
+        return 404, {"error": "Bridge configuration not found"}
+    
+    device_lookup = {device['address']: device for device in graph["paired_devices"]}
+    
+    # Build timer response
+    timer_address = bridge_config['timer_address']
+    timer_info = {
+        "address": timer_address,
+        "status": "configured" if timer_address else "not_configured",
+        "device_info": device_lookup.get(timer_address) if timer_address else None
+    }
+    
+    # Build sensors response with target assignments
+    sensors = []
+    targets = {}
+    
+    for assignment in bridge_config['assignments']:
+        sensor_addr = assignment['sensor_address']
+        target_num = assignment['target_number']
+        
+        sensor_info = {
+            "address": sensor_addr,
+            "label": assignment['sensor_label'],
+            "target_number": target_num,
+            "device_info": device_lookup.get(sensor_addr),
+            "status": "paired" if sensor_addr in device_lookup else "not_paired"
         }
-        
-        # Build sensors response with target assignments
-        sensors = []
-        targets = {}
-        
-        for assignment in target_assignments:
-            sensor_addr = assignment['sensor_address']
-            target_num = assignment['target_number']
-            
-            sensor_info = {
-                "address": sensor_addr,
-                "label": assignment['sensor_label'],
-                "target_number": target_num,
-                "device_info": device_lookup.get(sensor_addr),
-                "status": "paired" if sensor_addr in device_lookup else "not_paired"
-            }
-            sensors.append(sensor_info)
-            targets[f"target_{target_num}"] = sensor_info
-        
-        response = {
-            "bridge_id": bridge_config['bridge_id'],
-            "stage_config_id": bridge_config['stage_config_id'],
-            "stage_name": bridge_config['stage_name'],
-            "timer": timer_info,
-            "sensors": sensors,
-            "targets": targets,
-            "summary": {
-                "timer_configured": bool(timer_address),
-                "sensors_count": len(sensors),
-                "sensors_paired": len([s for s in sensors if s['status'] == 'paired']),
-                "targets_assigned": len(targets)
-            }
+        sensors.append(sensor_info)
+        targets[f"target_{target_num}"] = sensor_info
+    
+    return 200, {
+        "bridge_id": bridge_config['bridge_id'],
+        "stage_config_id": bridge_config['stage_config_id'],
+        "stage_name": bridge_config['stage_name'],
+        "timer": timer_info,
+        "sensors": sensors,
+        "targets": targets,
+        "summary": {
+            "timer_configured": bool(timer_address),
+            "sensors_count": len(sensors),
+            "sensors_paired": len([s for s in sensors if s['status'] == 'paired']),
+            "targets_assigned": len(targets)
         }
-        
-        return JSONResponse(content=response)
-        
-    except Exception as e:
-        logger.error(f"Failed to get bridge config: {e}")
-        return JSONResponse(
-            content={"error": f"Failed to get bridge config: {str(e)}"},
-            status_code=500
-        )
-        
+    }
+
+@app.get("/api/admin/bridge/config")
+async def get_bridge_config(request: Request):
+    """Get the current bridge device configuration (cached snapshot, ETag)"""
+    try:
+        return await config_snapshot.respond(request, "bridge_config:1", _render_bridge_config)
     except Exception as e:
         logger.error(f"Failed to get bridge config: {e}")
         return JSONResponse(
@@ -1086,7 +1160,7 @@ async def get_bridge_config():
         )
 
 @app.put("/api/admin/bridge/config")
-async def update_bridge_config(request: dict):
+async def update_bridge_config(request: dict, db: DatabaseAccess = Depends(get_leadville_db)):
     """Update the bridge device configuration in database and JSON file"""
     try:
         import json
@@ -1105,46 +1179,24 @@ async def update_bridge_config(request: dict):
         
         bridge_id = 1  # Default bridge ID
         
-        # Update database with transaction
-        with get_db_connection() as conn:
-            conn.execute("BEGIN TRANSACTION")
+        # Update database in one writer transaction
+        def _apply(conn):
+            # Update bridge configuration (timer)
+            conn.execute("""
+                INSERT OR REPLACE INTO bridge_configurations 
+                (bridge_id, stage_config_id, timer_address)
+                VALUES (?, COALESCE((SELECT stage_config_id FROM bridge_configurations WHERE bridge_id = ?), 1), ?)
+            """, (bridge_id, bridge_id, timer))
             
-            try:
-                # Update bridge configuration (timer)
-                conn.execute("""
-                    INSERT OR REPLACE INTO bridge_configurations 
-                    (bridge_id, stage_config_id, timer_address)
-                    VALUES (?, COALESCE((SELECT stage_config_id FROM bridge_configurations WHERE bridge_id = ?), 1), ?)
-                """, (bridge_id, bridge_id, timer))
-                
-                # Clear existing target assignments
-                conn.execute("DELETE FROM bridge_target_assignments WHERE bridge_id = ?", (bridge_id,))
-                
-                # Insert new target assignments
-                if targets:
-                    # Using targets dictionary (new format)
-                    for target_num_str, sensor_addr in targets.items():
-                        if sensor_addr:  # Only assign if not null/empty
-                            target_num = int(target_num_str)
-                            
-                            # Get sensor label from device pool
-                            cursor = conn.execute(
-                                "SELECT label FROM device_pool WHERE hw_addr = ?",
-                                (sensor_addr,)
-                            )
-                            device_row = cursor.fetchone()
-                            sensor_label = device_row['label'] if device_row else f"Sensor {sensor_addr[-4:]}"
-                            
-                            conn.execute("""
-                                INSERT INTO bridge_target_assignments 
-                                (bridge_id, target_number, sensor_address, sensor_label)
-                                VALUES (?, ?, ?, ?)
-                            """, (bridge_id, target_num, sensor_addr, sensor_label))
-                            
-                elif sensors:
-                    # Using sensors list (legacy format) - assign to targets sequentially
-                    for i, sensor_addr in enumerate(sensors):
-                        target_num = i + 1
+            # Clear existing target assignments
+            conn.execute("DELETE FROM bridge_target_assignments WHERE bridge_id = ?", (bridge_id,))
+            
+            # Insert new target assignments
+            if targets:
+                # Using targets dictionary (new format)
+                for target_num_str, sensor_addr in targets.items():
+                    if sensor_addr:  # Only assign if not null/empty
+                        target_num = int(target_num_str)
                         
                         # Get sensor label from device pool
                         cursor = conn.execute(
@@ -1159,12 +1211,27 @@ async def update_bridge_config(request: dict):
                             (bridge_id, target_number, sensor_address, sensor_label)
                             VALUES (?, ?, ?, ?)
                         """, (bridge_id, target_num, sensor_addr, sensor_label))
-                
-                conn.execute("COMMIT")
-                
-            except Exception as e:
-                conn.execute("ROLLBACK")
-                raise e
+                        
+            elif sensors:
+                # Using sensors list (legacy format) - assign to targets sequentially
+                for i, sensor_addr in enumerate(sensors):
+                    target_num = i + 1
+                    
+                    # Get sensor label from device pool
+                    cursor = conn.execute(
+                        "SELECT label FROM device_pool WHERE hw_addr = ?",
+                        (sensor_addr,)
+                    )
+                    device_row = cursor.fetchone()
+                    sensor_label = device_row['label'] if device_row else f"Sensor {sensor_addr[-4:]}"
+                    
+                    conn.execute("""
+                        INSERT INTO bridge_target_assignments 
+                        (bridge_id, target_number, sensor_address, sensor_label)
+                        VALUES (?, ?, ?, ?)
+                    """, (bridge_id, target_num, sensor_addr, sensor_label))
+        
+        await db.write(_apply)
         
         # Dual-write: Update JSON file for boot sequence
         await _update_json_config_from_db(bridge_id)
@@ -1189,7 +1256,8 @@ async def update_bridge_config(request: dict):
         )
 
 @app.put("/api/admin/bridge/target/{target_number}/assign")
-async def assign_device_to_target(target_number: str, request: dict):
+async def assign_device_to_target(target_number: str, request: dict,
+                                  db: DatabaseAccess = Depends(get_leadville_db)):
     """Assign a device to a specific target (for drag-and-drop)"""
     try:
         device_address = request.get("device_address")
@@ -1220,19 +1288,16 @@ async def assign_device_to_target(target_number: str, request: dict):
                     status_code=400
                 )
         
-        with get_db_connection() as conn:
+        # Look up the device and apply the assignment in one writer transaction
+        def _apply(conn):
             # Get device label from device pool
             cursor = conn.execute(
                 "SELECT label, device_type FROM device_pool WHERE hw_addr = ?",
                 (device_address,)
             )
             device_row = cursor.fetchone()
-            
             if not device_row:
-                return JSONResponse(
-                    content={"error": f"Device {device_address} not found in device pool"},
-                    status_code=404
-                )
+                return None
             
             device_label = device_row['label']
             device_type = device_row['device_type']
@@ -1245,28 +1310,7 @@ async def assign_device_to_target(target_number: str, request: dict):
                     (bridge_id, stage_config_id, timer_address)
                     VALUES (?, COALESCE((SELECT stage_config_id FROM bridge_configurations WHERE bridge_id = ?), 1), ?)
                 """, (bridge_id, bridge_id, device_address))
-                
-                conn.commit()
-                await _update_json_config_from_db(bridge_id)
-                
-                return JSONResponse({
-                    "status": "success",
-                    "message": f"{device_label} assigned as bridge timer",
-                    "assignment": {
-                        "device_address": device_address,
-                        "device_label": device_label,
-                        "target": "timer",
-                        "bridge_id": bridge_id
-                    }
-                })
-            else:
-                # Handle sensor assignment to target
-                if target_num is None:
-                    return JSONResponse(
-                        content={"error": "target_number required for sensor assignment"},
-                        status_code=400
-                    )
-                
+            elif target_num is not None:
                 # Remove any existing assignment for this sensor (ensure 1:1 mapping)
                 conn.execute(
                     "DELETE FROM bridge_target_assignments WHERE bridge_id = ? AND sensor_address = ?",
@@ -1285,21 +1329,51 @@ async def assign_device_to_target(target_number: str, request: dict):
                     (bridge_id, target_number, sensor_address, sensor_label)
                     VALUES (?, ?, ?, ?)
                 """, (bridge_id, target_num, device_address, device_label))
+            return device_label, device_type
+        
+        device = await db.write(_apply)
+        if device is None:
+            return JSONResponse(
+                content={"error": f"Device {device_address} not found in device pool"},
+                status_code=404
+            )
+        device_label, device_type = device
+        
+        # Handle timer assignment (special case)
+        if is_timer_assignment or device_type == 'timer':
+            await _update_json_config_from_db(bridge_id)
             
-                conn.commit()
-                await _update_json_config_from_db(bridge_id)
-                
-                return JSONResponse(content={
-                    "status": "success",
-                    "message": f"{device_label} assigned to Target {target_num}",
-                    "assignment": {
-                        "device_address": device_address,
-                        "device_label": device_label,
-                        "device_type": device_type,
-                        "target_number": target_num,
-                        "bridge_id": bridge_id
-                    }
-                })
+            return JSONResponse({
+                "status": "success",
+                "message": f"{device_label} assigned as bridge timer",
+                "assignment": {
+                    "device_address": device_address,
+                    "device_label": device_label,
+                    "target": "timer",
+                    "bridge_id": bridge_id
+                }
+            })
+        
+        # Handle sensor assignment to target
+        if target_num is None:
+            return JSONResponse(
+                content={"error": "target_number required for sensor assignment"},
+                status_code=400
+            )
+        
+        await _update_json_config_from_db(bridge_id)
+        
+        return JSONResponse(content={
+            "status": "success",
+            "message": f"{device_label} assigned to Target {target_num}",
+            "assignment": {
+                "device_address": device_address,
+                "device_label": device_label,
+                "device_type": device_type,
+                "target_number": target_num,
+                "bridge_id": bridge_id
+            }
+        })
         
     except Exception as e:
         logger.error(f"Failed to assign device: {e}")
@@ -1308,29 +1382,199 @@ async def assign_device_to_target(target_number: str, request: dict):
             status_code=500
         )
 
+def _plan_bulk_assignments(conn, bridge_id: int, stage_config_id, timer_given: bool, timer, targets: dict):
+    """Validate a complete stage mapping; returns (plan, errors).
+    
+    Everything is checked against one consistent view of the database before
+    anything is written, so a bad entry rejects the whole mapping.
+    """
+    errors = []
+    current = conn.execute(
+        "SELECT stage_config_id, timer_address FROM bridge_configurations WHERE bridge_id = ?",
+        (bridge_id,)
+    ).fetchone()
+    
+    stage_id = stage_config_id or (current['stage_config_id'] if current else None)
+    stage = None
+    if stage_id is not None:
+        stage = conn.execute("SELECT id, name FROM stage_configs WHERE id = ?", (stage_id,)).fetchone()
+        if not stage:
+            errors.append(f"Stage config {stage_id} not found")
+    stage_targets = set()
+    if stage:
+        stage_targets = {row['target_number'] for row in conn.execute(
+            "SELECT target_number FROM target_configs WHERE stage_config_id = ?", (stage_id,)
+        )}
+    
+    # Resolve every device in one query
+    wanted = {addr.upper() for addr in targets.values() if addr}
+    if timer_given and timer:
+        wanted.add(timer.upper())
+    devices = {}
+    if wanted:
+        placeholders = ",".join("?" * len(wanted))
+        for row in conn.execute(
+            f"SELECT hw_addr, label, device_type FROM device_pool WHERE UPPER(hw_addr) IN ({placeholders})",
+            tuple(wanted)
+        ):
+            devices[row['hw_addr'].upper()] = row
+    
+    assignments = []
+    seen = {}
+    for target_key, address in targets.items():
+        try:
+            target_num = int(target_key)
+        except (TypeError, ValueError):
+            errors.append(f"Target '{target_key}' is not a target number")
+            continue
+        if target_num < 1 or (stage_targets and target_num not in stage_targets):
+            errors.append(f"Target {target_num} does not exist in stage {stage_id}")
+            continue
+        if not address:
+            continue  # Explicitly empty target
+        device = devices.get(address.upper())
+        if not device:
+            errors.append(f"Target {target_num}: device {address} not found in device pool")
+            continue
+        if device['device_type'] == 'timer':
+            errors.append(f"Target {target_num}: {device['label']} is a timer, not a sensor")
+            continue
+        if address.upper() in seen:
+            errors.append(f"Device {address} assigned to both Target {seen[address.upper()]} and Target {target_num}")
+            continue
+        seen[address.upper()] = target_num
+        assignments.append((target_num, device['hw_addr'], device['label']))
+    
+    timer_address = current['timer_address'] if current else None
+    if timer_given:
+        timer_address = None
+        if timer:
+            device = devices.get(timer.upper())
+            if not device:
+                errors.append(f"Timer {timer} not found in device pool")
+            elif device['device_type'] != 'timer':
+                errors.append(f"{device['label']} is not a timer")
+            else:
+                timer_address = device['hw_addr']
+    
+    if stage_id is None and not errors:
+        errors.append("stage_config_id is required (bridge has no stage yet)")
+    
+    assignments.sort()
+    return {
+        "stage_id": stage_id,
+        "stage_name": stage['name'] if stage else None,
+        "timer_address": timer_address,
+        "assignments": assignments,
+    }, errors
+
+@app.put("/api/admin/bridge/assignments")
+async def bulk_assign_bridge(request: dict, db: DatabaseAccess = Depends(get_leadville_db)):
+    """Replace a bridge's stage, timer and complete target->sensor mapping at once
+    
+    Body: {"bridge_id": 1, "stage_config_id": 3, "timer": "60:09:...",
+           "targets": {"1": "EA:18:...", "2": "DB:10:...", ...}}
+    Targets missing from the mapping end up unassigned; "timer" and
+    "stage_config_id" keep their current values when omitted. The mapping is
+    validated as a whole and applied in one transaction, followed by a single
+    JSON config rewrite (which the running bridge picks up).
+    """
+    try:
+        bridge_id = request.get("bridge_id", 1)
+        stage_config_id = request.get("stage_config_id")
+        targets = request.get("targets", {})
+        timer_given = "timer" in request
+        timer = request.get("timer")
+        
+        if not isinstance(targets, dict):
+            return JSONResponse(
+                content={"error": "targets must be an object of target number -> device address"},
+                status_code=400
+            )
+        
+        def _apply(conn):
+            plan, errors = _plan_bulk_assignments(conn, bridge_id, stage_config_id, timer_given, timer, targets)
+            if errors:
+                return plan, errors
+            conn.execute("""
+                INSERT OR REPLACE INTO bridge_configurations 
+                (bridge_id, stage_config_id, timer_address)
+                VALUES (?, ?, ?)
+            """, (bridge_id, plan["stage_id"], plan["timer_address"]))
+            conn.execute("UPDATE bridges SET current_stage_id = ? WHERE id = ?", (plan["stage_id"], bridge_id))
+            # Like assign_bridge_to_stage: sensors on this stage's targets belong to this bridge
+            plan["sensors_updated"] = conn.execute("""
+                UPDATE sensors SET bridge_id = ?
+                WHERE target_config_id IN (SELECT id FROM target_configs WHERE stage_config_id = ?)
+            """, (bridge_id, plan["stage_id"])).rowcount
+            conn.execute("DELETE FROM bridge_target_assignments WHERE bridge_id = ?", (bridge_id,))
+            conn.executemany("""
+                INSERT INTO bridge_target_assignments 
+                (bridge_id, target_number, sensor_address, sensor_label)
+                VALUES (?, ?, ?, ?)
+            """, [(bridge_id, target_num, address, label) for target_num, address, label in plan["assignments"]])
+            return plan, errors
+        
+        plan, errors = await db.write(_apply)
+        if errors:
+            return JSONResponse(
+                content={"error": "Invalid assignments - nothing was changed", "details": errors},
+                status_code=400
+            )
+        
+        await _update_json_config_from_db(bridge_id)
+        
+        logger.info(f"Bulk assigned bridge {bridge_id}: stage {plan['stage_id']}, "
+                    f"timer {plan['timer_address']}, {len(plan['assignments'])} targets")
+        
+        return JSONResponse(content={
+            "status": "success",
+            "message": f"{len(plan['assignments'])} targets assigned for {plan['stage_name']}",
+            "bridge_id": bridge_id,
+            "stage": {
+                "stage_config_id": plan["stage_id"],
+                "stage_name": plan["stage_name"]
+            },
+            "timer": plan["timer_address"],
+            "assignments": [
+                {"target_number": target_num, "device_address": address, "device_label": label}
+                for target_num, address, label in plan["assignments"]
+            ],
+            "sensors_updated": plan["sensors_updated"]
+        })
+        
+    except Exception as e:
+        logger.error(f"Failed to bulk assign bridge: {e}")
+        return JSONResponse(
+            content={"error": f"Failed to bulk assign bridge: {str(e)}"},
+            status_code=500
+        )
+
 @app.delete("/api/admin/bridge/target/{target_number}/unassign")
-async def unassign_target(target_number: int, bridge_id: int = 1):
+async def unassign_target(target_number: int, bridge_id: int = 1,
+                          db: DatabaseAccess = Depends(get_leadville_db)):
     """Remove sensor assignment from a target"""
     try:
-        with get_db_connection() as conn:
+        def _apply(conn):
             cursor = conn.execute(
                 "SELECT sensor_address, sensor_label FROM bridge_target_assignments WHERE bridge_id = ? AND target_number = ?",
                 (bridge_id, target_number)
             )
             assignment = cursor.fetchone()
-            
-            if not assignment:
-                return JSONResponse(
-                    content={"error": f"No assignment found for Target {target_number}"},
-                    status_code=404
+            if assignment:
+                # Remove the assignment
+                conn.execute(
+                    "DELETE FROM bridge_target_assignments WHERE bridge_id = ? AND target_number = ?",
+                    (bridge_id, target_number)
                 )
-            
-            # Remove the assignment
-            conn.execute(
-                "DELETE FROM bridge_target_assignments WHERE bridge_id = ? AND target_number = ?",
-                (bridge_id, target_number)
+            return assignment
+        
+        assignment = await db.write(_apply)
+        if not assignment:
+            return JSONResponse(
+                content={"error": f"No assignment found for Target {target_number}"},
+                status_code=404
             )
-            conn.commit()
         
         # Update JSON config
         await _update_json_config_from_db(bridge_id)
@@ -1355,33 +1599,34 @@ async def unassign_target(target_number: int, bridge_id: int = 1):
         )
 
 @app.delete("/api/admin/bridge/timer/unassign")
-async def unassign_timer(request: dict):
+async def unassign_timer(request: dict, db: DatabaseAccess = Depends(get_leadville_db)):
     """Remove timer assignment from bridge"""
     try:
         bridge_id = request.get("bridge_id", 1)
         
-        with get_db_connection() as conn:
+        def _apply(conn):
             # Get current timer assignment
             cursor = conn.execute(
                 "SELECT timer_address FROM bridge_configurations WHERE bridge_id = ?",
                 (bridge_id,)
             )
             config = cursor.fetchone()
-            
             if not config or not config['timer_address']:
-                return JSONResponse(
-                    content={"message": "No timer currently assigned"},
-                    status_code=200
-                )
-            
-            timer_address = config['timer_address']
+                return None
             
             # Clear timer assignment
             conn.execute(
                 "UPDATE bridge_configurations SET timer_address = NULL WHERE bridge_id = ?",
                 (bridge_id,)
             )
-            conn.commit()
+            return config['timer_address']
+        
+        timer_address = await db.write(_apply)
+        if not timer_address:
+            return JSONResponse(
+                content={"message": "No timer currently assigned"},
+                status_code=200
+            )
         
         # Update JSON config
         await _update_json_config_from_db(bridge_id)
@@ -1402,31 +1647,32 @@ async def unassign_timer(request: dict):
         )
 
 @app.delete("/api/admin/bridge/sensors/unassign_all")
-async def unassign_all_sensors(request: dict):
+async def unassign_all_sensors(request: dict, db: DatabaseAccess = Depends(get_leadville_db)):
     """Remove all sensor assignments from bridge"""
     try:
         bridge_id = request.get("bridge_id", 1)
         
-        with get_db_connection() as conn:
+        def _apply(conn):
             # Get current sensor assignments
             cursor = conn.execute(
                 "SELECT sensor_address, sensor_label, target_number FROM bridge_target_assignments WHERE bridge_id = ?",
                 (bridge_id,)
             )
             assignments = cursor.fetchall()
-            
-            if not assignments:
-                return JSONResponse(
-                    content={"message": "No sensors currently assigned"},
-                    status_code=200
+            if assignments:
+                # Clear all sensor assignments
+                conn.execute(
+                    "DELETE FROM bridge_target_assignments WHERE bridge_id = ?",
+                    (bridge_id,)
                 )
-            
-            # Clear all sensor assignments
-            conn.execute(
-                "DELETE FROM bridge_target_assignments WHERE bridge_id = ?",
-                (bridge_id,)
+            return assignments
+        
+        assignments = await db.write(_apply)
+        if not assignments:
+            return JSONResponse(
+                content={"message": "No sensors currently assigned"},
+                status_code=200
             )
-            conn.commit()
         
         # Update JSON config
         await _update_json_config_from_db(bridge_id)
@@ -1452,7 +1698,7 @@ async def unassign_all_sensors(request: dict):
         )
 
 @app.put("/api/admin/bridge/stage")
-async def change_bridge_stage(request: dict):
+async def change_bridge_stage(request: dict, db: DatabaseAccess = Depends(get_leadville_db)):
     """Change bridge stage with optional assignment preservation"""
     try:
         stage_config_id = request.get("stage_config_id")
@@ -1465,19 +1711,15 @@ async def change_bridge_stage(request: dict):
                 status_code=400
             )
         
-        with get_db_connection() as conn:
+        def _apply(conn):
             # Verify stage exists
             cursor = conn.execute(
                 "SELECT name FROM stage_configs WHERE id = ?",
                 (stage_config_id,)
             )
             stage = cursor.fetchone()
-            
             if not stage:
-                return JSONResponse(
-                    content={"error": f"Stage config {stage_config_id} not found"},
-                    status_code=404
-                )
+                return None
             
             # Conditionally clear assignments based on parameter
             if not preserve_assignments:
@@ -1488,7 +1730,6 @@ async def change_bridge_stage(request: dict):
                     (bridge_id, stage_config_id, timer_address)
                     VALUES (?, ?, NULL)
                 """, (bridge_id, stage_config_id))
-                log_msg = f"Changed bridge {bridge_id} to stage {stage_config_id} ({stage['name']}) and cleared all assignments"
             else:
                 # Just update the stage, keep existing timer and assignments
                 conn.execute("""
@@ -1496,9 +1737,19 @@ async def change_bridge_stage(request: dict):
                     SET stage_config_id = ?
                     WHERE bridge_id = ?
                 """, (stage_config_id, bridge_id))
-                log_msg = f"Changed bridge {bridge_id} to stage {stage_config_id} ({stage['name']}) and preserved assignments"
-            
-            conn.commit()
+            return stage
+        
+        stage = await db.write(_apply)
+        if not stage:
+            return JSONResponse(
+                content={"error": f"Stage config {stage_config_id} not found"},
+                status_code=404
+            )
+        
+        if not preserve_assignments:
+            log_msg = f"Changed bridge {bridge_id} to stage {stage_config_id} ({stage['name']}) and cleared all assignments"
+        else:
+            log_msg = f"Changed bridge {bridge_id} to stage {stage_config_id} ({stage['name']}) and preserved assignments"
         
         # Update JSON config 
         await _update_json_config_from_db(bridge_id)
@@ -1566,70 +1817,37 @@ def get_leagues():
             status_code=500
         )
 
+def _render_league_stages(graph, league_id: int):
+    league = graph["leagues"].get(league_id)
+    if not league:
+        return 404, {"error": "League not found"}
+    
+    stages = [graph["stages"][stage_id] for stage_id in graph["stages_by_league"].get(league_id, [])]
+    return 200, {
+        "league": {
+            "id": league["id"],
+            "name": league["name"],
+            "abbreviation": league["abbreviation"]
+        },
+        "stages": [
+            {
+                "id": stage["id"],
+                "name": stage["name"],
+                "description": stage["description"],
+                "target_count": len(stage["targets"]),
+                "targets": stage["targets"]
+            }
+            for stage in stages
+        ]
+    }
+
 @app.get("/api/admin/leagues/{league_id}/stages")
-def get_league_stages(league_id: int):
-    """Get all stage configurations for a league"""
+async def get_league_stages(league_id: int, request: Request):
+    """Get all stage configurations for a league (cached snapshot, ETag)"""
     try:
-        from .database.models import League, StageConfig, TargetConfig, Sensor
-        from .database.database import get_database_session
-        from sqlalchemy.orm import joinedload
-        
-        with get_database_session() as session:
-            league = session.query(League).filter_by(id=league_id).first()
-            
-            if not league:
-                return JSONResponse(
-                    content={"error": "League not found"},
-                    status_code=404
-                )
-            
-            stages = session.query(StageConfig).options(
-                joinedload(StageConfig.target_configs)
-            ).filter_by(league_id=league_id).all()
-            
-            # Get all sensors assigned to target configs
-            assigned_sensors = session.query(Sensor).filter(
-                Sensor.target_config_id.isnot(None)
-            ).all()
-            sensor_by_target_config = {sensor.target_config_id: sensor for sensor in assigned_sensors}
-            
-            return JSONResponse(content={
-                "league": {
-                    "id": league.id,
-                    "name": league.name,
-                    "abbreviation": league.abbreviation
-                },
-                "stages": [
-                    {
-                        "id": stage.id,
-                        "name": stage.name,
-                        "description": stage.description,
-                        "target_count": len(stage.target_configs),
-                        "targets": [
-                            {
-                                "id": target.id,
-                                "target_number": target.target_number,
-                                "shape": target.shape,
-                                "type": target.type,
-                                "category": target.category,
-                                "distance_feet": target.distance_feet,
-                                "offset_feet": target.offset_feet,
-                                "height_feet": target.height_feet,
-                                "sensor": {
-                                    "id": sensor_by_target_config[target.id].id,
-                                    "hw_addr": sensor_by_target_config[target.id].hw_addr,
-                                    "label": sensor_by_target_config[target.id].label,
-                                    "last_seen": sensor_by_target_config[target.id].last_seen.isoformat() if sensor_by_target_config[target.id].last_seen else None,
-                                    "battery": sensor_by_target_config[target.id].battery,
-                                    "rssi": sensor_by_target_config[target.id].rssi
-                                } if target.id in sensor_by_target_config else None
-                            }
-                            for target in sorted(stage.target_configs, key=lambda t: t.target_number)
-                        ]
-                    }
-                    for stage in stages
-                ]
-            })
+        return await config_snapshot.respond(
+            request, f"league_stages:{league_id}",
+            lambda graph: _render_league_stages(graph, league_id))
     except Exception as e:
         logger.error(f"Failed to get league stages: {e}")
         return JSONResponse(
@@ -1637,68 +1855,33 @@ def get_league_stages(league_id: int):
             status_code=500
         )
 
+def _render_stage_details(graph, stage_id: int):
+    stage = graph["stages"].get(stage_id)
+    if not stage:
+        return 404, {"error": "Stage not found"}
+    
+    league = graph["leagues"][stage["league_id"]]
+    return 200, {
+        "stage": {
+            "id": stage["id"],
+            "name": stage["name"],
+            "description": stage["description"],
+            "league": {
+                "id": league["id"],
+                "name": league["name"],
+                "abbreviation": league["abbreviation"]
+            },
+            "targets": stage["targets"]
+        }
+    }
+
 @app.get("/api/admin/stages/{stage_id}")
-def get_stage_details(stage_id: int):
-    """Get detailed stage configuration including target layout"""
+async def get_stage_details(stage_id: int, request: Request):
+    """Get detailed stage configuration including target layout (cached snapshot, ETag)"""
     try:
-        from .database.models import StageConfig, TargetConfig, Sensor
-        from .database.database import get_database_session
-        from sqlalchemy.orm import joinedload
-        
-        with get_database_session() as session:
-            stage = session.query(StageConfig).options(
-                joinedload(StageConfig.target_configs),
-                joinedload(StageConfig.league)
-            ).filter_by(id=stage_id).first()
-            
-            if not stage:
-                return JSONResponse(
-                    content={"error": "Stage not found"},
-                    status_code=404
-                )
-            
-            # Get target config IDs for this stage
-            target_config_ids = [target.id for target in stage.target_configs]
-            
-            # Get sensors assigned to any target in this stage
-            assigned_sensors = session.query(Sensor).filter(
-                Sensor.target_config_id.in_(target_config_ids)
-            ).all()
-            sensor_assignments = {sensor.target_config_id: sensor for sensor in assigned_sensors}
-            
-            return JSONResponse(content={
-            "stage": {
-                "id": stage.id,
-                "name": stage.name,
-                "description": stage.description,
-                "league": {
-                    "id": stage.league.id,
-                    "name": stage.league.name,
-                    "abbreviation": stage.league.abbreviation
-                },
-                "targets": [
-                    {
-                        "id": target.id,
-                        "target_number": target.target_number,
-                        "shape": target.shape,
-                        "type": target.type,
-                        "category": target.category,
-                        "distance_feet": target.distance_feet,
-                        "offset_feet": target.offset_feet,
-                        "height_feet": target.height_feet,
-                        "sensor": {
-                            "id": sensor_assignments[target.id].id,
-                            "hw_addr": sensor_assignments[target.id].hw_addr,
-                            "label": sensor_assignments[target.id].label,
-                            "last_seen": sensor_assignments[target.id].last_seen.isoformat() if sensor_assignments[target.id].last_seen else None,
-                            "battery": sensor_assignments[target.id].battery,
-                            "rssi": sensor_assignments[target.id].rssi
-                        } if target.id in sensor_assignments else None
-                    }
-                    for target in sorted(stage.target_configs, key=lambda t: t.target_number)
-                ]
-            }
-        })
+        return await config_snapshot.respond(
+            request, f"stage:{stage_id}",
+            lambda graph: _render_stage_details(graph, stage_id))
     except Exception as e:
         logger.error(f"Failed to get stage details: {e}")
         return JSONResponse(
@@ -2167,58 +2350,26 @@ def parse_log_entry(line: str, source_file: str) -> Dict[str, Any]:
         return None
 
 @app.get("/api/health/detailed")
-def get_detailed_health():
+async def get_detailed_health(db: DatabaseAccess = Depends(get_leadville_db)):
     """Get comprehensive health status including system monitoring"""
     try:
         from src.impact_bridge.system_monitor import SystemMonitor
         monitor = SystemMonitor()
         
-        health_data = {
-            'timestamp': datetime.now().isoformat(),
-            'status': 'healthy',
-            'version': '2.0.0',
-            'system': monitor.get_system_stats(),
-            'services': monitor.get_service_health(),
-            'ble': monitor.get_ble_quality(),
-            'network_interfaces': monitor.get_network_interfaces()
-        }
-        
-        # Determine overall health status
-        cpu_usage = health_data['system']['cpu']['usage_percent']
-        memory_usage = health_data['system']['memory']['percent']
-        disk_usage = health_data['system']['disk']['percent']
-        
-        if cpu_usage > 90 or memory_usage > 95 or disk_usage > 95:
-            health_data['status'] = 'critical'
-        elif cpu_usage > 70 or memory_usage > 85 or disk_usage > 85:
-            health_data['status'] = 'warning'
-        
-        return JSONResponse(content=health_data)
-    except Exception as e:
-        return JSONResponse(
-            content={
-                'timestamp': datetime.now().isoformat(),
-                'status': 'error',
-                'error': f'Health check failed: {str(e)}'
-            },
-            status_code=500
-        )
-
-@app.get("/api/health/detailed")
-def get_detailed_health():
-    """Get comprehensive health status including system monitoring"""
-    try:
-        from src.impact_bridge.system_monitor import SystemMonitor
-        monitor = SystemMonitor()
+        def _collect():
+            return {
+                'system': monitor.get_system_stats(),
+                'services': monitor.get_service_health(),
+                'ble': monitor.get_ble_quality(),
+                'network_interfaces': monitor.get_network_interfaces()
+            }
         
         health_data = {
             'timestamp': datetime.now().isoformat(),
             'status': 'healthy',
             'version': '2.0.0',
-            'system': monitor.get_system_stats(),
-            'services': monitor.get_service_health(),
-            'ble': monitor.get_ble_quality(),
-            'network_interfaces': monitor.get_network_interfaces()
+            **(await run_in_threadpool(_collect)),
+            'database': await _database_counters(db)
         }
         
         # Determine overall health status
@@ -2242,6 +2393,27 @@ def get_detailed_health():
             status_code=500
         )
 
+# Multi-bridge match timeline (set up on startup when MQTT is available)
+match_aggregator = None
+
+# Periodic stats counter reconciliation (started on startup, cancelled on shutdown)
+stats_reconciler_task = None
+
+@app.get("/api/match/events")
+async def get_match_events(since: int = 0, limit: int = 500):
+    """Merged, clock-corrected timer/impact/run events from all bridges"""
+    if match_aggregator is None:
+        return JSONResponse(content={'error': 'Match aggregator not running'}, status_code=503)
+    events = match_aggregator.events(since=since, limit=min(limit, 5000))
+    return {'events': events, 'last_index': events[-1]['index'] if events else since}
+
+@app.get("/api/match/aggregator")
+async def get_match_aggregator_status():
+    """Per-bridge clock offsets and merge statistics"""
+    if match_aggregator is None:
+        return JSONResponse(content={'error': 'Match aggregator not running'}, status_code=503)
+    return match_aggregator.stats()
+
 # Setup authentication routes
 try:
     from src.impact_bridge.auth.api import create_auth_routes
@@ -2250,9 +2422,29 @@ try:
 except ImportError as e:
     print(f"⚠️  Authentication not available: {e}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush buffered pool events and close pooled database connections"""
+    if match_aggregator is not None:
+        match_aggregator.stop()
+    if stats_reconciler_task is not None:
+        stats_reconciler_task.cancel()
+    try:
+        from src.impact_bridge.pool_api import flush_pool_events
+        await flush_pool_events()
+    except Exception as e:
+        logger.error(f"Failed to flush pool events: {e}")
+    close_databases()
+
+def _setup_backend_logging():
+    """Queue-listener logging, however the app was started (uvicorn, start script, __main__)"""
+    from src.impact_bridge.log_setup import setup_logging
+    return setup_logging('backend', log_dir=project_root / 'logs' / 'console')
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
+    _setup_backend_logging()
     try:
         # Initialize database
         try:
@@ -2275,6 +2467,10 @@ async def startup_event():
         from src.impact_bridge.event_streamer import event_streamer
         await event_streamer.start_periodic_tasks()
         
+        # Correct any drift in the maintained row counters
+        global stats_reconciler_task
+        stats_reconciler_task = asyncio.create_task(run_stats_reconciler(await get_leadville_db()))
+        
         # Try to setup MQTT integration
         try:
             from src.impact_bridge.mqtt_client import LeadVilleMQTT
@@ -2282,6 +2478,11 @@ async def startup_event():
             if await mqtt_client.connect():
                 event_streamer.setup_mqtt_integration(mqtt_client)
                 logger.info("MQTT integration enabled for event streaming")
+                
+                from src.impact_bridge.match_aggregator import MatchAggregator
+                global match_aggregator
+                match_aggregator = MatchAggregator(mqtt_client)
+                match_aggregator.start()
             else:
                 logger.warning("MQTT connection failed, event streaming will work without MQTT")
         except Exception as e:
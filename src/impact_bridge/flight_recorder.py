@@ -0,0 +1,246 @@
+"""In-memory flight recorder for post-mortem debugging.
+
+Keeps the last N seconds of raw BLE notifications, parsed samples, detector
+state transitions and correlator decisions per device in preallocated
+fixed-size binary records, so recording costs one ``struct.pack_into`` and
+nothing is formatted or written in steady state. ``trigger(reason)`` snapshots
+all rings and writes an NDJSON dump in a background thread; triggers are
+coalesced so a burst of anomalies (e.g. a disconnect storm) produces one dump.
+
+Record layout (``RECORD.size`` bytes)::
+
+    ts_ns  int64   wall clock
+    kind   uint8   KIND_* below
+    length uint8   valid payload bytes
+    flags  uint16  FLAG_CONTINUED when a raw payload spans several records
+    payload        PAYLOAD_SIZE bytes (raw bytes, 4 x float32, or UTF-8 text)
+
+Other processes (the API backend) request a dump with ``request_dump()``,
+which drops a request file the bridge picks up in ``check_requests()``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import struct
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+KIND_RAW = 1        # Raw notification bytes
+KIND_SAMPLE = 2     # Parsed sample: corrected x/y/z and magnitude (g)
+KIND_DETECTOR = 3   # Detector state transition ("event detail")
+KIND_CORRELATOR = 4 # Correlator decision ("event detail")
+KIND_MARK = 5       # Connection state and other markers
+
+KIND_NAMES = {
+    KIND_RAW: 'raw',
+    KIND_SAMPLE: 'sample',
+    KIND_DETECTOR: 'detector',
+    KIND_CORRELATOR: 'correlator',
+    KIND_MARK: 'mark',
+}
+
+FLAG_CONTINUED = 0x1
+
+PAYLOAD_SIZE = 52
+RECORD = struct.Struct(f"=qBBH{PAYLOAD_SIZE}s")
+_HEADER = struct.Struct("=qBBH")
+_SAMPLE = struct.Struct("=4f")
+
+REQUEST_FILE = 'dump.request'
+
+
+class DeviceRing:
+    """Fixed-capacity ring of binary records for one device"""
+
+    __slots__ = ('device', 'capacity', '_buf', '_next', 'total')
+
+    def __init__(self, device: str, capacity: int) -> None:
+        self.device = device
+        self.capacity = capacity
+        self._buf = bytearray(capacity * RECORD.size)
+        self._next = 0
+        self.total = 0
+
+    def append(self, ts_ns: int, kind: int, payload: bytes, flags: int = 0) -> None:
+        RECORD.pack_into(self._buf, self._next * RECORD.size, ts_ns, kind, len(payload), flags, payload)
+        self._next = (self._next + 1) % self.capacity
+        self.total += 1
+
+    def append_sample(self, ts_ns: int, x: float, y: float, z: float, magnitude: float) -> None:
+        offset = self._next * RECORD.size
+        _HEADER.pack_into(self._buf, offset, ts_ns, KIND_SAMPLE, _SAMPLE.size, 0)
+        _SAMPLE.pack_into(self._buf, offset + _HEADER.size, x, y, z, magnitude)
+        self._next = (self._next + 1) % self.capacity
+        self.total += 1
+
+    def snapshot(self) -> Tuple[bytes, int]:
+        """(records oldest first, count)"""
+        count = min(self.total, self.capacity)
+        if self.total <= self.capacity:
+            return bytes(self._buf[:self._next * RECORD.size]), count
+        split = self._next * RECORD.size
+        return bytes(self._buf[split:]) + bytes(self._buf[:split]), count
+
+
+def iter_records(data: bytes) -> Iterator[Dict[str, Any]]:
+    """Decode a ring snapshot into dicts, joining continued raw payloads"""
+    pending: Optional[Dict[str, Any]] = None
+    for ts_ns, kind, length, flags, payload in RECORD.iter_unpack(data):
+        payload = payload[:length]
+        if kind == KIND_RAW:
+            if pending is not None:
+                pending['_bytes'] += payload
+            else:
+                pending = {'ts_ns': ts_ns, 'kind': 'raw', '_bytes': payload}
+            if not flags & FLAG_CONTINUED:
+                pending['hex'] = pending.pop('_bytes').hex()
+                yield pending
+                pending = None
+            continue
+        record: Dict[str, Any] = {'ts_ns': ts_ns, 'kind': KIND_NAMES.get(kind, str(kind))}
+        if kind == KIND_SAMPLE:
+            x, y, z, magnitude = _SAMPLE.unpack(payload)
+            record.update(x=round(x, 4), y=round(y, 4), z=round(z, 4), magnitude=round(magnitude, 4))
+        else:
+            event, _, detail = payload.decode('utf-8', 'replace').partition(' ')
+            record['event'] = event
+            if detail:
+                record['detail'] = detail
+        yield record
+
+
+class FlightRecorder:
+    """Per-device rings of recent debug records, dumped on anomalies"""
+
+    def __init__(self, dump_dir: Path, seconds: float = 30.0, records_per_second: int = 200,
+                 min_dump_interval: float = 10.0) -> None:
+        self.dump_dir = Path(dump_dir)
+        self.seconds = seconds
+        self.capacity = max(16, int(seconds * records_per_second))
+        self.min_dump_interval = min_dump_interval
+        self._rings: Dict[str, DeviceRing] = {}
+        self._lock = threading.Lock()  # Serializes dump writers
+        self._last_dump = 0.0
+        self.dumps = 0
+        self.coalesced = 0
+        self.last_dump_path: Optional[Path] = None
+
+    def ring(self, device: str) -> DeviceRing:
+        ring = self._rings.get(device)
+        if ring is None:
+            ring = self._rings[device] = DeviceRing(device, self.capacity)
+        return ring
+
+    # Recording (hot path) ------------------------------------------------
+
+    def record_raw(self, device: str, data: bytes, ts_ns: Optional[int] = None) -> None:
+        """Raw notification bytes (split over several records when long)"""
+        ring = self.ring(device)
+        stamp = time.time_ns() if ts_ns is None else ts_ns
+        if len(data) <= PAYLOAD_SIZE:
+            ring.append(stamp, KIND_RAW, data)
+            return
+        last = len(data) - PAYLOAD_SIZE
+        for start in range(0, len(data), PAYLOAD_SIZE):
+            ring.append(stamp, KIND_RAW, data[start:start + PAYLOAD_SIZE],
+                        FLAG_CONTINUED if start < last else 0)
+
+    def record_block(self, block) -> None:
+        """Sample pipeline consumer: parsed, baseline-corrected samples"""
+        ring = self.ring(block.sensor_mac)
+        magnitude = block.magnitude().tolist()
+        for ts_ns, (x, y, z), mag in zip(block.ts_ns.tolist(), block.values.tolist(), magnitude):
+            ring.append_sample(ts_ns, x, y, z, mag)
+
+    def record_event(self, device: str, kind: int, event: str, detail: str = '') -> None:
+        """Detector transition, correlator decision or marker (``event`` is one word)"""
+        text = f"{event} {detail}" if detail else event
+        self.ring(device).append(time.time_ns(), kind, text.encode('utf-8')[:PAYLOAD_SIZE])
+
+    # Dumping -------------------------------------------------------------
+
+    def trigger(self, reason: str, device: Optional[str] = None) -> bool:
+        """Dump all rings in the background; returns False if coalesced"""
+        now = time.monotonic()
+        if self._last_dump and now - self._last_dump < self.min_dump_interval:
+            self.coalesced += 1
+            return False
+        self._last_dump = now
+        snapshot = self._snapshot()
+        threading.Thread(target=self._write_dump, args=(reason, device, snapshot),
+                         name='flight-recorder-dump', daemon=True).start()
+        return True
+
+    def dump(self, reason: str, device: Optional[str] = None) -> Path:
+        """Synchronous dump (tests, shutdown)"""
+        self._last_dump = time.monotonic()
+        return self._write_dump(reason, device, self._snapshot())
+
+    def _snapshot(self) -> List[Tuple[str, bytes, int]]:
+        return [(name, *ring.snapshot()) for name, ring in list(self._rings.items())]
+
+    def _write_dump(self, reason: str, device: Optional[str],
+                    snapshot: List[Tuple[str, bytes, int]]) -> Path:
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        safe_reason = re.sub(r'[^A-Za-z0-9_-]', '_', reason)[:40]
+        path = self.dump_dir / f"flight_{stamp}_{safe_reason}.ndjson"
+        cutoff_ns = time.time_ns() - int(self.seconds * 1e9)
+        with self._lock:
+            try:
+                self.dump_dir.mkdir(parents=True, exist_ok=True)
+                with open(path, 'w', encoding='utf-8') as f:
+                    header = {'kind': 'dump', 'reason': reason, 'device': device,
+                              'seconds': self.seconds, 'created': datetime.now().isoformat(),
+                              'devices': {name: count for name, _, count in snapshot}}
+                    f.write(json.dumps(header) + '\n')
+                    for name, data, _ in snapshot:
+                        for record in iter_records(data):
+                            if record['ts_ns'] >= cutoff_ns:
+                                record['device'] = name
+                                f.write(json.dumps(record) + '\n')
+                self.dumps += 1
+                self.last_dump_path = path
+                logger.warning(f"Flight recorder dumped ({reason}): {path}")
+            except OSError as e:
+                logger.error(f"Flight recorder dump failed: {e}")
+        return path
+
+    def check_requests(self) -> bool:
+        """Dump if another process left a request file (see ``request_dump``)"""
+        request = self.dump_dir / REQUEST_FILE
+        if not request.exists():
+            return False
+        try:
+            reason = request.read_text(encoding='utf-8').strip() or 'api'
+            request.unlink()
+        except OSError:
+            return False
+        self._last_dump = 0.0  # Explicit requests are never coalesced
+        return self.trigger(reason)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'devices': {name: ring.total for name, ring in self._rings.items()},
+            'capacity_per_device': self.capacity,
+            'bytes': sum(len(ring._buf) for ring in self._rings.values()),
+            'dumps': self.dumps,
+            'coalesced': self.coalesced,
+            'last_dump': str(self.last_dump_path) if self.last_dump_path else None,
+        }
+
+
+def request_dump(dump_dir: Path, reason: str = 'api') -> Path:
+    """Ask the running bridge to dump its flight recorder"""
+    dump_dir = Path(dump_dir)
+    dump_dir.mkdir(parents=True, exist_ok=True)
+    request = dump_dir / REQUEST_FILE
+    request.write_text(reason, encoding='utf-8')
+    return request
@@ -27,37 +27,16 @@ import sqlite3
 from pathlib import Path
 
 # Setup dual logging - both to console and file
+from impact_bridge.log_setup import setup_logging, add_handler, LazyHex, LogSampler
+
 def setup_dual_logging():
-    """Setup logging to both console and dedicated log files"""
-    # Create logs directory if it doesn't exist
-    log_dir = Path(__file__).parent / 'logs' / 'console'
-    log_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Create console log file with timestamp
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    console_log_file = log_dir / f'bridge_console_{timestamp}.log'
-    
-    # Setup root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
+    """Setup logging to both console and dedicated log files.
     
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter('[%(asctime)s] %(levelname)s: %(message)s', datefmt='%H:%M:%S')
-    console_handler.setFormatter(console_formatter)
-    
-    # File handler for complete console log
-    file_handler = logging.FileHandler(console_log_file)
-    file_handler.setLevel(logging.INFO)
-    file_formatter = logging.Formatter('[%(asctime)s] %(levelname)s: %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
-    file_handler.setFormatter(file_formatter)
-    
-    # Add handlers to root logger
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
-    
-    return console_log_file
+    Handlers run on a background QueueListener; the console log rotates by
+    size and old files are gzipped in the background.
+    """
+    log_dir = Path(__file__).parent / 'logs' / 'console'
+    return setup_logging('bridge', log_dir=log_dir, level=logging.INFO)
 
 # Initialize dual logging
 console_log_path = setup_dual_logging()
@@ -69,10 +48,10 @@ try:
     # parse_5561 available to preserve existing behavior used throughout the
     # bridge. The verbose parser can persist parsed frames for analysis.
     try:
-        from impact_bridge.ble.wtvb_parse import scan_and_parse, parse_flag61_frame, parse_wtvb32_frame  # type: ignore
+        from impact_bridge.ble.wtvb_parse import parse_flag61_frame, parse_wtvb32_frame  # type: ignore
     except Exception:
         # If the ble package import style isn't available, try the flat import
-        from impact_bridge.wtvb_parse import scan_and_parse, parse_flag61_frame, parse_wtvb32_frame  # type: ignore
+        from impact_bridge.wtvb_parse import parse_flag61_frame, parse_wtvb32_frame  # type: ignore
 
     # Import the simple parser under the expected name so existing code keeps working
     try:
@@ -85,6 +64,7 @@ try:
     from impact_bridge.enhanced_impact_detection import EnhancedImpactDetector
     from impact_bridge.statistical_timing_calibration import statistical_calibrator
     from impact_bridge.dev_config import dev_config
+    from impact_bridge.sample_pipeline import decode_block, SampleDbLogger
     print("✓ Successfully imported all impact bridge components")
     COMPONENTS_AVAILABLE = True
 except Exception as e:
@@ -115,6 +95,8 @@ class LeadVilleBridge:
     
     def __init__(self):
         self.logger = logger
+        # At most one line per high-frequency key (BT50 notifications) every 5s
+        self.log_sampler = LogSampler(self.logger, interval=5.0)
         
         # Initialize database for Bridge-assigned sensor lookups
         try:
@@ -152,6 +134,7 @@ class LeadVilleBridge:
         self.shot_counter = 0
         self.current_string_number = 1
         self.enhanced_impact_counter = 0
+        self._sample_db_logger = None
         
         # Initialize components if available
         if COMPONENTS_AVAILABLE:
@@ -251,9 +234,8 @@ class LeadVilleBridge:
         debug_handler.setFormatter(debug_formatter)
         
         # Add debug handler to root logger
-        root_logger = logging.getLogger()
-        root_logger.addHandler(debug_handler)
-        root_logger.setLevel(logging.DEBUG)
+        add_handler(debug_handler)
+        logging.getLogger().setLevel(logging.DEBUG)
         
         self.logger.info(f"Debug logging enabled: {debug_file}")
     
@@ -458,7 +440,7 @@ class LeadVilleBridge:
     async def amg_notification_handler(self, characteristic, data):
         """Handle AMG timer notifications with enhanced parsing"""
         hex_data = data.hex()
-        self.logger.debug(f"AMG notification: {hex_data}")
+        self.logger.debug("AMG notification: %s", hex_data)
         
         # Try to use the new sophisticated parser for rich data extraction
         try:
@@ -641,68 +623,53 @@ class LeadVilleBridge:
             return
             
         try:
-            # Persist verbose parsed frames for offline analysis if sample logging
-            # is enabled (this writes to db/leadville_runtime.db)
-            try:
-                write_db = False
-                if hasattr(self, 'dev_config') and self.dev_config:
-                    # dev_config may expose a sample logging toggle
-                    if hasattr(self.dev_config, 'is_sample_logging_enabled'):
-                        write_db = self.dev_config.is_sample_logging_enabled()
-                    elif hasattr(self.dev_config, 'should_log_all_samples'):
-                        write_db = self.dev_config.should_log_all_samples()
-
-                # scan_and_parse is non-blocking and quick; it will write rows when
-                # enabled. Wrap in its own try to avoid breaking detection on DB errors.
+            # Decode the notification once into a sample block and apply the
+            # baseline correction in place (scaled values like TinTown)
+            sensor_mac = self.bt50_client.address if self.bt50_client else "BT50"
+            self.log_sampler.debug("raw notification", "BT50 %s notification: %s", sensor_mac, LazyHex(data))
+            block = decode_block(sensor_mac, data)
+            if block is None:
+                return
+            block.apply_baseline((self.baseline_x, self.baseline_y, self.baseline_z))
+            
+            # Persist decoded frames for offline analysis if sample logging is
+            # enabled (one transaction per notification)
+            if self.dev_config and self.dev_config.is_sample_logging_enabled():
                 try:
-                    scan_and_parse(data, write_db=write_db)
+                    if self._sample_db_logger is None:
+                        self._sample_db_logger = SampleDbLogger()
+                    self._sample_db_logger(block)
                 except Exception as e:
-                    self.logger.debug(f"Verbose parser DB write failed: {e}")
-            except Exception:
-                # If verbose parser not available, ignore and continue
-                pass
-
-            # Parse sensor data using the simple parser (returns scaled vx/vy/vz)
-            result = parse_5561(data)
-            if not result or not result['samples']:
-                return
+                    self.log_sampler.debug("sample db write failed", "Sample DB write failed: %s", e)
             
-            # Apply baseline correction to samples using scaled values like TinTown
-            corrected_samples = []
-            for sample in result['samples']:
-                corrected_sample = sample.copy()
-                corrected_sample['vx_corrected'] = sample['vx'] - self.baseline_x
-                corrected_sample['vy_corrected'] = sample['vy'] - self.baseline_y  
-                corrected_sample['vz_corrected'] = sample['vz'] - self.baseline_z
-                corrected_samples.append(corrected_sample)
-                
             # Process samples for shot detection
             if self.shot_detector:
-                detected_shots = self.shot_detector.process_samples(corrected_samples)
+                detected_shots = self.shot_detector.process_samples(block.values[:, 0], block.ts_ns)
                 
                 for shot in detected_shots:
                     self.impact_counter += 1
+                    shot_time = datetime.fromtimestamp(shot.timestamp)
                     
                     # Calculate time from string start
                     time_from_start = 0.0
                     if self.start_beep_time:
-                        time_from_start = (shot.timestamp - self.start_beep_time).total_seconds()
+                        time_from_start = (shot_time - self.start_beep_time).total_seconds()
                     
                     # Calculate time from last shot
                     time_from_shot = 0.0
                     if self.previous_shot_time:
-                        time_from_shot = (shot.timestamp - self.previous_shot_time).total_seconds()
+                        time_from_shot = (shot_time - self.previous_shot_time).total_seconds()
                     
-                    self.logger.info(f"💥 String {self.current_string_number}, Impact #{self.impact_counter} - Time {time_from_start:.2f}s, Shot->Impact {time_from_shot:.3f}s, Peak {shot.peak_magnitude:.0f}g")
+                    self.logger.info(f"💥 String {self.current_string_number}, Impact #{self.impact_counter} - Time {time_from_start:.2f}s, Shot->Impact {time_from_shot:.3f}s, Peak {shot.max_deviation:.0f}g")
                     
-                    # Record impact for timing correlation
-                    if self.timing_calibrator:
-                        self.timing_calibrator.record_impact(shot.timestamp, shot.peak_magnitude)
+                    # Record impact for timing correlation (skip if method doesn't exist)
+                    if self.timing_calibrator and hasattr(self.timing_calibrator, 'record_impact'):
+                        self.timing_calibrator.record_impact(shot_time, shot.max_deviation)
             
             # Enhanced impact detection (if enabled)
             if self.enhanced_impact_detector:
                 enhanced_impacts = self.enhanced_impact_detector.process_samples(
-                    corrected_samples, 0  # baseline_x = 0 since we already corrected
+                    block.ts_ns, block.values, block.magnitude(), block.raw * block.scale
                 )
                 
                 for impact in enhanced_impacts:
@@ -722,7 +689,7 @@ class LeadVilleBridge:
                     self.logger.info(f"💥 String {self.current_string_number}, Enhanced Impact #{impact_number} - Time {time_from_start:.2f}s, Shot->Impact {time_from_shot:.3f}s, Peak {impact.peak_magnitude:.0f}g")
                     
         except Exception as e:
-            self.logger.error(f"BT50 processing failed: {e}")
+            self.log_sampler.log("bt50 processing failed", logging.ERROR, "BT50 processing failed: %s", e)
             
     async def reset_ble(self):
         """Reset BLE connections before starting"""
@@ -846,6 +813,7 @@ class LeadVilleBridge:
     async def cleanup(self):
         """Clean up connections and save data"""
         self.logger.info("Cleaning up connections...")
+        self.log_sampler.flush()
         
         # Save calibration data
         if self.timing_calibrator:
@@ -910,6 +878,7 @@ class LeadVilleBridge:
             # Main operation loop
             while self.running:
                 await asyncio.sleep(1.0)
+                self.log_sampler.tick()
                 
         except KeyboardInterrupt:
             print("\nStopping LeadVille Bridge...")
@@ -0,0 +1,230 @@
+"""Non-blocking stdlib logging shared by the bridge, backend and tools.
+
+``setup_logging()`` puts a single ``QueueHandler`` on the root logger; a
+``QueueListener`` thread owns the real handlers (console, size-rotated file,
+optional debug file). Callers only build the record and enqueue it, so slow
+terminals and SD cards never stall the event loop. Rotated console logs are
+gzip-compressed in a background thread.
+
+``LogSampler`` rate-limits high-frequency message keys ("parsed frame",
+"raw notification"): at most one line per key per interval is formatted and
+emitted, carrying the count of lines suppressed since the previous one;
+``tick()`` reports the suppressed count of keys that have gone quiet. Wrap
+raw payloads in ``LazyHex`` so sampled-out lines never hex-encode them.
+"""
+
+from __future__ import annotations
+
+import atexit
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+CONSOLE_FORMAT = '[%(asctime)s] %(levelname)s: %(message)s'
+CONSOLE_DATEFMT = '%H:%M:%S'
+FILE_DATEFMT = '%Y-%m-%d %H:%M:%S'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_log_file: Optional[Path] = None
+_lock = threading.Lock()
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Size-based rotation; rotated files are gzipped off the logging thread."""
+
+    def __init__(self, filename: os.PathLike, max_bytes: int = 10 * 1024 * 1024,
+                 backup_count: int = 5, compress: bool = True, encoding: str = 'utf-8') -> None:
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding)
+        self._compress_lock = threading.Lock()
+        if compress:
+            self.namer = lambda name: name + '.gz'
+            self.rotator = self._rotate_and_compress
+
+    def doRollover(self) -> None:
+        # Backups are shifted before the rotator runs: wait for the previous
+        # compression so its .gz is complete before it is renamed
+        with self._compress_lock:
+            super().doRollover()
+
+    def _rotate_and_compress(self, source: str, dest: str) -> None:
+        pending = dest[:-3] + '.pending'
+        os.replace(source, pending)
+        threading.Thread(target=self._compress, args=(pending, dest),
+                         name='log-compress', daemon=True).start()
+
+    def _compress(self, source: str, dest: str) -> None:
+        with self._compress_lock:
+            try:
+                with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(source)
+            except OSError as e:
+                sys.stderr.write(f"log compression failed for {source}: {e}\n")
+
+
+def setup_logging(name: str = 'bridge', log_dir: Optional[os.PathLike] = None,
+                  level: int = logging.INFO, console: bool = True,
+                  max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                  compress: bool = True) -> Optional[Path]:
+    """Route all logging through a queue to a background listener.
+
+    Args:
+        name: Prefix of the console log file (``<name>_console_<ts>.log``)
+        log_dir: Directory for the console log file; no file if None
+        level: Root logger level
+        console: Also write to stdout
+        max_bytes / backup_count: Size-based rotation of the file
+        compress: gzip rotated files in the background
+
+    Returns the console log file path. Calling it again is a no-op that
+    returns the existing path.
+    """
+    global _listener, _log_file
+    with _lock:
+        if _listener is not None:
+            return _log_file
+
+        handlers: List[logging.Handler] = []
+        if console:
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT, datefmt=CONSOLE_DATEFMT))
+            handlers.append(console_handler)
+        if log_dir is not None:
+            log_dir = Path(log_dir)
+            log_dir.mkdir(parents=True, exist_ok=True)
+            _log_file = log_dir / f"{name}_console_{time.strftime('%Y%m%d_%H%M%S')}.log"
+            file_handler = CompressingRotatingFileHandler(_log_file, max_bytes=max_bytes,
+                                                          backup_count=backup_count, compress=compress)
+            file_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT, datefmt=FILE_DATEFMT))
+            handlers.append(file_handler)
+        for handler in handlers:
+            handler.setLevel(level)
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        root.setLevel(level)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+        return _log_file
+
+
+def add_handler(handler: logging.Handler) -> None:
+    """Attach another handler (e.g. a debug file) to the background listener."""
+    if _listener is None:
+        logging.getLogger().addHandler(handler)
+        return
+    _listener.handlers = _listener.handlers + (handler,)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+class LazyHex:
+    """``bytes.hex()`` as a log argument, converted only if the line is formatted"""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+    def __str__(self) -> str:
+        return self.data.hex()
+
+
+class LogSampler:
+    """Rate-limit high-frequency log lines per key.
+
+    ``log(key, level, msg, *args)`` emits at most one record per key every
+    ``interval`` seconds; the message is only formatted when it is emitted
+    and carries the number of lines suppressed since the previous one.
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = 5.0,
+                 intervals: Optional[Dict[str, float]] = None) -> None:
+        self.logger = logger
+        self.interval = interval
+        self.intervals = dict(intervals or {})  # Per-key overrides
+        self._last: Dict[str, float] = {}
+        self._suppressed: Dict[str, int] = {}
+        self.emitted = 0
+        self.total_suppressed = 0
+
+    def log(self, key: str, level: int, msg: str, *args: Any) -> bool:
+        """Log ``msg % args`` unless ``key`` was logged within its interval"""
+        if not self.logger.isEnabledFor(level):
+            return False
+        now = time.monotonic()
+        last = self._last.get(key)
+        if last is not None and now - last < self.intervals.get(key, self.interval):
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            self.total_suppressed += 1
+            return False
+        self._last[key] = now
+        suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            self.logger.log(level, msg + " (+%d similar in %.1fs)", *args, suppressed,
+                            now - last)
+        else:
+            self.logger.log(level, msg, *args)
+        self.emitted += 1
+        return True
+
+    def info(self, key: str, msg: str, *args: Any) -> bool:
+        return self.log(key, logging.INFO, msg, *args)
+
+    def debug(self, key: str, msg: str, *args: Any) -> bool:
+        return self.log(key, logging.DEBUG, msg, *args)
+
+    def tick(self) -> int:
+        """Summarize keys whose suppressed lines are at least one interval old.
+
+        Call periodically: a key that went quiet would otherwise only report
+        its count with its next line or on ``flush()``. Returns the number of
+        summaries written.
+        """
+        now = time.monotonic()
+        written = 0
+        for key, count in list(self._suppressed.items()):
+            last = self._last[key]
+            if now - last < self.intervals.get(key, self.interval):
+                continue
+            del self._suppressed[key]
+            self._last[key] = now
+            self.logger.info("%s: %d lines suppressed in %.1fs", key, count, now - last)
+            written += 1
+        return written
+
+    def flush(self) -> None:
+        """Emit a summary line for every key with suppressed lines"""
+        for key, count in list(self._suppressed.items()):
+            self.logger.info("%s: %d lines suppressed", key, count)
+        self._suppressed.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'emitted': self.emitted,
+            'suppressed': self.total_suppressed,
+            'pending': dict(self._suppressed),
+        }
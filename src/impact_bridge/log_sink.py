@@ -0,0 +1,257 @@
+"""Buffered, asynchronous log sink for NDJSON/CSV log files.
+
+Callers hand records to a ``LogStream``; they are appended to an in-memory
+buffer and a background thread serializes and writes them in group commits
+(when ``max_batch`` records are pending or every ``flush_interval`` seconds),
+with one ``write()`` + ``flush()`` per file per commit. Date-based rotation is
+resolved by the writer thread once per commit, so the hot path is a deque
+append. Records are owned by the sink once written and must not be mutated
+afterwards.
+
+JSON encoding uses ``orjson`` when installed (``pip install orjson``) and the
+stdlib encoder otherwise. ``close()`` (also registered with ``atexit``) drains
+the buffer before returning.
+"""
+
+from __future__ import annotations
+
+import atexit
+import csv
+import io
+import json
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+_json_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str)
+
+try:
+    import orjson
+
+    def dumps(record: Any) -> str:
+        """Compact JSON for one record (orjson, stdlib fallback for odd types)"""
+        try:
+            return orjson.dumps(record, default=str).decode("utf-8")
+        except TypeError:
+            return _json_encoder.encode(record)
+
+    JSON_ENCODER = "orjson"
+except ImportError:  # pragma: no cover - depends on environment
+    dumps = _json_encoder.encode
+    JSON_ENCODER = "json"
+
+_JSON = 0
+_CSV = 1
+_CLOSE = 2
+
+
+class LogStream:
+    """One output file of a sink; the path may change with the date (rotation)."""
+
+    def __init__(self, sink: BufferedLogSink, path_for_date: Callable[[str], Path],
+                 header: Optional[Sequence[str]] = None) -> None:
+        self.sink = sink
+        self.path_for_date = path_for_date
+        self.header = header  # CSV header written to new/empty files
+        # Writer-thread state
+        self._path: Optional[Path] = None
+        self._file: Optional[TextIO] = None
+
+    def write_record(self, record: Dict[str, Any]) -> None:
+        """Queue a JSON record (one NDJSON line)"""
+        self.sink._append(self, _JSON, record)
+
+    def write_row(self, row: Sequence[Any]) -> None:
+        """Queue a CSV row"""
+        self.sink._append(self, _CSV, row)
+
+    def close(self) -> None:
+        """Flush queued records and close the file"""
+        self.sink._append(self, _CLOSE, None, force=True)
+        self.sink.flush()
+
+    # Writer thread only -------------------------------------------------
+
+    def _ensure_open(self, date: str) -> TextIO:
+        path = self.path_for_date(date)
+        if self._file is None or path != self._path:
+            if self._file is not None:
+                self._file.close()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = path.open("a", encoding="utf-8", newline="")
+            self._path = path
+            if self.header and self._file.tell() == 0:
+                self._file.write(_format_csv(self.header))
+        return self._file
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._path = None
+
+
+def _format_csv(row: Sequence[Any]) -> str:
+    out = io.StringIO()
+    csv.writer(out).writerow(row)
+    return out.getvalue()
+
+
+class BufferedLogSink:
+    """In-memory record buffer drained by a background writer thread."""
+
+    def __init__(self, flush_interval: float = 0.5, max_batch: int = 500,
+                 max_buffer: int = 50_000, name: str = "log-sink") -> None:
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_buffer = max_buffer
+
+        self._buffer: Deque[Tuple[LogStream, int, Any]] = deque()
+        self._streams: List[LogStream] = []
+        self._cond = threading.Condition()
+        self._flush_requested = 0
+        self._flushed = 0
+        self._closed = False
+
+        self.records_written = 0
+        self.records_dropped = 0
+        self.commits = 0
+        self.max_commit_ms = 0.0
+        self.write_errors = 0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def stream(self, path_for_date: Callable[[str], Path],
+               header: Optional[Sequence[str]] = None) -> LogStream:
+        stream = LogStream(self, path_for_date, header)
+        self._streams.append(stream)
+        return stream
+
+    def _append(self, stream: LogStream, kind: int, payload: Any, force: bool = False) -> None:
+        if self._closed and not force:
+            return
+        if len(self._buffer) >= self.max_buffer and not force:
+            self.records_dropped += 1
+            return
+        self._buffer.append((stream, kind, payload))
+        if len(self._buffer) >= self.max_batch:
+            with self._cond:
+                self._cond.notify()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is written"""
+        if not self._thread.is_alive():
+            self._drain()
+            return True
+        with self._cond:
+            self._flush_requested += 1
+            target = self._flush_requested
+            self._cond.notify()
+            return self._cond.wait_for(lambda: self._flushed >= target, timeout)
+
+    def close(self) -> None:
+        """Drain the buffer, close all files and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        with self._cond:
+            self._cond.notify()
+        self._thread.join(timeout=10.0)
+        self._drain()
+
+    def stats(self) -> Dict[str, Any]:
+        buffered = len(self._buffer)
+        return {
+            "buffered": buffered,
+            "capacity": self.max_buffer,
+            "fill_pct": round(100.0 * buffered / self.max_buffer, 1),
+            "written": self.records_written,
+            "dropped": self.records_dropped,
+            "commits": self.commits,
+            "max_commit_ms": round(self.max_commit_ms, 2),
+            "write_errors": self.write_errors,
+            "encoder": JSON_ENCODER,
+        }
+
+    # Writer thread ------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed and len(self._buffer) < self.max_batch \
+                        and self._flushed >= self._flush_requested:
+                    self._cond.wait(self.flush_interval)
+                target = self._flush_requested
+            self._drain()
+            with self._cond:
+                self._flushed = max(self._flushed, target)
+                self._cond.notify_all()
+            if self._closed and not self._buffer:
+                break
+        self._close_all()
+
+    def _drain(self) -> None:
+        """Group commit: serialize and write everything currently buffered"""
+        buffer = self._buffer
+        if not buffer:
+            return
+        start = time.perf_counter()
+        date = datetime.now().strftime("%Y%m%d")
+        groups: Dict[LogStream, List[str]] = {}
+        closing: List[LogStream] = []
+        count = 0
+        for _ in range(len(buffer)):
+            stream, kind, payload = buffer.popleft()
+            if kind == _CLOSE:
+                closing.append(stream)
+                continue
+            lines = groups.get(stream)
+            if lines is None:
+                lines = groups[stream] = []
+            lines.append(dumps(payload) + "\n" if kind == _JSON else _format_csv(payload))
+            count += 1
+
+        for stream, lines in groups.items():
+            try:
+                f = stream._ensure_open(date)
+                f.write("".join(lines))
+                f.flush()
+            except Exception as e:
+                self.write_errors += 1
+                logger.error(f"Log sink write to {stream._path} failed: {e}")
+        for stream in closing:
+            stream._close_file()
+            if stream in self._streams:
+                self._streams.remove(stream)
+
+        self.records_written += count
+        self.commits += 1
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms > self.max_commit_ms:
+            self.max_commit_ms = elapsed_ms
+
+    def _close_all(self) -> None:
+        self._drain()
+        for stream in self._streams:
+            stream._close_file()
+
+
+_default_sink: Optional[BufferedLogSink] = None
+_default_lock = threading.Lock()
+
+
+def get_default_sink() -> BufferedLogSink:
+    """Process-wide sink shared by the NDJSON/CSV loggers"""
+    global _default_sink
+    with _default_lock:
+        if _default_sink is None or _default_sink._closed:
+            _default_sink = BufferedLogSink()
+        return _default_sink
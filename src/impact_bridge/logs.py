@@ -1,18 +1,25 @@
-"""NDJSON logging with sequence numbers and rotation."""
+"""NDJSON logging with sequence numbers and rotation.
+
+Records are handed to a ``BufferedLogSink`` (see ``log_sink``): the caller
+only builds the record dict, serialization, writes and daily rotation happen
+in the sink's background thread.
+"""
 
 from __future__ import annotations
 
-import json
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional, TextIO, Union
+from typing import Any, Dict, Optional, Union
+
+from .log_sink import BufferedLogSink, get_default_sink
 
 
 class NdjsonLogger:
     """Thread-safe NDJSON logger with automatic rotation and sequence numbers."""
     
-    def __init__(self, log_dir: str, file_prefix: str = "bridge") -> None:
+    def __init__(self, log_dir: str, file_prefix: str = "bridge",
+                 sink: Optional[BufferedLogSink] = None) -> None:
         self.log_dir = Path(log_dir)
         self.file_prefix = file_prefix
         self.mode = "regular"  # regular or verbose
@@ -23,12 +30,13 @@ class NdjsonLogger:
         
         # State tracking
         self._seq = 0
-        self._current_file: Optional[TextIO] = None
-        self._current_date: Optional[str] = None
         self._start_time_ns = time.monotonic_ns()
         
-        # Open initial log file
-        self._rotate_if_needed()
+        # Daily file, rotated by the sink's writer thread
+        self._sink = sink or get_default_sink()
+        self._stream = self._sink.stream(
+            lambda date: self.log_dir / f"{self.file_prefix}_{date}.ndjson"
+        )
     
     def log(
         self,
@@ -39,8 +47,6 @@ class NdjsonLogger:
         data: Optional[Dict[str, Any]] = None,
     ) -> None:
         """Log a structured message to NDJSON."""
-        self._rotate_if_needed()
-        
         # Filter debug messages based on mode and whitelist
         if msg_type == "debug" and self.mode == "regular":
             if msg not in self.verbose_whitelist:
@@ -71,11 +77,9 @@ class NdjsonLogger:
         # Add human-readable timestamp
         record["hms"] = datetime.now().strftime("%H:%M:%S.%f")[:-3]
         
-        # Write to file
-        if self._current_file:
-            json.dump(record, self._current_file, separators=(",", ":"), ensure_ascii=False)
-            self._current_file.write("\n")
-            self._current_file.flush()
+        # Queue for the background writer
+        if self._stream:
+            self._stream.write_record(record)
     
     def event(
         self,
@@ -111,27 +115,19 @@ class NdjsonLogger:
         """Log a debug message (subject to filtering)."""
         self.log("debug", msg, data=data)
     
-    def close(self) -> None:
-        """Close the current log file."""
-        if self._current_file:
-            self._current_file.close()
-            self._current_file = None
+    def flush(self) -> None:
+        """Block until queued records are on disk."""
+        self._sink.flush()
     
-    def _rotate_if_needed(self) -> None:
-        """Rotate log file if date has changed."""
-        current_date = datetime.now().strftime("%Y%m%d")
-        
-        if self._current_date != current_date:
-            # Close existing file
-            if self._current_file:
-                self._current_file.close()
-            
-            # Open new file for current date
-            log_filename = f"{self.file_prefix}_{current_date}.ndjson"
-            log_path = self.log_dir / log_filename
-            
-            self._current_file = log_path.open("a", encoding="utf-8", buffering=1)
-            self._current_date = current_date
+    def buffer_stats(self) -> Dict[str, Any]:
+        """Fill level and write statistics of the underlying sink."""
+        return self._sink.stats()
+    
+    def close(self) -> None:
+        """Flush and close the current log file."""
+        if self._stream:
+            self._stream.close()
+            self._stream = None
     
     def __enter__(self) -> NdjsonLogger:
         return self
@@ -143,19 +139,18 @@ class NdjsonLogger:
 class DualNdjsonLogger(NdjsonLogger):
     """Extended logger that writes to both main and debug files."""
     
-    def __init__(self, log_dir: str, debug_dir: str, file_prefix: str = "bridge") -> None:
-        super().__init__(log_dir, file_prefix)
+    def __init__(self, log_dir: str, debug_dir: str, file_prefix: str = "bridge",
+                 sink: Optional[BufferedLogSink] = None) -> None:
+        super().__init__(log_dir, file_prefix, sink=sink)
         
         self.debug_dir = Path(debug_dir)
         self.debug_dir.mkdir(parents=True, exist_ok=True)
         
-        self._debug_file: Optional[TextIO] = None
         self._debug_session = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # Open debug file
-        debug_filename = f"{file_prefix}_debug_{self._debug_session}.ndjson"
-        debug_path = self.debug_dir / debug_filename
-        self._debug_file = debug_path.open("a", encoding="utf-8", buffering=1)
+        # One debug file per session
+        debug_path = self.debug_dir / f"{file_prefix}_debug_{self._debug_session}.ndjson"
+        self._debug_stream = self._sink.stream(lambda date: debug_path)
     
     def log(
         self,
@@ -167,7 +162,7 @@ class DualNdjsonLogger(NdjsonLogger):
     ) -> None:
         """Log to both main and debug files."""
         # Always write to debug file
-        if self._debug_file:
+        if self._debug_stream:
             self._seq += 1
             now_ns = time.monotonic_ns()
             ts_ms = (now_ns - self._start_time_ns) / 1_000_000
@@ -187,9 +182,7 @@ class DualNdjsonLogger(NdjsonLogger):
             if data is not None:
                 debug_record["data"] = data
             
-            json.dump(debug_record, self._debug_file, separators=(",", ":"), ensure_ascii=False)
-            self._debug_file.write("\n")
-            self._debug_file.flush()
+            self._debug_stream.write_record(debug_record)
         
         # Write to main file (with filtering)
         # Decrement seq since parent will increment it
@@ -199,6 +192,6 @@ class DualNdjsonLogger(NdjsonLogger):
     def close(self) -> None:
         """Close both main and debug files."""
         super().close()
-        if self._debug_file:
-            self._debug_file.close()
-            self._debug_file = None
\ No newline at end of file
+        if self._debug_stream:
+            self._debug_stream.close()
+            self._debug_stream = None
\ No newline at end of file
@@ -0,0 +1,435 @@
+"""
+Match-level event aggregation across bridges
+
+Each bridge correlates only its own AMG timer and sensors. At a multi-bay
+match every bridge publishes its timer, impact and run events through a
+``MatchEventPublisher`` on ``bridge/{bridge_id}/{kind}``, stamped with its own
+wall clock and a per-bridge sequence number. A central ``MatchAggregator``
+(the head node's backend) subscribes to all bridges and
+
+- estimates each bridge's clock offset with NTP-style exchanges: it
+  publishes ``aggregator/sync`` with its send time t0, the bridge answers on
+  ``bridge/{id}/sync`` with its receive/send times t1/t2, and the reply is
+  timestamped t3 on arrival. ``offset = ((t1 - t0) + (t2 - t3)) / 2``; the
+  sample with the smallest round trip among the last few wins, since queueing
+  delay only ever adds to it.
+- merges the per-bridge streams into one globally ordered log with a k-way
+  heap merge (one heap entry per bridge with pending events). Impacts are
+  stamped with their onset time and published after detection, so a
+  bridge's own stream may be out of order by up to ``lateness_ms``. An
+  event is released once every bridge has been heard from (events or the
+  1 s heartbeats) more than ``lateness_ms`` past its corrected timestamp, or
+  once it is older than the reorder window, so a silent bridge delays the
+  log by at most the window. Events arriving after something later was
+  released are passed through immediately and flagged ``late``.
+
+Events are published with QoS 1, so the broker may deliver one twice. The
+aggregator drops any event whose (bridge_id, seq) it has already seen: below
+the next expected sequence only numbers recorded as gaps are accepted. Each
+publisher stamps a ``session`` id; a new one (bridge restarted, sequence
+starting over) resets that bridge's tracking.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+EVENT_KINDS = ('timer', 'impact', 'run')
+SYNC_REQUEST_TOPIC = 'aggregator/sync'
+BRIDGE_TOPIC = 'bridge/{bridge_id}/{kind}'
+
+DEFAULT_REORDER_WINDOW_MS = 500.0
+DEFAULT_LATENESS_MS = 250.0
+DEFAULT_SYNC_INTERVAL_S = 2.0
+DEFAULT_HEARTBEAT_S = 1.0
+STALE_BRIDGE_S = 5.0
+MAX_TRACKED_GAPS = 1000  # Missing sequence numbers remembered per bridge
+
+Clock = Callable[[], int]
+
+
+def _received_wall_ns(message, clock: Clock) -> int:
+    """Wall-clock arrival time of an ingress message (excludes local queueing)"""
+    return clock() - int((time.monotonic() - message.received_at) * 1e9)
+
+
+@dataclass
+class MatchEvent:
+    """One bridge event placed on the match timeline"""
+    bridge_id: str
+    seq: int
+    kind: str
+    ts_ns: int            # Corrected to the aggregator clock
+    bridge_ts_ns: int     # As stamped by the bridge
+    data: Dict[str, Any] = field(default_factory=dict)
+    received_ns: int = 0
+    index: int = 0        # Position in the merged log
+    late: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'index': self.index,
+            'bridge_id': self.bridge_id,
+            'seq': self.seq,
+            'kind': self.kind,
+            'ts_ns': self.ts_ns,
+            'bridge_ts_ns': self.bridge_ts_ns,
+            'late': self.late,
+            'data': self.data,
+        }
+
+
+class ClockOffsetEstimator:
+    """Bridge clock offset from (t0, t1, t2, t3) exchanges, min-delay filtered"""
+
+    def __init__(self, samples: int = 8):
+        self._samples: Deque[Tuple[int, int]] = deque(maxlen=samples)  # (delay, offset)
+        self.exchanges = 0
+
+    def add_sample(self, t0: int, t1: int, t2: int, t3: int) -> Tuple[int, int]:
+        """Record one exchange; returns its (offset_ns, delay_ns)"""
+        offset = ((t1 - t0) + (t2 - t3)) // 2
+        delay = (t3 - t0) - (t2 - t1)
+        self._samples.append((delay, offset))
+        self.exchanges += 1
+        return offset, delay
+
+    @property
+    def synced(self) -> bool:
+        return bool(self._samples)
+
+    @property
+    def offset_ns(self) -> int:
+        """Bridge clock minus aggregator clock (0 until the first exchange)"""
+        return min(self._samples)[1] if self._samples else 0
+
+    @property
+    def delay_ns(self) -> int:
+        return min(self._samples)[0] if self._samples else 0
+
+    def to_local(self, bridge_ts_ns: int) -> int:
+        return bridge_ts_ns - self.offset_ns
+
+
+class ReorderMerger:
+    """K-way merge of per-source streams with a bounded reorder window"""
+
+    def __init__(self, window_ms: float = DEFAULT_REORDER_WINDOW_MS,
+                 lateness_ms: float = DEFAULT_LATENESS_MS):
+        self.window_ns = int(window_ms * 1_000_000)
+        self.lateness_ns = int(lateness_ms * 1_000_000)
+        # Per source: heap of (ts, seq, event); merge heap: (head ts, seq, source)
+        self._queues: Dict[str, List[Tuple[int, int, MatchEvent]]] = {}
+        self._heap: List[Tuple[int, int, str]] = []
+        self._watermarks: Dict[str, int] = {}
+        self._late: List[MatchEvent] = []
+        self.last_emitted_ns: Optional[int] = None
+        self.pending = 0
+        self.late = 0
+        self.forced = 0
+
+    def advance(self, source: str, ts_ns: int) -> None:
+        """``source`` has been heard from up to ``ts_ns`` (event or heartbeat)"""
+        mark = ts_ns - self.lateness_ns
+        if mark > self._watermarks.get(source, mark - 1):
+            self._watermarks[source] = mark
+
+    def push(self, event: MatchEvent) -> None:
+        source = event.bridge_id
+        if self.last_emitted_ns is not None and event.ts_ns < self.last_emitted_ns:
+            event.late = True
+            self.late += 1
+            self._late.append(event)
+            return
+        self.advance(source, event.ts_ns)
+        queue = self._queues.setdefault(source, [])
+        entry = (event.ts_ns, event.seq, event)
+        if not queue or entry[:2] < queue[0][:2]:
+            # New head for this source: replace its merge-heap entry lazily
+            heapq.heappush(self._heap, (event.ts_ns, event.seq, source))
+        heapq.heappush(queue, entry)
+        self.pending += 1
+
+    def remove_source(self, source: str) -> None:
+        """Stop waiting for ``source``; its queued events are still merged"""
+        self._watermarks.pop(source, None)
+
+    def drain(self, now_ns: int) -> List[MatchEvent]:
+        """Events that can be released, in timeline order"""
+        out, self._late = self._late, []
+        if not self._heap:
+            return out
+        safe = min(self._watermarks.values()) if self._watermarks else None
+        bound = now_ns - self.window_ns
+        heap, queues = self._heap, self._queues
+        while heap:
+            ts, seq, source = heap[0]
+            queue = queues[source]
+            if not queue or queue[0][:2] != (ts, seq):
+                heapq.heappop(heap)  # Superseded head entry
+                continue
+            if (safe is None or ts > safe) and ts > bound:
+                break
+            if safe is None or ts > safe:
+                self.forced += 1
+            heapq.heappop(heap)
+            out.append(heapq.heappop(queue)[2])
+            self.pending -= 1
+            self.last_emitted_ns = ts
+            if queue:
+                head_ts, head_seq, _ = queue[0]
+                heapq.heappush(heap, (head_ts, head_seq, source))
+        return out
+
+
+class MatchAggregator:
+    """Subscribes to every bridge and keeps the merged match event log"""
+
+    def __init__(self, mqtt_client: Any, window_ms: float = DEFAULT_REORDER_WINDOW_MS,
+                 lateness_ms: float = DEFAULT_LATENESS_MS, sync_interval_s: float = DEFAULT_SYNC_INTERVAL_S,
+                 history: int = 5000, on_event: Optional[Callable[[MatchEvent], Any]] = None,
+                 clock: Clock = time.time_ns):
+        self.mqtt_client = mqtt_client
+        self.merger = ReorderMerger(window_ms, lateness_ms)
+        self.sync_interval_s = sync_interval_s
+        self.on_event = on_event
+        self.clock = clock
+        self.clocks: Dict[str, ClockOffsetEstimator] = {}
+        self.history: Deque[MatchEvent] = deque(maxlen=history)
+        self._next_seq: Dict[str, int] = {}
+        self._missing: Dict[str, Set[int]] = {}  # Skipped seqs that may still arrive
+        self._sessions: Dict[str, Any] = {}
+        self._last_heard: Dict[str, float] = {}
+        self._sync_seq = itertools.count(1)
+        self._sync_sent: Dict[int, int] = {}
+        self._tasks: List[asyncio.Task] = []
+
+        self.received = 0
+        self.merged = 0
+        self.gaps = 0
+        self.duplicates = 0
+        self.latency_total_ns = 0
+        self.latency_max_ns = 0
+
+    def start(self) -> None:
+        for kind in EVENT_KINDS:
+            self.mqtt_client.subscribe(BRIDGE_TOPIC.format(bridge_id='+', kind=kind), self._on_event, raw=True)
+        self.mqtt_client.subscribe(BRIDGE_TOPIC.format(bridge_id='+', kind='sync'), self._on_sync, raw=True)
+        self.mqtt_client.subscribe(BRIDGE_TOPIC.format(bridge_id='+', kind='heartbeat'), self._on_heartbeat, raw=True)
+        self._tasks = [asyncio.create_task(self._sync_loop()), asyncio.create_task(self._drain_loop())]
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._release(self.clock() + self.merger.window_ns)
+
+    def _clock_for(self, bridge_id: str) -> ClockOffsetEstimator:
+        estimator = self.clocks.get(bridge_id)
+        if estimator is None:
+            estimator = self.clocks[bridge_id] = ClockOffsetEstimator()
+        return estimator
+
+    # MQTT handlers (event loop) ---------------------------------------------
+
+    def _on_event(self, topic: str, message) -> None:
+        try:
+            body = json.loads(message.payload)
+            bridge_id, kind = body['bridge_id'], topic.rsplit('/', 1)[1]
+            seq, bridge_ts = int(body['seq']), int(body['ts_ns'])
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Malformed bridge event on {topic}: {e}")
+            return
+        if not self._track_seq(bridge_id, body.get('session'), seq):
+            self.duplicates += 1
+            return
+        self.received += 1
+        self._last_heard[bridge_id] = message.received_at
+        self.merger.push(MatchEvent(
+            bridge_id=bridge_id, seq=seq, kind=kind,
+            ts_ns=self._clock_for(bridge_id).to_local(bridge_ts), bridge_ts_ns=bridge_ts,
+            data=body.get('data') or {}, received_ns=_received_wall_ns(message, self.clock),
+        ))
+        self._release(self.clock())
+
+    def _track_seq(self, bridge_id: str, session: Any, seq: int) -> bool:
+        """Record ``seq`` from ``bridge_id``; False if it was already seen (redelivery)"""
+        if self._sessions.get(bridge_id, session) != session:
+            # Bridge restarted: its sequence starts over
+            self._next_seq.pop(bridge_id, None)
+            self._missing.pop(bridge_id, None)
+        self._sessions[bridge_id] = session
+        expected = self._next_seq.get(bridge_id)
+        missing = self._missing.setdefault(bridge_id, set())
+        if expected is not None and seq < expected:
+            if seq not in missing:
+                return False
+            missing.discard(seq)
+            return True
+        if expected is not None and seq > expected:
+            self.gaps += seq - expected
+            missing.update(range(max(expected, seq - MAX_TRACKED_GAPS), seq))
+            if len(missing) > MAX_TRACKED_GAPS:
+                for old in sorted(missing)[:len(missing) - MAX_TRACKED_GAPS]:
+                    missing.discard(old)
+        self._next_seq[bridge_id] = seq + 1
+        return True
+
+    def _on_heartbeat(self, topic: str, message) -> None:
+        try:
+            body = json.loads(message.payload)
+            bridge_id = body['bridge_id']
+            self._last_heard[bridge_id] = message.received_at
+            self.merger.advance(bridge_id, self._clock_for(bridge_id).to_local(int(body['ts_ns'])))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Malformed heartbeat on {topic}: {e}")
+
+    def _on_sync(self, topic: str, message) -> None:
+        t3 = _received_wall_ns(message, self.clock)
+        try:
+            body = json.loads(message.payload)
+            t0 = self._sync_sent.get(int(body['sync_seq']))
+            if t0 is None or int(body['t0']) != t0:
+                return
+            offset, delay = self._clock_for(body['bridge_id']).add_sample(t0, int(body['t1']), int(body['t2']), t3)
+            logger.debug(f"Clock sync {body['bridge_id']}: offset {offset / 1e6:.3f} ms, delay {delay / 1e6:.3f} ms")
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Malformed sync reply on {topic}: {e}")
+
+    # Periodic work ----------------------------------------------------------
+
+    def send_sync(self) -> int:
+        sync_seq = next(self._sync_seq)
+        t0 = self.clock()
+        self._sync_sent[sync_seq] = t0
+        if len(self._sync_sent) > 16:
+            del self._sync_sent[min(self._sync_sent)]
+        self.mqtt_client.publish(SYNC_REQUEST_TOPIC, {'sync_seq': sync_seq, 't0': t0}, qos=0)
+        return sync_seq
+
+    async def _sync_loop(self) -> None:
+        while True:
+            try:
+                self.send_sync()
+            except Exception as e:
+                logger.error(f"Clock sync request failed: {e}")
+            await asyncio.sleep(self.sync_interval_s)
+
+    async def _drain_loop(self) -> None:
+        interval = max(self.merger.window_ns / 4e9, 0.005)
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for bridge_id, heard in list(self._last_heard.items()):
+                if now - heard > STALE_BRIDGE_S:
+                    # Don't hold the log back for a bridge that went away
+                    del self._last_heard[bridge_id]
+                    self.merger.remove_source(bridge_id)
+                    logger.warning(f"Bridge {bridge_id} silent for {STALE_BRIDGE_S:.0f}s, no longer waited for")
+            self._release(self.clock())
+
+    def _release(self, now_ns: int) -> None:
+        for event in self.merger.drain(now_ns):
+            self.merged += 1
+            event.index = self.merged
+            latency = now_ns - event.received_ns
+            self.latency_total_ns += latency
+            if latency > self.latency_max_ns:
+                self.latency_max_ns = latency
+            self.history.append(event)
+            if self.on_event is not None:
+                try:
+                    self.on_event(event)
+                except Exception as e:
+                    logger.error(f"Match event handler failed: {e}")
+
+    # Queries ----------------------------------------------------------------
+
+    def events(self, since: int = 0, limit: int = 500) -> List[Dict[str, Any]]:
+        """Merged events with ``index > since``, oldest first"""
+        out = [event.to_dict() for event in self.history if event.index > since]
+        return out[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'bridges': {
+                bridge_id: {
+                    'offset_ms': round(clock.offset_ns / 1e6, 3),
+                    'delay_ms': round(clock.delay_ns / 1e6, 3),
+                    'synced': clock.synced,
+                    'next_seq': self._next_seq.get(bridge_id),
+                    'active': bridge_id in self._last_heard,
+                }
+                for bridge_id, clock in self.clocks.items()
+            },
+            'received': self.received,
+            'merged': self.merged,
+            'pending': self.merger.pending,
+            'late': self.merger.late,
+            'forced': self.merger.forced,
+            'gaps': self.gaps,
+            'duplicates': self.duplicates,
+            'reorder_window_ms': self.merger.window_ns / 1e6,
+            'lateness_ms': self.merger.lateness_ns / 1e6,
+            'latency_avg_ms': round(self.latency_total_ns / self.merged / 1e6, 3) if self.merged else 0.0,
+            'latency_max_ms': round(self.latency_max_ns / 1e6, 3),
+        }
+
+
+class MatchEventPublisher:
+    """Bridge side: sequenced timer/impact/run events, heartbeats and sync replies"""
+
+    def __init__(self, mqtt_client: Any, bridge_id: str, heartbeat_s: float = DEFAULT_HEARTBEAT_S,
+                 clock: Clock = time.time_ns):
+        self.mqtt_client = mqtt_client
+        self.bridge_id = bridge_id
+        self.heartbeat_s = heartbeat_s
+        self.clock = clock
+        self.seq = 0
+        self.session = time.time_ns()  # Tells the aggregator the sequence restarted
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self.mqtt_client.subscribe(SYNC_REQUEST_TOPIC, self._on_sync_request, raw=True)
+        self._task = asyncio.create_task(self._heartbeat_loop())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def publish(self, kind: str, data: Dict[str, Any], ts_ns: Optional[int] = None) -> int:
+        """Publish one event (``kind`` in EVENT_KINDS); returns its sequence number"""
+        self.seq += 1
+        self.mqtt_client.publish(BRIDGE_TOPIC.format(bridge_id=self.bridge_id, kind=kind), {
+            'bridge_id': self.bridge_id,
+            'session': self.session,
+            'seq': self.seq,
+            'ts_ns': self.clock() if ts_ns is None else ts_ns,
+            'data': data,
+        }, qos=1)
+        return self.seq
+
+    def _on_sync_request(self, topic: str, message) -> None:
+        t1 = _received_wall_ns(message, self.clock)
+        try:
+            request = json.loads(message.payload)
+            reply = {'bridge_id': self.bridge_id, 'sync_seq': request['sync_seq'], 't0': request['t0'], 't1': t1}
+        except (ValueError, KeyError, TypeError):
+            return
+        reply['t2'] = self.clock()
+        self.mqtt_client.publish(BRIDGE_TOPIC.format(bridge_id=self.bridge_id, kind='sync'), reply, qos=0)
+
+    async def _heartbeat_loop(self) -> None:
+        topic = BRIDGE_TOPIC.format(bridge_id=self.bridge_id, kind='heartbeat')
+        while True:
+            self.mqtt_client.publish(topic, {'bridge_id': self.bridge_id, 'seq': self.seq, 'ts_ns': self.clock()}, qos=0)
+            await asyncio.sleep(self.heartbeat_s)
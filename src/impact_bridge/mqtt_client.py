@@ -9,11 +9,13 @@ import asyncio
 import json
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any, Callable, List
+from typing import Optional, Dict, Any, Callable
 from dataclasses import dataclass
 import paho.mqtt.client as mqtt
 from paho.mqtt.client import MQTTMessage
 
+from .mqtt_ingress import MQTTIngress
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +29,7 @@ class MQTTConfig:
     username: Optional[str] = None
     password: Optional[str] = None
     qos: int = 1  # At least once delivery
+    inbound_queue_size: int = 2048  # Messages waiting for the event loop before dropping
 
 
 class LeadVilleMQTT:
@@ -36,25 +39,45 @@ class LeadVilleMQTT:
     Topic Structure:
     - bridge/status - System status updates
     - sensor/{id}/telemetry - Sensor data streams  
+    - sensor/{id}/batch - Packed binary sample batches (see telemetry_batch)
     - timer/events - Timer event notifications
     - run/{id}/events - Run-specific events
+    - device/{id}/health - Stream watchdog transitions (stalled/ok)
+    
+    QoS is picked per topic class: bulk telemetry is QoS 0 (a lost batch is
+    superseded 50 ms later), shots/runs/status are QoS 1.
     """
     
     # Topic definitions
     TOPICS = {
         'bridge_status': 'bridge/status',
         'sensor_telemetry': 'sensor/{sensor_id}/telemetry',
+        'sensor_batch': 'sensor/{sensor_id}/batch',
         'timer_events': 'timer/events', 
         'run_events': 'run/{run_id}/events',
         'system_health': 'system/health',
-        'device_status': 'device/{device_id}/status'
+        'device_status': 'device/{device_id}/status',
+        'device_health': 'device/{device_id}/health'
+    }
+    
+    # QoS per topic class (None: MQTTConfig.qos)
+    TOPIC_QOS = {
+        'bridge_status': 1,
+        'sensor_telemetry': 0,
+        'sensor_batch': 0,
+        'timer_events': 1,
+        'run_events': 1,
+        'system_health': 0,
+        'device_status': 1,
+        'device_health': 1,
     }
     
     def __init__(self, config: MQTTConfig = None):
         self.config = config or MQTTConfig()
         self.client = mqtt.Client(client_id=self.config.client_id)
         self.connected = False
-        self.message_handlers: Dict[str, List[Callable]] = {}
+        # Inbound messages: topic trie + handoff from paho's thread to the event loop
+        self.ingress = MQTTIngress(maxsize=self.config.inbound_queue_size)
         
         # Set up MQTT client callbacks
         self.client.on_connect = self._on_connect
@@ -70,6 +93,7 @@ class LeadVilleMQTT:
         """Connect to MQTT broker"""
         try:
             logger.info(f"Connecting to MQTT broker at {self.config.host}:{self.config.port}")
+            self.ingress.start()
             self.client.connect(self.config.host, self.config.port, self.config.keepalive)
             self.client.loop_start()
             
@@ -96,6 +120,7 @@ class LeadVilleMQTT:
             self.client.loop_stop()
             self.client.disconnect()
             logger.info("Disconnected from MQTT broker")
+        self.ingress.stop()
     
     def _on_connect(self, client, userdata, flags, rc):
         """Callback for MQTT connection"""
@@ -115,41 +140,24 @@ class LeadVilleMQTT:
             logger.info("MQTT client disconnected")
     
     def _on_message(self, client, userdata, msg: MQTTMessage):
-        """Callback for incoming MQTT messages"""
-        try:
-            topic = msg.topic
-            payload = msg.payload.decode('utf-8')
-            
-            # Try to parse JSON payload
-            try:
-                data = json.loads(payload)
-            except json.JSONDecodeError:
-                data = payload
-            
-            logger.debug(f"MQTT message received: {topic} -> {data}")
-            
-            # Call registered handlers
-            if topic in self.message_handlers:
-                for handler in self.message_handlers[topic]:
-                    try:
-                        handler(topic, data)
-                    except Exception as e:
-                        logger.error(f"Error in MQTT message handler: {e}")
-                        
-        except Exception as e:
-            logger.error(f"Error processing MQTT message: {e}")
+        """Callback for incoming MQTT messages (paho network thread)"""
+        # Only queue it here; decoding and handlers run on the event loop
+        if not self.ingress.submit(msg.topic, msg.payload, msg.qos, msg.retain):
+            if self.ingress.dropped % 100 == 1:
+                logger.warning(f"MQTT inbound queue full - dropped {self.ingress.dropped} messages so far")
     
     def _on_publish(self, client, userdata, mid):
         """Callback for successful message publish"""
         logger.debug(f"MQTT message published: {mid}")
     
-    def subscribe(self, topic: str, handler: Callable[[str, Any], None] = None) -> bool:
+    def subscribe(self, topic: str, handler: Callable[[str, Any], None] = None, raw: bool = False) -> bool:
         """
         Subscribe to MQTT topic
         
         Args:
-            topic: Topic to subscribe to
-            handler: Optional message handler function
+            topic: Topic to subscribe to (``+``/``#`` wildcards allowed)
+            handler: Optional message handler, ``handler(topic, data)``; may be async
+            raw: Pass the undecoded ``InboundMessage`` instead of parsed data
         """
         try:
             result = self.client.subscribe(topic, qos=self.config.qos)
@@ -158,9 +166,7 @@ class LeadVilleMQTT:
                 
                 # Register handler if provided
                 if handler:
-                    if topic not in self.message_handlers:
-                        self.message_handlers[topic] = []
-                    self.message_handlers[topic].append(handler)
+                    self.ingress.add_handler(topic, handler, raw=raw)
                 
                 return True
             else:
@@ -171,14 +177,15 @@ class LeadVilleMQTT:
             logger.error(f"MQTT subscribe error: {e}")
             return False
     
-    def publish(self, topic: str, payload: Any, retain: bool = False) -> bool:
+    def publish(self, topic: str, payload: Any, retain: bool = False, qos: Optional[int] = None) -> bool:
         """
         Publish message to MQTT topic
         
         Args:
             topic: Topic to publish to
-            payload: Message payload (will be JSON encoded if dict)
+            payload: Message payload (JSON encoded if dict, sent as-is if bytes)
             retain: Whether to retain the message
+            qos: QoS for this message (default: MQTTConfig.qos)
         """
         try:
             if not self.connected:
@@ -188,13 +195,15 @@ class LeadVilleMQTT:
             # JSON encode if dict/object
             if isinstance(payload, (dict, list)):
                 message = json.dumps(payload)
+            elif isinstance(payload, (bytes, bytearray)):
+                message = payload
             else:
                 message = str(payload)
             
-            result = self.client.publish(topic, message, qos=self.config.qos, retain=retain)
+            result = self.client.publish(topic, message, qos=self.config.qos if qos is None else qos, retain=retain)
             
             if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                logger.debug(f"MQTT published: {topic} -> {message[:100]}...")
+                logger.debug(f"MQTT published: {topic} -> {message[:100]!r}...")
                 return True
             else:
                 logger.error(f"MQTT publish failed: {topic}")
@@ -212,7 +221,8 @@ class LeadVilleMQTT:
             'timestamp': datetime.utcnow().isoformat(),
             'source': 'bridge'
         })
-        return self.publish(self.TOPICS['bridge_status'], status, retain=True)
+        return self.publish(self.TOPICS['bridge_status'], status, retain=True,
+                            qos=self.TOPIC_QOS['bridge_status'])
     
     def publish_sensor_telemetry(self, sensor_id: str, data: Dict[str, Any]) -> bool:
         """Publish sensor telemetry data"""
@@ -221,7 +231,12 @@ class LeadVilleMQTT:
             'timestamp': datetime.utcnow().isoformat(),
             'sensor_id': sensor_id
         })
-        return self.publish(topic, data)
+        return self.publish(topic, data, qos=self.TOPIC_QOS['sensor_telemetry'])
+    
+    def publish_sensor_batch(self, sensor_id: str, payload: bytes) -> bool:
+        """Publish a packed telemetry batch (``telemetry_batch.encode_batch``)"""
+        topic = self.TOPICS['sensor_batch'].format(sensor_id=sensor_id)
+        return self.publish(topic, payload, qos=self.TOPIC_QOS['sensor_batch'])
     
     def publish_timer_event(self, event_type: str, data: Dict[str, Any]) -> bool:
         """Publish timer event"""
@@ -231,7 +246,7 @@ class LeadVilleMQTT:
             'source': 'timer',
             **data
         }
-        return self.publish(self.TOPICS['timer_events'], event_data)
+        return self.publish(self.TOPICS['timer_events'], event_data, qos=self.TOPIC_QOS['timer_events'])
     
     def publish_run_event(self, run_id: int, event_type: str, data: Dict[str, Any]) -> bool:
         """Publish run-specific event"""
@@ -242,7 +257,7 @@ class LeadVilleMQTT:
             'timestamp': datetime.utcnow().isoformat(),
             **data
         }
-        return self.publish(topic, event_data)
+        return self.publish(topic, event_data, qos=self.TOPIC_QOS['run_events'])
     
     def publish_device_status(self, device_id: str, status: Dict[str, Any]) -> bool:
         """Publish device status update"""
@@ -251,7 +266,13 @@ class LeadVilleMQTT:
             'device_id': device_id,
             'timestamp': datetime.utcnow().isoformat()
         })
-        return self.publish(topic, status, retain=True)
+        return self.publish(topic, status, retain=True, qos=self.TOPIC_QOS['device_status'])
+    
+    def publish_device_health(self, device_id: str, health: Dict[str, Any]) -> bool:
+        """Publish a stream health transition (retained: last state per device)"""
+        topic = self.TOPICS['device_health'].format(device_id=device_id)
+        health = {**health, 'device_id': device_id, 'timestamp': datetime.utcnow().isoformat()}
+        return self.publish(topic, health, retain=True, qos=self.TOPIC_QOS['device_health'])
     
     def subscribe_all_sensors(self, handler: Callable[[str, Any], None]) -> bool:
         """Subscribe to all sensor telemetry"""
@@ -268,7 +289,8 @@ class LeadVilleMQTT:
             'broker_host': self.config.host,
             'broker_port': self.config.port,
             'client_id': self.config.client_id,
-            'subscriptions': len(self.message_handlers)
+            'subscriptions': self.ingress.trie.size,
+            'ingress': self.ingress.stats()
         }
 
 
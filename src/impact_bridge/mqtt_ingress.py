@@ -0,0 +1,253 @@
+"""
+MQTT ingress for LeadVille Impact Bridge
+
+paho delivers messages on its network thread. ``MQTTIngress.submit`` only
+appends the raw message to a bounded queue and, when the queue goes from
+idle to busy, wakes the asyncio consumer with ``call_soon_threadsafe`` - so
+the network thread never decodes, parses or runs handlers. The consumer
+matches each topic against a ``TopicTrie`` (``+``/``#`` wildcards, O(depth))
+and runs sync and async handlers in arrival order on the event loop.
+
+Payloads are decoded lazily: ``InboundMessage.data`` decodes UTF-8/JSON once,
+on first use, so messages nobody subscribed to are never parsed and handlers
+registered with ``raw=True`` can read ``payload`` bytes directly.
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str, Any], Any]
+
+
+class InboundMessage:
+    """One received MQTT message; ``data`` is decoded on first access"""
+
+    __slots__ = ("topic", "payload", "qos", "retain", "received_at", "_data")
+
+    _UNDECODED = object()
+
+    def __init__(self, topic: str, payload: bytes, qos: int = 0, retain: bool = False,
+                 received_at: Optional[float] = None):
+        self.topic = topic
+        self.payload = payload
+        self.qos = qos
+        self.retain = retain
+        self.received_at = received_at if received_at is not None else time.monotonic()
+        self._data = self._UNDECODED
+
+    @property
+    def data(self) -> Any:
+        """JSON value, else text, else the raw bytes"""
+        if self._data is self._UNDECODED:
+            try:
+                text = self.payload.decode("utf-8")
+            except UnicodeDecodeError:
+                self._data = self.payload
+            else:
+                try:
+                    self._data = json.loads(text)
+                except ValueError:
+                    self._data = text
+        return self._data
+
+
+class _Node:
+    __slots__ = ("children", "handlers")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.handlers: List[Tuple[Handler, bool]] = []
+
+
+class TopicTrie:
+    """Subscription patterns by topic level, with MQTT ``+`` and ``#`` wildcards"""
+
+    def __init__(self):
+        self._root = _Node()
+        self.size = 0
+
+    def add(self, pattern: str, handler: Handler, raw: bool = False) -> None:
+        node = self._root
+        for level in pattern.split("/"):
+            node = node.children.setdefault(level, _Node())
+        node.handlers.append((handler, raw))
+        self.size += 1
+
+    def remove(self, pattern: str, handler: Handler) -> bool:
+        node = self._root
+        for level in pattern.split("/"):
+            node = node.children.get(level)
+            if node is None:
+                return False
+        for entry in node.handlers:
+            if entry[0] is handler:
+                node.handlers.remove(entry)
+                self.size -= 1
+                return True
+        return False
+
+    def match(self, topic: str) -> List[Tuple[Handler, bool]]:
+        """(handler, raw) pairs for every pattern matching ``topic``"""
+        levels = topic.split("/")
+        matched: List[Tuple[Handler, bool]] = []
+        # Wildcards never match the first level of $-topics ($SYS/...)
+        self._match(self._root, levels, 0, matched, not topic.startswith("$"))
+        return matched
+
+    def _match(self, node: _Node, levels: List[str], index: int,
+               matched: List[Tuple[Handler, bool]], wildcards: bool) -> None:
+        multi = node.children.get("#") if wildcards else None
+        if multi is not None:
+            # "a/#" also matches "a" itself
+            matched.extend(multi.handlers)
+        if index == len(levels):
+            matched.extend(node.handlers)
+            return
+        child = node.children.get(levels[index])
+        if child is not None:
+            self._match(child, levels, index + 1, matched, True)
+        single = node.children.get("+") if wildcards else None
+        if single is not None:
+            self._match(single, levels, index + 1, matched, True)
+
+
+class MQTTIngress:
+    """Thread-safe handoff of inbound messages to handlers on the asyncio loop"""
+
+    def __init__(self, maxsize: int = 2048):
+        self.trie = TopicTrie()
+        self.maxsize = maxsize
+        self._queue: deque = deque()
+        self._lock = threading.Lock()
+        self._wake_pending = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.received = 0
+        self.dispatched = 0
+        self.dropped = 0
+        self.unmatched = 0
+        self.max_depth = 0
+        self.handler_calls = 0
+        self.handler_errors = 0
+        self.handler_total_s = 0.0
+        self.handler_max_s = 0.0
+        self.max_lag_s = 0.0
+        self._rate_mark = (time.monotonic(), 0)
+
+    # Subscriptions ---------------------------------------------------------
+
+    def add_handler(self, pattern: str, handler: Handler, raw: bool = False) -> None:
+        """``handler(topic, data)``; with ``raw`` it gets ``(topic, InboundMessage)``"""
+        self.trie.add(pattern, handler, raw)
+
+    def remove_handler(self, pattern: str, handler: Handler) -> bool:
+        return self.trie.remove(pattern, handler)
+
+    # Lifecycle -------------------------------------------------------------
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Start the consumer task on ``loop`` (default: the running loop)"""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+        if self._queue:
+            self._wakeup.set()
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    # Network thread --------------------------------------------------------
+
+    def submit(self, topic: str, payload: bytes, qos: int = 0, retain: bool = False) -> bool:
+        """Queue a message from any thread; False if it was dropped (queue full)"""
+        depth = len(self._queue)
+        if depth >= self.maxsize:
+            self.dropped += 1
+            return False
+        self._queue.append(InboundMessage(topic, payload, qos, retain))
+        self.received += 1
+        if depth + 1 > self.max_depth:
+            self.max_depth = depth + 1
+        with self._lock:
+            wake = not self._wake_pending and self._loop is not None
+            if wake:
+                self._wake_pending = True
+        if wake:
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass  # Loop closed during shutdown
+        return True
+
+    # Event loop ------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                self._wake_pending = False
+            while self._queue:
+                await self.dispatch(self._queue.popleft())
+
+    async def dispatch(self, message: InboundMessage) -> int:
+        """Run every handler matching ``message``; returns how many ran"""
+        lag = time.monotonic() - message.received_at
+        if lag > self.max_lag_s:
+            self.max_lag_s = lag
+        handlers = self.trie.match(message.topic)
+        if not handlers:
+            self.unmatched += 1
+            return 0
+        self.dispatched += 1
+        for handler, raw in handlers:
+            start = time.perf_counter()
+            try:
+                result = handler(message.topic, message if raw else message.data)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                self.handler_errors += 1
+                logger.error(f"Error in MQTT message handler for {message.topic}: {e}")
+            elapsed = time.perf_counter() - start
+            self.handler_calls += 1
+            self.handler_total_s += elapsed
+            if elapsed > self.handler_max_s:
+                self.handler_max_s = elapsed
+        return len(handlers)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus the inbound rate since the previous call"""
+        now = time.monotonic()
+        mark_time, mark_received = self._rate_mark
+        self._rate_mark = (now, self.received)
+        elapsed = now - mark_time
+        return {
+            "received": self.received,
+            "dispatched": self.dispatched,
+            "unmatched": self.unmatched,
+            "dropped": self.dropped,
+            "inbound_rate": round((self.received - mark_received) / elapsed, 1) if elapsed > 0 else 0.0,
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self.max_depth,
+            "subscriptions": self.trie.size,
+            "handler_calls": self.handler_calls,
+            "handler_errors": self.handler_errors,
+            "handler_avg_ms": round(self.handler_total_s / self.handler_calls * 1000, 3) if self.handler_calls else 0.0,
+            "handler_max_ms": round(self.handler_max_s * 1000, 3),
+            "max_lag_ms": round(self.max_lag_s * 1000, 3),
+        }
@@ -9,9 +9,11 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
+import asyncio
 import logging
+import sqlite3
 
-from .database.session import get_db_session
+from .database.access import DatabaseAccess, get_leadville_db
 from .database.pool_models import (
     DevicePool, ActiveSession, DeviceLease, DevicePoolEvent,
     DevicePoolStatus, SessionStatus
@@ -20,62 +22,140 @@ from .database.pool_models import (
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/admin/pool", tags=["Device Pool Management"])
 
+
+class PoolEventLog:
+    """Buffers device pool events and appends them in batches.
+    
+    Lease/release transactions only touch the lease and device rows; the
+    events are written afterwards, many per transaction, so they do not
+    extend the time the write lock is held on every request.
+    """
+    
+    def __init__(self, database: DatabaseAccess, max_batch: int = 64, flush_interval: float = 0.25):
+        self.database = database
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._pending: List[tuple] = []
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.batches = 0
+    
+    def append(self, device_id: int, session_id: Optional[int], event_type: str, event_data: str) -> None:
+        self._pending.append((device_id, session_id, event_type, event_data,
+                              datetime.utcnow().isoformat(sep=" ")))
+        if self._task is None or self._task.done():
+            delay = 0 if len(self._pending) >= self.max_batch else self.flush_interval
+            self._task = asyncio.get_running_loop().create_task(self._flush_later(delay))
+    
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self.flush()
+    
+    async def flush(self) -> int:
+        """Write all pending events; returns how many were written"""
+        written = 0
+        while self._pending:
+            batch = self._pending[:self.max_batch]
+            del self._pending[:len(batch)]
+            try:
+                await self.database.write(lambda conn: conn.executemany("""
+                    INSERT INTO device_pool_events (device_id, session_id, event_type, event_data, timestamp)
+                    VALUES (?, ?, ?, ?, ?)
+                """, batch))
+            except Exception as e:
+                # Keep them for the next flush rather than losing the history
+                logger.error(f"Failed to write {len(batch)} pool events: {e}")
+                self._pending[:0] = batch
+                break
+            written += len(batch)
+            self.batches += 1
+        self.written += written
+        return written
+
+
+_event_logs: Dict[DatabaseAccess, PoolEventLog] = {}
+
+
+def pool_event_log(database: DatabaseAccess) -> PoolEventLog:
+    """Event log buffer for ``database``"""
+    log = _event_logs.get(database)
+    if log is None:
+        log = _event_logs[database] = PoolEventLog(database)
+    return log
+
+
+async def flush_pool_events() -> None:
+    """Write out buffered pool events (application shutdown)"""
+    for log in list(_event_logs.values()):
+        await log.flush()
+
+
+def _iso(value) -> Optional[str]:
+    """ISO timestamp for a raw SQLite DATETIME string"""
+    return value.replace(" ", "T") if isinstance(value, str) else value
+
+
 @router.get("/devices")
 async def get_pool_devices(
     status: Optional[str] = None,
     device_type: Optional[str] = None,
     include_leased: bool = False,
-    db: Session = Depends(get_db_session)
+    database: DatabaseAccess = Depends(get_leadville_db)
 ):
     """Get all devices in the pool with optional filtering"""
     try:
-        query = db.query(DevicePool)
-        
-        # Filter by status
-        if status:
-            try:
-                status_enum = DevicePoolStatus(status)
-                query = query.filter(DevicePool.status == status_enum)
-            except ValueError:
-                raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
-        
-        # Filter by device type
-        if device_type:
-            query = query.filter(DevicePool.device_type == device_type)
-        
-        # Filter out leased devices unless specifically requested
-        if not include_leased:
-            query = query.filter(DevicePool.status != "leased")
-        
-        devices = query.order_by(DevicePool.device_type, DevicePool.label).all()
+        def _query(db: Session):
+            query = db.query(DevicePool)
+        
+            # Filter by status
+            if status:
+                try:
+                    status_enum = DevicePoolStatus(status)
+                    query = query.filter(DevicePool.status == status_enum)
+                except ValueError:
+                    raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
+        
+            # Filter by device type
+            if device_type:
+                query = query.filter(DevicePool.device_type == device_type)
+        
+            # Filter out leased devices unless specifically requested
+            if not include_leased:
+                query = query.filter(DevicePool.status != "leased")
+        
+            devices = query.order_by(DevicePool.device_type, DevicePool.label).all()
+        
+            return {
+                "devices": [
+                    {
+                        "id": device.id,
+                        "hw_addr": device.hw_addr,
+                        "device_type": device.device_type,
+                        "label": device.label,
+                        "vendor": device.vendor,
+                        "model": device.model,
+                        "status": device.status,
+                        "last_seen": device.last_seen.isoformat() if device.last_seen else None,
+                        "battery": device.battery,
+                        "rssi": device.rssi,
+                        "notes": device.notes,
+                        "is_available": device.status == "available"
+                    }
+                    for device in devices
+                ],
+                "total_count": len(devices),
+                "available_count": len([d for d in devices if d.status == "available"])
+            }
         
-        return {
-            "devices": [
-                {
-                    "id": device.id,
-                    "hw_addr": device.hw_addr,
-                    "device_type": device.device_type,
-                    "label": device.label,
-                    "vendor": device.vendor,
-                    "model": device.model,
-                    "status": device.status,
-                    "last_seen": device.last_seen.isoformat() if device.last_seen else None,
-                    "battery": device.battery,
-                    "rssi": device.rssi,
-                    "notes": device.notes,
-                    "is_available": device.status == "available"
-                }
-                for device in devices
-            ],
-            "total_count": len(devices),
-            "available_count": len([d for d in devices if d.status == "available"])
-        }
+        return await database.read_orm(_query)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting pool devices: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/devices")
-async def add_device_to_pool(request: Request, db: Session = Depends(get_db_session)):
+async def add_device_to_pool(request: Request, database: DatabaseAccess = Depends(get_leadville_db)):
     """Add a discovered device to the shared pool"""
     try:
         data = await request.json()
@@ -88,94 +168,101 @@ async def add_device_to_pool(request: Request, db: Session = Depends(get_db_sess
         if not hw_addr:
             raise HTTPException(status_code=400, detail="hw_addr is required")
         
-        # Check if device already exists
-        existing = db.query(DevicePool).filter(DevicePool.hw_addr == hw_addr).first()
-        if existing:
-            raise HTTPException(status_code=409, detail="Device already exists in pool")
-        
-        # Create new pool device
-        device = DevicePool(
-            hw_addr=hw_addr,
-            device_type=device_type,
-            label=label,
-            vendor=vendor,
-            model=model,
-            status="available"
-        )
+        def _apply(db: Session):
+            # Check if device already exists
+            existing = db.query(DevicePool).filter(DevicePool.hw_addr == hw_addr).first()
+            if existing:
+                raise HTTPException(status_code=409, detail="Device already exists in pool")
+        
+            # Create new pool device
+            device = DevicePool(
+                hw_addr=hw_addr,
+                device_type=device_type,
+                label=label,
+                vendor=vendor,
+                model=model,
+                status="available"
+            )
         
-        db.add(device)
-        db.commit()
-        db.refresh(device)
+            db.add(device)
+            db.flush()  # Assigns device.id; write_orm commits once
         
-        # Log the event
-        event = DevicePoolEvent(
-            device_id=device.id,
-            event_type="discovered",
-            event_data=f"Added to pool: {label}"
-        )
-        db.add(event)
-        db.commit()
+            # Log the event
+            event = DevicePoolEvent(
+                device_id=device.id,
+                event_type="discovered",
+                event_data=f"Added to pool: {label}"
+            )
+            db.add(event)
         
-        return {
-            "message": "Device added to pool",
-            "device": {
-                "id": device.id,
-                "hw_addr": device.hw_addr,
-                "label": device.label,
-                "status": device.status
+            return {
+                "message": "Device added to pool",
+                "device": {
+                    "id": device.id,
+                    "hw_addr": device.hw_addr,
+                    "label": device.label,
+                    "status": device.status
+                }
             }
-        }
+        
+        return await database.write_orm(_apply)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error adding device to pool: {e}")
-        db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/sessions")
 async def get_active_sessions(
     status: Optional[str] = None,
     bridge_id: Optional[int] = None,
-    db: Session = Depends(get_db_session)
+    database: DatabaseAccess = Depends(get_leadville_db)
 ):
     """Get active sessions with their device assignments"""
     try:
-        query = db.query(ActiveSession)
-        
-        if status:
-            try:
-                status_enum = SessionStatus(status)
-                query = query.filter(ActiveSession.status == status_enum)
-            except ValueError:
-                raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
-        
-        if bridge_id:
-            query = query.filter(ActiveSession.bridge_id == bridge_id)
-        
-        sessions = query.order_by(ActiveSession.started_at.desc()).all()
+        def _query(db: Session):
+            query = db.query(ActiveSession)
+        
+            if status:
+                try:
+                    status_enum = SessionStatus(status)
+                    query = query.filter(ActiveSession.status == status_enum)
+                except ValueError:
+                    raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
+        
+            if bridge_id:
+                query = query.filter(ActiveSession.bridge_id == bridge_id)
+        
+            sessions = query.order_by(ActiveSession.started_at.desc()).all()
+        
+            return {
+                "sessions": [
+                    {
+                        "id": session.id,
+                        "session_name": session.session_name,
+                        "bridge_id": session.bridge_id,
+                        "stage_id": session.stage_id,
+                        "status": session.status,
+                        "started_at": session.started_at.isoformat(),
+                        "ended_at": session.ended_at.isoformat() if session.ended_at else None,
+                        "last_activity": session.last_activity.isoformat(),
+                        "device_count": len([lease for lease in session.device_leases if lease.released_at is None]),
+                        "connected_count": len([lease for lease in session.device_leases 
+                                              if lease.released_at is None and lease.is_connected])
+                    }
+                    for session in sessions
+                ]
+            }
         
-        return {
-            "sessions": [
-                {
-                    "id": session.id,
-                    "session_name": session.session_name,
-                    "bridge_id": session.bridge_id,
-                    "stage_id": session.stage_id,
-                    "status": session.status,
-                    "started_at": session.started_at.isoformat(),
-                    "ended_at": session.ended_at.isoformat() if session.ended_at else None,
-                    "last_activity": session.last_activity.isoformat(),
-                    "device_count": len([lease for lease in session.device_leases if lease.released_at is None]),
-                    "connected_count": len([lease for lease in session.device_leases 
-                                          if lease.released_at is None and lease.is_connected])
-                }
-                for session in sessions
-            ]
-        }
+        return await database.read_orm(_query)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting active sessions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/sessions")
-async def create_session(request: Request, db: Session = Depends(get_db_session)):
+async def create_session(request: Request, database: DatabaseAccess = Depends(get_leadville_db)):
     """Create a new active session for device management"""
     try:
         data = await request.json()
@@ -186,33 +273,36 @@ async def create_session(request: Request, db: Session = Depends(get_db_session)
         if not session_name or not bridge_id:
             raise HTTPException(status_code=400, detail="session_name and bridge_id are required")
         
-        # Create new session
-        session = ActiveSession(
-            session_name=session_name,
-            bridge_id=bridge_id,
-            stage_id=stage_id,
-            status="idle"
-        )
+        def _apply(db: Session):
+            # Create new session
+            session = ActiveSession(
+                session_name=session_name,
+                bridge_id=bridge_id,
+                stage_id=stage_id,
+                status="idle"
+            )
         
-        db.add(session)
-        db.commit()
-        db.refresh(session)
+            db.add(session)
+            db.flush()  # Assigns session.id; write_orm commits once
         
-        return {
-            "message": "Session created",
-            "session": {
-                "id": session.id,
-                "session_name": session.session_name,
-                "status": session.status
+            return {
+                "message": "Session created",
+                "session": {
+                    "id": session.id,
+                    "session_name": session.session_name,
+                    "status": session.status
+                }
             }
-        }
+        
+        return await database.write_orm(_apply)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating session: {e}")
-        db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/sessions/{session_id}/lease")
-async def lease_device(session_id: int, request: Request, db: Session = Depends(get_db_session)):
+async def lease_device(session_id: int, request: Request, database: DatabaseAccess = Depends(get_leadville_db)):
     """Lease a device from the pool to an active session"""
     try:
         data = await request.json()
@@ -222,198 +312,313 @@ async def lease_device(session_id: int, request: Request, db: Session = Depends(
         if not device_id:
             raise HTTPException(status_code=400, detail="device_id is required")
         
-        # Verify session exists and is active
-        session = db.query(ActiveSession).filter(ActiveSession.id == session_id).first()
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        if session.status == SessionStatus.ended:
-            raise HTTPException(status_code=400, detail="Cannot lease devices to ended session")
-        
-        # Verify device exists and is available
-        device = db.query(DevicePool).filter(DevicePool.id == device_id).first()
-        if not device:
-            raise HTTPException(status_code=404, detail="Device not found")
-        
-        if device.status != "available":
-            raise HTTPException(status_code=400, detail=f"Device is not available (status: {device.status})")
-        
-        # Check if device is already leased to another session
-        existing_lease = db.query(DeviceLease).filter(
-            and_(DeviceLease.device_id == device_id, DeviceLease.released_at.is_(None))
-        ).first()
-        
-        if existing_lease:
+        def _apply(conn):
+            # Session must exist and not be ended (touches last_activity)
+            if conn.execute(
+                "UPDATE active_sessions SET last_activity = CURRENT_TIMESTAMP WHERE id = ? AND status != 'ended'",
+                (session_id,)
+            ).rowcount != 1:
+                if conn.execute("SELECT 1 FROM active_sessions WHERE id = ?", (session_id,)).fetchone():
+                    raise HTTPException(status_code=400, detail="Cannot lease devices to ended session")
+                raise HTTPException(status_code=404, detail="Session not found")
+            
+            # Compare-and-set: only an available device without an open lease flips to leased
+            if conn.execute("""
+                UPDATE device_pool SET status = 'leased', updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND status = 'available'
+                  AND NOT EXISTS (SELECT 1 FROM device_leases WHERE device_id = ? AND released_at IS NULL)
+            """, (device_id, device_id)).rowcount != 1:
+                device = conn.execute("SELECT status FROM device_pool WHERE id = ?", (device_id,)).fetchone()
+                if not device:
+                    raise HTTPException(status_code=404, detail="Device not found")
+                if device[0] != "available":
+                    raise HTTPException(status_code=400, detail=f"Device is not available (status: {device[0]})")
+                raise HTTPException(status_code=409, detail="Device is already leased to another session")
+            
+            cursor = conn.execute("""
+                INSERT INTO device_leases (device_id, session_id, target_assignment, leased_at, is_connected, connection_attempts)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP, 0, 0)
+            """, (device_id, session_id, target_assignment))
+            lease = conn.execute("""
+                SELECT l.id, l.leased_at, d.hw_addr, s.session_name
+                FROM device_leases l
+                JOIN device_pool d ON d.id = l.device_id
+                JOIN active_sessions s ON s.id = l.session_id
+                WHERE l.id = ?
+            """, (cursor.lastrowid,)).fetchone()
+            return lease
+        
+        try:
+            lease = await database.write(_apply)
+        except sqlite3.IntegrityError:
+            # Open-lease unique index caught a lease the CAS did not see
             raise HTTPException(status_code=409, detail="Device is already leased to another session")
         
-        # Create lease
-        lease = DeviceLease(
-            device_id=device_id,
-            session_id=session_id,
-            target_assignment=target_assignment
-        )
-        
-        # Update device status
-        device.status = "leased"
-        
-        # Update session activity
-        session.last_activity = func.now()
-        
-        db.add(lease)
-        db.commit()
-        db.refresh(lease)
-        
         # Log the event
-        event = DevicePoolEvent(
-            device_id=device_id,
-            session_id=session_id,
-            event_type="lease",
-            event_data=f"Leased to session '{session.session_name}' as '{target_assignment}'"
+        pool_event_log(database).append(
+            device_id, session_id, "lease",
+            f"Leased to session '{lease['session_name']}' as '{target_assignment}'"
         )
-        db.add(event)
-        db.commit()
         
         return {
             "message": "Device leased successfully",
             "lease": {
-                "id": lease.id,
-                "device_hw_addr": device.hw_addr,
+                "id": lease["id"],
+                "device_hw_addr": lease["hw_addr"],
                 "target_assignment": target_assignment,
-                "leased_at": lease.leased_at.isoformat()
+                "leased_at": _iso(lease["leased_at"])
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error leasing device: {e}")
-        db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/sessions/{session_id}/release/{device_id}")
-async def release_device(session_id: int, device_id: int, db: Session = Depends(get_db_session)):
-    """Release a device from a session back to the pool"""
+@router.put("/sessions/{session_id}/leases")
+async def set_session_leases(session_id: int, request: Request, database: DatabaseAccess = Depends(get_leadville_db)):
+    """Lease a whole set of devices to a session in one transaction
+    
+    Body: {"leases": [{"device_id": 3, "target_assignment": "Target 1"}, ...],
+           "replace": true}
+    Every device is validated before anything changes; one conflict rejects
+    the whole set. Devices already leased to this session just get their
+    target updated. With "replace", the session's other leases are released.
+    """
     try:
-        # Find active lease
-        lease = db.query(DeviceLease).filter(
-            and_(
-                DeviceLease.session_id == session_id,
-                DeviceLease.device_id == device_id,
-                DeviceLease.released_at.is_(None)
-            )
-        ).first()
-        
-        if not lease:
-            raise HTTPException(status_code=404, detail="Active lease not found")
+        data = await request.json()
+        requested = data.get("leases", [])
+        replace = bool(data.get("replace", False))
+        
+        if not isinstance(requested, list) or any(not isinstance(item, dict) or not item.get("device_id")
+                                                  for item in requested):
+            raise HTTPException(status_code=400, detail="leases must be a list of {device_id, target_assignment}")
+        
+        wanted = {}
+        for item in requested:
+            if item["device_id"] in wanted:
+                raise HTTPException(status_code=400, detail=f"Device {item['device_id']} listed more than once")
+            wanted[item["device_id"]] = item.get("target_assignment", "")
+        
+        def _apply(db: Session):
+            session = db.query(ActiveSession).filter(ActiveSession.id == session_id).first()
+            if not session:
+                raise HTTPException(status_code=404, detail="Session not found")
+            
+            if session.status == "ended":
+                raise HTTPException(status_code=400, detail="Cannot lease devices to ended session")
+            
+            devices = {device.id: device for device in
+                       db.query(DevicePool).filter(DevicePool.id.in_(list(wanted))).all()} if wanted else {}
+            open_leases = {lease.device_id: lease for lease in db.query(DeviceLease).filter(
+                and_(
+                    or_(DeviceLease.device_id.in_(list(wanted)), DeviceLease.session_id == session_id),
+                    DeviceLease.released_at.is_(None)
+                )
+            ).all()}
+            
+            # Validate everything before touching anything
+            conflicts = []
+            for device_id in wanted:
+                device = devices.get(device_id)
+                lease = open_leases.get(device_id)
+                if not device:
+                    conflicts.append(f"Device {device_id} not found")
+                elif lease and lease.session_id != session_id:
+                    conflicts.append(f"Device {device.hw_addr} is already leased to another session")
+                elif not lease and device.status != "available":
+                    conflicts.append(f"Device {device.hw_addr} is not available (status: {device.status})")
+            if conflicts:
+                raise HTTPException(status_code=409, detail={"message": "No devices were leased", "conflicts": conflicts})
+            
+            leased, updated, released, events = [], [], [], []
+            for device_id, target_assignment in wanted.items():
+                lease = open_leases.get(device_id)
+                if lease:
+                    if lease.target_assignment != target_assignment:
+                        lease.target_assignment = target_assignment
+                        updated.append(lease)
+                    continue
+                lease = DeviceLease(
+                    device_id=device_id,
+                    session_id=session_id,
+                    target_assignment=target_assignment
+                )
+                devices[device_id].status = "leased"
+                db.add(lease)
+                events.append((device_id, session_id, "lease",
+                               f"Leased to session '{session.session_name}' as '{target_assignment}'"))
+                leased.append(lease)
+            
+            if replace:
+                for device_id, lease in open_leases.items():
+                    if lease.session_id == session_id and device_id not in wanted:
+                        lease.released_at = func.now()
+                        lease.device.status = "available"
+                        events.append((device_id, session_id, "release",
+                                       f"Released from session '{session.session_name}' (bulk replace)"))
+                        released.append(lease)
+            
+            session.last_activity = func.now()
+            db.flush()  # Assigns lease ids; write_orm commits once
+            
+            return events, {
+                "message": f"{len(leased)} leased, {len(updated)} updated, {len(released)} released",
+                "leases": [
+                    {
+                        "id": lease.id,
+                        "device_id": lease.device_id,
+                        "device_hw_addr": lease.device.hw_addr,
+                        "target_assignment": lease.target_assignment,
+                        "leased_at": lease.leased_at.isoformat()
+                    }
+                    for lease in leased + updated
+                ],
+                "released_device_ids": [lease.device_id for lease in released]
+            }
         
-        # Release the lease
-        lease.released_at = func.now()
+        events, result = await database.write_orm(_apply)
         
-        # Update device status back to available
-        device = lease.device
-        device.status = "available"
+        # Log the events
+        event_log = pool_event_log(database)
+        for event in events:
+            event_log.append(*event)
         
-        # Update session activity
-        session = lease.session
-        session.last_activity = func.now()
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error setting session leases: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/sessions/{session_id}/release/{device_id}")
+async def release_device(session_id: int, device_id: int, database: DatabaseAccess = Depends(get_leadville_db)):
+    """Release a device from a session back to the pool"""
+    try:
+        def _apply(conn):
+            # Close the active lease; only one concurrent release can win
+            if conn.execute("""
+                UPDATE device_leases SET released_at = CURRENT_TIMESTAMP
+                WHERE session_id = ? AND device_id = ? AND released_at IS NULL
+            """, (session_id, device_id)).rowcount == 0:
+                raise HTTPException(status_code=404, detail="Active lease not found")
+            
+            # Update device status back to available
+            conn.execute(
+                "UPDATE device_pool SET status = 'available', updated_at = CURRENT_TIMESTAMP WHERE id = ? AND status = 'leased'",
+                (device_id,)
+            )
+            
+            # Update session activity
+            conn.execute("UPDATE active_sessions SET last_activity = CURRENT_TIMESTAMP WHERE id = ?", (session_id,))
+            
+            return conn.execute("""
+                SELECT d.hw_addr, s.session_name FROM device_pool d, active_sessions s
+                WHERE d.id = ? AND s.id = ?
+            """, (device_id, session_id)).fetchone()
         
-        db.commit()
+        released = await database.write(_apply)
         
         # Log the event
-        event = DevicePoolEvent(
-            device_id=device_id,
-            session_id=session_id,
-            event_type="release",
-            event_data=f"Released from session '{session.session_name}'"
+        pool_event_log(database).append(
+            device_id, session_id, "release",
+            f"Released from session '{released['session_name']}'"
         )
-        db.add(event)
-        db.commit()
         
         return {
             "message": "Device released successfully",
-            "device_hw_addr": device.hw_addr
+            "device_hw_addr": released["hw_addr"]
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error releasing device: {e}")
-        db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/sessions/{session_id}/end")
-async def end_session(session_id: int, db: Session = Depends(get_db_session)):
+async def end_session(session_id: int, database: DatabaseAccess = Depends(get_leadville_db)):
     """End a session and release all its devices"""
     try:
-        session = db.query(ActiveSession).filter(ActiveSession.id == session_id).first()
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        if session.status == SessionStatus.ended:
-            raise HTTPException(status_code=400, detail="Session already ended")
-        
-        # Release all active leases
-        active_leases = db.query(DeviceLease).filter(
-            and_(DeviceLease.session_id == session_id, DeviceLease.released_at.is_(None))
-        ).all()
-        
-        released_count = 0
-        for lease in active_leases:
-            lease.released_at = func.now()
-            lease.device.status = "available"
-            released_count += 1
-            
-            # Log release event
-            event = DevicePoolEvent(
-                device_id=lease.device_id,
-                session_id=session_id,
-                event_type="release",
-                event_data=f"Auto-released when session ended"
-            )
-            db.add(event)
+        def _apply(db: Session):
+            session = db.query(ActiveSession).filter(ActiveSession.id == session_id).first()
+            if not session:
+                raise HTTPException(status_code=404, detail="Session not found")
+        
+            if session.status == SessionStatus.ended:
+                raise HTTPException(status_code=400, detail="Session already ended")
+        
+            # Release all active leases
+            active_leases = db.query(DeviceLease).filter(
+                and_(DeviceLease.session_id == session_id, DeviceLease.released_at.is_(None))
+            ).all()
+        
+            released = []
+            for lease in active_leases:
+                lease.released_at = func.now()
+                lease.device.status = "available"
+                released.append(lease.device_id)
+        
+            # End session
+            session.status = "ended"
+            session.ended_at = func.now()
+        
+            return released
         
-        # End session
-        session.status = "ended"
-        session.ended_at = func.now()
+        released = await database.write_orm(_apply)
         
-        db.commit()
+        # Log the release events
+        event_log = pool_event_log(database)
+        for device_id in released:
+            event_log.append(device_id, session_id, "release", "Auto-released when session ended")
         
         return {
             "message": "Session ended successfully",
-            "devices_released": released_count
+            "devices_released": len(released)
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error ending session: {e}")
-        db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/sessions/{session_id}/devices")
-async def get_session_devices(session_id: int, db: Session = Depends(get_db_session)):
+async def get_session_devices(session_id: int, database: DatabaseAccess = Depends(get_leadville_db)):
     """Get all devices currently leased to a session"""
     try:
-        session = db.query(ActiveSession).filter(ActiveSession.id == session_id).first()
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-        
-        # Get active leases
-        leases = db.query(DeviceLease).filter(
-            and_(DeviceLease.session_id == session_id, DeviceLease.released_at.is_(None))
-        ).all()
+        def _query(db: Session):
+            session = db.query(ActiveSession).filter(ActiveSession.id == session_id).first()
+            if not session:
+                raise HTTPException(status_code=404, detail="Session not found")
+        
+            # Get active leases
+            leases = db.query(DeviceLease).filter(
+                and_(DeviceLease.session_id == session_id, DeviceLease.released_at.is_(None))
+            ).all()
+        
+            return {
+                "session_id": session_id,
+                "session_name": session.session_name,
+                "session_status": session.status,
+                "devices": [
+                    {
+                        "lease_id": lease.id,
+                        "device_id": lease.device.id,
+                        "hw_addr": lease.device.hw_addr,
+                        "device_type": lease.device.device_type,
+                        "label": lease.device.label,
+                        "target_assignment": lease.target_assignment,
+                        "is_connected": lease.is_connected,
+                        "leased_at": lease.leased_at.isoformat(),
+                        "connection_attempts": lease.connection_attempts,
+                        "last_connection_attempt": lease.last_connection_attempt.isoformat() if lease.last_connection_attempt else None
+                    }
+                    for lease in leases
+                ]
+            }
         
-        return {
-            "session_id": session_id,
-            "session_name": session.session_name,
-            "session_status": session.status,
-            "devices": [
-                {
-                    "lease_id": lease.id,
-                    "device_id": lease.device.id,
-                    "hw_addr": lease.device.hw_addr,
-                    "device_type": lease.device.device_type,
-                    "label": lease.device.label,
-                    "target_assignment": lease.target_assignment,
-                    "is_connected": lease.is_connected,
-                    "leased_at": lease.leased_at.isoformat(),
-                    "connection_attempts": lease.connection_attempts,
-                    "last_connection_attempt": lease.last_connection_attempt.isoformat() if lease.last_connection_attempt else None
-                }
-                for lease in leases
-            ]
-        }
+        return await database.read_orm(_query)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting session devices: {e}")
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Bounded, priority-ordered lanes for capture writers.
+
+Raw motion samples, status updates, impacts and timer events used to share one
+unbounded ``asyncio.Queue``. PriorityLanes keeps one bounded lane per class of
+item and always drains the most important lane first:
+
+    event  (timer, impact)  - never shed while there is room, drop-oldest when full
+    status (device status)  - drop-oldest when full (newer status supersedes)
+    sample (raw motion)     - shedding policy under pressure:
+        drop      - reject new samples while the lane is full
+        decimate  - above the high watermark keep only every Nth sample
+        spill     - write samples that do not fit to an NDJSON spill file
+
+Per-lane metrics cover depth, shed/spill counts and end-to-end latency from
+enqueue to ``record_written`` (i.e. the DB commit).
+
+Producers call ``put_nowait(item)`` from the event loop thread (BLE callbacks);
+the writer awaits ``get_batch()``. ``put_nowait(None)`` closes the lanes.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LANE_EVENT = 'event'
+LANE_STATUS = 'status'
+LANE_SAMPLE = 'sample'
+
+SHED_POLICIES = ('drop', 'decimate', 'spill')
+
+# (lane, item, enqueue time ns)
+LaneEntry = Tuple[str, Any, int]
+
+
+def classify_item(item: Dict[str, Any]) -> str:
+    """Lane for a capture writer item"""
+    if 'timer' in item or 'impact' in item:
+        return LANE_EVENT
+    if 'status' in item:
+        return LANE_STATUS
+    return LANE_SAMPLE
+
+
+@dataclass
+class LaneStats:
+    enqueued: int = 0
+    written: int = 0
+    shed: int = 0
+    spilled: int = 0
+    max_depth: int = 0
+    latency_total_ns: int = 0
+    latency_max_ns: int = 0
+
+    def to_dict(self, depth: int, capacity: int) -> Dict[str, Any]:
+        return {
+            'depth': depth,
+            'capacity': capacity,
+            'max_depth': self.max_depth,
+            'enqueued': self.enqueued,
+            'written': self.written,
+            'shed': self.shed,
+            'spilled': self.spilled,
+            'latency_avg_ms': round(self.latency_total_ns / self.written / 1e6, 2) if self.written else 0.0,
+            'latency_max_ms': round(self.latency_max_ns / 1e6, 2),
+        }
+
+
+@dataclass
+class _Lane:
+    name: str
+    capacity: int
+    items: Deque[LaneEntry] = field(default_factory=deque)
+    stats: LaneStats = field(default_factory=LaneStats)
+
+
+class PriorityLanes:
+    """Bounded priority lanes with a shedding policy for raw samples"""
+
+    def __init__(self, event_size: int = 10000, status_size: int = 1000, sample_size: int = 5000,
+                 shed_policy: str = 'drop', decimate_factor: int = 4, high_watermark: float = 0.8,
+                 spill_path: Optional[str] = None):
+        if shed_policy not in SHED_POLICIES:
+            raise ValueError(f"shed_policy must be one of {SHED_POLICIES}")
+        if shed_policy == 'spill' and not spill_path:
+            raise ValueError("spill policy requires spill_path")
+        # Highest priority first
+        self._lanes: Dict[str, _Lane] = {
+            LANE_EVENT: _Lane(LANE_EVENT, event_size),
+            LANE_STATUS: _Lane(LANE_STATUS, status_size),
+            LANE_SAMPLE: _Lane(LANE_SAMPLE, sample_size),
+        }
+        self.shed_policy = shed_policy
+        self.decimate_factor = max(2, decimate_factor)
+        self.high_watermark = int(sample_size * high_watermark)
+        self.spill_path = spill_path
+        self._spill_file = None
+        self._decimate_counter = 0
+        self._closed = False
+        self._not_empty = asyncio.Event()
+
+    # Producer side -------------------------------------------------------
+
+    def put_nowait(self, item: Optional[Dict[str, Any]]) -> bool:
+        """Enqueue an item into its lane; returns False if it was shed"""
+        if item is None:
+            self.close()
+            return False
+        lane = self._lanes[classify_item(item)]
+        entry = (lane.name, item, time.monotonic_ns())
+
+        if lane.name == LANE_SAMPLE:
+            if not self._admit_sample(lane, item):
+                return False
+        elif len(lane.items) >= lane.capacity:
+            lane.items.popleft()
+            lane.stats.shed += 1
+            if lane.name == LANE_EVENT:
+                logger.error("event lane full, dropping oldest event")
+
+        lane.items.append(entry)
+        lane.stats.enqueued += 1
+        if len(lane.items) > lane.stats.max_depth:
+            lane.stats.max_depth = len(lane.items)
+        self._not_empty.set()
+        return True
+
+    def _admit_sample(self, lane: _Lane, item: Dict[str, Any]) -> bool:
+        depth = len(lane.items)
+        if self.shed_policy == 'decimate' and depth >= self.high_watermark:
+            self._decimate_counter += 1
+            if self._decimate_counter % self.decimate_factor:
+                lane.stats.shed += 1
+                return False
+        if depth < lane.capacity:
+            return True
+        if self.shed_policy == 'spill':
+            self._spill(item)
+            lane.stats.spilled += 1
+        else:
+            lane.stats.shed += 1
+        return False
+
+    def _spill(self, item: Dict[str, Any]) -> None:
+        try:
+            if self._spill_file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.spill_path)), exist_ok=True)
+                self._spill_file = open(self.spill_path, 'a', encoding='utf-8')
+            self._spill_file.write(json.dumps(item, default=str) + '\n')
+        except Exception as e:
+            logger.error(f"spill to {self.spill_path} failed: {e}")
+
+    def close(self) -> None:
+        """No more items; get_batch() returns [] once drained"""
+        self._closed = True
+        self._not_empty.set()
+
+    # Consumer side -------------------------------------------------------
+
+    def qsize(self) -> int:
+        return sum(len(lane.items) for lane in self._lanes.values())
+
+    async def get_batch(self, max_items: int = 50, linger: float = 0.0) -> List[LaneEntry]:
+        """Wait for items and return up to ``max_items`` in priority order.
+
+        With ``linger`` the writer waits that long for a fuller batch unless
+        an event is pending. Returns [] once closed and drained.
+        """
+        while not self.qsize():
+            if self._closed:
+                return []
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        if linger > 0 and self.qsize() < max_items and not self._closed \
+                and not self._lanes[LANE_EVENT].items:
+            await asyncio.sleep(linger)
+
+        batch: List[LaneEntry] = []
+        for lane in self._lanes.values():
+            while lane.items and len(batch) < max_items:
+                batch.append(lane.items.popleft())
+        return batch
+
+    def record_written(self, batch: List[LaneEntry]) -> None:
+        """Account a committed batch (end-to-end latency per lane)"""
+        now = time.monotonic_ns()
+        for lane_name, _, enqueued_ns in batch:
+            stats = self._lanes[lane_name].stats
+            latency = now - enqueued_ns
+            stats.written += 1
+            stats.latency_total_ns += latency
+            if latency > stats.latency_max_ns:
+                stats.latency_max_ns = latency
+        if self._spill_file is not None:
+            self._spill_file.flush()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {name: lane.stats.to_dict(len(lane.items), lane.capacity)
+                for name, lane in self._lanes.items()}
+
+    def close_spill(self) -> None:
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
@@ -0,0 +1,479 @@
+"""Single-decode, multi-consumer pipeline for BT50 notifications.
+
+Each BLE notification is decoded exactly once into a compact ``SampleBlock``
+(NumPy columns instead of one dict per sample). Baseline correction is applied
+in place on the block and the same block is then handed to every registered
+consumer (shot detector, enhanced impact detector, sample logger, live chart
+buffer, MQTT telemetry). Consumers can be enabled/disabled at runtime and the
+CPU time spent in every stage is tracked for performance monitoring.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Flag 0x61 frame: 0x55 0x61 + 13 little-endian int16 registers
+FLAG61_HEADER = b"\x55\x61"
+FLAG61_FRAME_LEN = 28
+FLAG61_REGISTERS = 13
+FLAG61_DTYPE = np.dtype("<i2")
+
+# Register order inside a flag 0x61 frame (matches bt50_samples columns)
+REGISTER_FIELDS = (
+    "vx", "vy", "vz",
+    "angle_x", "angle_y", "angle_z",
+    "temp_raw",
+    "disp_x", "disp_y", "disp_z",
+    "freq_x", "freq_y", "freq_z",
+)
+
+# Same counts -> g scale as wtvb_parse_simple.DEFAULT_SCALE
+DEFAULT_SCALE = 0.000902
+
+Consumer = Callable[["SampleBlock"], Any]
+
+
+def find_flag61_offsets(payload: bytes) -> List[int]:
+    """Return the offsets of every complete flag 0x61 frame in ``payload``.
+
+    Mirrors the framing rules of ``wtvb_parse.scan_and_parse``: scanning
+    stops at the first header without enough bytes behind it.
+    """
+    offsets: List[int] = []
+    end = len(payload)
+    i = payload.find(FLAG61_HEADER)
+    while i != -1:
+        if i + FLAG61_FRAME_LEN > end:
+            break
+        offsets.append(i)
+        i = payload.find(FLAG61_HEADER, i + FLAG61_FRAME_LEN)
+    return offsets
+
+
+class SampleBlock:
+    """Decoded samples from one notification, stored column-wise.
+
+    Attributes:
+        sensor_mac: Source sensor address
+        payload: Original notification bytes (frames are referenced, not copied)
+        offsets: Frame start offsets inside ``payload``
+        ts_ns: Per-sample timestamps (int64, wall clock ns)
+        registers: (n, 13) int16 register matrix in ``REGISTER_FIELDS`` order
+        values: (n, 3) float64 scaled X/Y/Z, baseline-corrected in place
+        baseline: Baseline subtracted from ``values`` (None until corrected)
+    """
+
+    __slots__ = (
+        "sensor_mac", "payload", "offsets", "ts_ns", "registers",
+        "values", "baseline", "scale", "_magnitude",
+    )
+
+    def __init__(self, sensor_mac: str, payload: bytes, offsets: List[int],
+                 ts_ns: np.ndarray, registers: np.ndarray, scale: float = DEFAULT_SCALE) -> None:
+        self.sensor_mac = sensor_mac
+        self.payload = payload
+        self.offsets = offsets
+        self.ts_ns = ts_ns
+        self.registers = registers
+        self.scale = scale
+        self.values = registers[:, :3] * scale
+        self.baseline: Optional[Tuple[float, float, float]] = None
+        self._magnitude: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.ts_ns)
+
+    @property
+    def raw(self) -> np.ndarray:
+        """Raw X/Y/Z counts (view into ``registers``)"""
+        return self.registers[:, :3]
+
+    @property
+    def corrected(self) -> bool:
+        return self.baseline is not None
+
+    def apply_baseline(self, baseline: Tuple[float, float, float]) -> None:
+        """Subtract ``baseline`` from ``values`` in place"""
+        np.subtract(self.values, baseline, out=self.values)
+        self.baseline = baseline
+        self._magnitude = None
+
+    def magnitude(self) -> np.ndarray:
+        """Per-sample vector magnitude of ``values`` (computed once, cached)"""
+        if self._magnitude is None:
+            v = self.values
+            self._magnitude = np.sqrt(np.einsum("ij,ij->i", v, v))
+        return self._magnitude
+
+    def frame(self, index: int) -> bytes:
+        """Raw bytes of the frame behind sample ``index``"""
+        start = self.offsets[index]
+        return self.payload[start:start + FLAG61_FRAME_LEN]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Legacy per-sample dict view (same keys as ``parse_5561`` plus corrections)"""
+        samples = []
+        scale = self.scale
+        for i in range(len(self)):
+            vx_raw, vy_raw, vz_raw = (int(v) for v in self.registers[i, :3])
+            sample = {
+                'vx': vx_raw * scale,
+                'vy': vy_raw * scale,
+                'vz': vz_raw * scale,
+                'vx_raw': vx_raw,
+                'vy_raw': vy_raw,
+                'vz_raw': vz_raw,
+                'raw': (vx_raw, vy_raw, vz_raw),
+                'parser': 'flag61',
+                'timestamp': self.ts_ns[i] / 1e9,
+            }
+            if self.corrected:
+                sample['vx_corrected'] = float(self.values[i, 0])
+                sample['vy_corrected'] = float(self.values[i, 1])
+                sample['vz_corrected'] = float(self.values[i, 2])
+            samples.append(sample)
+        return samples
+
+
+def decode_block(sensor_mac: str, payload: bytes, ts_ns: Optional[int] = None,
+                 scale: float = DEFAULT_SCALE) -> Optional[SampleBlock]:
+    """Decode every flag 0x61 frame in ``payload`` into one ``SampleBlock``.
+
+    All samples of a notification share the receive timestamp, which matches
+    what the per-sample path did with ``time.time()``.
+    """
+    if not payload:
+        return None
+    offsets = find_flag61_offsets(payload)
+    if not offsets:
+        return None
+
+    count = len(offsets)
+    contiguous = offsets[-1] - offsets[0] == (count - 1) * FLAG61_FRAME_LEN
+    if contiguous:
+        # Common case: back-to-back frames -> one strided view, one copy
+        frames = np.frombuffer(payload, dtype=np.uint8, count=count * FLAG61_FRAME_LEN,
+                               offset=offsets[0]).reshape(count, FLAG61_FRAME_LEN)
+        registers = frames[:, 2:].copy().view(FLAG61_DTYPE)
+    else:
+        registers = np.empty((count, FLAG61_REGISTERS), dtype=FLAG61_DTYPE)
+        for row, start in enumerate(offsets):
+            registers[row] = np.frombuffer(payload, dtype=FLAG61_DTYPE,
+                                           count=FLAG61_REGISTERS, offset=start + 2)
+
+    stamp = time.time_ns() if ts_ns is None else ts_ns
+    timestamps = np.full(count, stamp, dtype=np.int64)
+    return SampleBlock(sensor_mac, payload, offsets, timestamps, registers, scale)
+
+
+@dataclass
+class StageStats:
+    """CPU time accounting for one pipeline stage"""
+    calls: int = 0
+    samples: int = 0
+    errors: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+    def record(self, elapsed_ns: int, samples: int) -> None:
+        self.calls += 1
+        self.samples += samples
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'samples': self.samples,
+            'errors': self.errors,
+            'total_ms': round(self.total_ns / 1e6, 3),
+            'avg_us': round(self.total_ns / self.calls / 1e3, 3) if self.calls else 0.0,
+            'max_us': round(self.max_ns / 1e3, 3),
+        }
+
+
+class _ConsumerSlot:
+    __slots__ = ("name", "consumer", "enabled", "stats")
+
+    def __init__(self, name: str, consumer: Consumer, enabled: bool) -> None:
+        self.name = name
+        self.consumer = consumer
+        self.enabled = enabled
+        self.stats = StageStats()
+
+
+class SamplePipeline:
+    """Decode -> baseline correction -> fan-out to registered consumers.
+
+    Consumers are called in registration order with the same ``SampleBlock``;
+    they must treat it as read-only. A failing consumer is logged and counted
+    but never stops the others.
+    """
+
+    DECODE_STAGE = "decode"
+    BASELINE_STAGE = "baseline"
+
+    def __init__(self, scale: float = DEFAULT_SCALE) -> None:
+        self.scale = scale
+        self._baselines: Dict[str, Tuple[float, float, float]] = {}
+        self._default_baseline: Optional[Tuple[float, float, float]] = None
+        self._consumers: List[_ConsumerSlot] = []
+        self._stage_stats: Dict[str, StageStats] = {
+            self.DECODE_STAGE: StageStats(),
+            self.BASELINE_STAGE: StageStats(),
+        }
+        self.blocks_processed = 0
+        self.empty_notifications = 0
+
+    # Baselines
+
+    def set_baseline(self, sensor_mac: str, x: float, y: float, z: float) -> None:
+        """Set the calibrated baseline used for ``sensor_mac``"""
+        self._baselines[sensor_mac] = (float(x), float(y), float(z))
+
+    def set_default_baseline(self, x: float, y: float, z: float) -> None:
+        """Baseline for sensors without a per-sensor calibration"""
+        self._default_baseline = (float(x), float(y), float(z))
+
+    def remove_baseline(self, sensor_mac: str) -> None:
+        self._baselines.pop(sensor_mac, None)
+
+    def clear_baselines(self) -> None:
+        self._baselines.clear()
+        self._default_baseline = None
+
+    def get_baseline(self, sensor_mac: str) -> Optional[Tuple[float, float, float]]:
+        return self._baselines.get(sensor_mac, self._default_baseline)
+
+    # Consumers
+
+    def register_consumer(self, name: str, consumer: Consumer, enabled: bool = True) -> None:
+        """Register ``consumer`` under ``name`` (replaces an existing one)"""
+        for slot in self._consumers:
+            if slot.name == name:
+                slot.consumer = consumer
+                slot.enabled = enabled
+                return
+        self._consumers.append(_ConsumerSlot(name, consumer, enabled))
+
+    def unregister_consumer(self, name: str) -> bool:
+        for i, slot in enumerate(self._consumers):
+            if slot.name == name:
+                del self._consumers[i]
+                return True
+        return False
+
+    def set_consumer_enabled(self, name: str, enabled: bool) -> bool:
+        """Enable or disable a consumer at runtime; returns False if unknown"""
+        for slot in self._consumers:
+            if slot.name == name:
+                slot.enabled = enabled
+                logger.info(f"Sample pipeline consumer '{name}' {'enabled' if enabled else 'disabled'}")
+                return True
+        return False
+
+    def enable_consumer(self, name: str) -> bool:
+        return self.set_consumer_enabled(name, True)
+
+    def disable_consumer(self, name: str) -> bool:
+        return self.set_consumer_enabled(name, False)
+
+    def is_consumer_enabled(self, name: str) -> bool:
+        return any(slot.name == name and slot.enabled for slot in self._consumers)
+
+    def list_consumers(self) -> Dict[str, bool]:
+        return {slot.name: slot.enabled for slot in self._consumers}
+
+    # Processing
+
+    def process(self, sensor_mac: str, payload: bytes, ts_ns: Optional[int] = None) -> Optional[SampleBlock]:
+        """Run one notification through every stage.
+
+        Returns the corrected ``SampleBlock`` or None if the payload held no
+        complete frames.
+        """
+        clock = time.thread_time_ns
+
+        start = clock()
+        block = decode_block(sensor_mac, payload, ts_ns=ts_ns, scale=self.scale)
+        if block is None:
+            self.empty_notifications += 1
+            self._stage_stats[self.DECODE_STAGE].record(clock() - start, 0)
+            return None
+        count = len(block)
+        mark = clock()
+        self._stage_stats[self.DECODE_STAGE].record(mark - start, count)
+
+        baseline = self._baselines.get(sensor_mac, self._default_baseline)
+        if baseline is not None:
+            block.apply_baseline(baseline)
+            now = clock()
+            self._stage_stats[self.BASELINE_STAGE].record(now - mark, count)
+            mark = now
+
+        for slot in self._consumers:
+            if not slot.enabled:
+                continue
+            try:
+                slot.consumer(block)
+            except Exception as e:
+                slot.stats.errors += 1
+                logger.error(f"Sample pipeline consumer '{slot.name}' failed: {e}")
+            now = clock()
+            slot.stats.record(now - mark, count)
+            mark = now
+
+        self.blocks_processed += 1
+        return block
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-stage CPU time and consumer state"""
+        stages = {name: stats.to_dict() for name, stats in self._stage_stats.items()}
+        for slot in self._consumers:
+            entry = slot.stats.to_dict()
+            entry['enabled'] = slot.enabled
+            stages[slot.name] = entry
+        return {
+            'blocks_processed': self.blocks_processed,
+            'empty_notifications': self.empty_notifications,
+            'stages': stages,
+        }
+
+    def reset_stats(self) -> None:
+        self._stage_stats = {name: StageStats() for name in self._stage_stats}
+        for slot in self._consumers:
+            slot.stats = StageStats()
+        self.blocks_processed = 0
+        self.empty_notifications = 0
+
+
+class LiveChartBuffer:
+    """Per-sensor fixed-size ring of recent corrected samples for live charts"""
+
+    def __init__(self, capacity: int = 500) -> None:
+        self.capacity = capacity
+        self._rings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._heads: Dict[str, int] = {}
+        self._counts: Dict[str, int] = {}
+
+    def _ring(self, sensor_mac: str) -> Tuple[np.ndarray, np.ndarray]:
+        ring = self._rings.get(sensor_mac)
+        if ring is None:
+            # columns: x, y, z, magnitude
+            ring = (np.zeros(self.capacity, dtype=np.int64),
+                    np.zeros((self.capacity, 4), dtype=np.float64))
+            self._rings[sensor_mac] = ring
+            self._heads[sensor_mac] = 0
+            self._counts[sensor_mac] = 0
+        return ring
+
+    def __call__(self, block: SampleBlock) -> None:
+        ts_ring, val_ring = self._ring(block.sensor_mac)
+        n = len(block)
+        if n >= self.capacity:
+            start = n - self.capacity
+            ts_ring[:] = block.ts_ns[start:]
+            val_ring[:, :3] = block.values[start:]
+            val_ring[:, 3] = block.magnitude()[start:]
+            self._heads[block.sensor_mac] = 0
+            self._counts[block.sensor_mac] = self.capacity
+            return
+        head = self._heads[block.sensor_mac]
+        idx = (np.arange(n) + head) % self.capacity
+        ts_ring[idx] = block.ts_ns
+        val_ring[idx, :3] = block.values
+        val_ring[idx, 3] = block.magnitude()
+        self._heads[block.sensor_mac] = (head + n) % self.capacity
+        self._counts[block.sensor_mac] = min(self._counts[block.sensor_mac] + n, self.capacity)
+
+    def snapshot(self, sensor_mac: str, count: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return up to ``count`` most recent samples, oldest first"""
+        if sensor_mac not in self._rings:
+            return []
+        ts_ring, val_ring = self._rings[sensor_mac]
+        available = self._counts[sensor_mac]
+        count = available if count is None else min(count, available)
+        head = self._heads[sensor_mac]
+        idx = (np.arange(head - count, head)) % self.capacity
+        return [
+            {'ts_ns': int(ts_ring[i]), 'x': float(val_ring[i, 0]), 'y': float(val_ring[i, 1]),
+             'z': float(val_ring[i, 2]), 'magnitude': float(val_ring[i, 3])}
+            for i in idx
+        ]
+
+    def sensors(self) -> List[str]:
+        return list(self._rings)
+
+
+class SampleDbLogger:
+    """Consumer persisting decoded frames to ``bt50_samples`` in one transaction per block"""
+
+    def __init__(self, db_path: Optional[Any] = None) -> None:
+        from .ble import wtvb_parse
+        self._wtvb_parse = wtvb_parse
+        self.db_path = db_path or wtvb_parse.DB_PATH
+        self.rows_written = 0
+
+    def __call__(self, block: SampleBlock) -> None:
+        self.write_blocks([block])
+
+    def write_blocks(self, blocks: List[SampleBlock], window_tag: Optional[str] = None) -> None:
+        """Write several blocks in one transaction, optionally tagged with a capture window"""
+        rows = [
+            (int(block.ts_ns[i]), block.frame(i).hex(), "flag61", *block.registers[i].tolist())
+            for block in blocks
+            for i in range(len(block))
+        ]
+        self._wtvb_parse.write_db_rows(rows, path=self.db_path, window_tag=window_tag)
+        self.rows_written += len(rows)
+
+
+class GatedSampleLogger:
+    """Consumer persisting blocks only inside impact/string windows.
+
+    Blocks wait in a per-sensor pre-trigger ring (see ``event_capture``); the
+    bridge calls ``capture.trigger()`` when a detector fires and
+    ``capture.start_string()``/``stop_string()`` on timer START/STOP.
+    """
+
+    def __init__(self, db_logger: Optional[SampleDbLogger] = None,
+                 pre_ms: float = 500.0, post_ms: float = 500.0) -> None:
+        from .event_capture import EventGatedCapture
+        self.db_logger = db_logger or SampleDbLogger()
+        self.capture = EventGatedCapture(self._write, pre_ms=pre_ms, post_ms=post_ms)
+
+    def __call__(self, block: SampleBlock) -> None:
+        self.capture.feed(block.sensor_mac, int(block.ts_ns[-1]), block)
+
+    def _write(self, sensor_mac: str, blocks: List[SampleBlock], window_tag: str) -> None:
+        self.db_logger.write_blocks(blocks, window_tag=window_tag)
+
+
+class MqttTelemetryConsumer:
+    """Consumer publishing a per-block telemetry summary over MQTT"""
+
+    def __init__(self, mqtt_client: Any) -> None:
+        self.mqtt_client = mqtt_client
+        self.published = 0
+
+    def __call__(self, block: SampleBlock) -> None:
+        if not getattr(self.mqtt_client, 'connected', False):
+            return
+        magnitude = block.magnitude()
+        peak = int(np.argmax(magnitude))
+        sensor_id = block.sensor_mac.replace(':', '')
+        if self.mqtt_client.publish_sensor_telemetry(sensor_id, {
+            'ts_ns': int(block.ts_ns[-1]),
+            'samples': len(block),
+            'peak_magnitude': float(magnitude[peak]),
+            'peak': [float(v) for v in block.values[peak]],
+        }):
+            self.published += 1
@@ -3,10 +3,12 @@ Real-time shot detection for BT50 sensor data.
 Based on analysis showing 6 shots with 150 count threshold and 6-11 sample duration.
 """
 import time
-from typing import Optional, List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 from dataclasses import dataclass
 import logging
 
+import numpy as np
+
 @dataclass
 class ShotEvent:
     """Represents a detected shot event"""
@@ -74,6 +76,9 @@ class ShotDetector:
         # History for validation
         self.recent_shots: List[ShotEvent] = []
         
+        # Optional state-transition hook: trace(event, detail)
+        self.trace: Optional[Callable[[str, str], None]] = None
+        
         self.logger = logging.getLogger(__name__)
         
     def reset(self):
@@ -114,8 +119,12 @@ class ShotDetector:
                 self.shot_start_sample = self.sample_count
                 self.shot_values = [x_raw]
                 self.logger.debug(f"Shot start at sample {self.sample_count}, deviation: {deviation}")
+                if self.trace:
+                    self.trace('start', f"sample={self.sample_count} deviation={deviation}")
             else:
                 self.logger.debug(f"Shot rejected - too soon after last shot ({timestamp - self.last_shot_time:.1f}s)")
+                if self.trace:
+                    self.trace('too_soon', f"{timestamp - self.last_shot_time:.3f}s")
                 
         elif self.in_shot and exceeds_threshold:
             # Continue existing shot
@@ -124,48 +133,141 @@ class ShotDetector:
             # Check for maximum duration exceeded
             duration = len(self.shot_values)
             if duration > self.max_duration:
-                self.logger.debug(f"Shot rejected - too long ({duration} samples)")
-                self._reset_shot_state()
+                self._reject_too_long()
                 
         elif self.in_shot and not exceeds_threshold:
             # End of shot - validate and create event
-            duration = len(self.shot_values)
-            
-            if duration >= self.min_duration:
-                # Valid shot detected!
-                self.shot_count += 1
-                max_deviation = max(abs(x - self.baseline_x) for x in self.shot_values)
-                
-                shot_event = ShotEvent(
-                    shot_id=self.shot_count,
-                    start_sample=self.shot_start_sample,
-                    end_sample=self.shot_start_sample + duration - 1,
-                    duration_samples=duration,
-                    max_deviation=max_deviation,
-                    timestamp=timestamp,
-                    x_values=self.shot_values.copy()
-                )
-                
-                self.recent_shots.append(shot_event)
-                self.last_shot_time = timestamp
-                
-                # Keep only last 10 shots in memory
-                if len(self.recent_shots) > 10:
-                    self.recent_shots.pop(0)
-                    
-                self.logger.info(f"Shot {self.shot_count} detected: "
-                               f"samples {shot_event.start_sample}-{shot_event.end_sample}, "
-                               f"duration {duration}, max deviation {max_deviation}")
-                
-                self._reset_shot_state()
-                return shot_event
-            else:
-                self.logger.debug(f"Shot rejected - too short ({duration} samples)")
-                self._reset_shot_state()
+            return self._finish_shot(self.sample_count, timestamp)
         
         # No shot event
         return None
     
+    def process_samples(self, x_values: np.ndarray, timestamps_ns: np.ndarray) -> List[ShotEvent]:
+        """
+        Process a block of X-axis samples and detect shots
+        
+        Equivalent to calling process_sample() for every sample with
+        timestamp=timestamps_ns/1e9, but finds threshold runs vectorized and
+        only walks the (rare) runs in Python. Shot state carries over between
+        blocks.
+        
+        Args:
+            x_values: X-axis values (same units/baseline as process_sample)
+            timestamps_ns: Integer nanosecond timestamps, one per sample
+            
+        Returns:
+            List of ShotEvents completed within this block
+        """
+        x = np.asarray(x_values)
+        n = len(x)
+        if n == 0:
+            return []
+        base_count = self.sample_count
+        self.sample_count += n
+        
+        # Fast path: quiet block and no shot in progress (list max/min beats
+        # NumPy reductions for notification-sized blocks)
+        if not self.in_shot:
+            xs = x.tolist()
+            if max(xs) - self.baseline_x < self.threshold and self.baseline_x - min(xs) < self.threshold:
+                return []
+        
+        ts = np.asarray(timestamps_ns) / 1e9
+        exceeds = np.abs(x - self.baseline_x) >= self.threshold
+        # Run boundaries: starts where a run of exceeding samples begins,
+        # ends at the first non-exceeding sample after it (or n)
+        edges = np.diff(exceeds.astype(np.int8), prepend=0, append=0)
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.flatnonzero(edges == -1)
+        
+        events: List[ShotEvent] = []
+        
+        # A shot carried over from the previous block ends at sample 0
+        if self.in_shot and not exceeds[0]:
+            event = self._finish_shot(base_count + 1, float(ts[0]))
+            if event:
+                events.append(event)
+        
+        for start, end in zip(run_starts.tolist(), run_ends.tolist()):
+            i = start
+            while i < end:
+                if not self.in_shot:
+                    # Start at the first sample satisfying the minimum interval
+                    allowed = np.flatnonzero(ts[i:end] - self.last_shot_time >= self.min_interval_seconds)
+                    if len(allowed) == 0:
+                        self.logger.debug(f"Shot rejected - too soon after last shot ({ts[end - 1] - self.last_shot_time:.1f}s)")
+                        if self.trace:
+                            self.trace('too_soon', f"{ts[end - 1] - self.last_shot_time:.3f}s")
+                        break
+                    i += int(allowed[0])
+                    self.in_shot = True
+                    self.shot_start_sample = base_count + i + 1
+                    self.shot_values = []
+                    self.logger.debug(f"Shot start at sample {self.shot_start_sample}, "
+                                      f"deviation: {abs(x[i] - self.baseline_x)}")
+                    if self.trace:
+                        self.trace('start', f"sample={self.shot_start_sample} "
+                                            f"deviation={abs(x[i] - self.baseline_x)}")
+                
+                # Extend the shot until the run ends or it grows past max_duration
+                room = self.max_duration + 1 - len(self.shot_values)
+                take = min(room, end - i)
+                self.shot_values.extend(x[i:i + take].tolist())
+                i += take
+                if len(self.shot_values) > self.max_duration:
+                    self._reject_too_long()
+            
+            if self.in_shot and end < n:
+                event = self._finish_shot(base_count + end + 1, float(ts[end]))
+                if event:
+                    events.append(event)
+        
+        return events
+    
+    def _finish_shot(self, sample_number: int, timestamp: float) -> Optional[ShotEvent]:
+        """Validate the current shot when a below-threshold sample ends it"""
+        duration = len(self.shot_values)
+        if duration < self.min_duration:
+            self.logger.debug(f"Shot rejected - too short ({duration} samples)")
+            if self.trace:
+                self.trace('too_short', f"samples={duration}")
+            self._reset_shot_state()
+            return None
+        
+        self.shot_count += 1
+        max_deviation = max(abs(x - self.baseline_x) for x in self.shot_values)
+        shot_event = ShotEvent(
+            shot_id=self.shot_count,
+            start_sample=self.shot_start_sample,
+            end_sample=self.shot_start_sample + duration - 1,
+            duration_samples=duration,
+            max_deviation=max_deviation,
+            timestamp=timestamp,
+            x_values=self.shot_values.copy()
+        )
+        
+        self.recent_shots.append(shot_event)
+        self.last_shot_time = timestamp
+        if len(self.recent_shots) > 10:
+            self.recent_shots.pop(0)
+        
+        self.logger.info(f"Shot {self.shot_count} detected: "
+                         f"samples {shot_event.start_sample}-{shot_event.end_sample}, "
+                         f"duration {duration}, max deviation {max_deviation}")
+        if self.trace:
+            self.trace('shot', f"id={self.shot_count} samples={duration} max_deviation={max_deviation}")
+        
+        self._reset_shot_state()
+        return shot_event
+    
+    def _reject_too_long(self):
+        """Above threshold for longer than max_duration: the detector timed out"""
+        duration = len(self.shot_values)
+        self.logger.debug(f"Shot rejected - too long ({duration} samples)")
+        if self.trace:
+            self.trace('timeout', f"samples={duration} max={self.max_duration}")
+        self._reset_shot_state()
+    
     def _reset_shot_state(self):
         """Reset current shot tracking state"""
         self.in_shot = False
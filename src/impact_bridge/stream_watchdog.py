@@ -0,0 +1,241 @@
+"""Per-device notification stream watchdog.
+
+A BT50 that stays connected but stops notifying used to go unnoticed until
+``idle_reconnect_sec`` (5 minutes) ran out. ``StreamWatchdog`` learns each
+device's inter-notification interval and flags a stall within a few expected
+periods:
+
+* ``note(device, ts_ns)`` is the hot path, one call per notification. It
+  keeps an EWMA of the interval and of its squared deviation (the first
+  ``warmup`` intervals are a plain running mean so the estimate settles
+  quickly).
+* ``check(now_ns)`` runs from a timer. A device is stalled once the gap since
+  its last notification exceeds::
+
+      max(stall_periods * period, period + jitter_sigmas * jitter, min_stall_ms)
+
+  capped at ``max_stall_ms``, so bursty BLE connection events widen the
+  threshold and a steady stream narrows it. Stall gaps never feed the
+  estimate.
+* The first notification after a stall is the recovery.
+
+Transitions are dicts ready for MQTT/WebSocket. A stall transition carries
+``time_to_detect_ms``, measured from when the missed notification was due.
+A recovery carries ``time_to_recover_ms``, measured from detection. The
+bridge writes ``snapshot()`` to ``STATUS_FILE`` for the admin API
+(``read_status``).
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+STATE_OK = 'ok'
+STATE_STALLED = 'stalled'
+
+STATUS_FILE = 'stream_health.json'
+
+NS_PER_MS = 1_000_000
+
+
+class DeviceStream:
+    """Interval estimate, state and metrics for one device"""
+
+    __slots__ = ('device', 'last_ns', 'period_ns', 'var_ns2', 'intervals', 'notifications', 'state',
+                 'detected_ns', 'last_gap_ns', 'stalls', 'reconnects', 'last_reconnect_ns',
+                 'detect_ms', 'recover_ms')
+
+    def __init__(self, device: str, history: int) -> None:
+        self.device = device
+        self.last_ns: Optional[int] = None
+        self.period_ns = 0.0
+        self.var_ns2 = 0.0
+        self.intervals = 0
+        self.notifications = 0
+        self.state = STATE_OK
+        self.detected_ns: Optional[int] = None
+        self.last_gap_ns = 0
+        self.stalls = 0
+        self.reconnects = 0
+        self.last_reconnect_ns: Optional[int] = None
+        self.detect_ms: Deque[float] = deque(maxlen=history)
+        self.recover_ms: Deque[float] = deque(maxlen=history)
+
+    @property
+    def jitter_ns(self) -> float:
+        return math.sqrt(self.var_ns2)
+
+
+class StreamWatchdog:
+    """Stall detection from learned per-device notification intervals"""
+
+    def __init__(self, stall_periods: float = 4.0, jitter_sigmas: float = 6.0,
+                 min_stall_ms: float = 100.0, max_stall_ms: float = 2000.0,
+                 alpha: float = 0.02, warmup: int = 16,
+                 reconnect_backoff_ms: float = 5000.0, history: int = 50) -> None:
+        self.stall_periods = stall_periods
+        self.jitter_sigmas = jitter_sigmas
+        self.min_stall_ns = min_stall_ms * NS_PER_MS
+        self.max_stall_ns = max_stall_ms * NS_PER_MS
+        self.alpha = alpha
+        self.warmup = warmup
+        self.reconnect_backoff_ns = reconnect_backoff_ms * NS_PER_MS
+        self.history = history
+        self._streams: Dict[str, DeviceStream] = {}
+        self._pending: List[Dict[str, Any]] = []  # Recoveries seen by note(), reported by check()
+
+    # Hot path --------------------------------------------------------------
+
+    def note(self, device: str, ts_ns: int) -> None:
+        """One notification from ``device`` arrived at monotonic ``ts_ns``"""
+        stream = self._streams.get(device)
+        if stream is None:
+            stream = self._streams[device] = DeviceStream(device, self.history)
+        if stream.state == STATE_STALLED:
+            self._recover(stream, ts_ns)
+        elif stream.last_ns is not None:
+            gap = ts_ns - stream.last_ns
+            stream.intervals += 1
+            alpha = max(self.alpha, 1.0 / stream.intervals)
+            diff = gap - stream.period_ns
+            stream.period_ns += alpha * diff
+            stream.var_ns2 = (1.0 - alpha) * (stream.var_ns2 + alpha * diff * diff)
+        stream.last_ns = ts_ns
+        stream.notifications += 1
+
+    # Periodic checks ---------------------------------------------------------
+
+    def threshold_ns(self, device: str) -> Optional[float]:
+        """Gap that counts as a stall, or None until the interval is learned"""
+        stream = self._streams.get(device)
+        if stream is None or stream.intervals < self.warmup:
+            return None
+        return self._threshold(stream)
+
+    def _threshold(self, stream: DeviceStream) -> float:
+        threshold = max(self.stall_periods * stream.period_ns,
+                        stream.period_ns + self.jitter_sigmas * stream.jitter_ns,
+                        self.min_stall_ns)
+        return min(threshold, self.max_stall_ns)
+
+    def check(self, now_ns: int) -> List[Dict[str, Any]]:
+        """Flag new stalls; returns the transitions since the last check"""
+        transitions, self._pending = self._pending, []
+        for stream in self._streams.values():
+            if stream.state != STATE_OK or stream.intervals < self.warmup:
+                continue
+            gap = now_ns - stream.last_ns
+            threshold = self._threshold(stream)
+            if gap <= threshold:
+                continue
+            stream.state = STATE_STALLED
+            stream.detected_ns = now_ns
+            stream.last_gap_ns = gap
+            stream.stalls += 1
+            detect_ms = (gap - stream.period_ns) / NS_PER_MS
+            stream.detect_ms.append(detect_ms)
+            transitions.append(self._transition(stream, STATE_OK, gap_ms=round(gap / NS_PER_MS, 1),
+                                                threshold_ms=round(threshold / NS_PER_MS, 1),
+                                                time_to_detect_ms=round(detect_ms, 1)))
+        return transitions
+
+    def _recover(self, stream: DeviceStream, ts_ns: int) -> None:
+        recover_ms = (ts_ns - stream.detected_ns) / NS_PER_MS
+        stream.recover_ms.append(recover_ms)
+        stream.state = STATE_OK
+        self._pending.append(self._transition(stream, STATE_STALLED,
+                                              gap_ms=round((ts_ns - stream.last_ns) / NS_PER_MS, 1),
+                                              time_to_recover_ms=round(recover_ms, 1)))
+
+    def _transition(self, stream: DeviceStream, previous: str, **metrics: Any) -> Dict[str, Any]:
+        return {
+            'device_id': stream.device,
+            'state': stream.state,
+            'previous': previous,
+            'expected_period_ms': round(stream.period_ns / NS_PER_MS, 2),
+            'stalls': stream.stalls,
+            'reconnects': stream.reconnects,
+            **metrics,
+        }
+
+    # Reconnects --------------------------------------------------------------
+
+    def due_reconnects(self, now_ns: int) -> List[str]:
+        """Stalled devices whose last reconnect attempt is older than the backoff"""
+        return [stream.device for stream in self._streams.values()
+                if stream.state == STATE_STALLED
+                and (stream.last_reconnect_ns is None
+                     or now_ns - stream.last_reconnect_ns >= self.reconnect_backoff_ns)]
+
+    def note_reconnect(self, device: str, now_ns: int) -> None:
+        stream = self._streams.get(device)
+        if stream is not None:
+            stream.reconnects += 1
+            stream.last_reconnect_ns = now_ns
+
+    def forget(self, device: str) -> None:
+        """Stop watching a device (unassigned or disconnected on purpose)"""
+        self._streams.pop(device, None)
+
+    def state(self, device: str) -> Optional[str]:
+        stream = self._streams.get(device)
+        return stream.state if stream else None
+
+    # Reporting -----------------------------------------------------------------
+
+    def device_stats(self, device: str, now_ns: int) -> Dict[str, Any]:
+        stream = self._streams[device]
+        period_ms = stream.period_ns / NS_PER_MS
+        return {
+            'state': stream.state,
+            'armed': stream.intervals >= self.warmup,
+            'notifications': stream.notifications,
+            'rate_hz': round(1000.0 / period_ms, 1) if period_ms else None,
+            'period_ms': round(period_ms, 2),
+            'jitter_ms': round(stream.jitter_ns / NS_PER_MS, 2),
+            'threshold_ms': round(self._threshold(stream) / NS_PER_MS, 1),
+            'silent_ms': round((now_ns - stream.last_ns) / NS_PER_MS, 1) if stream.last_ns else None,
+            'stalls': stream.stalls,
+            'reconnects': stream.reconnects,
+            'time_to_detect_ms': _summary(stream.detect_ms),
+            'time_to_recover_ms': _summary(stream.recover_ms),
+        }
+
+    def snapshot(self, now_ns: int) -> Dict[str, Any]:
+        devices = {device: self.device_stats(device, now_ns) for device in self._streams}
+        return {
+            'devices': devices,
+            'stalled': [device for device, stats in devices.items() if stats['state'] == STATE_STALLED],
+            'stalls': sum(stats['stalls'] for stats in devices.values()),
+            'reconnects': sum(stats['reconnects'] for stats in devices.values()),
+        }
+
+    def write_status(self, status_dir: Path, now_ns: int, updated: str) -> Path:
+        """Write ``snapshot()`` for other processes (see ``read_status``)"""
+        status_dir = Path(status_dir)
+        status_dir.mkdir(parents=True, exist_ok=True)
+        path = status_dir / STATUS_FILE
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps({'updated': updated, **self.snapshot(now_ns)}), encoding='utf-8')
+        os.replace(tmp, path)
+        return path
+
+
+def _summary(values: Deque[float]) -> Dict[str, Any]:
+    if not values:
+        return {'last': None, 'mean': None, 'max': None}
+    return {'last': round(values[-1], 1), 'mean': round(sum(values) / len(values), 1),
+            'max': round(max(values), 1)}
+
+
+def read_status(status_dir: Path) -> Optional[Dict[str, Any]]:
+    """Last snapshot written by the running bridge, or None"""
+    try:
+        return json.loads((Path(status_dir) / STATUS_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
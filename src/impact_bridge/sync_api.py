@@ -0,0 +1,198 @@
+"""
+Head node side of bridge store-and-forward sync
+
+Bridges POST gzip batches of their outbound journal (see ``sync_journal``).
+Entries are upserted into ``synced_events`` keyed by (bridge_id, seq) and
+``sync_peers`` tracks the highest contiguous sequence held per bridge, which
+is what every response acknowledges. A batch that starts past that point is
+refused with 409 and the current ack, so the bridge rewinds and resends,
+unless it is flagged ``allow_gap`` (the bridge pruned the missing entries).
+
+Bridges send their journal epoch with ack lookups and batches. A new epoch
+(the bridge's journal was recreated and its sequence restarted) is stored
+after everything held so far: ``seq_offset`` is added to its sequence
+numbers, and acks are reported in the bridge's own numbering.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Optional, Set, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from .database.access import DatabaseAccess, get_leadville_db
+from .sync_journal import decode_batch
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/sync", tags=["Bridge Sync"])
+
+SYNC_SCHEMA = """
+CREATE TABLE IF NOT EXISTS synced_events (
+    bridge_id VARCHAR(50) NOT NULL,
+    seq INTEGER NOT NULL,
+    kind VARCHAR(20) NOT NULL,
+    ts_ns INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    received_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (bridge_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_synced_events_ts ON synced_events (ts_ns);
+CREATE TABLE IF NOT EXISTS sync_peers (
+    bridge_id VARCHAR(50) PRIMARY KEY,
+    acked_seq INTEGER NOT NULL,
+    events INTEGER NOT NULL DEFAULT 0,
+    batches INTEGER NOT NULL DEFAULT 0,
+    last_batch_at DATETIME,
+    epoch INTEGER,
+    seq_offset INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Columns added after the first release: (name, definition)
+SYNC_PEER_COLUMNS = [('epoch', 'INTEGER'), ('seq_offset', 'INTEGER NOT NULL DEFAULT 0')]
+
+_installed: Set[DatabaseAccess] = set()
+
+
+def install_sync_tables(conn) -> None:
+    for statement in SYNC_SCHEMA.split(';'):
+        if statement.strip():
+            conn.execute(statement)
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(sync_peers)")}
+    for name, definition in SYNC_PEER_COLUMNS:
+        if name not in existing:
+            conn.execute(f"ALTER TABLE sync_peers ADD COLUMN {name} {definition}")
+
+
+async def _sync_db(database: DatabaseAccess) -> DatabaseAccess:
+    """``database`` with the sync tables created"""
+    if database not in _installed:
+        await database.write(install_sync_tables)
+        _installed.add(database)
+    return database
+
+
+def _acked_seq(conn, bridge_id: str) -> int:
+    """Ack in the bridge's numbering for its current epoch"""
+    row = conn.execute("SELECT acked_seq - seq_offset FROM sync_peers WHERE bridge_id = ?",
+                       (bridge_id,)).fetchone()
+    return row[0] if row else 0
+
+
+def _peer_epoch(conn, bridge_id: str, epoch: Optional[int]) -> Tuple[int, int]:
+    """(acked_seq, seq_offset) in head numbering, starting a new epoch if ``epoch`` changed"""
+    row = conn.execute("SELECT acked_seq, seq_offset, epoch FROM sync_peers WHERE bridge_id = ?",
+                       (bridge_id,)).fetchone()
+    if row is None:
+        if epoch is not None:
+            conn.execute("INSERT INTO sync_peers (bridge_id, acked_seq, epoch) VALUES (?, 0, ?)",
+                         (bridge_id, epoch))
+        return 0, 0
+    acked, offset, current = row
+    if epoch is None or epoch == current:
+        return acked, offset
+    if current is None:
+        # First contact since epochs were introduced: same journal
+        conn.execute("UPDATE sync_peers SET epoch = ? WHERE bridge_id = ?", (epoch, bridge_id))
+        return acked, offset
+    logger.warning(f"Bridge {bridge_id} started sync epoch {epoch}: storing its journal after seq {acked}")
+    conn.execute("UPDATE sync_peers SET epoch = ?, seq_offset = acked_seq WHERE bridge_id = ?",
+                 (epoch, bridge_id))
+    return acked, acked
+
+
+def resume_peer(conn, bridge_id: str, epoch: Optional[int]) -> int:
+    """Ack for a bridge resuming with ``epoch``, in its own numbering"""
+    acked, offset = _peer_epoch(conn, bridge_id, epoch)
+    return acked - offset
+
+
+def apply_batch(conn, bridge_id: str, batch: Dict[str, Any]) -> Optional[int]:
+    """Upsert one decoded batch; returns the new ack, or None if it leaves a gap"""
+    acked, offset = _peer_epoch(conn, bridge_id, batch.get('epoch'))
+    if batch['first_seq'] + offset > acked + 1:
+        if not batch.get('allow_gap'):
+            return None
+        logger.warning(f"Bridge {bridge_id} pruned seq {acked - offset + 1}..{batch['first_seq'] - 1} "
+                       f"before syncing it, skipping ahead")
+        acked = batch['first_seq'] + offset - 1
+    conn.executemany("""
+        INSERT INTO synced_events (bridge_id, seq, kind, ts_ns, payload)
+        VALUES (?, ?, ?, ?, json(?))
+        ON CONFLICT(bridge_id, seq) DO UPDATE SET
+            kind = excluded.kind, ts_ns = excluded.ts_ns, payload = excluded.payload
+    """, [(bridge_id, seq + offset, kind, ts_ns, json.dumps(payload, separators=(',', ':')))
+          for seq, kind, ts_ns, payload in batch['events']])
+    new_ack = max(acked, batch['last_seq'] + offset)
+    conn.execute("""
+        INSERT INTO sync_peers (bridge_id, acked_seq, events, batches, last_batch_at)
+        VALUES (?, ?, ?, 1, CURRENT_TIMESTAMP)
+        ON CONFLICT(bridge_id) DO UPDATE SET
+            acked_seq = excluded.acked_seq, events = events + excluded.events,
+            batches = batches + 1, last_batch_at = CURRENT_TIMESTAMP
+    """, (bridge_id, new_ack, new_ack - acked))
+    return new_ack - offset
+
+
+@router.get("/{bridge_id}/ack")
+async def get_sync_ack(bridge_id: str, epoch: Optional[int] = None,
+                       database: DatabaseAccess = Depends(get_leadville_db)):
+    """Highest contiguous journal sequence held for ``bridge_id`` (in its ``epoch``)"""
+    db = await _sync_db(database)
+    if epoch is None:
+        return {'bridge_id': bridge_id, 'acked_seq': await db.read(_acked_seq, bridge_id)}
+    return {'bridge_id': bridge_id, 'acked_seq': await db.write(resume_peer, bridge_id, epoch)}
+
+
+@router.post("/{bridge_id}/batches")
+async def post_sync_batch(bridge_id: str, request: Request,
+                          database: DatabaseAccess = Depends(get_leadville_db)):
+    """Receive a gzip journal batch; idempotent per (bridge_id, seq)"""
+    try:
+        batch = decode_batch(await request.body())
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid sync batch: {e}")
+    if batch.get('bridge_id') != bridge_id:
+        raise HTTPException(status_code=400, detail="Batch bridge_id does not match the URL")
+
+    db = await _sync_db(database)
+    new_ack = await db.write(apply_batch, bridge_id, batch)
+    if new_ack is None:
+        acked = await db.read(_acked_seq, bridge_id)
+        return JSONResponse(status_code=409, content={
+            'detail': f"Batch starts at {batch['first_seq']}, expected {acked + 1}",
+            'acked_seq': acked,
+        })
+    return {'bridge_id': bridge_id, 'acked_seq': new_ack}
+
+
+@router.get("/peers")
+async def get_sync_peers(database: DatabaseAccess = Depends(get_leadville_db)):
+    """Sync progress per bridge"""
+    db = await _sync_db(database)
+    rows = await db.fetchall(
+        "SELECT bridge_id, acked_seq, events, batches, last_batch_at, epoch FROM sync_peers ORDER BY bridge_id"
+    )
+    return {'peers': [dict(row) for row in rows]}
+
+
+@router.get("/events")
+async def get_synced_events(bridge_id: Optional[str] = None, kind: Optional[str] = None,
+                            since_ts_ns: int = 0, limit: int = 1000,
+                            database: DatabaseAccess = Depends(get_leadville_db)):
+    """Consolidated events from all bridges, in timestamp order"""
+    db = await _sync_db(database)
+    where, params = ["ts_ns > ?"], [since_ts_ns]
+    if bridge_id:
+        where.append("bridge_id = ?")
+        params.append(bridge_id)
+    if kind:
+        where.append("kind = ?")
+        params.append(kind)
+    params.append(min(limit, 10000))
+    rows = await db.fetchall(
+        f"SELECT bridge_id, seq, kind, ts_ns, payload FROM synced_events "
+        f"WHERE {' AND '.join(where)} ORDER BY ts_ns, bridge_id, seq LIMIT ?", params
+    )
+    return {'events': [{**dict(row), 'payload': json.loads(row['payload'])} for row in rows]}
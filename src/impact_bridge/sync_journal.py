@@ -0,0 +1,416 @@
+"""
+Store-and-forward sync from a bridge to the head node
+
+In offline (AP) mode results used to stay on each Pi until someone copied
+database files at the end of the day. Now every timer event, impact,
+correlation decision and run record the bridge produces is also appended to a
+durable outbound journal (``SyncJournal``, its own SQLite file, WAL +
+synchronous=FULL). Each entry gets a per-bridge sequence number. ``append()``
+only queues the entry; a writer thread commits everything queued in one
+transaction, so the fsync never runs on the event loop and a burst of
+impacts costs one fsync rather than one each.
+
+``SyncForwarder`` drains the journal to the head node whenever it can reach
+it: entries after the last acknowledged sequence go out in gzip-compressed
+batches (``POST /api/sync/{bridge_id}/batches``). The head upserts them keyed
+by (bridge_id, seq), so a batch resent after a lost response is harmless, and
+answers with the highest contiguous sequence it holds. The forwarder resumes
+from that ack after restarts or outages (asking the head first, so a head
+that lost data gets it resent) and backs off exponentially while the head is
+unreachable. Acknowledged entries are pruned after ``retention_days``.
+
+Each journal has a random epoch sent with every request. A recreated journal
+starts a new epoch, so its sequence numbers restart without overwriting what
+the head holds from the old one (the head stores the new epoch after it). A
+head acknowledging more than this journal ever wrote (journal restored from
+a backup) also gets a new epoch instead of being believed. If the head
+rewinds to entries that were already pruned here, the gap is logged and
+skipped (``allow_gap``) rather than retried forever.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+import urllib.error
+import zlib
+import urllib.request
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SYNC_FORMAT_VERSION = 1
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_INTERVAL_S = 5.0
+MAX_BACKOFF_S = 60.0
+DEFAULT_RETENTION_DAYS = 7.0
+MAX_BATCH_BYTES = 32 * 1024 * 1024  # Decompressed
+
+JOURNAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    ts_ns INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def encode_batch(bridge_id: str, entries: List[Tuple[int, str, int, str]],
+                 epoch: Optional[int] = None, allow_gap: bool = False) -> bytes:
+    """gzip JSON batch of journal rows (seq, kind, ts_ns, payload JSON)"""
+    body = {
+        'version': SYNC_FORMAT_VERSION,
+        'bridge_id': bridge_id,
+        'first_seq': entries[0][0],
+        'last_seq': entries[-1][0],
+        'events': [[seq, kind, ts_ns, json.loads(payload)] for seq, kind, ts_ns, payload in entries],
+    }
+    if epoch is not None:
+        body['epoch'] = epoch
+    if allow_gap:
+        body['allow_gap'] = True  # Entries before first_seq are gone for good
+    return gzip.compress(json.dumps(body, separators=(',', ':')).encode('utf-8'), compresslevel=6)
+
+
+def decode_batch(blob: bytes, max_bytes: int = MAX_BATCH_BYTES) -> Dict[str, Any]:
+    """Inverse of ``encode_batch``; raises ValueError on bad input"""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        raw = decompressor.decompress(blob, max_bytes)
+    except zlib.error as e:
+        raise ValueError(f"Sync batch is not gzip: {e}")
+    if decompressor.unconsumed_tail:
+        raise ValueError(f"Sync batch exceeds {max_bytes} bytes")
+    body = json.loads(raw)
+    if body.get('version') != SYNC_FORMAT_VERSION:
+        raise ValueError(f"Unsupported sync batch version {body.get('version')}")
+    events = body.get('events') or []
+    seqs = [event[0] for event in events]
+    if not events or seqs != list(range(body['first_seq'], body['last_seq'] + 1)):
+        raise ValueError("Sync batch sequence numbers are not contiguous")
+    return body
+
+
+class SyncJournal:
+    """Durable outbound journal with a per-bridge sequence"""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.executescript(JOURNAL_SCHEMA)
+        self.conn.commit()
+        if self._state('epoch') is None:
+            self.new_epoch()
+
+        # Writer thread state: its own connection, so its transactions never
+        # interleave with ack updates made on the event loop
+        self._write_conn = sqlite3.connect(path, check_same_thread=False)
+        self._write_conn.execute("PRAGMA synchronous=FULL")
+        self._pending: Deque[Tuple[str, int, Dict[str, Any], float]] = deque()
+        self._cond = threading.Condition()
+        self._flush_requested = 0
+        self._flushed = 0
+        self._closed = False
+
+        self.appended = 0
+        self.written = 0
+        self.commits = 0
+        self.write_errors = 0
+
+        self._thread = threading.Thread(target=self._run, name='sync-journal', daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Commit everything queued, then close"""
+        if self._closed:
+            return
+        self._closed = True
+        with self._cond:
+            self._cond.notify()
+        self._thread.join(timeout=10.0)
+        self._write_pending()
+        self._write_conn.close()
+        self.conn.close()
+
+    def append(self, kind: str, data: Dict[str, Any], ts_ns: Optional[int] = None) -> None:
+        """Queue one record for the writer thread; ``data`` must not be mutated afterwards"""
+        self._pending.append((kind, time.time_ns() if ts_ns is None else ts_ns, data, time.time()))
+        self.appended += 1
+        with self._cond:
+            self._cond.notify()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is committed"""
+        if not self._thread.is_alive():
+            self._write_pending()
+            return True
+        with self._cond:
+            self._flush_requested += 1
+            target = self._flush_requested
+            self._cond.notify()
+            return self._cond.wait_for(lambda: self._flushed >= target, timeout)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed and not self._pending and self._flushed >= self._flush_requested:
+                    self._cond.wait()
+                target = self._flush_requested
+            self._write_pending()
+            with self._cond:
+                self._flushed = max(self._flushed, target)
+                self._cond.notify_all()
+            if self._closed and not self._pending:
+                break
+
+    def _write_pending(self) -> None:
+        """Group commit: everything currently queued in one transaction"""
+        pending = self._pending
+        rows = [pending.popleft() for _ in range(len(pending))]
+        if not rows:
+            return
+        try:
+            with self._write_conn:
+                self._write_conn.executemany(
+                    "INSERT INTO journal (kind, ts_ns, payload, created_at) VALUES (?, ?, ?, ?)",
+                    [(kind, ts_ns, json.dumps(data, separators=(',', ':'), default=str), created_at)
+                     for kind, ts_ns, data, created_at in rows]
+                )
+            self.written += len(rows)
+            self.commits += 1
+        except Exception as e:
+            self.write_errors += 1
+            logger.error(f"Sync journal write of {len(rows)} entries failed: {e}")
+
+    def read_after(self, seq: int, limit: int = DEFAULT_BATCH_SIZE) -> List[Tuple[int, str, int, str]]:
+        return self.conn.execute(
+            "SELECT seq, kind, ts_ns, payload FROM journal WHERE seq > ? ORDER BY seq LIMIT ?",
+            (seq, limit)
+        ).fetchall()
+
+    @property
+    def last_seq(self) -> int:
+        """Highest sequence ever issued (pruning does not lower it)"""
+        row = self.conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'journal'").fetchone()
+        return row[0] if row else 0
+
+    @property
+    def acked_seq(self) -> int:
+        return self._state('acked_seq') or 0
+
+    @property
+    def epoch(self) -> int:
+        return self._state('epoch')
+
+    def set_acked(self, seq: int) -> None:
+        self._set_state('acked_seq', seq)
+
+    def new_epoch(self) -> int:
+        """Start a new journal identity; the head keeps the old one's entries apart"""
+        epoch = random.getrandbits(48)
+        self._set_state('epoch', epoch)
+        return epoch
+
+    def _state(self, key: str) -> Optional[int]:
+        row = self.conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value: int) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO sync_state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, value)
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'appended': self.appended,
+            'written': self.written,
+            'pending': self.pending,
+            'commits': self.commits,
+            'write_errors': self.write_errors,
+        }
+
+    def prune(self, retention_days: float = DEFAULT_RETENTION_DAYS) -> int:
+        """Delete acknowledged entries older than ``retention_days``"""
+        with self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM journal WHERE seq <= ? AND created_at < ?",
+                (self.acked_seq, time.time() - retention_days * 86400)
+            )
+        return cursor.rowcount
+
+
+class SyncForwarder:
+    """Ships journal entries to the head node in compressed, acknowledged batches"""
+
+    def __init__(self, journal: SyncJournal, head_url: str, bridge_id: str,
+                 batch_size: int = DEFAULT_BATCH_SIZE, interval_s: float = DEFAULT_INTERVAL_S,
+                 timeout_s: float = 10.0, retention_days: float = DEFAULT_RETENTION_DAYS):
+        self.journal = journal
+        self.base_url = f"{head_url.rstrip('/')}/api/sync/{bridge_id}"
+        self.bridge_id = bridge_id
+        self.batch_size = batch_size
+        self.interval_s = interval_s
+        self.timeout_s = timeout_s
+        self.retention_days = retention_days
+        self._resumed = False
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+        self.batches_sent = 0
+        self.events_sent = 0
+        self.bytes_sent = 0
+        self.failures = 0
+        self.skipped_events = 0
+        self.last_sync_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def notify(self) -> None:
+        """Sync soon (e.g. after the network came back)"""
+        self._wakeup.set()
+
+    # HTTP (runs in a worker thread) ------------------------------------------
+
+    def _request(self, path: str, data: Optional[bytes] = None) -> Tuple[int, Dict[str, Any]]:
+        headers = {'Accept': 'application/json'}
+        if data is not None:
+            headers.update({'Content-Type': 'application/json', 'Content-Encoding': 'gzip'})
+        request = urllib.request.Request(self.base_url + path, data=data, headers=headers,
+                                         method='POST' if data is not None else 'GET')
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout_s) as response:
+                return response.status, json.loads(response.read() or b'{}')
+        except urllib.error.HTTPError as e:
+            try:
+                body = json.loads(e.read() or b'{}')
+            except ValueError:
+                body = {}
+            return e.code, body
+
+    # Sync -------------------------------------------------------------------
+
+    async def sync_once(self) -> int:
+        """Send everything after the acknowledged sequence; returns events acknowledged"""
+        await asyncio.to_thread(self.journal.flush)
+        if not self._resumed:
+            head_acked = await self._head_ack()
+            if head_acked > self.journal.last_seq:
+                logger.warning(f"Head node acknowledges {head_acked} but this journal only reached "
+                               f"{self.journal.last_seq} (restored from a backup?), starting a new sync epoch")
+                self.journal.new_epoch()
+                head_acked = await self._head_ack()
+            if head_acked != self.journal.acked_seq:
+                logger.info(f"Resuming sync from head ack {head_acked} (local ack {self.journal.acked_seq})")
+                self.journal.set_acked(head_acked)
+            self._resumed = True
+
+        acknowledged = 0
+        while True:
+            acked = self.journal.acked_seq
+            entries = self.journal.read_after(acked, self.batch_size)
+            if not entries:
+                break
+            gap = entries[0][0] > acked + 1
+            if gap:
+                lost = entries[0][0] - acked - 1
+                self.skipped_events += lost
+                logger.error(f"Journal entries {acked + 1}..{entries[0][0] - 1} were pruned before the "
+                             f"head node stored them, skipping {lost} events")
+                acked = entries[0][0] - 1
+            blob = encode_batch(self.bridge_id, entries, self.journal.epoch, allow_gap=gap)
+            status, body = await asyncio.to_thread(self._request, '/batches', blob)
+            if status == 409:
+                # Head is missing earlier entries (e.g. restored from backup): rewind
+                head_acked = int(body.get('acked_seq', 0))
+                if head_acked >= self.journal.acked_seq:
+                    raise ConnectionError(f"Head node refused batch at {acked + 1} without rewinding")
+                self.journal.set_acked(head_acked)
+                continue
+            if status != 200:
+                raise ConnectionError(f"Head node rejected batch: HTTP {status} {body.get('detail', '')}")
+            new_ack = int(body['acked_seq'])
+            self.journal.set_acked(new_ack)
+            acknowledged += max(new_ack - acked, 0)
+            self.batches_sent += 1
+            self.events_sent += len(entries)
+            self.bytes_sent += len(blob)
+            if new_ack <= acked:
+                raise ConnectionError("Head node did not advance the acknowledged sequence")
+        self.last_sync_at = time.time()
+        return acknowledged
+
+    async def _head_ack(self) -> int:
+        status, body = await asyncio.to_thread(self._request, f'/ack?epoch={self.journal.epoch}')
+        if status != 200:
+            raise ConnectionError(f"Head node ack lookup failed: HTTP {status}")
+        return int(body.get('acked_seq', 0))
+
+    async def _run(self) -> None:
+        backoff = self.interval_s
+        last_prune = 0.0
+        while True:
+            try:
+                if self.journal.pending or self.journal.last_seq > self.journal.acked_seq or not self._resumed:
+                    sent = await self.sync_once()
+                    if sent:
+                        logger.info(f"Synced {sent} events to head node (ack {self.journal.acked_seq})")
+                backoff = self.interval_s
+                self.last_error = None
+                if time.monotonic() - last_prune > 3600:
+                    last_prune = time.monotonic()
+                    self.journal.prune(self.retention_days)
+            except Exception as e:
+                self.failures += 1
+                self._resumed = False
+                if self.last_error is None:
+                    logger.warning(f"Head node unreachable, journaling locally: {e}")
+                self.last_error = str(e)
+                backoff = min(backoff * 2, MAX_BACKOFF_S)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=backoff * random.uniform(0.8, 1.2))
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'last_seq': self.journal.last_seq,
+            'acked_seq': self.journal.acked_seq,
+            'backlog': self.journal.last_seq - self.journal.acked_seq,
+            'batches_sent': self.batches_sent,
+            'events_sent': self.events_sent,
+            'bytes_sent': self.bytes_sent,
+            'failures': self.failures,
+            'skipped_events': self.skipped_events,
+            'last_sync_at': self.last_sync_at,
+            'last_error': self.last_error,
+            'journal': self.journal.stats(),
+        }
@@ -0,0 +1,187 @@
+"""Batched, compact BT50 telemetry for MQTT.
+
+Publishing one JSON message per sample costs a broker round-trip (QoS 1) and
+~150 bytes per sample. ``TelemetryBatcher`` is a sample-pipeline consumer that
+collects each sensor's samples into time windows (50 ms by default, by sample
+timestamp) and publishes every window as one packed binary message at QoS 0
+on ``sensor/{id}/batch``.
+
+Batch layout (schema version 1, little-endian)::
+
+    header  B  version          (TELEMETRY_SCHEMA_VERSION)
+            B  flags            (bit 0: baseline present)
+            H  sample count
+            6s sensor MAC
+            q  base timestamp   (wall clock ns of the first sample)
+            f  scale            (counts -> g)
+            3f baseline         (g, subtracted by the bridge; 0 if absent)
+    samples count x (I dt_us since base, h x, h y, h z raw counts)
+
+``decode_batch`` is the reference reader for subscribers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TELEMETRY_SCHEMA_VERSION = 1
+FLAG_BASELINE = 0x01
+
+HEADER = struct.Struct("<BBH6sqf3f")
+SAMPLE_DTYPE = np.dtype([("dt_us", "<u4"), ("x", "<i2"), ("y", "<i2"), ("z", "<i2")])
+
+DEFAULT_WINDOW_MS = 50.0
+DEFAULT_MAX_SAMPLES = 1024
+
+
+def _mac_bytes(sensor_mac: str) -> bytes:
+    return bytes.fromhex(sensor_mac.replace(":", ""))
+
+
+def encode_batch(sensor_mac: str, ts_ns: np.ndarray, raw: np.ndarray, scale: float,
+                 baseline: Optional[tuple] = None) -> bytes:
+    """Pack samples (timestamps + raw X/Y/Z counts) into one batch message"""
+    count = len(ts_ns)
+    base = int(ts_ns[0])
+    samples = np.empty(count, dtype=SAMPLE_DTYPE)
+    samples["dt_us"] = (np.asarray(ts_ns, dtype=np.int64) - base) // 1000
+    samples["x"] = raw[:, 0]
+    samples["y"] = raw[:, 1]
+    samples["z"] = raw[:, 2]
+    header = HEADER.pack(
+        TELEMETRY_SCHEMA_VERSION,
+        FLAG_BASELINE if baseline is not None else 0,
+        count,
+        _mac_bytes(sensor_mac),
+        base,
+        scale,
+        *(baseline if baseline is not None else (0.0, 0.0, 0.0)),
+    )
+    return header + samples.tobytes()
+
+
+def decode_batch(payload: bytes) -> Dict[str, Any]:
+    """Unpack a batch message; raises ValueError on unknown schema or bad length"""
+    if len(payload) < HEADER.size:
+        raise ValueError(f"Telemetry batch too short: {len(payload)} bytes")
+    version, flags, count, mac, base, scale, bx, by, bz = HEADER.unpack_from(payload)
+    if version != TELEMETRY_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported telemetry schema version {version}")
+    expected = HEADER.size + count * SAMPLE_DTYPE.itemsize
+    if len(payload) != expected:
+        raise ValueError(f"Telemetry batch length {len(payload)} != {expected}")
+    samples = np.frombuffer(payload, dtype=SAMPLE_DTYPE, count=count, offset=HEADER.size)
+    return {
+        "version": version,
+        "sensor_mac": ":".join(f"{b:02X}" for b in mac),
+        "ts_ns": base + samples["dt_us"].astype(np.int64) * 1000,
+        "raw": np.stack([samples["x"], samples["y"], samples["z"]], axis=1),
+        "scale": scale,
+        "baseline": (bx, by, bz) if flags & FLAG_BASELINE else None,
+    }
+
+
+class _Batch:
+    __slots__ = ("start_ns", "baseline", "scale", "ts", "raw", "count")
+
+    def __init__(self, start_ns: int, baseline: Optional[tuple], scale: float) -> None:
+        self.start_ns = start_ns
+        self.baseline = baseline
+        self.scale = scale
+        self.ts: List[np.ndarray] = []
+        self.raw: List[np.ndarray] = []
+        self.count = 0
+
+
+class TelemetryBatcher:
+    """Sample-pipeline consumer publishing per-sensor time-windowed batches"""
+
+    def __init__(self, mqtt_client: Any, window_ms: float = DEFAULT_WINDOW_MS,
+                 max_samples: int = DEFAULT_MAX_SAMPLES) -> None:
+        self.mqtt_client = mqtt_client
+        self.window_ns = int(window_ms * 1_000_000)
+        self.max_samples = max_samples
+        self._batches: Dict[str, _Batch] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self.published = 0
+        self.samples = 0
+        self.bytes = 0
+        self.failed = 0
+        self.dropped = 0
+        self.dropped_samples = 0
+
+    def __call__(self, block) -> None:
+        if not len(block):
+            return
+        sensor_mac = block.sensor_mac
+        batch = self._batches.get(sensor_mac)
+        first_ns = int(block.ts_ns[0])
+        if batch is not None and (first_ns - batch.start_ns >= self.window_ns
+                                  or batch.baseline != block.baseline
+                                  or batch.count + len(block) > self.max_samples):
+            self.flush(sensor_mac)
+            batch = None
+        if batch is None:
+            batch = self._batches[sensor_mac] = _Batch(first_ns, block.baseline, block.scale)
+            self._arm_timer(sensor_mac)
+        batch.ts.append(block.ts_ns)
+        batch.raw.append(block.raw)
+        batch.count += len(block)
+
+    def _arm_timer(self, sensor_mac: str) -> None:
+        # Publish the tail of a stream even if no further block arrives
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        timer = self._timers.pop(sensor_mac, None)
+        if timer is not None:
+            timer.cancel()
+        self._timers[sensor_mac] = loop.call_later(self.window_ns / 1e9, self.flush, sensor_mac)
+
+    def flush(self, sensor_mac: Optional[str] = None) -> int:
+        """Publish the open batch of ``sensor_mac`` (or all sensors); returns batches sent"""
+        macs = [sensor_mac] if sensor_mac else list(self._batches)
+        sent = 0
+        for mac in macs:
+            timer = self._timers.pop(mac, None)
+            if timer is not None:
+                timer.cancel()
+            batch = self._batches.pop(mac, None)
+            if batch is None or not batch.count:
+                continue
+            if not getattr(self.mqtt_client, 'connected', False):
+                # No backlog while the broker is away - live telemetry is only useful live
+                self.dropped += 1
+                self.dropped_samples += batch.count
+                if self.dropped % 100 == 1:
+                    logger.warning(f"MQTT disconnected - dropped {self.dropped} telemetry batches so far")
+                continue
+            payload = encode_batch(mac, np.concatenate(batch.ts), np.concatenate(batch.raw),
+                                   batch.scale, batch.baseline)
+            if self.mqtt_client.publish_sensor_batch(mac.replace(':', ''), payload):
+                self.published += 1
+                self.samples += batch.count
+                self.bytes += len(payload)
+                sent += 1
+            else:
+                self.failed += 1
+        return sent
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "published": self.published,
+            "samples": self.samples,
+            "bytes": self.bytes,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "dropped_samples": self.dropped_samples,
+            "open_batches": len(self._batches),
+        }
@@ -0,0 +1,131 @@
+"""
+Shot timestamps on the timer's own clock
+
+AMG frames carry the timer's time since the start beep (``current_time``, in
+centiseconds) but the bridge used to stamp shots with their BLE arrival time,
+which adds a connection-interval latency that varies from frame to frame.
+``TimerClock`` maps timer time back onto host time with a line per string::
+
+    host_ns = anchor_ns + timer_s * 1e9 * (1 + drift)
+
+* The START beep is timer time 0. START and SHOT frames add a (timer time,
+  arrival time) point. STOP is not one: it repeats the last shot's time but
+  is sent whenever the shooter stops the timer.
+* Arrival is the event plus a latency >= 0, so the anchor is the lower
+  envelope of the points: min(arrival - timer time * (1 + drift)).
+* Drift between the timer crystal and the host clock (tens of ppm) is the
+  Theil-Sen slope over point pairs at least ``min_pair_span_s`` apart, fitted
+  when a string ends and pooled across strings by span^2 (its inverse
+  variance), clamped to ``max_drift_ppm``.
+
+Shots are re-timestamped as their frame arrives from the points seen so far,
+so the first shot of a string is only as good as the START frame's latency
+and later shots converge on the envelope. ``to_host_ns`` gives the hindsight
+value once more frames are in.
+"""
+
+from statistics import median
+from typing import Any, Dict, List, Optional, Tuple
+
+NS_PER_S = 1_000_000_000
+
+
+class TimerClock:
+    """Offset and drift between a shot timer's clock and host monotonic time"""
+
+    def __init__(self, max_drift_ppm: float = 500.0, min_pair_span_s: float = 1.0,
+                 max_drift_weight: float = 10_000.0):
+        self.max_drift_ppm = max_drift_ppm
+        self.min_pair_span_s = min_pair_span_s
+        self.max_drift_weight = max_drift_weight
+
+        self.drift = 0.0  # Host seconds per timer second, minus one
+        self._drift_weight = 0.0
+        self._points: List[Tuple[float, int]] = []  # (timer_s, arrival_ns) of the current string
+        self.anchor_ns: Optional[int] = None  # Host time of the start beep
+
+        self.strings = 0
+        self.frames = 0
+        self.last_correction_ms = 0.0  # Arrival minus reconstructed time of the latest frame
+        self._correction_sum_ms = 0.0
+
+    @property
+    def drift_ppm(self) -> float:
+        return self.drift * 1e6
+
+    @property
+    def active(self) -> bool:
+        return bool(self._points)
+
+    def start_string(self, arrival_ns: int) -> int:
+        """START beep frame arrived; returns its host time (the new anchor)"""
+        if self._points:
+            self.end_string()
+        return self.observe(0.0, arrival_ns)
+
+    def observe(self, timer_s: float, arrival_ns: int) -> int:
+        """Add a frame stamped ``timer_s`` by the timer; returns the event's host time"""
+        if self._points and timer_s < self._points[-1][0]:
+            # Timer time went backwards: a new string whose START frame was missed
+            self.end_string()
+        self._points.append((timer_s, arrival_ns))
+        self.frames += 1
+        candidate = arrival_ns - self._scaled_ns(timer_s)
+        if len(self._points) == 1 or candidate < self.anchor_ns:
+            self.anchor_ns = candidate
+        host_ns = self.to_host_ns(timer_s)
+        self.last_correction_ms = (arrival_ns - host_ns) / 1e6
+        self._correction_sum_ms += self.last_correction_ms
+        return host_ns
+
+    def end_string(self) -> Optional[float]:
+        """Close the string and update drift.
+
+        Returns the string's own drift estimate in ppm, or None if it was too
+        short to measure one. The anchor stays valid for ``to_host_ns`` until
+        the next string starts.
+        """
+        points, self._points = self._points, []
+        if not points:
+            return None
+        self.strings += 1
+
+        estimate = self._fit_drift(points)
+        if estimate is not None:
+            limit = self.max_drift_ppm / 1e6
+            estimate = max(-limit, min(limit, estimate))
+            span = points[-1][0] - points[0][0]
+            weight = span * span
+            self.drift = (self.drift * self._drift_weight + estimate * weight) / (self._drift_weight + weight)
+            self._drift_weight = min(self._drift_weight + weight, self.max_drift_weight)
+        # Re-anchor the finished string with the updated drift
+        self.anchor_ns = min(arrival - self._scaled_ns(t) for t, arrival in points)
+        return estimate * 1e6 if estimate is not None else None
+
+    def to_host_ns(self, timer_s: float) -> Optional[int]:
+        """Host time of timer time ``timer_s`` in the current (or last) string"""
+        if self.anchor_ns is None:
+            return None
+        return self.anchor_ns + self._scaled_ns(timer_s)
+
+    def _scaled_ns(self, timer_s: float) -> int:
+        return int(round(timer_s * NS_PER_S * (1.0 + self.drift)))
+
+    def _fit_drift(self, points: List[Tuple[float, int]]) -> Optional[float]:
+        """Theil-Sen slope of arrival against timer time, minus one"""
+        slopes = []
+        for i, (t_i, h_i) in enumerate(points):
+            for t_j, h_j in points[i + 1:]:
+                span = t_j - t_i
+                if span >= self.min_pair_span_s:
+                    slopes.append((h_j - h_i) / (span * NS_PER_S) - 1.0)
+        return median(slopes) if slopes else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'strings': self.strings,
+            'frames': self.frames,
+            'drift_ppm': round(self.drift_ppm, 2),
+            'last_correction_ms': round(self.last_correction_ms, 2),
+            'mean_correction_ms': round(self._correction_sum_ms / self.frames, 2) if self.frames else 0.0,
+        }
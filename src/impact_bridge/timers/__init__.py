@@ -8,6 +8,8 @@ Provides standardized interfaces for shot timer integration with support for:
 """
 
 from .base import ITimerAdapter, BaseTimerAdapter
+from .channel import TimerEventChannel
+from .hub import TimerHub, HubEvent
 from .types import (
     TimerEvent, TimerInfo, ConnectionType,
     TimerConnected, TimerDisconnected, TimerReady,
@@ -21,6 +23,7 @@ __all__ = [
     # Interfaces
     'ITimerAdapter',
     'BaseTimerAdapter',
+    'TimerEventChannel',
     
     # Event types
     'TimerEvent',
@@ -41,6 +44,10 @@ __all__ = [
     'get_timer_info',
     'TimerType',
     
+    # Multi-timer
+    'TimerHub',
+    'HubEvent',
+    
     # Adapters
     'AMGCommanderAdapter',
     'SpecialPieAdapter',
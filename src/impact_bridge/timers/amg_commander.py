@@ -4,10 +4,9 @@ AMG Commander timer adapter conforming to ITimerAdapter interface.
 
 from __future__ import annotations
 
-import asyncio
 import logging
 import time
-from typing import Dict, Any, AsyncIterator
+from typing import AsyncIterator
 
 try:
     from bleak import BleakClient, BleakScanner
@@ -22,12 +21,7 @@ from .types import (
     Shot, StringStart, StringStop, Battery, ClockSync
 )
 
-# Import existing AMG parser
-try:
-    from ..ble.amg_parse import parse_amg_timer_data, format_amg_event
-    AMG_PARSER_AVAILABLE = True
-except ImportError:
-    AMG_PARSER_AVAILABLE = False
+from ..ble.amg_parse import AmgFrame, decode_amg_frame
 
 logger = logging.getLogger(__name__)
 
@@ -123,135 +117,66 @@ class AMGCommanderAdapter(BaseTimerAdapter):
     
     def _amg_notification_handler(self, sender: int, data: bytes) -> None:
         """Handle AMG BLE notifications and convert to timer events."""
+        # Stamp on entry, before any parsing, so the host time reflects arrival
         timestamp_ms = int(time.time() * 1000)
-        hex_data = data.hex().upper()
-        
-        # Parse using existing AMG parser if available
-        parsed_data = None
-        if AMG_PARSER_AVAILABLE:
-            try:
-                parsed_data = parse_amg_timer_data(data)
-            except Exception as e:
-                logger.debug(f"AMG parsing failed: {e}")
-        
-        # Create raw data for event
+        frame = decode_amg_frame(data)
+        event = self._convert_amg_to_event(frame, timestamp_ms) if frame else None
+        if event:
+            self._post_event(event)
+    
+    def _convert_amg_to_event(self, frame: AmgFrame, timestamp_ms: int) -> TimerEvent | None:
+        """Convert a decoded AMG frame to a standardized timer event."""
+        kind = frame.event
+        if kind is None:
+            return None
+        # The frame itself is the parsed data; the WebSocket encoder serializes it on demand
         raw_data = {
-            'hex': hex_data,
-            'parsed': parsed_data,
-            'length': len(data),
+            'parsed': frame,
+            'length': len(frame.data),
             'adapter': 'amg_commander'
         }
         
-        # Convert to standardized timer events
-        event = self._convert_amg_to_event(data, timestamp_ms, raw_data, parsed_data)
-        if event:
-            asyncio.create_task(self._emit_event(event))
-    
-    def _convert_amg_to_event(self, data: bytes, timestamp_ms: int, raw_data: Dict[str, Any], parsed_data: Dict[str, Any] = None) -> TimerEvent | None:
-        """Convert AMG frame to standardized timer event."""
-        if len(data) < 2:
-            return None
+        if kind == 'START':
+            self.current_string = frame.current_round
+            self.shot_count = 0
+            self.string_start_time = timestamp_ms
+            
+            return StringStart(
+                timestamp_ms=timestamp_ms,
+                raw=raw_data,
+                string_number=frame.current_round
+            )
         
-        frame_header = data[0]
-        frame_type = data[1]
+        if not frame.is_status:
+            return None
         
-        # Use parsed data if available, otherwise fall back to basic parsing
-        if parsed_data:
-            shot_state = parsed_data.get('shot_state', 'UNKNOWN')
-            current_time = parsed_data.get('current_time', 0.0)
-            current_shot = parsed_data.get('current_shot', 0)
-            current_round = parsed_data.get('current_round', 0)
-            
-            if shot_state == 'START':
-                self.current_string = current_round
-                self.shot_count = 0
-                self.string_start_time = timestamp_ms
-                
-                return StringStart(
-                    timestamp_ms=timestamp_ms,
-                    raw=raw_data,
-                    string_number=current_round
-                )
-            
-            elif shot_state == 'ACTIVE' and parsed_data.get('type_id') == 1:
-                self.shot_count += 1
-                split_ms = int(current_time * 1000) if current_time else None
-                
-                return Shot(
-                    timestamp_ms=timestamp_ms,
-                    raw=raw_data,
-                    split_ms=split_ms,
-                    shot_number=self.shot_count,
-                    string_number=self.current_string
-                )
+        if kind == 'SHOT':
+            self.shot_count += 1
             
-            elif shot_state == 'STOPPED':
-                total_ms = int(current_time * 1000) if current_time else 0
-                shot_count = self.shot_count
-                string_number = self.current_string
-                
-                # Reset state
-                self.current_string = None
-                self.shot_count = 0
-                self.string_start_time = None
-                
-                return StringStop(
-                    timestamp_ms=timestamp_ms,
-                    raw=raw_data,
-                    total_ms=total_ms,
-                    shot_count=shot_count,
-                    string_number=string_number
-                )
+            return Shot(
+                timestamp_ms=timestamp_ms,
+                raw=raw_data,
+                split_ms=frame.time_cs * 10 if frame.time_cs else None,  # Centiseconds to milliseconds
+                shot_number=self.shot_count,
+                string_number=self.current_string
+            )
         
-        else:
-            # Fallback to basic frame parsing
-            if frame_header == 0x01 and frame_type == 0x05:  # START
-                string_number = data[13] if len(data) >= 14 else None
-                self.current_string = string_number
-                self.shot_count = 0
-                self.string_start_time = timestamp_ms
-                
-                return StringStart(
-                    timestamp_ms=timestamp_ms,
-                    raw=raw_data,
-                    string_number=string_number
-                )
-            
-            elif frame_header == 0x01 and frame_type == 0x03:  # SHOT
-                if len(data) >= 14:
-                    self.shot_count += 1
-                    time_cs = (data[4] << 8) | data[5]
-                    split_ms = int(time_cs * 10)  # Convert centiseconds to milliseconds
-                    
-                    return Shot(
-                        timestamp_ms=timestamp_ms,
-                        raw=raw_data,
-                        split_ms=split_ms,
-                        shot_number=self.shot_count,
-                        string_number=self.current_string
-                    )
-            
-            elif frame_header == 0x01 and frame_type == 0x08:  # STOP
-                if len(data) >= 14:
-                    time_cs = (data[4] << 8) | data[5]
-                    total_ms = int(time_cs * 10)  # Convert centiseconds to milliseconds
-                    shot_count = self.shot_count
-                    string_number = data[13] if len(data) >= 14 else self.current_string
-                    
-                    # Reset state
-                    self.current_string = None
-                    self.shot_count = 0
-                    self.string_start_time = None
-                    
-                    return StringStop(
-                        timestamp_ms=timestamp_ms,
-                        raw=raw_data,
-                        total_ms=total_ms,
-                        shot_count=shot_count,
-                        string_number=string_number
-                    )
+        # STOP
+        shot_count = self.shot_count
+        string_number = self.current_string if self.current_string is not None else frame.current_round
         
-        return None
+        # Reset state
+        self.current_string = None
+        self.shot_count = 0
+        self.string_start_time = None
+        
+        return StringStop(
+            timestamp_ms=timestamp_ms,
+            raw=raw_data,
+            total_ms=frame.time_cs * 10,
+            shot_count=shot_count,
+            string_number=string_number
+        )
     
     async def stop(self) -> None:
         """Stop the AMG adapter."""
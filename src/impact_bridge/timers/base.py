@@ -8,6 +8,7 @@ import asyncio
 from abc import ABC, abstractmethod
 from typing import AsyncIterator, Dict, Any
 
+from .channel import TimerEventChannel
 from .types import TimerEvent, TimerInfo
 
 
@@ -61,7 +62,7 @@ class BaseTimerAdapter(ITimerAdapter):
         self.name = name
         self._connected = False
         self._running = False
-        self._event_queue: asyncio.Queue[TimerEvent] = asyncio.Queue()
+        self._channel = TimerEventChannel()
         self._tasks: list[asyncio.Task] = []
 
     @property
@@ -75,7 +76,9 @@ class BaseTimerAdapter(ITimerAdapter):
             return
         
         self._running = True
-        self._event_queue = asyncio.Queue()
+        # Keep events emitted while connecting; only a stopped adapter needs a new channel
+        if self._channel.closed:
+            self._channel = TimerEventChannel()
 
     async def stop(self) -> None:
         """Stop the adapter and cleanup."""
@@ -83,6 +86,7 @@ class BaseTimerAdapter(ITimerAdapter):
             return
             
         self._running = False
+        self._channel.close()
         
         # Cancel all tasks
         for task in self._tasks:
@@ -94,22 +98,22 @@ class BaseTimerAdapter(ITimerAdapter):
         
         self._tasks.clear()
 
+    def _post_event(self, event: TimerEvent) -> bool:
+        """Queue an event in arrival order; safe to call from device callbacks on any thread."""
+        return self._channel.post(event)
+
     async def _emit_event(self, event: TimerEvent) -> None:
-        """Emit an event to the event queue."""
-        if self._running:
-            await self._event_queue.put(event)
+        """Emit an event to the event stream."""
+        self._post_event(event)
 
     @property
-    async def events(self) -> AsyncIterator[TimerEvent]:
-        """Async iterator yielding timer events."""
-        while self._running:
-            try:
-                event = await asyncio.wait_for(self._event_queue.get(), timeout=1.0)
-                yield event
-            except asyncio.TimeoutError:
-                continue
-            except asyncio.CancelledError:
-                break
+    def events(self) -> AsyncIterator[TimerEvent]:
+        """Async iterator yielding timer events until the adapter is stopped."""
+        return self._channel
+
+    def event_stats(self) -> Dict[str, Any]:
+        """Event channel depth, throughput and overflow counters."""
+        return self._channel.stats()
 
     def _create_task(self, coro) -> asyncio.Task:
         """Create and track an async task."""
@@ -0,0 +1,142 @@
+"""
+Event channel between timer device callbacks and the adapter ``events`` stream.
+
+BLE notification handlers and serial/UDP readers hand each decoded event to
+``TimerEventChannel.post``, which enqueues it synchronously: directly when
+called on the event loop, via ``call_soon_threadsafe`` from any other thread.
+Either way events reach the consumer in the order the frames arrived - no
+task is created per frame. The consumer waits on a single future instead of
+polling with a timeout, and ``close`` appends a sentinel so iteration ends
+as soon as the events queued before it have been delivered.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Dict, Optional
+
+from .types import TimerEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANNEL_SIZE = 1024
+
+_CLOSED = object()
+
+
+class TimerEventChannel:
+    """Bounded, ordered hand-off of timer events to a single async consumer."""
+
+    def __init__(self, maxsize: int = DEFAULT_CHANNEL_SIZE):
+        self.maxsize = maxsize
+        self._queue: deque = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiter: Optional[asyncio.Future] = None
+        self._closed = False
+
+        self.posted = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    # Producers (device callbacks) ---------------------------------------
+
+    def post(self, event: TimerEvent) -> bool:
+        """Enqueue ``event`` from any thread; False if the channel is closed or full."""
+        loop = self._foreign_loop()
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._put, event)
+            except RuntimeError:
+                return False  # Loop closed during shutdown
+            return True
+        return self._put(event)
+
+    def close(self) -> None:
+        """Stop accepting events; the consumer ends after draining what is queued."""
+        loop = self._foreign_loop()
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._close)
+            except RuntimeError:
+                pass
+            return
+        self._close()
+
+    def _foreign_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """The bound loop if the caller is on another thread, else None (binding if needed)."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is None:
+            return self._loop
+        if self._loop is None:
+            self._loop = running
+        return None if running is self._loop else self._loop
+
+    def _put(self, event: TimerEvent) -> bool:
+        if self._closed:
+            return False
+        depth = len(self._queue)
+        if depth >= self.maxsize:
+            if not self.dropped:
+                logger.warning(f"Timer event channel full ({self.maxsize}), dropping events")
+            self.dropped += 1
+            return False
+        self._queue.append(event)
+        self.posted += 1
+        if depth + 1 > self.max_depth:
+            self.max_depth = depth + 1
+        self._wake()
+        return True
+
+    def _close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._queue.append(_CLOSED)
+            self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    # Consumer -------------------------------------------------------------
+
+    def __aiter__(self) -> "TimerEventChannel":
+        return self
+
+    async def __anext__(self) -> TimerEvent:
+        while not self._queue:
+            if self._loop is None:
+                self._loop = asyncio.get_running_loop()
+            self._waiter = self._loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        event = self._queue.popleft()
+        if event is _CLOSED:
+            self._queue.appendleft(_CLOSED)  # Later iterations end too
+            raise StopAsyncIteration
+        self.delivered += 1
+        return event
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'depth': len(self._queue) - (1 if self._closed and self._queue else 0),
+            'posted': self.posted,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'max_depth': self.max_depth,
+            'closed': self._closed,
+        }
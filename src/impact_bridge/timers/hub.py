@@ -0,0 +1,214 @@
+"""
+Run several timer adapters at once behind one ordered event stream.
+
+``TimerHub`` owns any mix of ``ITimerAdapter`` instances (AMG over BLE,
+SpecialPie over serial/BLE/UDP, ...). One pump task per timer moves events
+from the adapter's ``events`` iterator into a per-timer queue; the hub's own
+``events`` iterator releases the earliest queued event by receive timestamp,
+tagged with its timer id.
+
+An event is released once no other timer can still produce an earlier one:
+every other timer either has an event queued (so the comparison is known) or
+its pump is parked on an empty adapter stream. Adapters stamp events when the
+device callback runs and post them straight into their channel, so on the
+event loop nothing stamped earlier can be in flight and no reorder delay is
+needed. Each timer may hold at most ``max_pending`` undelivered events in the
+hub; a pump at its limit stops pulling, so a chatty or stuck timer backs up
+into its own bounded adapter channel (where overflow is counted) instead of
+growing the hub or delaying the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .base import ITimerAdapter
+from .types import TimerEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PENDING = 256
+STOP_DRAIN_S = 1.0
+
+
+@dataclass
+class HubEvent:
+    """A timer event tagged with the timer that produced it."""
+    timer_id: str
+    seq: int  # Hub-wide arrival sequence, breaks timestamp ties
+    event: TimerEvent
+    queued_ns: int  # perf_counter_ns when the pump queued it
+
+
+class _TimerSlot:
+    __slots__ = ('timer_id', 'adapter', 'queue', 'credits', 'task', 'idle', 'closed',
+                 'received', 'delivered', 'blocked')
+
+    def __init__(self, timer_id: str, adapter: ITimerAdapter, max_pending: int):
+        self.timer_id = timer_id
+        self.adapter = adapter
+        self.queue: deque[HubEvent] = deque()
+        self.credits = asyncio.Semaphore(max_pending)
+        self.task: Optional[asyncio.Task] = None
+        self.idle = False
+        self.closed = False
+        self.received = 0
+        self.delivered = 0
+        self.blocked = 0
+
+
+class TimerHub:
+    """Several timer adapters merged into one stream ordered by receive time."""
+
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING):
+        self.max_pending = max_pending
+        self._slots: Dict[str, _TimerSlot] = {}
+        self._seq = 0
+        self._running = False
+        self._waiter: Optional[asyncio.Future] = None
+
+        self.merged = 0
+        self.inversions = 0  # Released before an earlier-stamped event (threaded adapters only)
+        self._last_released_ms: Optional[int] = None
+
+    @property
+    def timers(self) -> Dict[str, ITimerAdapter]:
+        return {timer_id: slot.adapter for timer_id, slot in self._slots.items()}
+
+    def add(self, timer_id: str, adapter: ITimerAdapter) -> None:
+        """Register a (connected or connecting) adapter under ``timer_id``."""
+        if timer_id in self._slots:
+            raise ValueError(f"Duplicate timer id: {timer_id}")
+        slot = _TimerSlot(timer_id, adapter, self.max_pending)
+        self._slots[timer_id] = slot
+        if self._running:
+            slot.task = asyncio.create_task(self._pump(slot))
+
+    async def start(self) -> None:
+        """Start every adapter and begin merging their events."""
+        if self._running:
+            return
+        self._running = True
+        for slot in self._slots.values():
+            await slot.adapter.start()
+            slot.task = asyncio.create_task(self._pump(slot))
+
+    async def stop(self) -> None:
+        """Stop the adapters; the stream ends after the queued events are delivered."""
+        if not self._running:
+            return
+        self._running = False
+        for slot in self._slots.values():
+            try:
+                await slot.adapter.stop()
+            except Exception as e:
+                logger.error(f"Error stopping timer {slot.timer_id}: {e}")
+        # Pumps end on their adapter's close sentinel; give them a moment to hand over
+        # what the adapters still had queued before cutting them off
+        tasks = [slot.task for slot in self._slots.values() if slot.task is not None]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=STOP_DRAIN_S)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._wake()
+
+    # Pumps ---------------------------------------------------------------
+
+    async def _pump(self, slot: _TimerSlot) -> None:
+        stream = slot.adapter.events.__aiter__()
+        try:
+            while True:
+                if slot.credits.locked():
+                    slot.blocked += 1
+                await slot.credits.acquire()
+                slot.idle = True
+                self._wake()  # Parked: the consumer may stop waiting on this timer
+                try:
+                    event = await stream.__anext__()
+                except StopAsyncIteration:
+                    slot.credits.release()
+                    break
+                finally:
+                    slot.idle = False
+                self._seq += 1
+                slot.queue.append(HubEvent(slot.timer_id, self._seq, event, time.perf_counter_ns()))
+                slot.received += 1
+                self._wake()
+        except Exception as e:
+            logger.error(f"Timer {slot.timer_id} event stream failed: {e}")
+        finally:
+            slot.idle = False
+            slot.closed = True
+            self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    # Consumer ------------------------------------------------------------
+
+    def _next_ready(self) -> Optional[_TimerSlot]:
+        """The slot holding the earliest event, if it is safe to release."""
+        best = None
+        for slot in self._slots.values():
+            if slot.queue:
+                head = slot.queue[0]
+                if best is None or (head.event.timestamp_ms, head.seq) < (
+                        best.queue[0].event.timestamp_ms, best.queue[0].seq):
+                    best = slot
+            elif not (slot.idle or slot.closed):
+                return None  # This timer may be about to queue an earlier event
+        return best
+
+    @property
+    def events(self) -> "TimerHub":
+        """Async iterator of ``HubEvent`` in receive-timestamp order."""
+        return self
+
+    def __aiter__(self) -> "TimerHub":
+        return self
+
+    async def __anext__(self) -> HubEvent:
+        while True:
+            slot = self._next_ready()
+            if slot is not None:
+                item = slot.queue.popleft()
+                slot.delivered += 1
+                slot.credits.release()
+                self.merged += 1
+                ts = item.event.timestamp_ms
+                if self._last_released_ms is not None and ts < self._last_released_ms:
+                    self.inversions += 1
+                else:
+                    self._last_released_ms = ts
+                return item
+            if all(s.closed and not s.queue for s in self._slots.values()) and (
+                    self._slots or not self._running):
+                raise StopAsyncIteration
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+    def stats(self) -> Dict[str, Any]:
+        timers = {}
+        for timer_id, slot in self._slots.items():
+            adapter_stats = getattr(slot.adapter, 'event_stats', None)
+            timers[timer_id] = {
+                'adapter': getattr(slot.adapter, 'name', type(slot.adapter).__name__),
+                'connected': slot.adapter.is_connected,
+                'queued': len(slot.queue),
+                'received': slot.received,
+                'delivered': slot.delivered,
+                'backpressure_waits': slot.blocked,
+                'closed': slot.closed,
+                'channel': adapter_stats() if adapter_stats else None,
+            }
+        return {'merged': self.merged, 'inversions': self.inversions, 'timers': timers}
@@ -13,6 +13,7 @@ import asyncio
 import json
 import logging
 import socket
+import struct
 import time
 from typing import Dict, Any, Optional, AsyncIterator
 from dataclasses import asdict
@@ -42,102 +43,181 @@ logger = logging.getLogger(__name__)
 class SpecialPieFramer:
     """
     Incremental frame decoder for SpecialPie protocol.
+
+    Wire format: [0xAA][opcode][length][payload x length][checksum][0x55],
+    where the checksum is the XOR of opcode, length and payload. Frames are
+    located by their length byte rather than by searching for the end marker,
+    so 0x55 inside a payload is harmless. The decoder advances a read offset
+    over one bytearray and only compacts it once the consumed prefix is large;
+    a corrupt frame costs one byte of resync, so valid frames behind it are
+    still found (once up to MAX_FRAME_SIZE bytes follow a corrupt length byte).
     """
     
     # TODO: fill from SpecialPie SDK
     FRAME_START = b'\xAA'  # Frame start marker
     FRAME_END = b'\x55'    # Frame end marker
-    MIN_FRAME_SIZE = 8     # Minimum frame size
+    MIN_FRAME_SIZE = 5     # Markers, opcode, length and checksum
     MAX_FRAME_SIZE = 64    # Maximum frame size
+    COMPACT_SIZE = 4096    # Consumed bytes kept before compacting the buffer
+    
+    _START = FRAME_START[0]
+    _END = FRAME_END[0]
     
     def __init__(self):
         self.buffer = bytearray()
+        self.offset = 0
+        self.frames = 0
+        self.bad_frames = 0
+        self.skipped_bytes = 0
+    
+    @classmethod
+    def encode(cls, opcode: int, payload: bytes = b'') -> bytes:
+        """Build one wire frame."""
+        checksum = opcode ^ len(payload)
+        for byte in payload:
+            checksum ^= byte
+        return bytes((cls._START, opcode, len(payload))) + payload + bytes((checksum, cls._END))
     
-    def feed(self, data: bytes) -> list[Dict[str, Any]]:
+    def feed(self, data: bytes, timestamp_ms: Optional[int] = None) -> list[Dict[str, Any]]:
         """
         Feed incoming data and return complete frames.
         
         Args:
             data: Raw bytes from device
+            timestamp_ms: Host receive time of ``data`` (default: now)
             
         Returns:
             List of parsed frame dictionaries
         """
-        self.buffer.extend(data)
+        if timestamp_ms is None:
+            timestamp_ms = int(time.time() * 1000)
+        buffer = self.buffer
+        buffer += data
+        end = len(buffer)
+        pos = self.offset
         frames = []
-        
-        while len(self.buffer) >= self.MIN_FRAME_SIZE:
-            # Find frame start
-            start_idx = self.buffer.find(self.FRAME_START)
-            if start_idx == -1:
-                # No frame start found, discard buffer
-                self.buffer.clear()
-                break
-            
-            # Remove data before frame start
-            if start_idx > 0:
-                self.buffer = self.buffer[start_idx:]
-            
-            # Look for frame end
-            end_idx = self.buffer.find(self.FRAME_END, 1)
-            if end_idx == -1:
-                # No complete frame yet
-                break
-            
-            # Extract frame
-            frame_data = bytes(self.buffer[1:end_idx])  # Exclude start/end markers
-            self.buffer = self.buffer[end_idx + 1:]
+        START, END, MIN_SIZE, MAX_SIZE = self._START, self._END, self.MIN_FRAME_SIZE, self.MAX_FRAME_SIZE
+        
+        while end - pos >= MIN_SIZE:
+            if buffer[pos] != START:
+                start = buffer.find(START, pos)
+                if start == -1:
+                    self.skipped_bytes += end - pos
+                    pos = end
+                    break
+                self.skipped_bytes += start - pos
+                pos = start
+                if end - pos < MIN_SIZE:
+                    break
+            size = buffer[pos + 2] + MIN_SIZE
+            if size > MAX_SIZE:
+                self._resync(pos)
+                pos += 1
+                continue
+            if end - pos < size:
+                break  # Incomplete frame
             
-            # Parse frame
-            try:
-                parsed_frame = self._parse_frame(frame_data)
-                if parsed_frame:
-                    frames.append(parsed_frame)
-            except Exception as e:
-                logger.warning(f"Failed to parse SpecialPie frame: {e}, data: {frame_data.hex()}")
+            # Opcode through end marker; valid frames XOR to the end marker
+            body = bytes(buffer[pos + 1:pos + size])
+            checksum = 0
+            for byte in body:
+                checksum ^= byte
+            if checksum != END or body[-1] != END:
+                self._resync(pos)
+                pos += 1
                 continue
-        
-        # Prevent buffer overflow
-        if len(self.buffer) > self.MAX_FRAME_SIZE * 2:
-            logger.warning("SpecialPie frame buffer overflow, clearing")
-            self.buffer.clear()
-        
+            
+            frames.append({
+                'opcode': body[0],
+                'length': body[1],
+                'payload': body[2:-2],
+                'raw_hex': body[:-1].hex(),
+                'timestamp_ms': timestamp_ms
+            })
+            pos += size
+        
+        self.frames += len(frames)
+        if pos == end:
+            buffer.clear()
+            pos = 0
+        elif pos >= self.COMPACT_SIZE:
+            del buffer[:pos]
+            pos = 0
+        self.offset = pos
         return frames
     
-    def _parse_frame(self, data: bytes) -> Optional[Dict[str, Any]]:
-        """Parse a single frame into a dictionary."""
-        if len(data) < 4:
-            return None
-        
-        # TODO: fill from SpecialPie SDK
-        # Basic frame structure: [opcode][length][payload][checksum]
-        opcode = data[0]
-        length = data[1]
-        
-        if len(data) < length + 2:  # +2 for opcode and length
-            return None
-        
-        payload = data[2:length]
-        checksum = data[length] if length < len(data) else 0
-        
-        # Verify checksum (simple XOR for now)
-        calculated_checksum = opcode ^ length
-        for byte in payload:
-            calculated_checksum ^= byte
-        
-        if checksum != calculated_checksum:
-            logger.warning(f"SpecialPie frame checksum mismatch: got {checksum}, expected {calculated_checksum}")
-            return None
-        
+    def _resync(self, pos: int) -> None:
+        """Count a rejected frame start; decoding resumes at the next byte."""
+        self.bad_frames += 1
+        self.skipped_bytes += 1
+        logger.debug(f"SpecialPie frame rejected at offset {pos}, resyncing")
+    
+    def stats(self) -> Dict[str, int]:
         return {
-            'opcode': opcode,
-            'length': length,
-            'payload': payload,
-            'raw_hex': data.hex(),
-            'timestamp_ms': int(time.time() * 1000)
+            'frames': self.frames,
+            'bad_frames': self.bad_frames,
+            'skipped_bytes': self.skipped_bytes,
+            'buffered': len(self.buffer) - self.offset,
         }
 
 
+# Payload layouts (little-endian), compiled once
+# TODO: fill from SpecialPie SDK - these are placeholder opcodes
+SHOT_PAYLOAD = struct.Struct('<HBB')  # split_ms, shot_number, string_number
+STOP_PAYLOAD = struct.Struct('<IBB')  # total_ms, shot_count, string_number
+BATTERY_PAYLOAD = struct.Struct('<B')  # level_pct
+CLOCK_PAYLOAD = struct.Struct('<II')  # device_time_ms, host_time_ms
+
+
+def _string_start(payload: bytes, timestamp_ms: int, frame: Dict[str, Any]) -> TimerEvent:
+    return StringStart(timestamp_ms=timestamp_ms, raw=frame,
+                       string_number=payload[0] if payload else None)
+
+
+def _shot(payload: bytes, timestamp_ms: int, frame: Dict[str, Any]) -> Optional[TimerEvent]:
+    if len(payload) < SHOT_PAYLOAD.size:
+        return None
+    split_ms, shot_number, string_number = SHOT_PAYLOAD.unpack_from(payload)
+    return Shot(timestamp_ms=timestamp_ms, raw=frame, split_ms=split_ms,
+                shot_number=shot_number, string_number=string_number)
+
+
+def _string_stop(payload: bytes, timestamp_ms: int, frame: Dict[str, Any]) -> Optional[TimerEvent]:
+    if len(payload) < STOP_PAYLOAD.size:
+        return None
+    total_ms, shot_count, string_number = STOP_PAYLOAD.unpack_from(payload)
+    return StringStop(timestamp_ms=timestamp_ms, raw=frame, total_ms=total_ms,
+                      shot_count=shot_count, string_number=string_number)
+
+
+def _battery(payload: bytes, timestamp_ms: int, frame: Dict[str, Any]) -> Optional[TimerEvent]:
+    if len(payload) < BATTERY_PAYLOAD.size:
+        return None
+    return Battery(timestamp_ms=timestamp_ms, raw=frame, level_pct=payload[0])
+
+
+def _clock_sync(payload: bytes, timestamp_ms: int, frame: Dict[str, Any]) -> Optional[TimerEvent]:
+    if len(payload) < CLOCK_PAYLOAD.size:
+        return None
+    device_time_ms, host_time_ms = CLOCK_PAYLOAD.unpack_from(payload)
+    return ClockSync(timestamp_ms=timestamp_ms, raw=frame, delta_ms=device_time_ms - host_time_ms,
+                     device_time_ms=device_time_ms, host_time_ms=host_time_ms)
+
+
+def _ready(payload: bytes, timestamp_ms: int, frame: Dict[str, Any]) -> TimerEvent:
+    return TimerReady(timestamp_ms=timestamp_ms, raw=frame)
+
+
+FRAME_DECODERS = {
+    0x01: _string_start,
+    0x02: _shot,
+    0x03: _string_stop,
+    0x04: _battery,
+    0x05: _clock_sync,
+    0x06: _ready,
+}
+
+
 def parse_specialpie_frame(frame: Dict[str, Any]) -> Optional[TimerEvent]:
     """
     Parse a SpecialPie frame into a timer event.
@@ -149,78 +229,14 @@ def parse_specialpie_frame(frame: Dict[str, Any]) -> Optional[TimerEvent]:
         TimerEvent or None if frame is not recognized
     """
     opcode = frame.get('opcode', 0)
-    payload = frame.get('payload', b'')
-    timestamp_ms = frame.get('timestamp_ms', int(time.time() * 1000))
-    
-    # TODO: fill from SpecialPie SDK - these are placeholder opcodes
-    if opcode == 0x01:  # String start
-        string_number = payload[0] if len(payload) > 0 else None
-        return StringStart(
-            timestamp_ms=timestamp_ms,
-            raw=frame,
-            string_number=string_number
-        )
-    
-    elif opcode == 0x02:  # Shot detected
-        if len(payload) >= 4:
-            split_ms = int.from_bytes(payload[0:2], 'little')
-            shot_number = payload[2] if len(payload) > 2 else None
-            string_number = payload[3] if len(payload) > 3 else None
-            
-            return Shot(
-                timestamp_ms=timestamp_ms,
-                raw=frame,
-                split_ms=split_ms,
-                shot_number=shot_number,
-                string_number=string_number
-            )
-    
-    elif opcode == 0x03:  # String stop
-        if len(payload) >= 6:
-            total_ms = int.from_bytes(payload[0:4], 'little')
-            shot_count = payload[4]
-            string_number = payload[5] if len(payload) > 5 else None
-            
-            return StringStop(
-                timestamp_ms=timestamp_ms,
-                raw=frame,
-                total_ms=total_ms,
-                shot_count=shot_count,
-                string_number=string_number
-            )
-    
-    elif opcode == 0x04:  # Battery status
-        if len(payload) >= 1:
-            level_pct = payload[0]
-            return Battery(
-                timestamp_ms=timestamp_ms,
-                raw=frame,
-                level_pct=level_pct
-            )
-    
-    elif opcode == 0x05:  # Clock sync
-        if len(payload) >= 8:
-            device_time_ms = int.from_bytes(payload[0:4], 'little')
-            host_time_ms = int.from_bytes(payload[4:8], 'little')
-            delta_ms = device_time_ms - host_time_ms
-            
-            return ClockSync(
-                timestamp_ms=timestamp_ms,
-                raw=frame,
-                delta_ms=delta_ms,
-                device_time_ms=device_time_ms,
-                host_time_ms=host_time_ms
-            )
-    
-    elif opcode == 0x06:  # Ready status
-        return TimerReady(
-            timestamp_ms=timestamp_ms,
-            raw=frame
-        )
-    
-    # Unknown opcode
-    logger.debug(f"Unknown SpecialPie opcode: {opcode:02x}")
-    return None
+    decoder = FRAME_DECODERS.get(opcode)
+    if decoder is None:
+        logger.debug("Unknown SpecialPie opcode: %02x", opcode)
+        return None
+    timestamp_ms = frame.get('timestamp_ms')
+    if timestamp_ms is None:
+        timestamp_ms = int(time.time() * 1000)
+    return decoder(frame.get('payload', b''), timestamp_ms, frame)
 
 
 class SpecialPieAdapter(BaseTimerAdapter):
@@ -387,7 +403,7 @@ class SpecialPieAdapter(BaseTimerAdapter):
                 data = await reader.read(1024)
                 if data:
                     self.last_data_time = time.time()
-                    await self._process_frame_data(data)
+                    self._process_frame_data(data, int(self.last_data_time * 1000))
                 else:
                     await asyncio.sleep(0.01)
         except Exception as e:
@@ -397,7 +413,7 @@ class SpecialPieAdapter(BaseTimerAdapter):
     def _ble_notification_handler(self, sender: int, data: bytes) -> None:
         """Handle BLE notifications."""
         self.last_data_time = time.time()
-        asyncio.create_task(self._process_frame_data(data))
+        self._process_frame_data(data, int(self.last_data_time * 1000))
     
     async def _process_udp_data(self) -> None:
         """Process incoming UDP data."""
@@ -409,21 +425,21 @@ class SpecialPieAdapter(BaseTimerAdapter):
                     data, addr = await loop.sock_recvfrom(self.udp_socket, 1024)
                     if data:
                         self.last_data_time = time.time()
-                        await self._process_frame_data(data)
+                        self._process_frame_data(data, int(self.last_data_time * 1000))
                 except BlockingIOError:
                     await asyncio.sleep(0.01)
         except Exception as e:
             logger.error(f"UDP data processing error: {e}")
             await self._handle_disconnect("UDP error")
     
-    async def _process_frame_data(self, data: bytes) -> None:
-        """Process incoming frame data."""
-        frames = self.framer.feed(data)
+    def _process_frame_data(self, data: bytes, received_ms: int) -> None:
+        """Decode frames from one read and queue their events in order."""
+        frames = self.framer.feed(data, received_ms)
         
         for frame in frames:
             event = parse_specialpie_frame(frame)
             if event:
-                await self._emit_event(event)
+                self._post_event(event)
     
     async def _run_simulator(self) -> None:
         """Run the UDP simulator, sending demo data."""
@@ -457,19 +473,7 @@ class SpecialPieAdapter(BaseTimerAdapter):
     
     async def _send_simulator_frame(self, opcode: int, payload: bytes) -> None:
         """Send a simulated frame via UDP."""
-        # Build frame with checksum
-        length = len(payload)
-        frame_data = bytes([opcode, length]) + payload
-        
-        # Calculate checksum
-        checksum = opcode ^ length
-        for byte in payload:
-            checksum ^= byte
-        
-        frame_data += bytes([checksum])
-        
-        # Wrap with start/end markers
-        complete_frame = SpecialPieFramer.FRAME_START + frame_data + SpecialPieFramer.FRAME_END
+        complete_frame = SpecialPieFramer.encode(opcode, payload)
         
         # Send to ourselves (simulator)
         if self.udp_socket:
@@ -11,7 +11,7 @@ import json
 import logging
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -106,6 +106,11 @@ class RealTimeTimingCalibrator:
         self.max_buffer_size = 50
         self.max_learning_samples = 20
         
+        # Optional decision hook: on_decision(event, detail) for
+        # 'correlated', 'rejected' and 'uncorrelated' (shot expired unmatched)
+        self.on_decision: Optional[Callable[[str, str], None]] = None
+        self.uncorrelated_shots = 0
+        
         logger.info(f"Timing calibrator initialized")
         logger.info(f"Expected delay: {self.calibration.expected_delay_ms}ms")
         logger.info(f"Correlation window: {self.calibration.correlation_window_ms}ms")
@@ -119,12 +124,26 @@ class RealTimeTimingCalibrator:
         logger.debug(f"Shot #{shot_number} recorded at {timestamp.strftime('%H:%M:%S.%f')[:-3]}")
         
         # Cleanup old shots outside correlation window
-        cutoff_time = timestamp - timedelta(milliseconds=self.calibration.correlation_window_ms)
-        self.pending_shots = [s for s in self.pending_shots if s.timestamp >= cutoff_time]
+        self.expire_uncorrelated(timestamp)
         
         # Try to correlate with pending impacts
         asyncio.create_task(self._correlate_events())
     
+    def expire_uncorrelated(self, now: datetime = None) -> List[ShotEvent]:
+        """Drop pending shots whose correlation window has closed without an impact"""
+        now = now or datetime.now()
+        cutoff_time = now - timedelta(milliseconds=self.calibration.correlation_window_ms)
+        expired = [s for s in self.pending_shots if s.timestamp < cutoff_time]
+        if not expired:
+            return []
+        self.pending_shots = [s for s in self.pending_shots if s.timestamp >= cutoff_time]
+        self.uncorrelated_shots += len(expired)
+        for shot in expired:
+            logger.debug(f"Shot #{shot.shot_number} expired without a correlated impact")
+            if self.on_decision:
+                self.on_decision('uncorrelated', f"shot={shot.shot_number} at={shot.timestamp.strftime('%H:%M:%S.%f')[:-3]}")
+        return expired
+    
     def add_impact_event(self, timestamp: datetime, magnitude: float, device_id: str, raw_value: float = None):
         """Add a new impact event for correlation"""
         if magnitude < self.calibration.minimum_magnitude:
@@ -197,9 +216,15 @@ class RealTimeTimingCalibrator:
                     
                     logger.debug(f"✅ Correlated Shot #{shot.shot_number} → Impact {best_impact.magnitude:.1f}g "
                                f"(delay: {actual_delay}ms, confidence: {confidence:.2f})")
+                    if self.on_decision:
+                        self.on_decision('correlated', f"shot={shot.shot_number} delay={actual_delay}ms "
+                                                       f"confidence={confidence:.2f}")
                     
                     # Update learning system
                     await self._update_calibration(actual_delay)
+                elif self.on_decision:
+                    self.on_decision('rejected', f"shot={shot.shot_number} delay={actual_delay}ms "
+                                                 f"magnitude={best_impact.magnitude:.0f}")
                 # Note: Removed overly strict validation warning - correlations like 90ms vs 83ms expected are actually excellent
         
         # Remove successfully correlated shots and impacts
@@ -279,7 +304,11 @@ class RealTimeTimingCalibrator:
                 'total_pairs': 0,
                 'success_rate': 0.0,
                 'avg_delay_ms': self.calibration.expected_delay_ms,
-                'calibration_status': 'no_data'
+                'expected_delay_ms': self.calibration.expected_delay_ms,
+                'calibration_status': 'no_data',
+                'pending_shots': len(self.pending_shots),
+                'pending_impacts': len(self.pending_impacts),
+                'uncorrelated_shots': self.uncorrelated_shots
             }
         
         recent_pairs = [
@@ -303,7 +332,8 @@ class RealTimeTimingCalibrator:
             'expected_delay_ms': self.calibration.expected_delay_ms,
             'calibration_status': 'active' if recent_pairs else 'learning',
             'pending_shots': len(self.pending_shots),
-            'pending_impacts': len(self.pending_impacts)
+            'pending_impacts': len(self.pending_impacts),
+            'uncorrelated_shots': self.uncorrelated_shots
         }
 
 # Example integration with existing bridge
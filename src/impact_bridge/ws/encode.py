@@ -6,7 +6,9 @@ Normalizes timer events into JSON format for frontend consumption.
 
 import json
 import time
-from typing import Dict, Any, Optional
+from enum import Enum
+from collections.abc import Mapping
+from typing import Dict, Any, Optional, Tuple
 from dataclasses import asdict
 
 from ..timers.types import (
@@ -15,6 +17,42 @@ from ..timers.types import (
 )
 
 
+def _json_default(value: Any) -> Any:
+    """JSON fallback for enums in device info, bytes and decoded frames in raw data."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    if isinstance(value, Mapping):
+        # e.g. AmgFrame: display fields are built only now
+        return value.as_dict() if hasattr(value, 'as_dict') else dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# Event type -> (wire type, fields copied from the event)
+_EVENT_LAYOUTS: Dict[type, Tuple[str, Tuple[str, ...]]] = {
+    TimerConnected: ("timer_connected", ()),
+    TimerDisconnected: ("timer_disconnected", ("reason",)),
+    TimerReady: ("timer_ready", ()),
+    Shot: ("shot", ("split_ms", "shot_number", "string_number")),
+    StringStart: ("string_start", ("string_number",)),
+    StringStop: ("string_stop", ("total_ms", "shot_count", "string_number")),
+    Battery: ("battery", ("level_pct",)),
+    ClockSync: ("clock_sync", ("delta_ms", "device_time_ms", "host_time_ms")),
+}
+
+
+def _event_layout(event_class: type) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """Layout for ``event_class``, falling back to its nearest known base class."""
+    layout = _EVENT_LAYOUTS.get(event_class)
+    if layout is None:
+        for base in event_class.__mro__[1:]:
+            if base in _EVENT_LAYOUTS:
+                layout = _EVENT_LAYOUTS[event_class] = _EVENT_LAYOUTS[base]
+                break
+    return layout
+
+
 def encode_timer_event(event: TimerEvent, source: str) -> Dict[str, Any]:
     """
     Encode a timer event for WebSocket transmission.
@@ -26,80 +64,29 @@ def encode_timer_event(event: TimerEvent, source: str) -> Dict[str, Any]:
     Returns:
         Dictionary ready for JSON serialization
     """
-    base_data = {
-        "source": source,
-        "t_ms": event.timestamp_ms,
-        "raw": event.raw
-    }
-    
-    if isinstance(event, TimerConnected):
-        return {
-            "type": "timer_connected",
-            **base_data,
-            "info": asdict(event.info)
-        }
-    
-    elif isinstance(event, TimerDisconnected):
-        return {
-            "type": "timer_disconnected", 
-            **base_data,
-            "reason": event.reason
-        }
-    
-    elif isinstance(event, TimerReady):
-        return {
-            "type": "timer_ready",
-            **base_data
-        }
-    
-    elif isinstance(event, Shot):
-        return {
-            "type": "shot",
-            **base_data,
-            "split_ms": event.split_ms,
-            "shot_number": event.shot_number,
-            "string_number": event.string_number
-        }
-    
-    elif isinstance(event, StringStart):
-        return {
-            "type": "string_start",
-            **base_data,
-            "string_number": event.string_number
-        }
-    
-    elif isinstance(event, StringStop):
-        return {
-            "type": "string_stop", 
-            **base_data,
-            "total_ms": event.total_ms,
-            "shot_count": event.shot_count,
-            "string_number": event.string_number
-        }
-    
-    elif isinstance(event, Battery):
-        return {
-            "type": "battery",
-            **base_data,
-            "level_pct": event.level_pct
-        }
-    
-    elif isinstance(event, ClockSync):
-        return {
-            "type": "clock_sync",
-            **base_data, 
-            "delta_ms": event.delta_ms,
-            "device_time_ms": event.device_time_ms,
-            "host_time_ms": event.host_time_ms
-        }
-    
-    else:
+    layout = _event_layout(type(event))
+    if layout is None:
         # Unknown event type
         return {
             "type": "unknown",
-            **base_data,
+            "source": source,
+            "t_ms": event.timestamp_ms,
+            "raw": event.raw,
             "event_class": event.__class__.__name__
         }
+    
+    event_type, fields = layout
+    data = {
+        "type": event_type,
+        "source": source,
+        "t_ms": event.timestamp_ms,
+        "raw": event.raw
+    }
+    for field in fields:
+        data[field] = getattr(event, field)
+    if event_type == "timer_connected":
+        data["info"] = asdict(event.info)
+    return data
 
 
 def encode_timer_event_json(event: TimerEvent, source: str) -> str:
@@ -114,7 +101,7 @@ def encode_timer_event_json(event: TimerEvent, source: str) -> str:
         JSON string ready to send over WebSocket
     """
     data = encode_timer_event(event, source)
-    return json.dumps(data, separators=(',', ':'))
+    return json.dumps(data, separators=(',', ':'), default=_json_default)
 
 
 class TimerEventEncoder:
@@ -149,4 +136,4 @@ class TimerEventEncoder:
     def encode_json(self, event: TimerEvent) -> str:
         """Encode event as JSON with context."""
         data = self.encode(event)
-        return json.dumps(data, separators=(',', ':'))
\ No newline at end of file
+        return json.dumps(data, separators=(',', ':'), default=_json_default)
\ No newline at end of file
@@ -0,0 +1,56 @@
+import json
+import os
+import sys
+
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.ble.amg_parse import decode_amg_frame, format_amg_event, parse_amg_timer_data
+from impact_bridge.timers import AMGCommanderAdapter, Shot, StringStart, StringStop
+from impact_bridge.ws.encode import encode_timer_event_json
+
+
+def _status(state, shot, time_cs, split_cs, round_number=1):
+    return bytes([0x01, state, shot, shot, time_cs >> 8, time_cs & 0xFF, split_cs >> 8, split_cs & 0xFF,
+                  0, 0x64, 0x01, 0x00, round_number >> 8, round_number & 0xFF])
+
+
+def test_status_sequence_and_screen_frames():
+    frame = decode_amg_frame(bytearray(_status(3, 2, 0x0100, 35)))
+    assert (frame.event, frame.time_cs, frame.current_time, frame.split_time) == ('SHOT', 256, 2.56, 0.35)
+    assert frame.first_shot_time == 1.0 and frame.second_shot_time == 2.56 and frame.current_round == 1
+    # The mapping view matches parse_amg_timer_data, display strings included
+    parsed = parse_amg_timer_data(_status(3, 2, 0x0100, 35))
+    assert dict(frame) == parsed and parsed['event_detail'] == "Shot 2: 2.56s"
+    assert format_amg_event(frame) == str(frame) == "Shot 2: 2.56s"
+
+    sequence = decode_amg_frame(bytes([10, 3, 0x00, 0x17, 0x01, 0x00, 0x01, 0x2C, 0x00]))
+    assert sequence.event is None and sequence.shot_times == (0.23, 2.56, 3.0)
+    assert decode_amg_frame(bytes([2, 6, 0, 100, 1, 0, 0, 5])).screen_cs == (100, 256, 5)
+    assert decode_amg_frame(b'\x01') is None and parse_amg_timer_data(bytes([1, 5])) is None
+
+
+def test_adapter_events_share_the_frame_and_skip_sequence_lines():
+    adapter = AMGCommanderAdapter()
+    events = []
+    adapter._post_event = events.append
+    for data in (_status(5, 0, 0, 0, round_number=4), _status(3, 1, 150, 150, round_number=4),
+                 _status(8, 1, 150, 0, round_number=4),
+                 # A sequence line with eight shots: byte 1 is a count, not the STOP state
+                 bytes([10, 8]) + bytes(16)):
+        adapter._amg_notification_handler(0, data)
+
+    assert [type(e) for e in events] == [StringStart, Shot, StringStop]
+    assert events[1].split_ms == 1500 and (events[2].total_ms, events[2].shot_count, events[2].string_number) == (1500, 1, 4)
+    encoded = json.loads(encode_timer_event_json(events[1], 'amg'))
+    assert encoded['type'] == 'shot' and encoded['shot_number'] == 1
+    assert encoded['raw']['parsed']['event_detail'] == "Shot 1: 1.50s"
+    assert encoded['raw']['parsed']['raw_hex'] == _status(3, 1, 150, 150, round_number=4).hex().upper()
+
+
+def test_encoder_dispatch_covers_subclasses():
+    class DelayedShot(Shot):
+        pass
+
+    encoded = json.loads(encode_timer_event_json(DelayedShot(timestamp_ms=5, raw={}, split_ms=120), 'sim'))
+    assert (encoded['type'], encoded['split_ms'], encoded['t_ms']) == ('shot', 120, 5)
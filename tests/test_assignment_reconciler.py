@@ -0,0 +1,57 @@
+import json
+import os
+import sys
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.assignment_reconciler import (
+    AssignmentWatcher, diff_assignments, read_assignment_file, write_assignment_file,
+)
+
+TIMER = '60:09:C3:1F:DC:1A'
+S1 = 'EA:18:3D:6A:BA:E5'
+S2 = 'C2:1B:DB:F0:55:50'
+S3 = 'DB:10:38:B9:0E:A5'
+
+
+def test_diff_only_touches_changed_sensors():
+    desired = {'timer': TIMER, 'sensors': [S1, S3]}
+    diff = diff_assignments(TIMER.lower(), [S1.lower(), S2], desired)
+    assert diff.connect_sensors == [S3]
+    assert diff.disconnect_sensors == [S2]
+    assert diff.keep_sensors == [S1]
+    assert diff.timer_change is None
+    assert not diff.empty
+
+    diff = diff_assignments(None, [S1, S3], desired)
+    assert diff.timer_change == (None, TIMER)
+    assert diff_assignments(TIMER, [S3, S1], desired).empty
+
+
+def test_watcher_reports_content_changes_only(tmp_path):
+    path = tmp_path / 'bridge_device_config.json'
+    write_assignment_file(path, {'timer': TIMER, 'sensors': [S1]})
+    watcher = AssignmentWatcher(path)
+    watcher.prime({'timer': TIMER, 'sensors': [S1.lower()]})
+    assert watcher.poll() is None
+
+    write_assignment_file(path, {'timer': TIMER, 'sensors': [S1, S2]})
+    os.utime(path, ns=(1, 1))  # Make sure the stamp differs on coarse clocks
+    assert watcher.poll() == {'timer': TIMER, 'sensors': [S1, S2]}
+    assert watcher.poll() is None
+
+    # Rewritten with identical assignments: no reload
+    path.write_text(json.dumps({'timer': TIMER.lower(), 'sensors': [S1, S2]}))
+    assert watcher.poll() is None
+    assert watcher.reloads == 1
+
+
+def test_invalid_file_is_ignored(tmp_path):
+    path = tmp_path / 'bridge_device_config.json'
+    path.write_text('{"timer": ')
+    assert read_assignment_file(path) is None
+    watcher = AssignmentWatcher(path)
+    watcher.prime({'timer': None, 'sensors': []})
+    path.write_text('{"sensors": []}')
+    assert watcher.poll() is None
+    assert read_assignment_file(tmp_path / 'missing.json') is None
@@ -0,0 +1,151 @@
+import asyncio
+import os
+import sqlite3
+import sys
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+import httpx
+from src.impact_bridge import fastapi_backend as backend
+from src.impact_bridge.database.access import DatabaseAccess
+
+TIMER = '60:09:C3:1F:DC:1A'
+SENSORS = [f'EA:18:3D:6A:BA:{n:02X}' for n in range(1, 5)]
+
+
+def _make_db(path):
+    conn = sqlite3.connect(str(path))
+    conn.executescript("""
+        CREATE TABLE stage_configs (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL);
+        CREATE TABLE target_configs (id INTEGER PRIMARY KEY, stage_config_id INTEGER NOT NULL,
+                                     target_number INTEGER NOT NULL);
+        CREATE TABLE bridges (id INTEGER PRIMARY KEY, name VARCHAR(100), current_stage_id INTEGER);
+        CREATE TABLE sensors (id INTEGER PRIMARY KEY, hw_addr VARCHAR(17) NOT NULL,
+                              target_config_id INTEGER, bridge_id INTEGER);
+        CREATE TABLE device_pool (id INTEGER PRIMARY KEY, hw_addr VARCHAR(17) NOT NULL UNIQUE,
+                                  device_type VARCHAR(20) NOT NULL, label VARCHAR(100) NOT NULL);
+        CREATE TABLE bridge_configurations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            bridge_id INTEGER NOT NULL UNIQUE,
+            stage_config_id INTEGER NOT NULL,
+            timer_address VARCHAR(17),
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE bridge_target_assignments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            bridge_id INTEGER NOT NULL,
+            target_number INTEGER NOT NULL,
+            sensor_address VARCHAR(17) NOT NULL,
+            sensor_label VARCHAR(100),
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(bridge_id, target_number),
+            UNIQUE(bridge_id, sensor_address)
+        );
+        INSERT INTO stage_configs (id, name) VALUES (1, 'Go Fast'), (2, 'Short Stage');
+        INSERT INTO target_configs (stage_config_id, target_number)
+            VALUES (1, 1), (1, 2), (1, 3), (1, 4), (2, 1), (2, 2);
+        INSERT INTO bridges (id, name) VALUES (1, 'Bridge 1'), (2, 'Bridge 2');
+        -- Sensors on targets of stage 1 (target_configs 1, 2) and stage 2 (target_config 5)
+        INSERT INTO sensors (hw_addr, target_config_id, bridge_id)
+            VALUES ('EA:18:3D:6A:BA:01', 1, 2), ('EA:18:3D:6A:BA:02', 2, NULL), ('EA:18:3D:6A:BA:03', 5, 2);
+    """)
+    conn.execute("INSERT INTO device_pool (hw_addr, device_type, label) VALUES (?, 'timer', 'AMG Timer')", (TIMER,))
+    conn.executemany("INSERT INTO device_pool (hw_addr, device_type, label) VALUES (?, 'sensor', ?)",
+                     [(addr, f'BT50 {n}') for n, addr in enumerate(SENSORS, 1)])
+    conn.commit()
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def test_plan_reports_every_problem(tmp_path):
+    conn = _make_db(tmp_path / 'leadville.db')
+    try:
+        plan, errors = backend._plan_bulk_assignments(conn, 1, 1, True, TIMER, {
+            '1': SENSORS[0].lower(), '2': '', '3': SENSORS[1]})
+        assert errors == []
+        assert plan == {'stage_id': 1, 'stage_name': 'Go Fast', 'timer_address': TIMER,
+                        'assignments': [(1, SENSORS[0], 'BT50 1'), (3, SENSORS[1], 'BT50 2')]}
+
+        _, errors = backend._plan_bulk_assignments(conn, 1, 2, True, SENSORS[3], {
+            'one': SENSORS[0],
+            '3': SENSORS[1],
+            '1': 'AA:BB:CC:DD:EE:FF',
+            '2': TIMER,
+        })
+        assert errors == [
+            "Target 'one' is not a target number",
+            'Target 3 does not exist in stage 2',
+            'Target 1: device AA:BB:CC:DD:EE:FF not found in device pool',
+            'Target 2: AMG Timer is a timer, not a sensor',
+            'BT50 4 is not a timer',
+        ]
+
+        _, errors = backend._plan_bulk_assignments(conn, 1, 1, True, 'AA:BB:CC:DD:EE:FF', {
+            '1': SENSORS[0], '2': SENSORS[0].lower()})
+        assert errors == [f'Device {SENSORS[0].lower()} assigned to both Target 1 and Target 2',
+                          'Timer AA:BB:CC:DD:EE:FF not found in device pool']
+
+        _, errors = backend._plan_bulk_assignments(conn, 1, None, False, None, {'1': SENSORS[0]})
+        assert errors == ['stage_config_id is required (bridge has no stage yet)']
+        _, errors = backend._plan_bulk_assignments(conn, 1, 9, False, None, {})
+        assert errors == ['Stage config 9 not found']
+    finally:
+        conn.close()
+
+
+def test_bulk_assign_replaces_mapping_or_changes_nothing(tmp_path, monkeypatch):
+    path = tmp_path / 'leadville.db'
+    _make_db(path).close()
+    database = DatabaseAccess(path, readers=2)
+    rewrites = []
+
+    async def _update_json_config_from_db(bridge_id):
+        rewrites.append(bridge_id)
+
+    monkeypatch.setattr(backend, '_update_json_config_from_db', _update_json_config_from_db)
+    backend.app.dependency_overrides[backend.get_leadville_db] = lambda: database
+
+    async def run():
+        transport = httpx.ASGITransport(app=backend.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            def put(body):
+                return client.put('/api/admin/bridge/assignments', json={'bridge_id': 1, **body})
+
+            first = await put({'stage_config_id': 1, 'timer': TIMER,
+                               'targets': {'1': SENSORS[0], '2': SENSORS[1], '3': SENSORS[2]}})
+            rejected = await put({'targets': {'1': SENSORS[3], '2': SENSORS[3], '5': SENSORS[2]}})
+            # Timer and stage are kept when omitted; unlisted targets are unassigned
+            second = await put({'targets': {'2': SENSORS[0], '4': SENSORS[3]}})
+            return first, rejected, second
+
+    try:
+        first, rejected, second = asyncio.run(run())
+    finally:
+        backend.app.dependency_overrides.pop(backend.get_leadville_db, None)
+        database.close()
+
+    assert first.status_code == 200 and first.json()['message'] == '3 targets assigned for Go Fast'
+    assert first.json()['sensors_updated'] == 2
+    assert rejected.status_code == 400
+    assert rejected.json() == {'error': 'Invalid assignments - nothing was changed', 'details': [
+        f'Device {SENSORS[3]} assigned to both Target 1 and Target 2',
+        'Target 5 does not exist in stage 1',
+    ]}
+    assert second.status_code == 200
+    assert second.json()['timer'] == TIMER and second.json()['stage']['stage_config_id'] == 1
+    assert rewrites == [1, 1]
+
+    conn = sqlite3.connect(str(path))
+    try:
+        assert conn.execute("SELECT target_number, sensor_address, sensor_label FROM bridge_target_assignments "
+                            "ORDER BY target_number").fetchall() == [(2, SENSORS[0], 'BT50 1'),
+                                                                     (4, SENSORS[3], 'BT50 4')]
+        assert conn.execute("SELECT stage_config_id, timer_address FROM bridge_configurations").fetchall() == [
+            (1, TIMER)]
+        assert conn.execute("SELECT current_stage_id FROM bridges WHERE id = 1").fetchone() == (1,)
+        # Same sensor ownership as assign_bridge_to_stage leaves behind
+        assert conn.execute("SELECT target_config_id, bridge_id FROM sensors ORDER BY id").fetchall() == [
+            (1, 1), (2, 1), (5, 2)]
+    finally:
+        conn.close()
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import sys
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from impact_bridge.config_snapshot import ConfigSnapshot
+
+
+def _make_app():
+    state = {'loads': 0, 'label': 'Sensor A'}
+
+    async def loader():
+        state['loads'] += 1
+        return {'stages': {1: {'id': 1, 'sensor': state['label']}}}
+
+    def render(graph, stage_id):
+        stage = graph['stages'].get(stage_id)
+        if not stage:
+            return 404, {'error': 'Stage not found'}
+        return 200, {'stage': stage}
+
+    snapshot = ConfigSnapshot(loader, max_age=60.0)
+    app = FastAPI()
+
+    @app.get('/stages/{stage_id}')
+    async def get_stage(stage_id: int, request: Request):
+        return await snapshot.respond(request, f'stage:{stage_id}', lambda graph: render(graph, stage_id))
+
+    return app, snapshot, state
+
+
+def test_responses_are_built_once_per_version_and_support_304():
+    app, snapshot, state = _make_app()
+    client = TestClient(app)
+
+    first = client.get('/stages/1')
+    assert first.status_code == 200 and first.json() == {'stage': {'id': 1, 'sensor': 'Sensor A'}}
+    etag = first.headers['etag']
+
+    again = client.get('/stages/1', headers={'If-None-Match': etag})
+    assert again.status_code == 304 and again.content == b''
+    assert client.get('/stages/2').status_code == 404
+    assert state['loads'] == 1
+    assert snapshot.stats()['not_modified'] == 1
+
+
+def test_invalidate_rebuilds_and_changes_etag():
+    app, snapshot, state = _make_app()
+    client = TestClient(app)
+    etag = client.get('/stages/1').headers['etag']
+
+    state['label'] = 'Sensor B'
+    snapshot.invalidate('sensor reassigned')
+    changed = client.get('/stages/1', headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.json()['stage']['sensor'] == 'Sensor B'
+    assert changed.headers['etag'] != etag
+    assert changed.headers['x-config-version'] == '1'
+    assert state['loads'] == 2
+
+
+def test_invalidation_during_load_is_not_cached():
+    snapshot = None
+    loads = []
+
+    async def loader():
+        loads.append(snapshot.version)
+        if len(loads) == 1:
+            snapshot.invalidate('write during load')
+        return {'n': len(loads)}
+
+    snapshot = ConfigSnapshot(loader)
+
+    async def run():
+        first = await snapshot.render('k', lambda graph: (200, graph))
+        second = await snapshot.render('k', lambda graph: (200, graph))
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.body == b'{"n":1}' and second.body == b'{"n":2}'
@@ -0,0 +1,77 @@
+import asyncio
+import os
+import sqlite3
+import sys
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+import pytest
+from sqlalchemy import create_engine
+from impact_bridge.database.access import DatabaseAccess
+from impact_bridge.database.models import Node
+
+
+def _make_db(path):
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.execute("INSERT INTO items (name) VALUES ('a'), ('b')")
+    conn.commit()
+    conn.close()
+
+
+def test_readers_are_read_only_and_see_committed_writes(tmp_path):
+    path = tmp_path / 'test.db'
+    _make_db(path)
+    db = DatabaseAccess(path, readers=2)
+
+    async def run():
+        rows = await db.fetchall("SELECT name FROM items ORDER BY id")
+        assert [row['name'] for row in rows] == ['a', 'b']
+        with pytest.raises(sqlite3.OperationalError):
+            await db.read(lambda conn: conn.execute("INSERT INTO items (name) VALUES ('x')"))
+        assert await db.execute("UPDATE items SET name = 'c' WHERE id = 1") == 1
+        return await db.fetchone("SELECT name FROM items WHERE id = 1")
+
+    try:
+        assert asyncio.run(run())['name'] == 'c'
+        assert db.stats()['writes'] == 1
+    finally:
+        db.close()
+
+
+def test_failed_write_rolls_back(tmp_path):
+    path = tmp_path / 'test.db'
+    _make_db(path)
+    db = DatabaseAccess(path)
+
+    def _fail(conn):
+        conn.execute("DELETE FROM items")
+        raise ValueError("boom")
+
+    async def run():
+        with pytest.raises(ValueError):
+            await db.write(_fail)
+        return await db.fetchall("SELECT id FROM items")
+
+    try:
+        assert len(asyncio.run(run())) == 2
+        assert db.stats()['write_errors'] == 1
+    finally:
+        db.close()
+
+
+def test_orm_helpers_use_writer_and_readers(tmp_path):
+    path = tmp_path / 'test.db'
+    engine = create_engine(f"sqlite:///{path}")
+    Node.__table__.create(engine)
+    engine.dispose()
+    db = DatabaseAccess(path)
+
+    async def run():
+        await db.write_orm(lambda session: session.add(Node(name='node-1', mode='online')))
+        return await db.read_orm(lambda session: [node.name for node in session.query(Node).all()])
+
+    try:
+        assert asyncio.run(run()) == ['node-1']
+    finally:
+        db.close()
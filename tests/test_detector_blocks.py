@@ -0,0 +1,138 @@
+import os
+import random
+import sys
+from datetime import datetime
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+import numpy as np
+from impact_bridge.shot_detector import ShotDetector
+from impact_bridge.enhanced_impact_detection import EnhancedImpactDetector, SampleRing
+
+
+def _stream(n=3000, seed=7):
+    """50Hz stream of noise with bursts of varying length and height"""
+    rng = random.Random(seed)
+    base = 1_700_000_000_000_000_000
+    ts = np.array([base + i * 20_000_000 for i in range(n)], dtype=np.int64)
+    values = np.array([[rng.gauss(0, 5), rng.gauss(0, 5), rng.gauss(0, 5)] for _ in range(n)])
+    i = 50
+    while i < n - 20:
+        length = rng.randint(1, 15)
+        values[i:i + length] += rng.choice([40, 120, 200, 400])
+        i += length + rng.randint(3, 80)
+    return ts, values
+
+
+def _blocks(n, seed=3):
+    rng = random.Random(seed)
+    i = 0
+    while i < n:
+        size = rng.randint(1, 12)
+        yield i, min(n, i + size)
+        i += size
+
+
+def test_shot_detector_block_matches_scalar():
+    ts, values = _stream()
+    kwargs = dict(baseline_x=0, threshold=100, min_duration=3, max_duration=8, min_interval_seconds=0.3)
+
+    scalar = ShotDetector(**kwargs)
+    expected = []
+    for x, t in zip(values[:, 0].tolist(), ts.tolist()):
+        event = scalar.process_sample(x, t / 1e9)
+        if event:
+            expected.append(event)
+
+    block = ShotDetector(**kwargs)
+    actual = []
+    for a, b in _blocks(len(ts)):
+        actual.extend(block.process_samples(values[a:b, 0], ts[a:b]))
+
+    assert len(expected) > 5
+    assert actual == expected
+    assert block.get_stats()['total_samples'] == scalar.get_stats()['total_samples']
+
+
+def test_enhanced_detector_block_matches_scalar():
+    ts, values = _stream(seed=11)
+    mags = np.sqrt((values ** 2).sum(axis=1))
+    raw = values + 2000
+
+    scalar = EnhancedImpactDetector(threshold=150.0, onset_threshold=30.0)
+    expected = []
+    for i in range(len(ts)):
+        event = scalar.process_sample(datetime.fromtimestamp(ts[i] / 1e9), raw[i].tolist(),
+                                      values[i].tolist(), float(mags[i]))
+        if event:
+            expected.append(event)
+
+    block = EnhancedImpactDetector(threshold=150.0, onset_threshold=30.0)
+    actual = []
+    for a, b in _blocks(len(ts)):
+        actual.extend(block.process_samples(ts[a:b], values[a:b], mags[a:b], raw[a:b]))
+
+    assert len(expected) > 5
+    assert [(e.onset_timestamp, e.peak_timestamp, e.peak_magnitude, e.sample_count, e.duration_ms)
+            for e in actual] == \
+           [(e.onset_timestamp, e.peak_timestamp, e.peak_magnitude, e.sample_count, e.duration_ms)
+            for e in expected]
+    # Events own their samples: still intact long after the ring wrapped over them
+    assert [e.peak_samples for e in actual] == [e.peak_samples for e in expected]
+    assert expected[0].peak_samples[0].timestamp == expected[0].onset_timestamp
+    # One block much longer than the ring
+    whole = EnhancedImpactDetector(threshold=150.0, onset_threshold=30.0).process_samples(ts, values, mags, raw)
+    assert [e.peak_samples for e in whole] == [e.peak_samples for e in expected]
+    assert block.ring.total == scalar.ring.total == len(ts)
+    assert np.array_equal(block.recent_window(50).magnitude, scalar.recent_window(50).magnitude)
+
+
+def test_sample_ring_blocks_and_buffered_samples():
+    ring = SampleRing(4)
+    base = 1_700_000_000_000_000_000
+    ts = base + np.arange(13, dtype=np.int64) * 1000
+    ids = np.arange(13, dtype=float)
+    xyz = np.stack([ids, ids, ids], axis=1)
+    ring.extend(ts[:3], xyz[:3], xyz[:3], ids[:3])
+    ring.extend(ts[3:9], xyz[3:9], xyz[3:9], ids[3:9])
+    ring.append(datetime.fromtimestamp(ts[9] / 1e9), [9, 9, 9], [9, 9, 9], 9.0)  # Converted when read
+
+    assert ring.window(9, 10).ts_ns.tolist() == [ts[9]]
+    assert ring.window(8, 10).magnitude.tolist() == [8.0, 9.0]
+    assert np.shares_memory(ring.window(8, 10).magnitude, ring.magnitude)
+    # Straddling the end of the buffer: a copy
+    window = ring.window(6, 10)
+    assert window.ts_ns.tolist() == ts[6:10].tolist() and window.corrected[:, 0].tolist() == [6, 7, 8, 9]
+    assert ring.lookback(2).corrected[:, 0].tolist() == [8, 9]
+    # More single samples than the ring holds
+    for t in range(10, 13):
+        ring.append(datetime.fromtimestamp(ts[t] / 1e9), [t] * 3, [t] * 3, float(t))
+    ring.append(datetime.fromtimestamp(ts[12] / 1e9), [0] * 3, [0] * 3, 13.0)
+    for t in (14, 15):
+        ring.append(datetime.fromtimestamp(ts[12] / 1e9), [0] * 3, [0] * 3, float(t))
+    assert (ring.oldest, len(ring)) == (12, 4)
+    assert ring.lookback(4).magnitude.tolist() == [12.0, 13.0, 14.0, 15.0]
+    assert ring.lookback(1).ts_ns.tolist() == [ts[12]]
+    ring.extend(ts[:1], xyz[:1], xyz[:1], ids[:1])
+    assert ring.lookback(4).magnitude.tolist() == [13.0, 14.0, 15.0, 0.0]
+
+
+def test_overlong_impact_is_discarded_in_both_paths():
+    n = 40
+    ts = 1_700_000_000_000_000_000 + np.arange(n, dtype=np.int64) * 20_000_000
+    values = np.zeros((n, 3))
+    values[5:25, 0] = 300  # 20 samples above onset, longer than the limit
+    values[30:34, 0] = 300
+    mags = np.abs(values[:, 0])
+
+    scalar = EnhancedImpactDetector(max_impact_samples=8)
+    expected = [scalar.process_sample(datetime.fromtimestamp(ts[i] / 1e9), values[i].tolist(),
+                                      values[i].tolist(), float(mags[i])) for i in range(n)]
+    expected = [e for e in expected if e]
+
+    block = EnhancedImpactDetector(max_impact_samples=8)
+    actual = []
+    for a, b in _blocks(n, seed=5):
+        actual.extend(block.process_samples(ts[a:b], values[a:b], mags[a:b]))
+
+    assert [e.sample_count for e in expected] == [e.sample_count for e in actual] == [5]
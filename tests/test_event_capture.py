@@ -0,0 +1,59 @@
+import os
+import sys
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.event_capture import EventGatedCapture
+
+MS = 1_000_000
+
+
+def _capture(**kwargs):
+    written = []
+    capture = EventGatedCapture(lambda mac, items, tag: written.extend((mac, i, tag) for i in items), **kwargs)
+    return capture, written
+
+
+def test_impact_releases_pre_and_post_window():
+    capture, written = _capture(pre_ms=100, post_ms=60)
+    for i in range(50):  # 20ms per sample
+        capture.feed('A', i * 20 * MS, i)
+        capture.feed('B', i * 20 * MS, i)
+        if i == 30:
+            capture.trigger('A', 30 * 20 * MS, 'impact:1')
+
+    # 100ms before (25..30) and 60ms after (31..33), sensor B untouched
+    assert [i for _, i, _ in written] == list(range(25, 34))
+    assert {(mac, tag) for mac, _, tag in written} == {('A', 'impact:1')}
+    stats = capture.get_stats()
+    assert stats['persisted'] == 9 and stats['seen'] == 100
+
+
+def test_string_captures_all_sensors_until_stop():
+    capture, written = _capture(pre_ms=40, post_ms=20)
+    for i in range(40):
+        ts = i * 10 * MS
+        if i == 10:
+            capture.start_string(3, ts)
+        if i == 20:
+            capture.stop_string(ts)
+        capture.feed('A', ts, i)
+        capture.feed('B', ts, i)
+
+    a = [i for mac, i, tag in written if mac == 'A']
+    assert a == list(range(6, 23))  # 40ms pre-trigger, string, 20ms after STOP
+    assert {tag for _, _, tag in written} == {'string:3'}
+    assert not capture.string_active
+
+
+def test_gated_session_drops_most_samples():
+    capture, written = _capture(pre_ms=500, post_ms=500)
+    # 10 minutes at 50Hz with one impact every 30s
+    for i in range(30_000):
+        ts = i * 20 * MS
+        capture.feed('A', ts, i)
+        if i % 1500 == 750:
+            capture.trigger('A', ts, f'impact:{i}')
+
+    assert capture.get_stats()['reduction_pct'] >= 90.0
+    assert len(written) == 20 * 51
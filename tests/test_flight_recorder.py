@@ -0,0 +1,90 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.flight_recorder import (FlightRecorder, KIND_CORRELATOR, KIND_DETECTOR,
+                                           request_dump)
+from impact_bridge.sample_pipeline import decode_block
+from impact_bridge.shot_detector import ShotDetector
+from impact_bridge.timing_calibration import RealTimeTimingCalibrator
+
+
+def _read(path):
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    return lines[0], lines[1:]
+
+
+def test_dump_contains_all_record_kinds_and_joins_long_payloads(tmp_path):
+    recorder = FlightRecorder(tmp_path, seconds=10)
+    frame = b'\x55\x61' + np.arange(13, dtype='<i2').tobytes()
+    recorder.record_raw('AA', frame * 3)  # 84 bytes -> two records
+    recorder.record_block(decode_block('AA', frame))
+    recorder.record_event('AA', KIND_DETECTOR, 'shot.timeout', 'samples=12 max=11')
+    recorder.record_event('correlator', KIND_CORRELATOR, 'uncorrelated', 'shot=3')
+
+    header, records = _read(recorder.dump('test'))
+    assert header['reason'] == 'test' and header['devices'] == {'AA': 4, 'correlator': 1}
+    raw, sample, detector, correlator = records
+    assert bytes.fromhex(raw['hex']) == frame * 3
+    assert sample['kind'] == 'sample' and abs(sample['x'] - 0.0) < 1e-6
+    assert (detector['event'], detector['detail']) == ('shot.timeout', 'samples=12 max=11')
+    assert correlator['device'] == 'correlator' and correlator['event'] == 'uncorrelated'
+
+
+def test_ring_keeps_newest_records_and_triggers_coalesce(tmp_path):
+    recorder = FlightRecorder(tmp_path, seconds=1, records_per_second=16, min_dump_interval=60)
+    for i in range(40):
+        recorder.record_event('AA', KIND_DETECTOR, 'step', str(i))
+    assert recorder.trigger('first')
+    assert not recorder.trigger('second')
+    deadline = time.monotonic() + 5
+    while recorder.dumps == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    _, records = _read(recorder.last_dump_path)
+    assert [r['detail'] for r in records] == [str(i) for i in range(24, 40)]
+    assert recorder.get_stats()['coalesced'] == 1
+
+
+def test_request_file_triggers_dump(tmp_path):
+    recorder = FlightRecorder(tmp_path, min_dump_interval=60)
+    recorder.dump('earlier')
+    assert not recorder.check_requests()
+    request_dump(tmp_path, 'operator/check')
+    assert recorder.check_requests()
+    assert not (tmp_path / 'dump.request').exists()
+
+
+def test_detector_and_correlator_hooks(tmp_path):
+    transitions = []
+    detector = ShotDetector(baseline_x=0, threshold=10, min_duration=2, max_duration=3)
+    detector.trace = lambda event, detail: transitions.append(event)
+    x = np.array([0, 20, 20, 20, 20, 0, 0], dtype=float)
+    detector.process_samples(x, 10_000_000_000 + np.arange(len(x), dtype=np.int64) * 20_000_000)
+    assert transitions == ['start', 'timeout']
+
+    decisions = []
+    calibrator = RealTimeTimingCalibrator(tmp_path / 'timing_calibration.json')
+    calibrator.on_decision = lambda event, detail: decisions.append(event)
+    delay = timedelta(milliseconds=calibrator.calibration.expected_delay_ms)
+
+    async def feed():
+        # The bridge feeds shots and impacts through the public API
+        shot_time = datetime.now() - timedelta(seconds=5)
+        calibrator.add_shot_event(shot_time, 1, 'AMG_TIMER:string1')
+        calibrator.add_impact_event(shot_time + delay, 200.0, 'EA:18:3D:6A:BA:01')
+        await asyncio.sleep(0)
+        calibrator.add_shot_event(shot_time + timedelta(seconds=1), 2, 'AMG_TIMER:string1')
+        await asyncio.sleep(0)
+
+    asyncio.run(feed())
+    assert decisions == ['correlated']
+    assert len(calibrator.expire_uncorrelated()) == 1
+    assert decisions == ['correlated', 'uncorrelated'] and calibrator.pending_shots == []
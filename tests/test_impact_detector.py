@@ -1,10 +1,12 @@
+import asyncio
 import time
 import os
 import sys
 repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if repo_root not in sys.path:
     sys.path.insert(0, repo_root)
-from tools.bt50_capture_db import ImpactDetector
+from tools.bt50_capture_db import ImpactDetector, enqueue_timer_event, make_capture
+from impact_bridge.priority_lanes import PriorityLanes
 
 
 def test_impact_detector_simple():
@@ -28,3 +30,30 @@ def test_impact_detector_simple():
     assert ev is not None, 'expected an impact event'
     assert ev['peak_mag'] >= 0.25
     assert ev['impact_ts_ns'] == samples[2][0]
+
+
+def test_timer_start_stop_gate_the_string_window():
+    lanes = PriorityLanes()
+    capture = make_capture(lanes, pre_ms=100, post_ms=100)
+    ms = 1_000_000
+
+    def sample(t_ms):
+        capture.feed('AA', t_ms * ms, {'sensor_mac': 'AA', 'parsed': {'t': t_ms}})
+
+    for t in (0, 950):  # Only 950 is inside the pre-trigger window
+        sample(t)
+    enqueue_timer_event(lanes, {'event_type': 'START', 'ts_ns': 1000 * ms, 'string_number': 3}, capture)
+    sample(1500)
+    enqueue_timer_event(lanes, {'event_type': 'STOP', 'ts_ns': 2000 * ms}, capture)
+    for t in (2050, 2500):  # Only 2050 is inside the post window
+        sample(t)
+
+    async def drain():
+        lanes.put_nowait(None)
+        return await lanes.get_batch(100)
+
+    items = [item for _, item, _ in asyncio.run(drain())]
+    timers = [item['timer']['event_type'] for item in items if 'timer' in item]
+    samples = [(item['parsed']['t'], item['window_tag']) for item in items if 'parsed' in item]
+    assert timers == ['START', 'STOP']
+    assert sorted(samples) == [(950, 'string:3'), (1500, 'string:3'), (2050, 'string:3')]
@@ -0,0 +1,88 @@
+import gzip
+import logging
+import os
+import sys
+import time
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.log_setup import CompressingRotatingFileHandler, LazyHex, LogSampler
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(record.getMessage())
+
+
+def _logger(name):
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = _ListHandler()
+    logger.handlers = [handler]
+    return logger, handler
+
+
+def test_sampler_emits_one_line_per_interval_with_counts():
+    logger, handler = _logger('test_sampler')
+    sampler = LogSampler(logger, interval=60.0)
+    for i in range(100):
+        sampler.info('parsed frame', "frame %d", i)
+    sampler.debug('raw notification', "raw %s", LazyHex(b'\xab'))
+
+    assert handler.lines == ['frame 0', 'raw ab']
+    sampler._last['parsed frame'] -= 61.0
+    sampler.info('parsed frame', "frame %d", 100)
+    assert handler.lines[-1].startswith('frame 100 (+99 similar in')
+
+    sampler.info('parsed frame', "frame %d", 101)
+    sampler.flush()
+    assert handler.lines[-1] == 'parsed frame: 1 lines suppressed'
+    assert sampler.stats() == {'emitted': 3, 'suppressed': 100, 'pending': {}}
+
+
+def test_sampler_tick_summarizes_quiet_keys():
+    logger, handler = _logger('test_sampler_tick')
+    sampler = LogSampler(logger, interval=60.0, intervals={'fast': 1.0})
+    for i in range(3):
+        sampler.debug('raw notification', "raw %d", i)
+        sampler.debug('fast', "fast %d", i)
+    assert sampler.tick() == 0
+    sampler._last['fast'] -= 2.0
+    assert sampler.tick() == 1
+    assert handler.lines[-1].startswith('fast: 2 lines suppressed in ')
+    # Summarized counts are not repeated by the next line or flush()
+    sampler._last['fast'] -= 2.0
+    sampler.debug('fast', "fast %d", 3)
+    assert handler.lines[-1] == 'fast 3'
+    assert sampler.stats()['pending'] == {'raw notification': 2}
+
+
+def test_sampler_skips_disabled_levels():
+    logger, handler = _logger('test_sampler_level')
+    logger.setLevel(logging.INFO)
+    sampler = LogSampler(logger)
+    assert not sampler.debug('raw notification', "raw %s", 'ab')
+    assert handler.lines == [] and sampler.stats()['suppressed'] == 0
+
+
+def test_rotation_compresses_backups(tmp_path):
+    path = tmp_path / 'bridge.log'
+    handler = CompressingRotatingFileHandler(path, max_bytes=200, backup_count=2)
+    logger, _ = _logger('test_rotation')
+    logger.handlers = [handler]
+    for i in range(40):
+        logger.info("line %03d %s", i, 'x' * 20)
+    handler.close()
+    deadline = time.monotonic() + 5.0
+    while any(p.suffix == '.pending' for p in tmp_path.iterdir()) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    backups = sorted(p.name for p in tmp_path.iterdir() if p.name != 'bridge.log')
+    assert backups == ['bridge.log.1.gz', 'bridge.log.2.gz']
+    with gzip.open(tmp_path / 'bridge.log.1.gz', 'rt') as f:
+        assert f.read().startswith('line ')
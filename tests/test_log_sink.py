@@ -0,0 +1,56 @@
+import csv
+import json
+import os
+import sys
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.log_sink import BufferedLogSink
+from impact_bridge.logs import DualNdjsonLogger
+from impact_bridge.event_logger import StructuredEventLogger
+
+
+def test_group_commit_and_rotation_by_date(tmp_path):
+    sink = BufferedLogSink(flush_interval=60, max_batch=10_000)
+    stream = sink.stream(lambda date: tmp_path / ('a.ndjson' if sink.commits == 0 else 'b.ndjson'))
+    for i in range(100):
+        stream.write_record({'i': i})
+    assert sink.stats()['buffered'] == 100  # nothing written on the caller's thread
+    assert sink.flush()
+    stream.write_record({'i': 100})
+    sink.close()
+
+    lines = (tmp_path / 'a.ndjson').read_text().splitlines()
+    assert [json.loads(line)['i'] for line in lines] == list(range(100))
+    assert json.loads((tmp_path / 'b.ndjson').read_text())['i'] == 100
+    assert sink.stats()['written'] == 101 and sink.stats()['commits'] == 2
+
+
+def test_full_buffer_drops_and_reports_fill(tmp_path):
+    sink = BufferedLogSink(flush_interval=60, max_batch=10_000, max_buffer=10)
+    stream = sink.stream(lambda date: tmp_path / 'x.ndjson')
+    for i in range(15):
+        stream.write_record({'i': i})
+    stats = sink.stats()
+    assert stats['fill_pct'] == 100.0 and stats['dropped'] == 5
+    sink.close()
+    assert len((tmp_path / 'x.ndjson').read_text().splitlines()) == 10
+
+
+def test_loggers_flush_on_close(tmp_path):
+    sink = BufferedLogSink(flush_interval=60)
+    ndjson = DualNdjsonLogger(str(tmp_path / 'logs'), str(tmp_path / 'debug'), sink=sink)
+    ndjson.status('Bridge started', {'active_tasks': 1})
+    ndjson.close()
+
+    events = StructuredEventLogger(str(tmp_path / 'logs'), str(tmp_path / 'debug'), sink=sink)
+    events.sensor_connected('12:E3')
+    events.close()
+
+    main_files = sorted((tmp_path / 'logs').glob('bridge_*.ndjson'))
+    assert json.loads(main_files[0].read_text())['msg'] == 'Bridge started'
+    debug_files = list((tmp_path / 'debug').glob('*.ndjson'))
+    assert [json.loads(f.read_text())['msg'] for f in debug_files] == ['Bridge started']
+    rows = list(csv.reader((tmp_path / 'logs' / 'main').glob('*.csv').__next__().open()))
+    assert rows[0][0] == 'Datetime' and rows[1][2:4] == ['Sensor', '12:E3']
+    sink.close()
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.match_aggregator import (ClockOffsetEstimator, MatchAggregator, MatchEvent,
+                                            MatchEventPublisher, ReorderMerger)
+from impact_bridge.mqtt_ingress import InboundMessage, TopicTrie
+
+MS = 1_000_000
+
+
+class LoopbackMQTT:
+    """In-process stand-in for LeadVilleMQTT: publish() delivers to matching subscribers"""
+
+    def __init__(self, bus):
+        self.bus = bus
+
+    def subscribe(self, topic, handler=None, raw=False):
+        self.bus.add(topic, handler, raw)
+        return True
+
+    def publish(self, topic, payload, retain=False, qos=None):
+        message = InboundMessage(topic, json.dumps(payload).encode())
+        for handler, raw in self.bus.match(topic):
+            handler(topic, message if raw else message.data)
+        return True
+
+
+def _event(bridge, seq, ts_ms, now_ms=0):
+    return MatchEvent(bridge_id=bridge, seq=seq, kind='impact', ts_ns=ts_ms * MS,
+                      bridge_ts_ns=ts_ms * MS, received_ns=now_ms * MS)
+
+
+def test_offset_estimate_prefers_fastest_exchange():
+    clock = ClockOffsetEstimator()
+    # Bridge runs 1500 ms ahead; one-way delay 2 ms, then a congested exchange
+    clock.add_sample(t0=0, t1=1502 * MS, t2=1503 * MS, t3=5 * MS)
+    clock.add_sample(t0=100 * MS, t1=1640 * MS, t2=1641 * MS, t3=143 * MS)
+    assert clock.offset_ns == 1500 * MS and clock.delay_ns == 4 * MS
+    assert clock.to_local(1600 * MS) == 100 * MS
+
+
+def test_merge_orders_across_bridges_and_bounds_the_wait():
+    merger = ReorderMerger(window_ms=100, lateness_ms=0)
+    merger.push(_event('A', 1, 10))
+    merger.push(_event('B', 1, 5))
+    merger.push(_event('A', 2, 30))
+    # B has only been heard up to 5 ms: A's 10 ms event must wait
+    assert [e.ts_ns // MS for e in merger.drain(now_ns=40 * MS)] == [5]
+    merger.push(_event('B', 2, 20))
+    assert [e.ts_ns // MS for e in merger.drain(now_ns=45 * MS)] == [10, 20]
+    # B goes silent: A's 30 ms event is released once it is older than the window
+    assert merger.drain(now_ns=120 * MS) == []
+    assert [e.ts_ns // MS for e in merger.drain(now_ns=131 * MS)] == [30]
+    assert merger.forced == 1
+
+    merger.push(_event('B', 3, 25))
+    late = merger.drain(now_ns=132 * MS)
+    assert len(late) == 1 and late[0].late and merger.late == 1
+
+
+def test_within_bridge_lateness_is_reordered():
+    merger = ReorderMerger(window_ms=1000, lateness_ms=50)
+    merger.push(_event('A', 1, 100))
+    merger.push(_event('A', 2, 70))   # Impact onset published after detection
+    merger.push(_event('A', 3, 140))
+    assert [e.ts_ns // MS for e in merger.drain(now_ns=150 * MS)] == [70]
+    merger.push(_event('A', 4, 200))
+    assert [e.seq for e in merger.drain(now_ns=210 * MS)] == [1, 3]
+
+
+def test_bridges_with_skewed_clocks_merge_on_aggregator_time():
+    bus = TopicTrie()
+    now = [1_000 * MS]
+    skews = {'bay1': 0, 'bay2': 2_000 * MS, 'bay3': -750 * MS}
+    merged = []
+
+    async def run():
+        aggregator = MatchAggregator(LoopbackMQTT(bus), window_ms=100, lateness_ms=0,
+                                     on_event=merged.append, clock=lambda: now[0])
+        aggregator.start()
+        bridges = {name: MatchEventPublisher(LoopbackMQTT(bus), name, clock=lambda s=skew: now[0] + s)
+                   for name, skew in skews.items()}
+        for bridge in bridges.values():
+            bridge.start()
+        aggregator.send_sync()
+
+        # Real (aggregator) times of each shot, published with each bridge's own clock
+        shots = [('bay2', 1_010), ('bay1', 1_020), ('bay3', 1_030), ('bay2', 1_040), ('bay1', 1_050)]
+        for name, real_ms in shots:
+            bridges[name].publish('impact', {'real_ms': real_ms}, ts_ns=real_ms * MS + skews[name])
+        now[0] = 1_200 * MS
+        aggregator.stop()
+        for bridge in bridges.values():
+            bridge.stop()
+        return aggregator.stats()
+
+    stats = asyncio.run(run())
+    assert [e.data['real_ms'] for e in merged] == [1_010, 1_020, 1_030, 1_040, 1_050]
+    assert [e.index for e in merged] == [1, 2, 3, 4, 5]
+    assert stats['bridges']['bay2']['offset_ms'] == pytest.approx(2000.0, abs=1)
+    assert stats['bridges']['bay3']['offset_ms'] == pytest.approx(-750.0, abs=1)
+    assert stats['merged'] == 5 and stats['gaps'] == 0
+
+
+def test_redelivered_events_are_dropped_and_restarts_reset_the_sequence():
+    bus = TopicTrie()
+    merged = []
+    mqtt = LoopbackMQTT(bus)
+
+    async def run():
+        aggregator = MatchAggregator(mqtt, window_ms=100, lateness_ms=0, on_event=merged.append,
+                                     clock=lambda: 1_000 * MS)
+        aggregator.start()
+        # QoS 1 redelivers 2 and 1; 3 arrives after 4 and still counts
+        for session, seq in [(7, 1), (7, 2), (7, 2), (7, 4), (7, 3), (7, 1), (7, 4), (8, 1), (8, 2)]:
+            mqtt.publish('bridge/bay1/impact', {'bridge_id': 'bay1', 'session': session, 'seq': seq,
+                                                'ts_ns': (1_000 + len(merged)) * MS, 'data': {'seq': seq}})
+        aggregator.stop()
+        return aggregator.stats()
+
+    stats = asyncio.run(run())
+    assert [e.seq for e in merged] == [1, 2, 4, 3, 1, 2]
+    assert (stats['received'], stats['duplicates'], stats['gaps']) == (6, 3, 1)
+    assert stats['bridges']['bay1']['next_seq'] == 3
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import sys
+import threading
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.mqtt_ingress import InboundMessage, MQTTIngress, TopicTrie
+
+
+def _names(trie, topic):
+    return sorted(handler.__name__ for handler, _ in trie.match(topic))
+
+
+def test_trie_wildcards():
+    trie = TopicTrie()
+
+    def exact(topic, data): pass
+    def sensors(topic, data): pass
+    def everything(topic, data): pass
+    def sensor_tree(topic, data): pass
+    def sys_stats(topic, data): pass
+
+    trie.add('timer/events', exact)
+    trie.add('sensor/+/telemetry', sensors)
+    trie.add('#', everything)
+    trie.add('sensor/#', sensor_tree)
+    trie.add('$SYS/#', sys_stats)
+
+    assert _names(trie, 'timer/events') == ['everything', 'exact']
+    assert _names(trie, 'sensor/BT50-001/telemetry') == ['everything', 'sensor_tree', 'sensors']
+    assert _names(trie, 'sensor') == ['everything', 'sensor_tree']
+    assert _names(trie, 'sensor/a/b/telemetry') == ['everything', 'sensor_tree']
+    assert _names(trie, '$SYS/broker/load') == ['sys_stats']
+    assert trie.remove('#', everything) and not trie.remove('#', everything)
+    assert _names(trie, 'timer/events') == ['exact'] and trie.size == 4
+
+
+def test_messages_from_network_thread_run_on_the_loop_in_order():
+    ingress = MQTTIngress()
+    seen = []
+
+    async def on_telemetry(topic, data):
+        await asyncio.sleep(0)
+        seen.append((topic, data['n'], threading.get_ident()))
+
+    ingress.add_handler('sensor/+/telemetry', on_telemetry)
+
+    async def run():
+        ingress.start()
+        loop_thread = threading.get_ident()
+
+        def network_thread():
+            for n in range(200):
+                ingress.submit(f'sensor/S{n % 3}/telemetry', b'{"n": %d}' % n)
+            ingress.submit('timer/events', b'not json')
+
+        thread = threading.Thread(target=network_thread)
+        thread.start()
+        thread.join()
+        while ingress.dispatched + ingress.unmatched < 201:
+            await asyncio.sleep(0.01)
+        ingress.stop()
+        return loop_thread
+
+    loop_thread = asyncio.run(run())
+    assert [n for _, n, _ in seen] == list(range(200))
+    assert {thread for _, _, thread in seen} == {loop_thread}
+    stats = ingress.stats()
+    assert stats['received'] == 201 and stats['unmatched'] == 1 and stats['queue_depth'] == 0
+    assert stats['handler_calls'] == 200
+
+
+def test_queue_is_bounded_and_payloads_decode_lazily():
+    ingress = MQTTIngress(maxsize=3)
+    assert all(ingress.submit('a', b'\xff\xfe') for _ in range(3))
+    assert not ingress.submit('a', b'x')
+    assert ingress.dropped == 1
+
+    message = InboundMessage('sensor/x/batch', b'\x01\x02\xff')
+    assert message._data is InboundMessage._UNDECODED
+    assert message.data == b'\x01\x02\xff'
+    assert InboundMessage('t', b'{"a": 1}').data == {'a': 1}
+    assert InboundMessage('t', b'plain').data == 'plain'
+
+    received = []
+    ingress = MQTTIngress()
+    ingress.add_handler('sensor/+/batch', lambda topic, msg: received.append(msg), raw=True)
+    asyncio.run(ingress.dispatch(InboundMessage('sensor/x/batch', b'\x01')))
+    assert isinstance(received[0], InboundMessage) and received[0]._data is InboundMessage._UNDECODED
@@ -0,0 +1,244 @@
+import asyncio
+import itertools
+import os
+import random
+import sqlite3
+import sys
+import time
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from impact_bridge.database.access import DatabaseAccess, get_leadville_db
+from impact_bridge.database.pool_models import Base
+from impact_bridge.pool_api import flush_pool_events, router
+
+DEVICES = 8
+SESSIONS = 6
+
+
+def _make_db(path):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    conn = sqlite3.connect(str(path))
+    conn.executemany(
+        "INSERT INTO device_pool (hw_addr, device_type, label, status, created_at, updated_at) "
+        "VALUES (?, 'sensor', ?, 'available', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+        [(f"EA:18:3D:6A:BA:{n:02X}", f"Sensor {n}") for n in range(1, DEVICES + 1)])
+    conn.executemany(
+        "INSERT INTO active_sessions (session_name, bridge_id, status, started_at, last_activity) "
+        "VALUES (?, 1, 'idle', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+        [(f"Tablet {n}",) for n in range(1, SESSIONS + 1)])
+    conn.commit()
+    conn.close()
+
+
+def _make_app(databases):
+    # Alternate between independent writers, like separate server processes
+    app = FastAPI()
+    app.include_router(router)
+    rotation = itertools.cycle(databases)
+    app.dependency_overrides[get_leadville_db] = lambda: next(rotation)
+    return app
+
+
+def _check_invariants(path):
+    conn = sqlite3.connect(str(path))
+    try:
+        doubled = conn.execute(
+            "SELECT device_id FROM device_leases WHERE released_at IS NULL "
+            "GROUP BY device_id HAVING COUNT(*) > 1").fetchall()
+        mismatched = conn.execute("""
+            SELECT d.id FROM device_pool d
+            WHERE (d.status = 'leased') != EXISTS (
+                SELECT 1 FROM device_leases l WHERE l.device_id = d.id AND l.released_at IS NULL)
+        """).fetchall()
+        counts = dict(conn.execute("SELECT event_type, COUNT(*) FROM device_pool_events GROUP BY event_type"))
+        leases = conn.execute("SELECT COUNT(*) FROM device_leases").fetchone()[0]
+        return doubled, mismatched, counts, leases
+    finally:
+        conn.close()
+
+
+def test_simultaneous_leases_allocate_each_device_once(tmp_path):
+    path = tmp_path / 'pool.db'
+    _make_db(path)
+    databases = [DatabaseAccess(path, readers=2), DatabaseAccess(path, readers=2)]
+    app = _make_app(databases)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            # Every session grabs for every device at the same moment
+            requests = [(session_id, device_id)
+                        for session_id in range(1, SESSIONS + 1) for device_id in range(1, DEVICES + 1)]
+            random.shuffle(requests)
+            responses = await asyncio.gather(*(
+                client.post(f'/api/admin/pool/sessions/{session_id}/lease',
+                            json={'device_id': device_id, 'target_assignment': f'Target {device_id}'})
+                for session_id, device_id in requests))
+            await flush_pool_events()
+            return [(request, response.status_code) for request, response in zip(requests, responses)]
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        for database in databases:
+            database.close()
+
+    winners = [device_id for (_, device_id), status in results if status == 200]
+    assert sorted(winners) == list(range(1, DEVICES + 1))
+    assert {status for _, status in results} <= {200, 400, 409}
+    doubled, mismatched, counts, leases = _check_invariants(path)
+    assert doubled == [] and mismatched == []
+    assert leases == DEVICES and counts == {'lease': DEVICES}
+
+
+def test_lease_release_churn_stays_consistent(tmp_path):
+    path = tmp_path / 'pool.db'
+    _make_db(path)
+    databases = [DatabaseAccess(path, readers=2), DatabaseAccess(path, readers=2)]
+    app = _make_app(databases)
+    rounds = 15
+    held = {}  # device_id -> session_id, per our successful responses
+
+    async def worker(client, session_id, rng):
+        leased = released = 0
+        for _ in range(rounds):
+            device_id = rng.randint(1, DEVICES)
+            response = await client.post(f'/api/admin/pool/sessions/{session_id}/lease',
+                                         json={'device_id': device_id})
+            if response.status_code == 200:
+                # Nobody else may hold it while we do
+                assert held.get(device_id) is None
+                held[device_id] = session_id
+                leased += 1
+                await asyncio.sleep(0)
+                del held[device_id]
+                response = await client.post(f'/api/admin/pool/sessions/{session_id}/release/{device_id}')
+                assert response.status_code == 200
+                released += 1
+            else:
+                assert response.status_code in (400, 409)
+        return leased, released
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            start = time.perf_counter()
+            totals = await asyncio.gather(*(
+                worker(client, session_id, random.Random(session_id))
+                for session_id in itertools.islice(itertools.cycle(range(1, SESSIONS + 1)), 36)))
+            elapsed = time.perf_counter() - start
+            await flush_pool_events()
+            return totals, elapsed
+
+    try:
+        totals, elapsed = asyncio.run(run())
+    finally:
+        for database in databases:
+            database.close()
+
+    leased = sum(t[0] for t in totals)
+    released = sum(t[1] for t in totals)
+    # ~900 req/s here; the floor only catches a serialized or stalled writer
+    assert (36 * rounds + released) / elapsed > 100
+    doubled, mismatched, counts, leases = _check_invariants(path)
+    assert doubled == [] and mismatched == []
+    assert leases == leased and counts == {'lease': leased, 'release': released}
+
+
+def test_bulk_leases_are_all_or_nothing_idempotent_and_replace(tmp_path):
+    path = tmp_path / 'pool.db'
+    _make_db(path)
+    database = DatabaseAccess(path, readers=2)
+    app = _make_app([database])
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            def put(session_id, leases, replace=False):
+                return client.put(f'/api/admin/pool/sessions/{session_id}/leases',
+                                  json={'leases': [{'device_id': d, 'target_assignment': t} for d, t in leases],
+                                        'replace': replace})
+
+            first = await put(1, [(1, 'Target 1'), (2, 'Target 2'), (3, 'Target 3')])
+            # Every problem is reported and nothing changes
+            rejected = await put(2, [(3, 'Target 1'), (99, 'Target 2'), (4, 'Target 3')])
+            duplicate = await put(2, [(4, 'Target 1'), (4, 'Target 2')])
+            missing = await put(SESSIONS + 1, [(4, 'Target 1')])
+            # Re-leasing to the same session only moves the target
+            again = await put(1, [(1, 'Target 1'), (2, 'Target 4')])
+            # Replace releases what is no longer listed
+            replaced = await put(1, [(2, 'Target 2'), (5, 'Target 5')], replace=True)
+            taken = await put(2, [(1, 'Target 1'), (3, 'Target 3')])
+            await flush_pool_events()
+            return first, rejected, duplicate, missing, again, replaced, taken
+
+    try:
+        first, rejected, duplicate, missing, again, replaced, taken = asyncio.run(run())
+    finally:
+        database.close()
+
+    assert first.status_code == 200 and first.json()['message'] == '3 leased, 0 updated, 0 released'
+    assert rejected.status_code == 409
+    assert rejected.json()['detail'] == {
+        'message': 'No devices were leased',
+        'conflicts': ['Device EA:18:3D:6A:BA:03 is already leased to another session', 'Device 99 not found'],
+    }
+    assert duplicate.status_code == 400 and missing.status_code == 404
+    assert again.status_code == 200 and again.json()['message'] == '0 leased, 1 updated, 0 released'
+    assert [(lease['device_id'], lease['target_assignment']) for lease in again.json()['leases']] == [
+        (2, 'Target 4')]
+    assert replaced.json()['message'] == '1 leased, 1 updated, 2 released'
+    assert sorted(replaced.json()['released_device_ids']) == [1, 3]
+    assert taken.status_code == 200
+
+    doubled, mismatched, counts, leases = _check_invariants(path)
+    assert doubled == [] and mismatched == []
+    assert leases == 6 and counts == {'lease': 6, 'release': 2}
+    conn = sqlite3.connect(str(path))
+    try:
+        held = conn.execute("SELECT device_id, session_id, target_assignment FROM device_leases "
+                            "WHERE released_at IS NULL ORDER BY device_id").fetchall()
+    finally:
+        conn.close()
+    assert held == [(1, 2, 'Target 1'), (2, 1, 'Target 2'), (3, 2, 'Target 3'), (5, 1, 'Target 5')]
+
+
+def test_device_and_session_endpoints_commit_once(tmp_path):
+    path = tmp_path / 'pool.db'
+    _make_db(path)
+    database = DatabaseAccess(path, readers=2)
+    app = _make_app([database])
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            added = await client.post('/api/admin/pool/devices', json={'hw_addr': 'EA:18:3D:6A:BA:F0'})
+            again = await client.post('/api/admin/pool/devices', json={'hw_addr': 'EA:18:3D:6A:BA:F0'})
+            created = await client.post('/api/admin/pool/sessions', json={'session_name': 'Bay 9', 'bridge_id': 1})
+            session_id = created.json()['session']['id']
+            await client.put(f'/api/admin/pool/sessions/{session_id}/leases',
+                             json={'leases': [{'device_id': 1}, {'device_id': 2}]})
+            ended = await client.post(f'/api/admin/pool/sessions/{session_id}/end')
+            await flush_pool_events()
+            return added, again, created, ended
+
+    try:
+        added, again, created, ended = asyncio.run(run())
+        writes = database.stats()
+    finally:
+        database.close()
+
+    assert added.status_code == 200 and added.json()['device']['id'] == DEVICES + 1
+    assert again.status_code == 409
+    assert created.status_code == 200 and created.json()['session']['id'] == SESSIONS + 1
+    assert ended.json() == {'message': 'Session ended successfully', 'devices_released': 2}
+    assert writes['write_errors'] == 1  # The rejected duplicate rolled back
+    doubled, mismatched, counts, leases = _check_invariants(path)
+    assert doubled == [] and mismatched == []
+    assert counts == {'discovered': 1, 'lease': 2, 'release': 2}
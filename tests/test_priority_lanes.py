@@ -0,0 +1,71 @@
+import asyncio
+import json
+import os
+import sys
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.priority_lanes import PriorityLanes
+
+
+def _sample(i):
+    return {'sensor_mac': 'AA', 'frame_hex': '', 'parser': 'flag61', 'parsed': {'vx': i}}
+
+
+def test_events_drain_before_samples_and_latency_is_tracked():
+    async def run():
+        lanes = PriorityLanes(sample_size=10)
+        for i in range(5):
+            lanes.put_nowait(_sample(i))
+        lanes.put_nowait({'sensor_mac': 'AA', 'status': {}})
+        lanes.put_nowait({'timer': {'event_type': 'SHOT'}})
+        batch = await lanes.get_batch(3)
+        lanes.record_written(batch)
+        return lanes, [lane for lane, _, _ in batch]
+
+    lanes, order = asyncio.run(run())
+    assert order == ['event', 'status', 'sample']
+    metrics = lanes.metrics()
+    assert metrics['event']['written'] == 1 and metrics['sample']['depth'] == 4
+    assert metrics['event']['latency_max_ms'] >= 0.0
+
+
+def test_drop_and_decimate_policies_bound_the_sample_lane():
+    dropping = PriorityLanes(sample_size=10, shed_policy='drop')
+    decimating = PriorityLanes(sample_size=10, shed_policy='decimate', decimate_factor=4, high_watermark=0.5)
+    for i in range(40):
+        dropping.put_nowait(_sample(i))
+        decimating.put_nowait(_sample(i))
+    # Events are never shed while there is room
+    assert dropping.put_nowait({'impact': {'peak_mag': 1.0}})
+
+    assert dropping.metrics()['sample']['depth'] == 10
+    assert dropping.metrics()['sample']['shed'] == 30
+    # 5 admitted freely, then 1 in 4 until full
+    assert decimating.metrics()['sample']['depth'] == 10
+    assert decimating.metrics()['sample']['shed'] == 35 - 5
+
+
+def test_spill_policy_writes_overflow_to_ndjson(tmp_path):
+    spill = tmp_path / 'spill' / 'samples.ndjson'
+    lanes = PriorityLanes(sample_size=2, shed_policy='spill', spill_path=str(spill))
+    for i in range(5):
+        lanes.put_nowait(_sample(i))
+    lanes.record_written([])
+    lanes.close_spill()
+
+    assert [json.loads(line)['parsed']['vx'] for line in spill.read_text().splitlines()] == [2, 3, 4]
+    assert lanes.metrics()['sample']['spilled'] == 3
+
+
+def test_close_drains_then_ends():
+    async def run():
+        lanes = PriorityLanes()
+        lanes.put_nowait(_sample(0))
+        lanes.put_nowait(None)
+        first = await lanes.get_batch(10, linger=1.0)
+        second = await lanes.get_batch(10)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert len(first) == 1 and second == []
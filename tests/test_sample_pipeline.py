@@ -0,0 +1,58 @@
+import os
+import struct
+import sys
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.sample_pipeline import SamplePipeline, decode_block
+from impact_bridge.ble.wtvb_parse_simple import parse_5561
+
+
+def _frame(vx, vy, vz):
+    return b'\x55\x61' + struct.pack('<13h', vx, vy, vz, *range(10))
+
+
+def test_decode_block_matches_parse_5561():
+    payload = b'\x00' + _frame(100, -200, 300) + _frame(1, 2, 3) + b'\x55\x61\x01'
+    block = decode_block('AA:BB', payload, ts_ns=123)
+    legacy = parse_5561(payload)['samples']
+
+    assert len(block) == len(legacy) == 2
+    assert [tuple(r) for r in block.raw.tolist()] == [s['raw'] for s in legacy]
+    assert block.values[0, 0] == legacy[0]['vx']
+    assert block.ts_ns.tolist() == [123, 123]
+
+
+def test_pipeline_corrects_in_place_and_fans_out():
+    pipeline = SamplePipeline(scale=1.0)
+    pipeline.set_baseline('AA:BB', 100, 100, 100)
+    seen_a, seen_b = [], []
+    pipeline.register_consumer('a', seen_a.append)
+    pipeline.register_consumer('b', seen_b.append)
+
+    block = pipeline.process('AA:BB', _frame(110, 100, 90))
+    assert block.values.tolist() == [[10.0, 0.0, -10.0]]
+    assert seen_a[0] is seen_b[0] is block
+
+    pipeline.disable_consumer('b')
+    pipeline.process('AA:BB', _frame(110, 100, 90))
+    assert len(seen_a) == 2 and len(seen_b) == 1
+
+    stats = pipeline.get_stats()['stages']
+    assert stats['decode']['samples'] == 2
+    assert stats['b']['enabled'] is False and stats['b']['calls'] == 1
+
+
+def test_failing_consumer_does_not_stop_others():
+    pipeline = SamplePipeline()
+    seen = []
+
+    def broken(block):
+        raise RuntimeError('boom')
+
+    pipeline.register_consumer('broken', broken)
+    pipeline.register_consumer('ok', seen.append)
+    pipeline.process('AA:BB', _frame(1, 2, 3))
+
+    assert len(seen) == 1
+    assert pipeline.get_stats()['stages']['broken']['errors'] == 1
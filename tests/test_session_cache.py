@@ -0,0 +1,74 @@
+import os
+import sys
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from sqlalchemy import event
+
+from impact_bridge.auth import AuthService, Role, SessionCache
+from impact_bridge.config import DatabaseConfig
+from impact_bridge.database.database import DatabaseSession
+from impact_bridge.database.models import UserSession
+
+
+def _service(tmp_path, **cache_kwargs):
+    db = DatabaseSession(DatabaseConfig(dir=str(tmp_path), file='auth.db'))
+    db.create_tables()
+    session = db.get_session()
+    service = AuthService(session, cache=SessionCache(**cache_kwargs))
+    service.create_user('ro', 'secret', 'Range Officer', Role.RO)
+    return db, service
+
+
+def _count_statements(engine):
+    statements = []
+    event.listen(engine, 'before_cursor_execute',
+                 lambda conn, cursor, sql, *args: statements.append(sql.split()[0].upper()))
+    return statements
+
+
+def test_cached_requests_skip_the_database_and_batch_activity(tmp_path):
+    db, service = _service(tmp_path, flush_interval=3600)
+    token = service.authenticate_user('ro', 'secret')['access_token']
+    statements = _count_statements(db.engine)
+
+    users = [service.get_user_from_token(token) for _ in range(20)]
+    assert {u.username for u in users} == {'ro'} and users[0].has_permission(Role.VIEWER)
+    assert statements == ['SELECT']  # one session lookup, no UPDATE per request
+    assert service.cache.stats()['hits'] == 19
+
+    assert service.cache.flush_activity(service.db) == 1
+    assert statements.count('UPDATE') == 1
+    row = service.db.query(UserSession).one()
+    assert row.last_activity_at >= row.created_at
+
+
+def test_revocation_is_immediate_even_when_cached(tmp_path):
+    _, service = _service(tmp_path)
+    login = service.authenticate_user('ro', 'secret')
+    token = login['access_token']
+    assert service.get_user_from_token(token) is not None
+
+    from impact_bridge.auth.utils import verify_token
+    jti = verify_token(token)['session_jti']
+    assert service.revoke_session(jti)
+    assert service.get_user_from_token(token) is None
+    assert service.cache.stats()['revoked'] == 1
+
+
+def test_bad_password_refresh_and_lockout(tmp_path):
+    _, service = _service(tmp_path)
+    ok = service.authenticate_user('ro', 'secret')
+    bad = service.authenticate_user('ro', 'wrong')
+    assert ok['success'] and ok['refresh_token']
+    assert bad == {'success': False, 'error': 'Invalid credentials'}
+    assert service.refresh_token(ok['refresh_token'])['success']
+    assert not service.refresh_token('not-a-token')['success']
+
+    token = ok['access_token']
+    assert service.get_user_from_token(token).has_permission(Role.RO)
+    # A lockout from failed logins reaches cached sessions at once
+    for _ in range(5):
+        service.authenticate_user('ro', 'wrong')
+    user = service.get_user_from_token(token)
+    assert user.is_locked() and not user.has_permission(Role.VIEWER)
@@ -0,0 +1,86 @@
+import os
+import random
+import sys
+from collections import Counter
+
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.timers import Shot, StringStop
+from impact_bridge.timers.specialpie import SpecialPieFramer, parse_specialpie_frame
+
+
+def _random_frame(rng):
+    # Bias payload bytes towards the markers so they show up inside frames
+    payload = bytes(rng.choice([0xAA, 0x55, rng.randrange(256)]) for _ in range(rng.randint(0, 20)))
+    return rng.randrange(256), payload
+
+
+def _feed_in_chunks(framer, stream, rng):
+    frames, pos = [], 0
+    while pos < len(stream):
+        size = rng.choice([1, 2, 7, 20, 64, 512])
+        frames += framer.feed(stream[pos:pos + size], timestamp_ms=0)
+        pos += size
+        # Unconsumed data never exceeds one frame
+        assert len(framer.buffer) - framer.offset < SpecialPieFramer.MAX_FRAME_SIZE
+    return [(f['opcode'], f['payload']) for f in frames]
+
+
+def test_frames_with_markers_in_payload_and_partial_reads():
+    framer = SpecialPieFramer()
+    shot = SpecialPieFramer.encode(0x02, (0x55AA).to_bytes(2, 'little') + bytes([0x55, 1]))
+    ready = SpecialPieFramer.encode(0x06)
+    frames = framer.feed(shot[:3], timestamp_ms=5) + framer.feed(shot[3:] + ready, timestamp_ms=6)
+    events = [parse_specialpie_frame(f) for f in frames]
+    assert isinstance(events[0], Shot) and events[0].split_ms == 0x55AA and events[0].shot_number == 0x55
+    assert events[0].timestamp_ms == 6 and frames[1]['opcode'] == 0x06
+
+    stop = SpecialPieFramer.encode(0x03, (1015).to_bytes(4, 'little') + bytes([5, 1]))
+    event = parse_specialpie_frame(framer.feed(stop)[0])
+    assert isinstance(event, StringStop) and (event.total_ms, event.shot_count) == (1015, 5)
+
+
+def test_fuzz_resync_keeps_intact_frames():
+    missing = spurious = total = 0
+    for seed in range(200):
+        rng = random.Random(seed)
+        stream, expected = bytearray(), []
+        for _ in range(rng.randint(1, 60)):
+            opcode, payload = _random_frame(rng)
+            frame = bytearray(SpecialPieFramer.encode(opcode, payload))
+            damage = rng.random()
+            if damage < 0.15:
+                # Corrupt a byte after the start marker (flip keeps it different)
+                frame[rng.randrange(1, len(frame))] ^= rng.randrange(1, 256)
+            elif damage < 0.25:
+                frame = frame[:rng.randrange(1, len(frame))]  # Truncated
+            else:
+                expected.append((opcode, payload))
+            if rng.random() < 0.2:
+                stream += bytes(rng.choice([0x00, 0x55, 0xFF, 0x13]) for _ in range(rng.randint(1, 30)))
+            stream += frame
+
+        # A corrupt length byte holds later frames back until at most one frame's worth of
+        # bytes follows it, so end the stream with idle line noise
+        stream += bytes(SpecialPieFramer.MAX_FRAME_SIZE)
+        framer = SpecialPieFramer()
+        decoded = _feed_in_chunks(framer, bytes(stream), rng)
+        # Chunking must not change the result
+        assert decoded == [(f['opcode'], f['payload']) for f in SpecialPieFramer().feed(bytes(stream))]
+        # Damaged bytes occasionally pass the 8-bit checksum and end marker; such a spurious
+        # frame can swallow the frame behind it. Everything else must come out intact.
+        decoded_counts, expected_counts = Counter(decoded), Counter(expected)
+        missing += sum((expected_counts - decoded_counts).values())
+        spurious += sum((decoded_counts - expected_counts).values())
+        total += len(expected)
+    assert missing <= total // 2000 and spurious <= total // 500
+
+
+def test_offset_compacts_instead_of_reslicing():
+    framer = SpecialPieFramer()
+    burst = SpecialPieFramer.encode(0x04, bytes([80])) * 2000
+    assert len(framer.feed(burst + b'\xAA\x04')) == 2000
+    # The trailing partial frame is kept; everything before it was dropped at once
+    assert bytes(framer.buffer[framer.offset:]) == b'\xAA\x04' and len(framer.buffer) == 2
+    assert framer.feed(b'\x01\x50\x55\x55')[0]['payload'] == bytes([0x50])
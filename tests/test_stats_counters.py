@@ -0,0 +1,86 @@
+import os
+import sqlite3
+import sys
+from datetime import datetime
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.config import DatabaseConfig
+from impact_bridge.database.crud import DatabaseCRUD
+from impact_bridge.database.database import DatabaseSession
+from impact_bridge.database.models import Match, Node, Run, Sensor, SensorEvent, Shooter, Stage
+from impact_bridge.database.stats import install_stats_triggers, read_stats, reconcile_stats
+
+
+def _make_db(tmp_path):
+    config = DatabaseConfig()
+    config.dir = str(tmp_path)
+    config.file = 'stats.db'
+    db = DatabaseSession(config)
+    db.create_tables()
+    return db, config.path
+
+
+def _add_run(session, status):
+    match = Match(name=f'Match {status}', date=datetime(2026, 1, 1))
+    session.add(match)
+    session.flush()
+    stage = Stage(match_id=match.id, name='Stage 1', number=1)
+    shooter = Shooter(name='Shooter')
+    session.add_all([stage, shooter])
+    session.flush()
+    run = Run(match_id=match.id, stage_id=stage.id, shooter_id=shooter.id, status=status)
+    session.add(run)
+    session.flush()
+    return run
+
+
+def test_counters_follow_inserts_deletes_and_status_changes(tmp_path):
+    db, _ = _make_db(tmp_path)
+    session = db.get_session()
+    try:
+        session.add(Node(name='pi', mode='online'))
+        sensor = Sensor(hw_addr='EA:18:3D:6A:BA:E5', label='BT50-1')
+        session.add(sensor)
+        session.flush()
+        for n in range(5):
+            session.add(SensorEvent(ts_utc=datetime(2026, 1, 1, 0, 0, n), sensor_id=sensor.id, magnitude=float(n)))
+        run = _add_run(session, 'active')
+        _add_run(session, 'pending')
+        session.commit()
+
+        stats = DatabaseCRUD.get_system_stats(session)
+        assert stats['sensor_events'] == 5 and stats['nodes'] == 1
+        assert stats['runs'] == 2 and stats['active_runs'] == 1
+
+        run.status = 'completed'
+        session.query(SensorEvent).filter(SensorEvent.magnitude < 2).delete()
+        session.commit()
+        stats = DatabaseCRUD.get_system_stats(session)
+        assert stats['sensor_events'] == 3 and stats['active_runs'] == 0
+    finally:
+        session.close()
+
+
+def test_install_seeds_existing_rows_and_reconcile_fixes_drift(tmp_path):
+    db, path = _make_db(tmp_path)
+    session = db.get_session()
+    session.add(Node(name='pi', mode='online'))
+    session.commit()
+    session.close()
+    db.engine.dispose()
+
+    conn = sqlite3.connect(path)
+    try:
+        # Database from before the counters existed
+        conn.execute("DROP TABLE table_stats")
+        conn.execute("DROP TRIGGER trg_stats_nodes_insert")
+        assert install_stats_triggers(conn) == 8
+        assert read_stats(conn)['nodes'] == 1
+
+        conn.execute("UPDATE table_stats SET row_count = 40 WHERE name = 'nodes'")
+        assert reconcile_stats(conn) == {'nodes': 39}
+        assert read_stats(conn)['nodes'] == 1
+        conn.commit()
+    finally:
+        conn.close()
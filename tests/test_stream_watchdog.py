@@ -0,0 +1,93 @@
+import os
+import random
+import sys
+
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.stream_watchdog import STATE_OK, STATE_STALLED, StreamWatchdog, read_status
+
+MS = 1_000_000
+
+
+def _stream(watchdog, device, start_ns, period_ms, count, jitter_ms=0.0, rng=None):
+    """Feed ``count`` notifications; returns the last timestamp"""
+    ts = start_ns
+    for _ in range(count):
+        ts += int((period_ms + (rng.uniform(-jitter_ms, jitter_ms) if rng else 0.0)) * MS)
+        watchdog.note(device, ts)
+    return ts
+
+
+def _detect(watchdog, last_ns, step_ms=10):
+    """Run checks every ``step_ms`` after the stream stops; returns (now, transitions)"""
+    now = last_ns
+    while True:
+        now += step_ms * MS
+        transitions = watchdog.check(now)
+        if transitions:
+            return now, transitions
+
+
+def test_stall_flagged_within_a_few_periods_for_that_device_only():
+    watchdog = StreamWatchdog(min_stall_ms=50)
+    assert watchdog.threshold_ns('A') is None
+    last_a = _stream(watchdog, 'A', 0, 20, 100)
+    _stream(watchdog, 'B', 0, 20, 100)
+    # Not armed before the interval is learned
+    _stream(watchdog, 'C', 0, 20, 5)
+
+    # B keeps streaming while A goes silent
+    now = last_a
+    for _ in range(20):
+        now += 10 * MS
+        watchdog.note('B', now)
+        transitions = watchdog.check(now)
+        if transitions:
+            break
+    assert [t['device_id'] for t in transitions] == ['A']
+    stall = transitions[0]
+    assert (stall['state'], stall['previous'], stall['stalls']) == (STATE_STALLED, STATE_OK, 1)
+    assert stall['expected_period_ms'] == 20.0 and stall['threshold_ms'] == 80.0
+    assert stall['gap_ms'] <= 90 and stall['time_to_detect_ms'] <= 70
+    assert watchdog.state('B') == STATE_OK and watchdog.state('C') == STATE_OK
+
+
+def test_threshold_adapts_to_jitter():
+    steady, bursty = StreamWatchdog(min_stall_ms=10), StreamWatchdog(min_stall_ms=10)
+    _stream(steady, 'S', 0, 10, 500, jitter_ms=0.5, rng=random.Random(5))
+    # Two notifications per BLE connection event: same mean interval, 1/19 ms gaps
+    for n in range(500):
+        bursty.note('S', (n // 2 * 20 + n % 2) * MS)
+    assert 38 * MS < steady.threshold_ns('S') < 42 * MS
+    assert 60 * MS < bursty.threshold_ns('S') < 70 * MS
+    # Slow streams are capped
+    slow = StreamWatchdog(max_stall_ms=2000)
+    _stream(slow, 'S', 0, 1000, 20)
+    assert slow.threshold_ns('S') == 2000 * MS
+
+
+def test_recovery_metrics_backoff_and_status_file(tmp_path):
+    watchdog = StreamWatchdog(reconnect_backoff_ms=1000)
+    last = _stream(watchdog, 'A', 0, 20, 50)
+    detected, _ = _detect(watchdog, last)
+    assert watchdog.due_reconnects(detected) == ['A']
+    watchdog.note_reconnect('A', detected)
+    assert watchdog.due_reconnects(detected + 500 * MS) == []
+    assert watchdog.due_reconnects(detected + 1000 * MS) == ['A']
+
+    watchdog.note('A', detected + 1200 * MS)
+    recovery, = watchdog.check(detected + 1210 * MS)
+    assert (recovery['state'], recovery['previous'], recovery['time_to_recover_ms']) == (STATE_OK, STATE_STALLED, 1200.0)
+    assert recovery['reconnects'] == 1 and watchdog.due_reconnects(detected + 5000 * MS) == []
+    # The reconnect gap is not learned as the normal interval
+    watchdog.note('A', detected + 1220 * MS)
+    assert watchdog.threshold_ns('A') == 100 * MS
+
+    watchdog.write_status(tmp_path, detected + 1220 * MS, 'now')
+    status = read_status(tmp_path)
+    stats = status['devices']['A']
+    assert status['stalled'] == [] and (status['stalls'], status['reconnects']) == (1, 1)
+    assert stats['rate_hz'] == 50.0 and stats['time_to_recover_ms']['last'] == 1200.0
+    watchdog.forget('A')
+    assert read_status(tmp_path / 'missing') is None and watchdog.snapshot(0)['devices'] == {}
@@ -0,0 +1,159 @@
+import asyncio
+import os
+import sqlite3
+import sys
+
+import pytest
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from impact_bridge.database.access import DatabaseAccess, get_leadville_db
+from impact_bridge.sync_api import router
+from impact_bridge.sync_journal import SyncForwarder, SyncJournal, decode_batch, encode_batch
+
+
+def _head(tmp_path):
+    database = DatabaseAccess(str(tmp_path / 'head.db'))
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_leadville_db] = lambda: database
+    return TestClient(app), database
+
+
+def _forwarder(journal, client, bridge_id, fail=None):
+    forwarder = SyncForwarder(journal, 'http://head', bridge_id, batch_size=40)
+
+    def request(path, data=None):
+        if fail and fail():
+            raise ConnectionError('network down')
+        url = f'/api/sync/{bridge_id}{path}'
+        response = client.post(url, content=data) if data is not None else client.get(url)
+        return response.status_code, response.json()
+
+    forwarder._request = request
+    return forwarder
+
+
+def _journal(tmp_path, name, events):
+    journal = SyncJournal(str(tmp_path / f'{name}.db'))
+    for n in range(events):
+        journal.append('impact' if n % 3 else 'timer', {'n': n, 'bridge': name}, ts_ns=1_000 + n)
+    return journal
+
+
+def test_batch_codec_rejects_gaps():
+    blob = encode_batch('bay1', [(5, 'timer', 1, '{"a":1}'), (6, 'impact', 2, '{}')])
+    assert decode_batch(blob)['events'][0] == [5, 'timer', 1, {'a': 1}]
+    with pytest.raises(ValueError, match='contiguous'):
+        decode_batch(encode_batch('bay1', [(5, 'timer', 1, '{}'), (7, 'timer', 2, '{}')]))
+
+
+def test_appends_are_committed_by_the_writer_thread(tmp_path):
+    journal = _journal(tmp_path, 'bay1', 200)
+    assert journal.flush()
+    assert journal.read_after(0, 1000)[-1][:3] == (200, 'impact', 1_199)
+    journal.append('timer', {'n': 200}, ts_ns=1_200)
+    epoch = journal.epoch
+    journal.close()  # Commits what is still queued
+    stats = journal.stats()
+    assert stats['written'] == stats['appended'] == 201 and stats['pending'] == 0
+    assert 1 <= stats['commits'] <= 201 and stats['write_errors'] == 0
+    reopened = SyncJournal(str(tmp_path / 'bay1.db'))
+    assert reopened.last_seq == 201 and reopened.epoch == epoch
+    reopened.close()
+
+
+def test_sync_survives_outage_and_resends_are_idempotent(tmp_path):
+    client, database = _head(tmp_path)
+    journal = _journal(tmp_path, 'bay1', 100)
+    down = [False]
+    forwarder = _forwarder(journal, client, 'bay1', fail=lambda: down[0])
+
+    async def run():
+        assert await forwarder.sync_once() == 100
+        for n in range(100, 150):
+            journal.append('impact', {'n': n, 'bridge': 'bay1'}, ts_ns=1_000 + n)
+        down[0] = True
+        try:
+            await forwarder.sync_once()
+        except ConnectionError:
+            pass
+        down[0] = False
+        # An ack lost on the way back: the bridge resends 81..100 as well
+        journal.set_acked(80)
+        return await forwarder.sync_once()
+
+    assert asyncio.run(run()) == 70
+    assert journal.acked_seq == 150 and forwarder.events_sent == 170
+
+    database.close()
+    conn = sqlite3.connect(str(tmp_path / 'head.db'))
+    assert conn.execute("SELECT COUNT(*), MIN(seq), MAX(seq) FROM synced_events").fetchone() == (150, 1, 150)
+    assert conn.execute("SELECT acked_seq FROM sync_peers WHERE bridge_id = 'bay1'").fetchone() == (150,)
+    conn.close()
+
+
+def test_head_rewinds_bridge_after_data_loss_and_merges_bridges(tmp_path):
+    client, database = _head(tmp_path)
+    bay1, bay2 = _journal(tmp_path, 'bay1', 60), _journal(tmp_path, 'bay2', 30)
+    bay1.set_acked(50)  # Head was restored from an older backup and holds nothing
+    forwarders = [_forwarder(bay1, client, 'bay1'), _forwarder(bay2, client, 'bay2')]
+
+    async def run():
+        return [await forwarder.sync_once() for forwarder in forwarders]
+
+    assert asyncio.run(run()) == [60, 30]
+    status = client.post('/api/sync/bay2/batches', content=encode_batch('bay2', [(40, 'timer', 1, '{}')]))
+    assert status.status_code == 409 and status.json()['acked_seq'] == 30
+
+    events = client.get('/api/sync/events', params={'limit': 5}).json()['events']
+    assert [(e['bridge_id'], e['seq']) for e in events] == [
+        ('bay1', 1), ('bay2', 1), ('bay1', 2), ('bay2', 2), ('bay1', 3)]
+    assert events[0]['payload'] == {'n': 0, 'bridge': 'bay1'}
+    peers = client.get('/api/sync/peers').json()['peers']
+    assert [(p['bridge_id'], p['acked_seq']) for p in peers] == [('bay1', 60), ('bay2', 30)]
+    database.close()
+
+
+def test_pruned_gap_is_skipped_and_new_epochs_do_not_overwrite(tmp_path):
+    client, database = _head(tmp_path)
+    journal = _journal(tmp_path, 'bay1', 30)
+
+    async def run():
+        assert await _forwarder(journal, client, 'bay1').sync_once() == 30
+        # A journal recreated from scratch restarts at seq 1 under a new epoch
+        recreated = _journal(tmp_path, 'bay1-new', 5)
+        assert recreated.epoch != journal.epoch
+        assert await _forwarder(recreated, client, 'bay1').sync_once() == 5
+        # One restored from a backup keeps its epoch but is behind the head
+        restored = _journal(tmp_path, 'bay1-restored', 3)
+        restored._set_state('epoch', recreated.epoch)
+        assert await _forwarder(restored, client, 'bay1').sync_once() == 3
+        assert restored.epoch != recreated.epoch
+
+        # Head loses everything after the bridge pruned what it had acked
+        restored.prune(retention_days=0)
+        for n in range(3, 8):
+            restored.append('impact', {'n': n, 'bridge': 'bay1-restored'}, ts_ns=2_000 + n)
+        other_head, other_database = _head(tmp_path / 'other')
+        forwarder = _forwarder(restored, other_head, 'bay1')
+        forwarder._resumed = True
+        sent = await forwarder.sync_once()
+        other_database.close()
+        return sent, forwarder
+
+    sent, forwarder = asyncio.run(run())
+    assert sent == 5 and forwarder.skipped_events == 3 and forwarder.journal.acked_seq == 8
+
+    database.close()
+    conn = sqlite3.connect(str(tmp_path / 'head.db'))
+    rows = conn.execute("SELECT seq, payload FROM synced_events ORDER BY seq").fetchall()
+    assert [seq for seq, _ in rows] == list(range(1, 39))
+    assert rows[0][1] == '{"n":0,"bridge":"bay1"}' and rows[30][1] == '{"n":0,"bridge":"bay1-new"}'
+    assert rows[35][1] == '{"n":0,"bridge":"bay1-restored"}'
+    conn.close()
+    conn = sqlite3.connect(str(tmp_path / 'other' / 'head.db'))
+    assert conn.execute("SELECT MIN(seq), MAX(seq) FROM synced_events").fetchone() == (4, 8)
+    conn.close()
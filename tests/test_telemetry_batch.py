@@ -0,0 +1,84 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.sample_pipeline import SampleBlock
+from impact_bridge.telemetry_batch import HEADER, TelemetryBatcher, decode_batch, encode_batch
+
+MAC = 'EA:18:3D:6A:BA:E5'
+
+
+class FakeMQTT:
+    connected = True
+
+    def __init__(self):
+        self.sent = []
+
+    def publish_sensor_batch(self, sensor_id, payload):
+        self.sent.append((sensor_id, payload))
+        return True
+
+
+def _block(start_ms, n=5, period_ms=10, baseline=(0.0, 0.0, 1.0)):
+    ts = np.int64(1_700_000_000_000_000_000) + (start_ms + np.arange(n) * period_ms).astype(np.int64) * 1_000_000
+    registers = np.zeros((n, 13), dtype=np.int16)
+    registers[:, 0] = np.arange(n)
+    registers[:, 1] = -np.arange(n)
+    registers[:, 2] = 2000
+    block = SampleBlock(MAC, b'', [], ts, registers)
+    block.baseline = baseline
+    return block
+
+
+def test_encode_decode_round_trip():
+    block = _block(0, n=40)
+    payload = encode_batch(MAC, block.ts_ns, block.raw, block.scale, block.baseline)
+    assert len(payload) == HEADER.size + 40 * 10
+
+    decoded = decode_batch(payload)
+    assert decoded['sensor_mac'] == MAC and decoded['baseline'] == (0.0, 0.0, 1.0)
+    assert np.array_equal(decoded['ts_ns'], block.ts_ns)
+    assert np.array_equal(decoded['raw'], block.raw)
+    assert decoded['scale'] == pytest.approx(block.scale)
+
+    with pytest.raises(ValueError, match='schema version'):
+        decode_batch(b'\x02' + payload[1:])
+    with pytest.raises(ValueError):
+        decode_batch(payload[:-1])
+
+
+def test_batches_close_on_window_baseline_change_and_flush():
+    mqtt = FakeMQTT()
+    batcher = TelemetryBatcher(mqtt, window_ms=50)
+    batcher(_block(0))     # 0..40 ms
+    batcher(_block(50))    # new window -> first batch published
+    assert len(mqtt.sent) == 1
+    batcher(_block(60, baseline=(0.0, 0.0, 0.9)))  # recalibrated -> publish
+    batcher.flush()
+
+    batches = [decode_batch(payload) for _, payload in mqtt.sent]
+    assert [len(b['ts_ns']) for b in batches] == [5, 5, 5]
+    assert mqtt.sent[0][0] == MAC.replace(':', '')
+    assert batches[2]['baseline'] == pytest.approx((0.0, 0.0, 0.9))
+    assert batcher.stats()['samples'] == 15 and batcher.stats()['open_batches'] == 0
+
+
+def test_batches_dropped_while_disconnected_are_counted():
+    mqtt = FakeMQTT()
+    mqtt.connected = False
+    batcher = TelemetryBatcher(mqtt, window_ms=50)
+    batcher(_block(0))
+    batcher(_block(50))
+    batcher.flush()
+    assert mqtt.sent == []
+
+    mqtt.connected = True
+    batcher(_block(100, n=3))
+    batcher.flush()
+    stats = batcher.stats()
+    assert (stats['dropped'], stats['dropped_samples']) == (2, 10)
+    assert (stats['published'], stats['samples'], stats['failed']) == (1, 3, 0)
@@ -0,0 +1,80 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.timers import AMGCommanderAdapter, Shot, StringStart, StringStop, TimerEventChannel
+
+
+def _amg(state, shot, centiseconds, string_number=1):
+    return bytes([0x01, state, shot, shot, centiseconds >> 8, centiseconds & 0xFF,
+                  0, 0, 0, 0, 0, 0, 0, string_number])
+
+
+def test_notifications_keep_frame_order_and_receive_time(monkeypatch):
+    adapter = AMGCommanderAdapter()
+    now = [1_000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+
+    async def run():
+        await adapter.start()
+        # Back-to-back BLE notifications on the loop, each stamped when its callback ran
+        frames = [_amg(5, 0, 0)] + [_amg(3, n, 100 * n) for n in range(1, 6)] + [_amg(8, 5, 500)]
+        for frame in frames:
+            adapter._amg_notification_handler(0, frame)
+            now[0] += 0.5
+        await adapter.stop()
+        return [event async for event in adapter.events]
+
+    events = asyncio.run(run())
+    assert [type(e) for e in events] == [StringStart] + [Shot] * 5 + [StringStop]
+    assert [(e.shot_number, e.split_ms) for e in events if isinstance(e, Shot)] == [(n, 1000 * n) for n in range(1, 6)]
+    assert [e.timestamp_ms for e in events] == list(range(1_000_000, 1_003_500, 500))
+    assert adapter.event_stats()['delivered'] == 7
+
+
+def test_threaded_producer_and_close_sentinel():
+    channel = TimerEventChannel()
+    received = []
+
+    async def run():
+        consumer = asyncio.create_task(_consume())
+        await asyncio.sleep(0)
+
+        def producer():
+            for n in range(500):
+                channel.post(Shot(timestamp_ms=n, raw={}, split_ms=n))
+            channel.close()
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+        # Ends on the sentinel, without any polling timeout
+        await asyncio.wait_for(consumer, timeout=2)
+        thread.join()
+
+    async def _consume():
+        async for event in channel:
+            received.append(event.timestamp_ms)
+
+    asyncio.run(run())
+    assert received == list(range(500))
+    assert not channel.post(Shot(timestamp_ms=0, raw={}, split_ms=0))
+
+
+def test_overflow_is_counted_and_queued_events_survive():
+    channel = TimerEventChannel(maxsize=3)
+
+    async def run():
+        results = [channel.post(Shot(timestamp_ms=n, raw={}, split_ms=None)) for n in range(5)]
+        channel.close()
+        return results, [event.timestamp_ms async for event in channel]
+
+    results, delivered = asyncio.run(run())
+    assert results == [True, True, True, False, False]
+    assert delivered == [0, 1, 2]
+    assert channel.stats() == {'depth': 0, 'posted': 3, 'delivered': 3, 'dropped': 2,
+                               'max_depth': 3, 'closed': True}
@@ -0,0 +1,55 @@
+import os
+import random
+import sys
+
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.timer_clock import TimerClock
+
+S = 1_000_000_000
+MS = 1_000_000
+
+
+def _string(clock, rng, beep_ns, drift_ppm=0.0, shots=8, latency_ms=40):
+    """Feed one string with 0..latency_ms BLE latency; returns (timer_s, true, live) per shot"""
+    scale = 1 + drift_ppm / 1e6
+    clock.start_string(beep_ns + rng.randrange(latency_ms * MS))
+    timer_s, results = 0.0, []
+    for _ in range(shots):
+        timer_s = round(timer_s + rng.uniform(0.5, 1.5), 2)
+        true_ns = beep_ns + int(timer_s * S * scale)
+        results.append((timer_s, true_ns, clock.observe(timer_s, true_ns + rng.randrange(latency_ms * MS))))
+    clock.end_string()
+    return results
+
+
+def test_shots_land_on_the_lower_envelope():
+    rng = random.Random(3)
+    clock = TimerClock()
+    results = _string(clock, rng, 100 * S, shots=12)
+    errors = [live - true for _, true, live in results]
+    # Never later than arrival, never earlier than the event, and tighter as frames arrive
+    assert all(0 <= error < 40 * MS for error in errors)
+    assert max(errors[6:]) < 15 * MS
+    assert clock.stats()['frames'] == 13 and clock.last_correction_ms > 0
+
+
+def test_drift_is_learned_across_strings():
+    rng = random.Random(7)
+    clock = TimerClock()
+    for n in range(30):
+        _string(clock, rng, (100 + 60 * n) * S, drift_ppm=300.0, shots=20, latency_ms=5)
+    assert 250 < clock.drift_ppm < 350
+    # The finished string is re-anchored with the learned drift
+    results = _string(clock, rng, 2000 * S, drift_ppm=300.0, shots=20, latency_ms=5)
+    assert all(abs(clock.to_host_ns(timer_s) - true) < 5 * MS for timer_s, true, _ in results)
+
+
+def test_missed_start_begins_a_new_string():
+    clock = TimerClock()
+    clock.start_string(10 * S)
+    clock.observe(2.0, 12 * S + 20 * MS)
+    # Timer time goes backwards: the next string's first shot, its START frame lost
+    assert clock.observe(1.5, 50 * S) == 50 * S
+    assert clock.strings == 1 and clock.anchor_ns == 50 * S - int(1.5 * S * (1 + clock.drift))
@@ -0,0 +1,113 @@
+import asyncio
+import importlib.util
+import os
+import sys
+
+import pytest
+
+src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+from impact_bridge.timers import BaseTimerAdapter, ConnectionType, Shot, TimerHub, TimerInfo
+
+
+class FakeTimer(BaseTimerAdapter):
+    def __init__(self, name):
+        super().__init__(name)
+        self._connected = True
+
+    async def connect(self, **kwargs):
+        pass
+
+    def info(self):
+        return TimerInfo(model=self.name, firmware_version='test', connection_type=ConnectionType.UDP)
+
+    def shot(self, timestamp_ms, number):
+        return self._post_event(Shot(timestamp_ms=timestamp_ms, raw={}, split_ms=None, shot_number=number))
+
+
+def test_events_from_all_timers_merge_in_receive_order():
+    amg, pie = FakeTimer('amg_commander'), FakeTimer('specialpie')
+    hub = TimerHub()
+    hub.add('bay1', amg)
+    hub.add('bay2', pie)
+    merged = []
+
+    async def consume():
+        async for item in hub.events:
+            merged.append((item.timer_id, item.event.timestamp_ms))
+
+    async def run():
+        await hub.start()
+        consumer = asyncio.create_task(consume())
+        # Callbacks from both timers land back to back, before either pump runs
+        for timer, ts in [(pie, 100), (amg, 110), (pie, 130), (amg, 150), (pie, 160)]:
+            timer.shot(ts, 0)
+        await asyncio.sleep(0.01)
+        amg.shot(170, 0)
+        await asyncio.sleep(0.01)
+        await hub.stop()
+        await asyncio.wait_for(consumer, timeout=1)
+
+    asyncio.run(run())
+    assert merged == [('bay2', 100), ('bay1', 110), ('bay2', 130), ('bay1', 150),
+                      ('bay2', 160), ('bay1', 170)]
+    assert hub.stats()['inversions'] == 0
+
+
+def test_busy_timer_is_held_back_without_blocking_others():
+    busy, quiet = FakeTimer('busy'), FakeTimer('quiet')
+    hub = TimerHub(max_pending=4)
+    hub.add('busy', busy)
+    hub.add('quiet', quiet)
+
+    async def run():
+        await hub.start()
+        for n in range(20):
+            busy.shot(1_000 + n, n)
+        await asyncio.sleep(0.01)
+        stats = hub.stats()['timers']
+        # The hub holds at most max_pending per timer; the rest waits in the adapter channel
+        assert stats['busy']['queued'] == 4 and stats['busy']['channel']['depth'] == 16
+        quiet.shot(999, 1)
+        await asyncio.sleep(0)
+        first = [await hub.__anext__() for _ in range(3)]
+        consumer = asyncio.create_task(_collect())
+        await hub.stop()
+        return first, await asyncio.wait_for(consumer, timeout=1)
+
+    async def _collect():
+        return [item async for item in hub.events]
+
+    first, rest = asyncio.run(run())
+    assert [(e.timer_id, e.event.timestamp_ms) for e in first] == [('quiet', 999), ('busy', 1_000), ('busy', 1_001)]
+    assert [e.event.timestamp_ms for e in rest] == list(range(1_002, 1_020))
+
+
+def _load_bridge_cli():
+    path = os.path.join(os.path.dirname(__file__), '..', 'bin', 'bridge.py')
+    spec = importlib.util.spec_from_file_location('bridge_cli', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_timer_specs_are_rejected_before_any_timer_connects(monkeypatch, capsys):
+    cli = _load_bridge_cli()
+    parser = cli.create_parser()
+    args = parser.parse_args(['--timer-spec', 'bay1=amg,ble=AA:BB:CC:DD:EE:FF',
+                              '--timer-spec', 'bay2=specialpie,serial=/dev/ttyACM0,baud=9600'])
+    assert args.timer_spec == [('bay1', 'amg', {'mac_address': 'AA:BB:CC:DD:EE:FF'}),
+                               ('bay2', 'specialpie', {'port': '/dev/ttyACM0', 'baud': 9600})]
+
+    for bad in ('bay1', 'bay1=nope', 'bay1=amg,colour=red', 'bay1=specialpie,baud=fast'):
+        with pytest.raises(SystemExit):
+            parser.parse_args(['--timer-spec', bad])
+    assert "must be an integer" in capsys.readouterr().err
+
+    monkeypatch.setattr(cli, 'BridgeApplication', lambda: pytest.fail('bridge started'))
+    monkeypatch.setattr(sys, 'argv', ['bridge.py', '--timer-spec', 'bay1=amg,sim=1',
+                                      '--timer-spec', 'bay1=specialpie,sim=1'])
+    with pytest.raises(SystemExit):
+        cli.main()
+    assert "must be unique: bay1" in capsys.readouterr().err
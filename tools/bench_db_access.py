@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+tools/bench_db_access.py
+
+Load test for the FastAPI database access paths against a synthetic shot_log
+database while a background thread keeps inserting rows (like the capture
+writer does):
+
+  loop     async endpoint, sqlite3.connect() per request on the event loop
+           (how the bridge-config endpoints used to work)
+  thread   sync endpoint, connect per request in Starlette's threadpool
+           (how /api/shot-log used to work)
+  pool     DatabaseAccess: pooled read-only connections in a bounded executor
+
+Reports requests/sec, latency percentiles and the worst event-loop stall seen
+by a 5 ms ticker task.
+
+Usage:
+    python tools/bench_db_access.py --requests 2000 --concurrency 32 --rows 50000
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import Depends, FastAPI
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(repo_root, 'src'))
+
+from impact_bridge.database.access import DatabaseAccess
+
+QUERY = "SELECT id, ts_ns, sensor_mac, magnitude FROM shot_log ORDER BY ts_ns DESC LIMIT ?"
+
+
+def make_db(path: Path, rows: int) -> None:
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE shot_log (id INTEGER PRIMARY KEY, ts_ns INTEGER, sensor_mac TEXT, magnitude REAL)")
+    conn.execute("CREATE INDEX idx_shot_log_ts ON shot_log(ts_ns)")
+    conn.executemany("INSERT INTO shot_log (ts_ns, sensor_mac, magnitude) VALUES (?, ?, ?)",
+                     ((i * 20_000_000, f"EA:18:3D:6A:BA:{i % 4:02X}", (i % 97) / 3.0) for i in range(rows)))
+    conn.commit()
+    conn.close()
+
+
+def writer_thread(path: Path, stop: threading.Event) -> None:
+    """Capture-like writer: small committed batches every 10 ms"""
+    conn = sqlite3.connect(str(path), timeout=5.0)
+    n = 10 ** 9
+    while not stop.is_set():
+        conn.executemany("INSERT INTO shot_log (ts_ns, sensor_mac, magnitude) VALUES (?, ?, ?)",
+                         ((n + i, "EA:18:3D:6A:BA:FF", 1.0) for i in range(20)))
+        conn.commit()
+        n += 20
+        time.sleep(0.01)
+    conn.close()
+
+
+def make_app(path: Path, readers: int) -> tuple[FastAPI, DatabaseAccess]:
+    app = FastAPI()
+    database = DatabaseAccess(path, readers=readers)
+
+    def _rows(conn, limit):
+        return [dict(row) for row in conn.execute(QUERY, (limit,)).fetchall()]
+
+    @app.get("/loop")
+    async def on_loop(limit: int = 100):
+        conn = sqlite3.connect(str(path))
+        conn.row_factory = sqlite3.Row
+        try:
+            return {"logs": _rows(conn, limit)}
+        finally:
+            conn.close()
+
+    @app.get("/thread")
+    def in_threadpool(limit: int = 100):
+        conn = sqlite3.connect(str(path))
+        conn.row_factory = sqlite3.Row
+        try:
+            return {"logs": _rows(conn, limit)}
+        finally:
+            conn.close()
+
+    async def get_db() -> DatabaseAccess:
+        return database
+
+    @app.get("/pool")
+    async def pooled(limit: int = 100, db: DatabaseAccess = Depends(get_db)):
+        return {"logs": await db.read(_rows, limit)}
+
+    return app, database
+
+
+async def run_case(app: FastAPI, route: str, requests: int, concurrency: int) -> dict:
+    latencies = []
+    max_stall = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal max_stall
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            max_stall = max(max_stall, time.perf_counter() - start - 0.005)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = iter(range(requests))
+
+        async def worker():
+            for _ in remaining:
+                start = time.perf_counter()
+                response = await client.get(route)
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+
+        tick = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await tick
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "stall_ms": max_stall * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--readers', type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        make_db(path, args.rows)
+        app, database = make_app(path, args.readers)
+        stop = threading.Event()
+        writer = threading.Thread(target=writer_thread, args=(path, stop), daemon=True)
+        writer.start()
+        try:
+            print(f"{args.requests} requests, concurrency {args.concurrency}, {args.rows} rows, "
+                  f"{args.readers} pooled readers, concurrent writer")
+            for route in ("/loop", "/thread", "/pool"):
+                result = asyncio.run(run_case(app, route, args.requests, args.concurrency))
+                print(f"  {route:<8} {result['rps']:8.0f} req/s  p50 {result['p50_ms']:7.2f} ms  "
+                      f"p95 {result['p95_ms']:7.2f} ms  max loop stall {result['stall_ms']:6.2f} ms")
+        finally:
+            stop.set()
+            writer.join()
+            database.close()
+
+
+if __name__ == '__main__':
+    main()
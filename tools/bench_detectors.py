@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+tools/bench_detectors.py
+
+Throughput benchmark for the shot / enhanced impact detectors: per-sample
+process_sample() versus block process_samples(). Uses a synthetic 50Hz stream
+with impact bursts, checks both paths produce identical events and reports
+samples/sec.
+
+Usage:
+    python tools/bench_detectors.py --samples 200000 --block 8
+"""
+from __future__ import annotations
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(repo_root, 'src'))
+
+from impact_bridge.shot_detector import ShotDetector
+from impact_bridge.enhanced_impact_detection import EnhancedImpactDetector
+
+
+def make_stream(n: int, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    base = time.time_ns()
+    ts = base + np.arange(n, dtype=np.int64) * 20_000_000
+    values = rng.normal(0, 5, size=(n, 3))
+    r = random.Random(seed)
+    i = 100
+    while i < n - 20:
+        length = r.randint(4, 10)
+        values[i:i + length] += r.choice([60, 200, 400])
+        i += length + r.randint(50, 500)
+    return ts, values
+
+
+def bench(label: str, fn) -> float:
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed * 1000:9.1f} ms  {count} events")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=200_000)
+    parser.add_argument('--block', type=int, default=8, help='Samples per block (per BLE notification)')
+    args = parser.parse_args()
+
+    # Detectors log every event at INFO; keep the benchmark quiet
+    logging.basicConfig(level=logging.WARNING)
+
+    ts, values = make_stream(args.samples)
+    mags = np.sqrt(np.einsum("ij,ij->i", values, values))
+    blocks = [(a, min(a + args.block, args.samples)) for a in range(0, args.samples, args.block)]
+    shot_kwargs = dict(baseline_x=0, threshold=150, min_duration=3, max_duration=11, min_interval_seconds=0.5)
+
+    print(f"{args.samples} samples, {args.block} samples/block")
+    results = {}
+
+    def shot_scalar():
+        det = ShotDetector(**shot_kwargs)
+        events = [det.process_sample(x, t / 1e9) for x, t in zip(values[:, 0].tolist(), ts.tolist())]
+        results['shot_scalar'] = [e for e in events if e]
+        return len(results['shot_scalar'])
+
+    def shot_block():
+        det = ShotDetector(**shot_kwargs)
+        events = []
+        for a, b in blocks:
+            events.extend(det.process_samples(values[a:b, 0], ts[a:b]))
+        results['shot_block'] = events
+        return len(events)
+
+    def impact_scalar():
+        det = EnhancedImpactDetector()
+        events = []
+        corrected = values.tolist()
+        for i, t in enumerate(ts.tolist()):
+            ev = det.process_sample(datetime.fromtimestamp(t / 1e9), corrected[i], corrected[i], float(mags[i]))
+            if ev:
+                events.append(ev)
+        results['impact_scalar'] = events
+        return len(events)
+
+    def impact_block():
+        det = EnhancedImpactDetector()
+        events = []
+        for a, b in blocks:
+            events.extend(det.process_samples(ts[a:b], values[a:b], mags[a:b]))
+        results['impact_block'] = events
+        return len(events)
+
+    print("ShotDetector")
+    s_scalar = bench("process_sample (scalar)", shot_scalar)
+    s_block = bench("process_samples (block)", shot_block)
+    print("EnhancedImpactDetector")
+    i_scalar = bench("process_sample (scalar)", impact_scalar)
+    i_block = bench("process_samples (block)", impact_block)
+
+    assert results['shot_scalar'] == results['shot_block'], "shot events differ"
+    assert [e.onset_timestamp for e in results['impact_scalar']] == \
+           [e.onset_timestamp for e in results['impact_block']], "impact events differ"
+
+    print()
+    print(f"ShotDetector:           {args.samples / s_scalar:12,.0f} -> {args.samples / s_block:12,.0f} samples/s "
+          f"({s_scalar / s_block:.1f}x)")
+    print(f"EnhancedImpactDetector: {args.samples / i_scalar:12,.0f} -> {args.samples / i_block:12,.0f} samples/s "
+          f"({i_scalar / i_block:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+tools/bench_mqtt_telemetry.py
+
+Compare sample-pipeline MQTT telemetry publishing through the real
+LeadVilleMQTT client against a minimal local MQTT 3.1.1 broker stand-in
+(CONNECT/PUBLISH/PUBACK/PINGREQ only, counts what arrives):
+
+  json     every notification's raw samples as one JSON message at QoS 1
+           (what full-fidelity telemetry cost with the previous publisher)
+  summary  MqttTelemetryConsumer, one JSON summary per notification (QoS 1
+           before the per-topic QoS map, now QoS 0; no raw samples)
+  batch    TelemetryBatcher, every raw sample in packed windows at QoS 0
+
+Synthetic BT50 notifications are pushed as fast as the client accepts them.
+Reports messages/s, wire bytes/s, samples/s delivered and bytes per sample.
+
+Usage:
+    python tools/bench_mqtt_telemetry.py --sensors 4 --blocks 5000 --rate-hz 100
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(repo_root, 'src'))
+
+from impact_bridge.mqtt_client import LeadVilleMQTT, MQTTConfig
+from impact_bridge.sample_pipeline import MqttTelemetryConsumer, SampleBlock
+from impact_bridge.telemetry_batch import TelemetryBatcher
+
+
+class JsonSampleConsumer:
+    """Baseline: raw samples as JSON, one QoS 1 message per notification"""
+
+    def __init__(self, mqtt_client):
+        self.mqtt_client = mqtt_client
+        self.published = 0
+        self.samples = 0
+
+    def __call__(self, block):
+        if self.mqtt_client.publish(f"sensor/{block.sensor_mac.replace(':', '')}/telemetry", {
+            'ts_ns': [int(t) for t in block.ts_ns],
+            'raw': block.raw.tolist(),
+            'baseline': list(block.baseline),
+        }, qos=1):
+            self.published += 1
+            self.samples += len(block)
+
+
+class BrokerStandIn:
+    """Single-purpose MQTT broker: acks everything, forwards nothing"""
+
+    def __init__(self):
+        self.messages = 0
+        self.payload_bytes = 0
+        self.wire_bytes = 0
+        self.port = None
+        self._ready = threading.Event()
+        self._loop = None
+
+    def start(self):
+        threading.Thread(target=self._thread, daemon=True).start()
+        self._ready.wait()
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def reset(self):
+        self.messages = self.payload_bytes = self.wire_bytes = 0
+
+    def _thread(self):
+        self._loop = asyncio.new_event_loop()
+        server = self._loop.run_until_complete(asyncio.start_server(self._client, '127.0.0.1', 0))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _client(self, reader, writer):
+        sock = writer.get_extra_info('socket')
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            while True:
+                first = (await reader.readexactly(1))[0]
+                length, shift, header = 0, 0, 1
+                while True:
+                    byte = (await reader.readexactly(1))[0]
+                    header += 1
+                    length |= (byte & 0x7F) << shift
+                    shift += 7
+                    if not byte & 0x80:
+                        break
+                body = await reader.readexactly(length)
+                self.wire_bytes += header + length
+                kind = first >> 4
+                if kind == 1:  # CONNECT
+                    writer.write(b'\x20\x02\x00\x00')
+                elif kind == 3:  # PUBLISH
+                    qos = (first >> 1) & 3
+                    topic_len = int.from_bytes(body[:2], 'big')
+                    offset = 2 + topic_len
+                    if qos:
+                        writer.write(b'\x40\x02' + body[offset:offset + 2])
+                        offset += 2
+                    self.messages += 1
+                    self.payload_bytes += length - offset
+                elif kind == 8:  # SUBSCRIBE
+                    writer.write(b'\x90\x03' + body[:2] + b'\x00')
+                elif kind == 12:  # PINGREQ
+                    writer.write(b'\xd0\x00')
+                elif kind == 14:  # DISCONNECT
+                    break
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def make_blocks(sensors, blocks, samples_per_block, period_ns):
+    rng = np.random.default_rng(7)
+    start = time.time_ns()
+    macs = [f'EA:18:3D:6A:BA:{n:02X}' for n in range(sensors)]
+    out = []
+    for i in range(blocks):
+        for mac in macs:
+            ts = start + (i * samples_per_block + np.arange(samples_per_block, dtype=np.int64)) * period_ns
+            registers = rng.integers(-60, 60, size=(samples_per_block, 13)).astype(np.int16)
+            registers[:, 2] += 2000
+            block = SampleBlock(mac, b'', [], ts, registers)
+            block.baseline = (0.0, 0.0, 1.0)
+            block.values -= block.baseline
+            out.append(block)
+    return out
+
+
+async def run_mode(mode, broker, blocks, args):
+    client = LeadVilleMQTT(MQTTConfig(host='127.0.0.1', port=broker.port, client_id=f'bench-{mode}'))
+    if not await client.connect():
+        raise SystemExit('Could not connect to broker stand-in')
+    await asyncio.sleep(0.1)
+    broker.reset()
+
+    if mode == 'batch':
+        consumer = TelemetryBatcher(client, window_ms=args.window_ms)
+    elif mode == 'json':
+        consumer = JsonSampleConsumer(client)
+    else:
+        consumer = MqttTelemetryConsumer(client)
+        if mode == 'summary-qos1':
+            client.TOPIC_QOS = {**client.TOPIC_QOS, 'sensor_telemetry': 1}
+    start = time.perf_counter()
+    for block in blocks:
+        consumer(block)
+    if mode == 'batch':
+        consumer.flush()
+    expected_messages = consumer.published
+    deadline = time.perf_counter() + args.timeout
+    while broker.messages < expected_messages and time.perf_counter() < deadline:
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    client.disconnect()
+
+    samples = getattr(consumer, 'samples', 0)
+    return {
+        'mode': mode,
+        'messages': broker.messages,
+        'elapsed_s': elapsed,
+        'msgs_per_s': broker.messages / elapsed,
+        'wire_bytes_per_s': broker.wire_bytes / elapsed,
+        'samples_per_s': samples / elapsed,
+        'bytes_per_sample': broker.wire_bytes / samples if samples else float('nan'),
+        'complete': broker.messages >= expected_messages,
+    }
+
+
+async def main_async(args):
+    broker = BrokerStandIn()
+    broker.start()
+    period_ns = int(1e9 / args.rate_hz)
+    blocks = make_blocks(args.sensors, args.blocks, args.samples_per_block, period_ns)
+    samples = len(blocks) * args.samples_per_block
+    print(f"{args.sensors} sensors x {args.blocks} notifications x {args.samples_per_block} samples "
+          f"@ {args.rate_hz:g} Hz ({samples} samples, {samples * period_ns / args.sensors / 1e9:.0f} s of stream), "
+          f"batch window {args.window_ms:g} ms\n")
+    print(f"{'mode':<12} {'msgs':>7} {'time s':>7} {'msgs/s':>9} {'wire B/s':>11} {'samples/s':>10} {'B/sample':>9}")
+    for mode in ('json', 'summary-qos1', 'summary', 'batch'):
+        r = await run_mode(mode, broker, blocks, args)
+        print(f"{r['mode']:<12} {r['messages']:>7} {r['elapsed_s']:>7.2f} {r['msgs_per_s']:>9.0f} "
+              f"{r['wire_bytes_per_s']:>11.0f} {r['samples_per_s']:>10.0f} {r['bytes_per_sample']:>9.1f}"
+              f"{'' if r['complete'] else '  (timed out)'}")
+    broker.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sensors', type=int, default=4)
+    parser.add_argument('--blocks', type=int, default=5000, help='Notifications per sensor')
+    parser.add_argument('--samples-per-block', type=int, default=1, help='Samples per notification')
+    parser.add_argument('--rate-hz', type=float, default=100.0, help='Per-sensor sample rate')
+    parser.add_argument('--window-ms', type=float, default=50.0, help='Batch window')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
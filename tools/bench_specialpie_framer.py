@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+tools/bench_specialpie_framer.py
+
+Throughput benchmark for SpecialPieFramer against the previous decoder,
+which resliced its buffer after every frame and located frames by searching
+for the end marker.
+
+Traffic is the shooting script from tools/specialpie_sim.py (DEMO_STRINGS,
+repeated) encoded in the adapter's binary wire format - that simulator itself
+sends an ASCII line format the adapter does not decode. With --corrupt a
+fraction of frames get one byte flipped. The stream is fed in reads of
+--chunk bytes (20 = one BLE notification, 1024 = one serial read, 0 = the
+whole capture at once, like a backlog after a reconnect).
+
+Usage:
+    python tools/bench_specialpie_framer.py --repeat 2000 --chunk 20
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import sys
+import time
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(repo_root, 'src'))
+sys.path.insert(0, os.path.join(repo_root, 'tools'))
+
+from impact_bridge.timers.specialpie import SpecialPieFramer
+from specialpie_sim import DEMO_STRINGS
+
+
+class LegacyFramer(SpecialPieFramer):
+    """The previous feed loop: reslice per frame, split on the first end marker"""
+
+    def feed(self, data, timestamp_ms=None):
+        self.buffer.extend(data)
+        frames = []
+        while len(self.buffer) >= 8:
+            start_idx = self.buffer.find(self.FRAME_START)
+            if start_idx == -1:
+                self.buffer.clear()
+                break
+            if start_idx > 0:
+                self.buffer = self.buffer[start_idx:]
+            end_idx = self.buffer.find(self.FRAME_END, 1)
+            if end_idx == -1:
+                break
+            frame_data = bytes(self.buffer[1:end_idx])
+            self.buffer = self.buffer[end_idx + 1:]
+            # Checksum with the corrected payload offsets, so only framing differs
+            if len(frame_data) >= 3 and len(frame_data) == frame_data[1] + 3:
+                checksum = 0
+                for byte in frame_data:
+                    checksum ^= byte
+                if not checksum:
+                    frames.append({
+                        'opcode': frame_data[0],
+                        'length': frame_data[1],
+                        'payload': frame_data[2:-1],
+                        'raw_hex': frame_data.hex(),
+                        'timestamp_ms': timestamp_ms
+                    })
+        if len(self.buffer) > self.MAX_FRAME_SIZE * 2:
+            self.buffer.clear()
+        return frames
+
+
+def demo_traffic(repeat: int):
+    frames = [SpecialPieFramer.encode(0x06), SpecialPieFramer.encode(0x04, bytes([87]))]
+    for n in range(repeat):
+        for string_number, string in enumerate(DEMO_STRINGS, 1):
+            string_number += 3 * n
+            frames.append(SpecialPieFramer.encode(0x01, bytes([string_number & 0xFF])))
+            previous = 0.0
+            for shot_number, shot_time in enumerate(string['shots'], 1):
+                split_ms = int(round((shot_time - previous) * 1000))
+                previous = shot_time
+                frames.append(SpecialPieFramer.encode(
+                    0x02, split_ms.to_bytes(2, 'little') + bytes([shot_number, string_number & 0xFF])))
+            total_ms = int(round(string['shots'][-1] * 1000))
+            frames.append(SpecialPieFramer.encode(
+                0x03, total_ms.to_bytes(4, 'little') + bytes([len(string['shots']), string_number & 0xFF])))
+    return frames
+
+
+def run(framer, stream: bytes, chunk: int):
+    chunk = chunk or len(stream)
+    decoded = 0
+    start = time.perf_counter()
+    for pos in range(0, len(stream), chunk):
+        decoded += len(framer.feed(stream[pos:pos + chunk], 0))
+    return time.perf_counter() - start, decoded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=2000, help='Times to replay the demo strings')
+    parser.add_argument('--chunk', type=int, nargs='+', default=[20, 1024, 0], help='Read sizes (0 = all)')
+    parser.add_argument('--corrupt', type=float, default=0.0, help='Fraction of frames with a flipped byte')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    frames = demo_traffic(args.repeat)
+    intact = 0
+    stream = bytearray()
+    for frame in frames:
+        if rng.random() < args.corrupt:
+            frame = bytearray(frame)
+            frame[rng.randrange(1, len(frame))] ^= rng.randrange(1, 256)
+        else:
+            intact += 1
+        stream += frame
+    stream = bytes(stream)
+    print(f"{len(frames)} frames ({intact} intact), {len(stream)} bytes")
+
+    for chunk in args.chunk:
+        label = f"{chunk} B reads" if chunk else "one burst"
+        for name, framer in (('legacy', LegacyFramer()), ('offset', SpecialPieFramer())):
+            elapsed, decoded = run(framer, stream, chunk)
+            print(f"  {label:<14} {name:<7} {elapsed * 1000:9.1f} ms  "
+                  f"{len(stream) / elapsed / 1e6:7.2f} MB/s  {decoded} frames")
+
+
+if __name__ == '__main__':
+    main()
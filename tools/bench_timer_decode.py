@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+tools/bench_timer_decode.py
+
+Decode benchmark for timer frames: the struct/dispatch-table decoders against
+the previous per-byte parsers.
+
+AMG traffic is a synthetic match - per string a START, 4-12 SHOT frames, a
+STOP and the shot-sequence frames the timer sends after it. Three stages are
+timed per frame:
+
+  decode   bytes -> parsed frame (parse_amg_timer_data dict vs AmgFrame)
+  adapter  AMGCommanderAdapter notification handler: decode + TimerEvent
+  encode   adapter + WebSocket JSON (encode_timer_event_json)
+
+SpecialPie traffic is the DEMO_STRINGS script (as in bench_specialpie_framer)
+through SpecialPieFramer, timed for parse_specialpie_frame + WebSocket JSON.
+
+Usage:
+    python tools/bench_timer_decode.py --strings 2000
+"""
+from __future__ import annotations
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+from dataclasses import asdict
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(repo_root, 'src'))
+sys.path.insert(0, os.path.join(repo_root, 'tools'))
+
+from impact_bridge.ble.amg_parse import ShotState, convert_time_bytes, decode_amg_frame
+from impact_bridge.timers import (AMGCommanderAdapter, Battery, ClockSync, Shot, StringStart, StringStop,
+                                  TimerConnected, TimerDisconnected, TimerReady)
+from impact_bridge.timers.specialpie import SpecialPieFramer, parse_specialpie_frame
+from impact_bridge.ws.encode import _json_default, encode_timer_event_json
+from bench_specialpie_framer import demo_traffic
+
+
+# Previous implementations --------------------------------------------------
+
+def legacy_parse_amg_timer_data(data):
+    """parse_amg_timer_data before the struct layouts"""
+    if len(data) < 14:
+        return None
+    try:
+        bytes_list = list(data)
+        type_id = bytes_list[0]
+        shot_state_raw = bytes_list[1]
+        try:
+            shot_state = ShotState(shot_state_raw)
+        except ValueError:
+            shot_state = ShotState.ACTIVE
+        current_shot = bytes_list[2]
+        total_shots = bytes_list[3]
+        current_time = convert_time_bytes(bytes_list[4], bytes_list[5])
+        split_time = convert_time_bytes(bytes_list[6], bytes_list[7])
+        first_shot_time = convert_time_bytes(bytes_list[8], bytes_list[9])
+        second_shot_time = convert_time_bytes(bytes_list[10], bytes_list[11])
+        current_round = (bytes_list[12] << 8) | bytes_list[13]
+        event_type = "String"
+        if shot_state == ShotState.START:
+            event_detail = "Timer Started"
+        elif shot_state == ShotState.STOPPED:
+            event_detail = "Timer Stopped"
+        elif type_id == 1 and shot_state_raw == 3:
+            event_detail = f"Shot {current_shot}: {current_time:.2f}s"
+        elif 10 <= type_id <= 26:
+            event_detail = f"Shot Sequence {current_shot}/{total_shots}: {current_time:.2f}s"
+        else:
+            event_detail = f"Timer Active: {current_time:.2f}s"
+        result = {
+            'type_id': type_id, 'shot_state': shot_state.name, 'shot_state_raw': shot_state_raw,
+            'current_shot': current_shot, 'total_shots': total_shots, 'current_time': current_time,
+            'split_time': split_time, 'first_shot_time': first_shot_time,
+            'second_shot_time': second_shot_time, 'current_round': current_round,
+            'event_type': event_type, 'event_detail': event_detail, 'raw_hex': data.hex().upper()
+        }
+        logging.getLogger('amg_parse').debug(f"Parsed AMG data: {result}")
+        return result
+    except Exception:
+        return None
+
+
+class LegacyAMGAdapter(AMGCommanderAdapter):
+    """Notification handler before AmgFrame: parse to a dict, convert by shot_state name"""
+
+    def _amg_notification_handler(self, sender, data):
+        timestamp_ms = int(time.time() * 1000)
+        parsed = legacy_parse_amg_timer_data(data)
+        raw = {'hex': data.hex().upper(), 'parsed': parsed, 'length': len(data), 'adapter': 'amg_commander'}
+        if not parsed:
+            return
+        state = parsed.get('shot_state', 'UNKNOWN')
+        current_time = parsed.get('current_time', 0.0)
+        if state == 'START':
+            self.current_string, self.shot_count = parsed.get('current_round', 0), 0
+            event = StringStart(timestamp_ms=timestamp_ms, raw=raw, string_number=self.current_string)
+        elif state == 'ACTIVE' and parsed.get('type_id') == 1:
+            self.shot_count += 1
+            event = Shot(timestamp_ms=timestamp_ms, raw=raw, split_ms=int(current_time * 1000) if current_time else None,
+                         shot_number=self.shot_count, string_number=self.current_string)
+        elif state == 'STOPPED':
+            event = StringStop(timestamp_ms=timestamp_ms, raw=raw, total_ms=int(current_time * 1000) if current_time else 0,
+                               shot_count=self.shot_count, string_number=self.current_string)
+            self.current_string, self.shot_count = None, 0
+        else:
+            return
+        self._post_event(event)
+
+
+def legacy_encode_timer_event(event, source):
+    """encode_timer_event before the dispatch table: an isinstance chain"""
+    base_data = {"source": source, "t_ms": event.timestamp_ms, "raw": event.raw}
+    if isinstance(event, TimerConnected):
+        return {"type": "timer_connected", **base_data, "info": asdict(event.info)}
+    elif isinstance(event, TimerDisconnected):
+        return {"type": "timer_disconnected", **base_data, "reason": event.reason}
+    elif isinstance(event, TimerReady):
+        return {"type": "timer_ready", **base_data}
+    elif isinstance(event, Shot):
+        return {"type": "shot", **base_data, "split_ms": event.split_ms,
+                "shot_number": event.shot_number, "string_number": event.string_number}
+    elif isinstance(event, StringStart):
+        return {"type": "string_start", **base_data, "string_number": event.string_number}
+    elif isinstance(event, StringStop):
+        return {"type": "string_stop", **base_data, "total_ms": event.total_ms,
+                "shot_count": event.shot_count, "string_number": event.string_number}
+    elif isinstance(event, Battery):
+        return {"type": "battery", **base_data, "level_pct": event.level_pct}
+    elif isinstance(event, ClockSync):
+        return {"type": "clock_sync", **base_data, "delta_ms": event.delta_ms,
+                "device_time_ms": event.device_time_ms, "host_time_ms": event.host_time_ms}
+    return {"type": "unknown", **base_data, "event_class": event.__class__.__name__}
+
+
+def legacy_encode_json(event, source):
+    return json.dumps(legacy_encode_timer_event(event, source), separators=(',', ':'), default=_json_default)
+
+
+def legacy_parse_specialpie_frame(frame):
+    """parse_specialpie_frame before the payload layouts"""
+    opcode = frame.get('opcode', 0)
+    payload = frame.get('payload', b'')
+    timestamp_ms = frame.get('timestamp_ms', int(time.time() * 1000))
+    if opcode == 0x01:
+        return StringStart(timestamp_ms=timestamp_ms, raw=frame, string_number=payload[0] if len(payload) > 0 else None)
+    elif opcode == 0x02 and len(payload) >= 4:
+        return Shot(timestamp_ms=timestamp_ms, raw=frame, split_ms=int.from_bytes(payload[0:2], 'little'),
+                    shot_number=payload[2], string_number=payload[3])
+    elif opcode == 0x03 and len(payload) >= 6:
+        return StringStop(timestamp_ms=timestamp_ms, raw=frame, total_ms=int.from_bytes(payload[0:4], 'little'),
+                          shot_count=payload[4], string_number=payload[5])
+    elif opcode == 0x04 and len(payload) >= 1:
+        return Battery(timestamp_ms=timestamp_ms, raw=frame, level_pct=payload[0])
+    elif opcode == 0x06:
+        return TimerReady(timestamp_ms=timestamp_ms, raw=frame)
+    logging.getLogger('specialpie').debug(f"Unknown SpecialPie opcode: {opcode:02x}")
+    return None
+
+
+# Traffic -------------------------------------------------------------------
+
+def _status(state, shot, time_cs, split_cs, first_cs, round_number):
+    return bytes([0x01, state, shot, shot]) + b''.join(
+        value.to_bytes(2, 'big') for value in (time_cs, split_cs, first_cs, 0, round_number))
+
+
+def amg_match(strings, seed=1):
+    rng = random.Random(seed)
+    frames = []
+    for string_number in range(1, strings + 1):
+        frames.append(_status(5, 0, 0, 0, 0, string_number))
+        times, time_cs = [], 0
+        for shot in range(1, rng.randint(4, 12) + 1):
+            split = rng.randint(18, 150)
+            time_cs += split
+            times.append(time_cs)
+            frames.append(_status(3, shot, time_cs, split, times[0], string_number))
+        frames.append(_status(8, len(times), time_cs, 0, times[0], string_number))
+        for line, start in enumerate(range(0, len(times), 9)):
+            chunk = times[start:start + 9]
+            frames.append(bytes([10 + line, len(chunk)]) + b''.join(t.to_bytes(2, 'big') for t in chunk))
+    return frames
+
+
+def specialpie_frames(repeat):
+    return SpecialPieFramer().feed(b''.join(demo_traffic(repeat)), timestamp_ms=0)
+
+
+# Benchmark -----------------------------------------------------------------
+
+def best_of(rounds, fn):
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_adapter(adapter_class, frames, encode=None):
+    adapter = adapter_class()
+    events = []
+    adapter._post_event = events.append
+    handler = adapter._amg_notification_handler
+    for data in frames:
+        handler(0, data)
+    if encode:
+        for event in events:
+            encode(event, 'amg')
+    return events
+
+
+def report(label, frames, legacy_s, new_s):
+    print(f"  {label:<22} {legacy_s / frames * 1e6:7.2f} us  {new_s / frames * 1e6:7.2f} us  "
+          f"{legacy_s / new_s:5.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--strings', type=int, default=2000, help='AMG strings to decode')
+    parser.add_argument('--repeat', type=int, default=500, help='SpecialPie DEMO_STRINGS repetitions')
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    frames = amg_match(args.strings)
+    # Both paths must agree before their speed is compared
+    assert all(legacy_parse_amg_timer_data(f) == (decode_amg_frame(f).as_dict() if len(f) >= 14 else None)
+               for f in frames)
+    # (on timer event frames: the legacy adapter also read shot-sequence frames whose
+    # shot count happened to be 5 or 8 as START/STOP)
+    timer_frames = [f for f in frames if f[0] == 0x01]
+    legacy_events = run_adapter(LegacyAMGAdapter, timer_frames)
+    new_events = run_adapter(AMGCommanderAdapter, frames)
+    assert [(type(e), getattr(e, 'shot_number', None)) for e in legacy_events] == \
+           [(type(e), getattr(e, 'shot_number', None)) for e in new_events]
+
+    n = len(frames)
+    print(f"AMG: {args.strings} strings, {n} frames ({len(new_events)} timer events)")
+    print(f"  {'stage':<22} {'legacy':>10}  {'new':>10}  speedup")
+    report('decode', n,
+           best_of(args.rounds, lambda: [legacy_parse_amg_timer_data(f) for f in frames]),
+           best_of(args.rounds, lambda: [decode_amg_frame(f) for f in frames]))
+    report('adapter', n,
+           best_of(args.rounds, lambda: run_adapter(LegacyAMGAdapter, frames)),
+           best_of(args.rounds, lambda: run_adapter(AMGCommanderAdapter, frames)))
+    report('adapter + ws json', n,
+           best_of(args.rounds, lambda: run_adapter(LegacyAMGAdapter, frames, legacy_encode_json)),
+           best_of(args.rounds, lambda: run_adapter(AMGCommanderAdapter, frames, encode_timer_event_json)))
+
+    sp_frames = specialpie_frames(args.repeat)
+    m = len(sp_frames)
+    print(f"\nSpecialPie: {m} frames")
+    print(f"  {'stage':<22} {'legacy':>10}  {'new':>10}  speedup")
+    report('parse', m,
+           best_of(args.rounds, lambda: [legacy_parse_specialpie_frame(f) for f in sp_frames]),
+           best_of(args.rounds, lambda: [parse_specialpie_frame(f) for f in sp_frames]))
+    report('parse + ws json', m,
+           best_of(args.rounds, lambda: [legacy_encode_json(legacy_parse_specialpie_frame(f), 'specialpie')
+                                         for f in sp_frames]),
+           best_of(args.rounds, lambda: [encode_timer_event_json(parse_specialpie_frame(f), 'specialpie')
+                                         for f in sp_frames]))
+
+
+if __name__ == '__main__':
+    main()
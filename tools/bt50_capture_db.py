@@ -3,7 +3,9 @@
 This script accepts one or more `--mac` arguments and connects to each device
 concurrently. Parsed frames are enqueued to a single DB writer coroutine which
 serializes writes into `logs/bt50_samples.db` and tags each row with the
-source `sensor_mac`.
+source `sensor_mac`. The writer queue is split into bounded priority lanes
+(timer/impact > status > raw samples) so events are written first and raw
+samples are shed (drop / decimate / spill) when storage falls behind.
 
 Usage (examples):
     # single sensor (backwards compatible)
@@ -11,6 +13,12 @@ Usage (examples):
 
     # multiple sensors
     PYTHONPATH=projects/LeadVille/src python3 tools/bt50_capture_db.py --mac AA:BB:CC:DD:EE:FF --mac 11:22:33:44:55:66 --duration 60
+
+    # event-gated: only persist motion frames around detected impacts / timer strings
+    PYTHONPATH=projects/LeadVille/src python3 tools/bt50_capture_db.py --mac AA:BB:CC:DD:EE:FF --detect-enabled --capture-mode gated --pre-trigger-ms 500
+
+    # event-gated by the AMG timer: capture every sensor from START to STOP
+    PYTHONPATH=projects/LeadVille/src python3 tools/bt50_capture_db.py --mac AA:BB:CC:DD:EE:FF --timer-mac 60:09:C3:1F:DC:1A --capture-mode gated
 """
 
 import argparse
@@ -96,13 +104,19 @@ else:
     # fallback to repo root (older setups)
     sys.path.insert(0, repo_root)
 
+from impact_bridge.ble.amg_parse import decode_amg_frame
 from impact_bridge.ble.wtvb_parse import scan_and_parse
+from impact_bridge.event_capture import EventGatedCapture
+from impact_bridge.priority_lanes import PriorityLanes, SHED_POLICIES
+from impact_bridge.log_setup import setup_logging, LazyHex, LogSampler
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('bt50_capture_db')
+# Per-frame lines are summarized: one per key every 5s with a count
+frame_log = LogSampler(logger, interval=5.0)
 
 
 DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'db', 'bt50_samples.db')
+AMG_NOTIFY_UUID = '6e400003-b5a3-f393-e0a9-e50e24dcca9e'
 
 # Samples with all motion values below this threshold are considered status-only
 # (values are in raw register units; tune per your calibration)
@@ -132,6 +146,11 @@ def _ensure_db(path: str):
         """
     )
     con.commit()
+    # Event-gated capture tags each persisted window with its impact/string id
+    cur.execute("PRAGMA table_info(bt50_samples)")
+    if 'window_tag' not in [r[1] for r in cur.fetchall()]:
+        cur.execute("ALTER TABLE bt50_samples ADD COLUMN window_tag TEXT")
+        con.commit()
     # Create a compact device_status table for low-rate status updates
     cur.execute(
         """
@@ -211,160 +230,205 @@ writer_metrics = {
 }
 
 
-async def db_writer(queue: asyncio.Queue, db_path: str, batch_size: int = 50):
-    """Consume parsed records from the queue and write them to SQLite."""
-    _ensure_db(db_path)
-    con = sqlite3.connect(db_path)
+def _write_item(cur: sqlite3.Cursor, item: Dict[str, Any]) -> int:
+    """Execute the INSERT/REPLACE statements for one queued item; returns rows written."""
+    rows = 0
+    # Support two item types:
+    # 1) full sample item: {'sensor_mac','frame_hex','parser','parsed'} -> insert into bt50_samples
+    # 2) status update: {'sensor_mac','status':{'temperature_c', 'temp_raw', 'battery_pct', ...}, 'last_seen_ns'}
+    if 'status' in item:
+        status = item['status'] or {}
+        sensor_mac = item.get('sensor_mac')
+        last_seen_ns = item.get('last_seen_ns')
+        # Upsert device_status (simple replace semantics)
+        cur.execute(
+            "REPLACE INTO device_status (sensor_mac, last_seen_ns, temperature_c, temp_raw, battery_pct, battery_mv, last_history_ns) VALUES (?,?,?,?,?,?,?)",
+            (
+                sensor_mac,
+                last_seen_ns,
+                status.get('temperature_c'),
+                status.get('temp_raw'),
+                status.get('battery_pct'),
+                status.get('battery_mv'),
+                item.get('last_history_ns'),
+            ),
+        )
+        rows += 1
+        writer_metrics['status_updates'] += 1
+        # Optionally insert into history table when requested
+        if item.get('history'):
+            ts_ns = item.get('ts_ns') or last_seen_ns
+            cur.execute(
+                "INSERT INTO device_status_history (sensor_mac, ts_ns, temperature_c, temp_raw, battery_pct, battery_mv) VALUES (?,?,?,?,?,?)",
+                (
+                    sensor_mac,
+                    ts_ns,
+                    status.get('temperature_c'),
+                    status.get('temp_raw'),
+                    status.get('battery_pct'),
+                    status.get('battery_mv'),
+                ),
+            )
+            rows += 1
+            writer_metrics['history_inserts'] += 1
+    elif 'impact' in item:
+        # compact impact summary
+        impact = item['impact'] or {}
+        cur.execute(
+            "INSERT INTO impacts (sensor_mac, impact_ts_ns, detection_ts_ns, peak_mag, pre_mag, post_mag, duration_ms) VALUES (?,?,?,?,?,?,?)",
+            (
+                item.get('sensor_mac'),
+                impact.get('impact_ts_ns'),
+                impact.get('detection_ts_ns'),
+                impact.get('peak_mag'),
+                impact.get('pre_mag'),
+                impact.get('post_mag'),
+                impact.get('duration_ms'),
+            ),
+        )
+        rows += 1
+        writer_metrics.setdefault('impacts', 0)
+        writer_metrics['impacts'] += 1
+    elif 'timer' in item:
+        te = item['timer'] or {}
+        # ts_ns may be provided; otherwise use current time
+        ts_ns = te.get('ts_ns') or int(time.time() * 1e9)
+        cur.execute(
+            "INSERT INTO timer_events (ts_ns, device_id, event_type, split_seconds, split_cs, raw_hex) VALUES (?,?,?,?,?,?)",
+            (
+                ts_ns,
+                item.get('device_id') or te.get('device_id'),
+                te.get('event_type'),
+                te.get('split_seconds'),
+                te.get('split_cs'),
+                te.get('raw_hex'),
+            ),
+        )
+        rows += 1
+        writer_metrics.setdefault('timer_events', 0)
+        writer_metrics['timer_events'] += 1
+    else:
+        sensor_mac = item.get('sensor_mac')
+        frame_hex = item.get('frame_hex')
+        parser = item.get('parser')
+        parsed: Dict[str, Any] = item.get('parsed', {})
+
+        cur.execute(
+            """
+            INSERT INTO bt50_samples (
+                sensor_mac, frame_hex, parser,
+                vx, vy, vz, angle_x, angle_y, angle_z,
+                temp_raw, temperature_c, disp_x, disp_y, disp_z,
+                freq_x, freq_y, freq_z, window_tag
+            ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+            """,
+            (
+                sensor_mac,
+                frame_hex,
+                parser,
+                parsed.get('vx'),
+                parsed.get('vy'),
+                parsed.get('vz'),
+                parsed.get('angle_x'),
+                parsed.get('angle_y'),
+                parsed.get('angle_z'),
+                parsed.get('temp_raw'),
+                parsed.get('temperature_c'),
+                parsed.get('disp_x'),
+                parsed.get('disp_y'),
+                parsed.get('disp_z'),
+                parsed.get('freq_x'),
+                parsed.get('freq_y'),
+                parsed.get('freq_z'),
+                item.get('window_tag'),
+            ),
+        )
+        rows += 1
+        writer_metrics['inserts'] += 1
+
+    return rows
+
+
+def _write_batch(con: sqlite3.Connection, batch) -> int:
     cur = con.cursor()
+    rows = 0
+    for _lane, item, _enqueued_ns in batch:
+        rows += _write_item(cur, item)
+    con.commit()
+    return rows
+
+
+async def db_writer(queue: PriorityLanes, db_path: str, batch_size: int = 50, linger: float = 0.2):
+    """Drain the priority lanes and write them to SQLite.
+
+    Batches are taken highest priority first (timer/impact, status, raw
+    samples) and committed in a worker thread so a stalled SD card does not
+    block BLE callbacks; the lanes absorb (and shed) the backlog meanwhile.
+    """
+    _ensure_db(db_path)
+    con = sqlite3.connect(db_path, check_same_thread=False)
     try:
-        pending = 0
         while True:
-            item = await queue.get()
-            if item is None:
+            batch = await queue.get_batch(batch_size, linger=linger)
+            if not batch:
                 break
+            await asyncio.to_thread(_write_batch, con, batch)
+            queue.record_written(batch)
+            writer_metrics['batches_committed'] += 1
+    finally:
+        con.close()
+        queue.close_spill()
 
-            # Support two item types:
-            # 1) full sample item: {'sensor_mac','frame_hex','parser','parsed'} -> insert into bt50_samples
-            # 2) status update: {'sensor_mac','status':{'temperature_c', 'temp_raw', 'battery_pct', ...}, 'last_seen_ns'}
-            if 'status' in item:
-                status = item['status'] or {}
-                sensor_mac = item.get('sensor_mac')
-                last_seen_ns = item.get('last_seen_ns')
-                # Upsert device_status (simple replace semantics)
-                cur.execute(
-                    "REPLACE INTO device_status (sensor_mac, last_seen_ns, temperature_c, temp_raw, battery_pct, battery_mv, last_history_ns) VALUES (?,?,?,?,?,?,?)",
-                    (
-                        sensor_mac,
-                        last_seen_ns,
-                        status.get('temperature_c'),
-                        status.get('temp_raw'),
-                        status.get('battery_pct'),
-                        status.get('battery_mv'),
-                        item.get('last_history_ns'),
-                    ),
-                )
-                pending += 1
-                writer_metrics['status_updates'] += 1
-                # Optionally insert into history table when requested
-                if item.get('history'):
-                    ts_ns = item.get('ts_ns') or last_seen_ns
-                    cur.execute(
-                        "INSERT INTO device_status_history (sensor_mac, ts_ns, temperature_c, temp_raw, battery_pct, battery_mv) VALUES (?,?,?,?,?,?)",
-                        (
-                            sensor_mac,
-                            ts_ns,
-                            status.get('temperature_c'),
-                            status.get('temp_raw'),
-                            status.get('battery_pct'),
-                            status.get('battery_mv'),
-                        ),
-                    )
-                    pending += 1
-                    writer_metrics['history_inserts'] += 1
-            elif 'impact' in item:
-                # compact impact summary
-                impact = item['impact'] or {}
-                cur.execute(
-                    "INSERT INTO impacts (sensor_mac, impact_ts_ns, detection_ts_ns, peak_mag, pre_mag, post_mag, duration_ms) VALUES (?,?,?,?,?,?,?)",
-                    (
-                        item.get('sensor_mac'),
-                        impact.get('impact_ts_ns'),
-                        impact.get('detection_ts_ns'),
-                        impact.get('peak_mag'),
-                        impact.get('pre_mag'),
-                        impact.get('post_mag'),
-                        impact.get('duration_ms'),
-                    ),
-                )
-                pending += 1
-                writer_metrics.setdefault('impacts', 0)
-                writer_metrics['impacts'] += 1
-            elif 'timer' in item:
-                te = item['timer'] or {}
-                # ts_ns may be provided; otherwise use current time
-                ts_ns = te.get('ts_ns') or int(time.time() * 1e9)
-                cur.execute(
-                    "INSERT INTO timer_events (ts_ns, device_id, event_type, split_seconds, split_cs, raw_hex) VALUES (?,?,?,?,?,?)",
-                    (
-                        ts_ns,
-                        item.get('device_id') or te.get('device_id'),
-                        te.get('event_type'),
-                        te.get('split_seconds'),
-                        te.get('split_cs'),
-                        te.get('raw_hex'),
-                    ),
-                )
-                pending += 1
-                writer_metrics.setdefault('timer_events', 0)
-                writer_metrics['timer_events'] += 1
-            else:
-                sensor_mac = item.get('sensor_mac')
-                frame_hex = item.get('frame_hex')
-                parser = item.get('parser')
-                parsed: Dict[str, Any] = item.get('parsed', {})
-
-                cur.execute(
-                    """
-                    INSERT INTO bt50_samples (
-                        sensor_mac, frame_hex, parser,
-                        vx, vy, vz, angle_x, angle_y, angle_z,
-                        temp_raw, temperature_c, disp_x, disp_y, disp_z,
-                        freq_x, freq_y, freq_z
-                    ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-                    """,
-                    (
-                        sensor_mac,
-                        frame_hex,
-                        parser,
-                        parsed.get('vx'),
-                        parsed.get('vy'),
-                        parsed.get('vz'),
-                        parsed.get('angle_x'),
-                        parsed.get('angle_y'),
-                        parsed.get('angle_z'),
-                        parsed.get('temp_raw'),
-                        parsed.get('temperature_c'),
-                        parsed.get('disp_x'),
-                        parsed.get('disp_y'),
-                        parsed.get('disp_z'),
-                        parsed.get('freq_x'),
-                        parsed.get('freq_y'),
-                        parsed.get('freq_z'),
-                    ),
-                )
-                pending += 1
-                writer_metrics['inserts'] += 1
 
-            # Commit in batches for performance
-            if pending >= batch_size:
-                con.commit()
-                pending = 0
-                writer_metrics['batches_committed'] += 1
+def make_capture(queue: PriorityLanes, pre_ms: float, post_ms: float) -> EventGatedCapture:
+    """Event-gated capture whose windows are enqueued for the DB writer, tagged"""
+    def enqueue_window(sensor_mac: str, items: List[Dict[str, Any]], tag: str):
+        for item in items:
+            item['window_tag'] = tag
+            queue.put_nowait(item)
+    return EventGatedCapture(enqueue_window, pre_ms=pre_ms, post_ms=post_ms)
 
-            queue.task_done()
 
-        # final commit for any remaining
-        if pending:
-            con.commit()
-            writer_metrics['batches_committed'] += 1
-    finally:
-        con.close()
+def enqueue_timer_event(queue: PriorityLanes, timer: Dict[str, Any], capture: EventGatedCapture | None = None):
+    """Enqueue a timer event; START/STOP open and close the capture string window."""
+    ts_ns = timer.get('ts_ns') or int(time.time() * 1e9)
+    if capture is not None:
+        event_type = (timer.get('event_type') or '').upper()
+        if event_type == 'START':
+            capture.start_string(timer.get('string_number', ts_ns), ts_ns)
+        elif event_type == 'STOP':
+            capture.stop_string(ts_ns)
+    queue.put_nowait({'timer': timer, 'device_id': timer.get('device_id')})
 
 
-async def metrics_logger(queue: asyncio.Queue, interval: int = 10):
+def _reconnect_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Exponential backoff with +-10% jitter"""
+    delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+    jitter = delay * 0.1
+    delay = delay + (jitter * (2 * (os.urandom(1)[0] / 255.0) - 1))
+    return max(0.1, delay)
+
+
+async def metrics_logger(queue: PriorityLanes, interval: int = 10, capture: EventGatedCapture | None = None):
     """Periodically log queue size and writer metrics."""
     try:
         while True:
             qsize = queue.qsize()
             metrics_snapshot = writer_metrics.copy()
             logger.info(f"metrics: queue_size={qsize} inserts={metrics_snapshot['inserts']} status_updates={metrics_snapshot['status_updates']} history_inserts={metrics_snapshot['history_inserts']} batches={metrics_snapshot['batches_committed']}")
+            for lane, lm in queue.metrics().items():
+                logger.info(f"lane {lane}: depth={lm['depth']}/{lm['capacity']} max={lm['max_depth']} written={lm['written']} shed={lm['shed']} spilled={lm['spilled']} latency avg={lm['latency_avg_ms']}ms max={lm['latency_max_ms']}ms")
+            if capture is not None:
+                cs = capture.get_stats()
+                logger.info(f"capture: seen={cs['seen']} persisted={cs['persisted']} windows={cs['windows']} buffered={cs['buffered']} reduction={cs['reduction_pct']}%")
+            frame_log.tick()
             await asyncio.sleep(interval)
     except asyncio.CancelledError:
         logger.debug("metrics_logger cancelled")
         return
 
 
-async def sensor_task(mac: str, char_uuid: str, duration: int, queue: asyncio.Queue, status_interval: int = 60,
+async def sensor_task(mac: str, char_uuid: str, duration: int, queue: PriorityLanes, status_interval: int = 60,
                       max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 30.0,
                       initial_last_history: Dict[str, int] | None = None,
                       detect_enabled: bool = False,
@@ -372,8 +436,13 @@ async def sensor_task(mac: str, char_uuid: str, duration: int, queue: asyncio.Qu
                       detect_pre_ms: int = 30,
                       detect_threshold_start: float = 0.05,
                       detect_threshold_spike: float = 0.25,
-                      status_temp_delta: float = 0.5):
-    """Connect to one sensor, subscribe, parse payloads and enqueue parsed records."""
+                      status_temp_delta: float = 0.5,
+                      capture: EventGatedCapture | None = None):
+    """Connect to one sensor, subscribe, parse payloads and enqueue parsed records.
+
+    With ``capture`` set, motion frames go through event-gated capture and are
+    only enqueued inside impact/string windows.
+    """
     buf = bytearray()
     # mac may be a BleakDevice or a string address. Derive a stable sensor_id
     raw_id = getattr(mac, 'address', mac)
@@ -382,7 +451,7 @@ async def sensor_task(mac: str, char_uuid: str, duration: int, queue: asyncio.Qu
 
     def handler(sender, data: bytes):
         nonlocal buf
-        logger.debug(f"[{sensor_id}] raw: {data.hex()}")
+        frame_log.debug('raw notification', "[%s] raw: %s", sensor_id, LazyHex(data))
         buf.extend(data)
         try:
             # Do not let scan_and_parse write directly to DB; receive parsed results
@@ -408,9 +477,21 @@ async def sensor_task(mac: str, char_uuid: str, duration: int, queue: asyncio.Qu
                             mag = math.sqrt(sx*sx + sy*sy + sz*sz)
                         except Exception:
                             mag = None
+                        now_ns = int(time.time() * 1e9)
+                        item = {
+                            'sensor_mac': sensor_id,
+                            'frame_hex': frame_hex,
+                            'parser': parser,
+                            'parsed': parsed,
+                        }
+                        # Enqueue full motion sample for DB writer (or hold it in the
+                        # pre-trigger ring until an impact/string window releases it)
+                        if capture is not None:
+                            capture.feed(sensor_id, now_ns, item)
+                        else:
+                            queue.put_nowait(item)
                         # run detector if enabled
                         if detect_enabled and mag is not None:
-                            now_ns = int(time.time() * 1e9)
                             det = handler._detector
                             ev = det.feed_sample(now_ns, mag)
                             if ev:
@@ -420,16 +501,11 @@ async def sensor_task(mac: str, char_uuid: str, duration: int, queue: asyncio.Qu
                                     'impact': ev,
                                 }
                                 queue.put_nowait(impact_item)
+                                if capture is not None:
+                                    # impacts.impact_ts_ns joins back to the tagged window
+                                    capture.trigger(sensor_id, ev['impact_ts_ns'], f"impact:{ev['impact_ts_ns']}")
                                 logger.info(f"[{sensor_id}] impact detected: {ev}")
-                        item = {
-                            'sensor_mac': sensor_id,
-                            'frame_hex': frame_hex,
-                            'parser': parser,
-                            'parsed': parsed,
-                        }
-                        # Enqueue full motion sample for DB writer
-                        queue.put_nowait(item)
-                        logger.info(f"[{sensor_id}] parsed [{parser}] @ offset {r.get('offset')}: {parsed}")
+                        frame_log.info('parsed frame', "[%s] parsed [%s] @ offset %s: %s", sensor_id, parser, r.get('offset'), parsed)
                     else:
                         # Status-only: create a compact status update item
                         status = {
@@ -495,7 +571,7 @@ async def sensor_task(mac: str, char_uuid: str, duration: int, queue: asyncio.Qu
                             'ts_ns': now_ns,
                         }
                         queue.put_nowait(status_item)
-                        logger.debug(f"[{sensor_id}] status update: {status} history={history_flag}")
+                        frame_log.debug('status update', "[%s] status update: %s history=%s", sensor_id, status, history_flag)
                 # Clear buffer after consuming frames
                 buf.clear()
         except Exception:
@@ -530,20 +606,73 @@ async def sensor_task(mac: str, char_uuid: str, duration: int, queue: asyncio.Qu
             if max_retries >= 0 and attempt > max_retries:
                 logger.error(f"[{mac}] exceeded max_retries={max_retries}; giving up")
                 break
-            # exponential backoff
-            delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
-            # add jitter
-            jitter = delay * 0.1
-            delay = delay + (jitter * (2 * (os.urandom(1)[0] / 255.0) - 1))
-            delay = max(0.1, delay)
+            delay = _reconnect_delay(attempt, base_delay, max_delay)
             logger.info(f"[{mac}] reconnecting in {delay:.1f}s (attempt {attempt}/{max_retries})")
             await asyncio.sleep(delay)
 
 
-async def main(macs: List[str], char_uuid: str, duration: int, status_interval: int = 60, reconnect_args: dict | None = None, detect_args: dict | None = None):
-    queue: asyncio.Queue = asyncio.Queue()
+async def timer_task(mac: str, char_uuid: str, duration: int, queue: PriorityLanes,
+                     capture: EventGatedCapture | None = None,
+                     max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 30.0):
+    """Connect to the AMG timer and enqueue its START/SHOT/STOP events.
+
+    With ``capture`` set, START and STOP open and close the string window, so
+    every sensor is captured for the whole string.
+    """
+    device_id = getattr(mac, 'address', mac).upper()
+    string_number = 0
+
+    def handler(sender, data: bytes):
+        nonlocal string_number
+        frame = decode_amg_frame(data)
+        if frame is None or frame.event is None:
+            return
+        if frame.event == 'START':
+            string_number = data[13] if frame.is_status else string_number + 1
+        timer = {
+            'ts_ns': int(time.time() * 1e9),
+            'device_id': device_id,
+            'event_type': frame.event,
+            'split_seconds': frame.split_time,
+            'split_cs': frame.split_cs,
+            'raw_hex': frame.raw_hex,
+            'string_number': string_number,
+        }
+        enqueue_timer_event(queue, timer, capture)
+        logger.info(f"[{device_id}] timer {frame.event} (string {string_number})")
+
+    attempt = 0
+    while True:
+        try:
+            async with BleakClient(mac) as client:
+                logger.info(f"[{device_id}] Timer connected")
+                await client.start_notify(char_uuid, handler)
+                await asyncio.sleep(duration)
+                await client.stop_notify(char_uuid)
+                break
+        except Exception:
+            attempt += 1
+            logger.exception(f"[{device_id}] timer connection error (attempt {attempt})")
+            if max_retries >= 0 and attempt > max_retries:
+                logger.error(f"[{device_id}] exceeded max_retries={max_retries}; giving up")
+                break
+            delay = _reconnect_delay(attempt, base_delay, max_delay)
+            logger.info(f"[{device_id}] reconnecting in {delay:.1f}s (attempt {attempt}/{max_retries})")
+            await asyncio.sleep(delay)
+
+
+async def main(macs: List[str], char_uuid: str, duration: int, status_interval: int = 60, reconnect_args: dict | None = None, detect_args: dict | None = None,
+               capture_args: dict | None = None, lane_args: dict | None = None,
+               timer_mac: str | None = None, timer_char: str = AMG_NOTIFY_UUID):
+    queue = PriorityLanes(**(lane_args or {}))
+    capture_args = capture_args or {'capture_mode': 'all'}
+    capture = None
+    if capture_args.get('capture_mode') == 'gated':
+        capture = make_capture(queue, capture_args.get('pre_trigger_ms', 500), capture_args.get('post_trigger_ms', 500))
+        if not (detect_args or {}).get('detect_enabled') and not timer_mac:
+            logger.warning("gated capture without --detect-enabled or --timer-mac persists no motion frames")
     writer = asyncio.create_task(db_writer(queue, DB_PATH))
-    metrics_task = asyncio.create_task(metrics_logger(queue, interval=10))
+    metrics_task = asyncio.create_task(metrics_logger(queue, interval=10, capture=capture))
 
     handler_reconnect = reconnect_args or {'max_retries': 5, 'base_delay': 1.0, 'max_delay': 30.0}
     detect_args = detect_args or {'detect_enabled': False, 'detect_window_ms': 100, 'detect_pre_ms': 30, 'detect_threshold_start': 0.05, 'detect_threshold_spike': 0.25}
@@ -608,6 +737,7 @@ async def main(macs: List[str], char_uuid: str, duration: int, status_interval:
                 detect_pre_ms=detect_args.get('detect_pre_ms', 30),
                 detect_threshold_start=detect_args.get('detect_threshold_start', 0.05),
                 detect_threshold_spike=detect_args.get('detect_threshold_spike', 0.25),
+                capture=capture,
             )))
         else:
             # Not discovered — stagger start times to reduce concurrent scanner calls
@@ -630,20 +760,31 @@ async def main(macs: List[str], char_uuid: str, duration: int, status_interval:
                     detect_pre_ms=detect_args.get('detect_pre_ms', 30),
                     detect_threshold_start=detect_args.get('detect_threshold_start', 0.05),
                     detect_threshold_spike=detect_args.get('detect_threshold_spike', 0.25),
+                    capture=capture,
                 )
             tasks.append(asyncio.create_task(delayed_start(m, delay)))
 
-    # Wait for all sensor tasks to complete
+    if timer_mac:
+        tasks.append(asyncio.create_task(timer_task(
+            timer_mac, timer_char, duration, queue, capture=capture,
+            max_retries=handler_reconnect.get('max_retries', 5),
+            base_delay=handler_reconnect.get('base_delay', 1.0),
+            max_delay=handler_reconnect.get('max_delay', 30.0),
+        )))
+
+    # Wait for all sensor (and timer) tasks to complete
     await asyncio.gather(*tasks)
 
     # signal writer to finish
-    await queue.put(None)
+    queue.put_nowait(None)
     await writer
     # stop metrics task
     metrics_task.cancel()
+    frame_log.flush()
 
 
 if __name__ == '__main__':
+    setup_logging('bt50_capture', log_dir=os.path.join(repo_root, 'logs', 'console'))
     parser = argparse.ArgumentParser()
     parser.add_argument('--mac', action='append', required=True, help='BT50 device MAC address (can specify multiple)')
     parser.add_argument('--char', default='0000ffe4-0000-1000-8000-00805f9a34fb', help='Notify characteristic UUID')
@@ -657,6 +798,16 @@ if __name__ == '__main__':
     parser.add_argument('--detect-pre-ms', type=int, default=30, help='Pre-window size in ms for pre_mag')
     parser.add_argument('--detect-threshold-start', type=float, default=0.05, help='Start threshold (magnitude units)')
     parser.add_argument('--detect-threshold-spike', type=float, default=0.25, help='Spike threshold (magnitude units)')
+    parser.add_argument('--sample-lane-size', type=int, default=5000, help='Max raw samples queued for the DB writer')
+    parser.add_argument('--event-lane-size', type=int, default=10000, help='Max timer/impact events queued for the DB writer')
+    parser.add_argument('--shed-policy', choices=SHED_POLICIES, default='drop', help='What to do with raw samples when the sample lane is under pressure')
+    parser.add_argument('--decimate-factor', type=int, default=4, help="'decimate' policy: keep 1 in N samples above the high watermark")
+    parser.add_argument('--spill-path', default=os.path.join(repo_root, 'logs', 'bt50_spill.ndjson'), help="'spill' policy: NDJSON file for samples that do not fit")
+    parser.add_argument('--timer-mac', help='AMG timer MAC address: record its events and, when gated, capture strings START..STOP')
+    parser.add_argument('--timer-char', default=AMG_NOTIFY_UUID, help='AMG timer notify characteristic UUID')
+    parser.add_argument('--capture-mode', choices=['all', 'gated'], default='all', help="Persist every motion frame ('all') or only impact/string windows ('gated')")
+    parser.add_argument('--pre-trigger-ms', type=float, default=500, help='Gated capture: ms kept before an impact / timer START')
+    parser.add_argument('--post-trigger-ms', type=float, default=500, help='Gated capture: ms persisted after an impact / timer STOP')
     args = parser.parse_args()
 
     # Normalize MACs
@@ -673,4 +824,17 @@ if __name__ == '__main__':
                          'detect_pre_ms': args.detect_pre_ms,
                          'detect_threshold_start': args.detect_threshold_start,
                          'detect_threshold_spike': args.detect_threshold_spike,
-                     }))
+                     },
+                     capture_args={
+                         'capture_mode': args.capture_mode,
+                         'pre_trigger_ms': args.pre_trigger_ms,
+                         'post_trigger_ms': args.post_trigger_ms,
+                     },
+                     lane_args={
+                         'sample_size': args.sample_lane_size,
+                         'event_size': args.event_lane_size,
+                         'shed_policy': args.shed_policy,
+                         'decimate_factor': args.decimate_factor,
+                         'spill_path': args.spill_path,
+                     },
+                     timer_mac=args.timer_mac, timer_char=args.timer_char))
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+tools/sim_match_aggregator.py
+
+Run many synthetic bridges against a local MQTT broker stand-in and merge
+their streams with MatchAggregator, all through real LeadVilleMQTT clients.
+
+Each bridge gets a random clock skew (--skew-ms), publishes impacts at
+--rate per second (Poisson) stamped with its own clock, and back-dates each
+impact by a random detection delay of up to --detect-ms (the onset is
+published after the detector has seen the whole window). The aggregator
+estimates offsets from sync exchanges, so the run starts once every bridge
+has been synced.
+
+Reports merged events/s, ordering latency (arrival at the aggregator to
+release into the merged log) and end-to-end latency percentiles, how many
+events came out of true order and the worst inversion, and the clock offset
+estimation error per bridge.
+
+Usage:
+    python tools/sim_match_aggregator.py --bridges 16 --rate 20 --duration 10
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import random
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(repo_root, 'src'))
+
+from impact_bridge.match_aggregator import MatchAggregator, MatchEventPublisher
+from impact_bridge.mqtt_client import LeadVilleMQTT, MQTTConfig
+from impact_bridge.mqtt_ingress import TopicTrie
+
+
+def _remaining_length(n):
+    out = bytearray()
+    while True:
+        byte, n = n & 0x7F, n >> 7
+        out.append(byte | (0x80 if n else 0))
+        if not n:
+            return bytes(out)
+
+
+class ForwardingBroker:
+    """Minimal MQTT 3.1.1 broker: CONNECT, SUBSCRIBE, PUBLISH (delivered at QoS 0), PING"""
+
+    def __init__(self):
+        self.subscriptions = TopicTrie()
+        self.forwarded = 0
+        self.port = None
+        self._ready = threading.Event()
+        self._loop = None
+
+    def start(self):
+        threading.Thread(target=self._thread, daemon=True).start()
+        self._ready.wait()
+
+    def _thread(self):
+        self._loop = asyncio.new_event_loop()
+        server = self._loop.run_until_complete(asyncio.start_server(self._client, '127.0.0.1', 0))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _client(self, reader, writer):
+        writer.get_extra_info('socket').setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            while True:
+                first = (await reader.readexactly(1))[0]
+                length, shift = 0, 0
+                while True:
+                    byte = (await reader.readexactly(1))[0]
+                    length |= (byte & 0x7F) << shift
+                    shift += 7
+                    if not byte & 0x80:
+                        break
+                body = await reader.readexactly(length)
+                kind = first >> 4
+                if kind == 1:  # CONNECT
+                    writer.write(b'\x20\x02\x00\x00')
+                elif kind == 3:  # PUBLISH
+                    qos = (first >> 1) & 3
+                    topic_len = int.from_bytes(body[:2], 'big')
+                    topic = body[2:2 + topic_len].decode()
+                    offset = 2 + topic_len
+                    if qos:
+                        writer.write(b'\x40\x02' + body[offset:offset + 2])
+                        offset += 2
+                    packet = body[:2 + topic_len] + body[offset:]
+                    packet = b'\x30' + _remaining_length(len(packet)) + packet
+                    for subscriber in {w for w, _ in self.subscriptions.match(topic)}:
+                        subscriber.write(packet)
+                        self.forwarded += 1
+                elif kind == 8:  # SUBSCRIBE
+                    packet_id, offset, granted = body[:2], 2, b''
+                    while offset < len(body):
+                        topic_len = int.from_bytes(body[offset:offset + 2], 'big')
+                        self.subscriptions.add(body[offset + 2:offset + 2 + topic_len].decode(), writer)
+                        offset += 2 + topic_len + 1
+                        granted += b'\x00'
+                    writer.write(b'\x90' + _remaining_length(2 + len(granted)) + packet_id + granted)
+                elif kind == 12:  # PINGREQ
+                    writer.write(b'\xd0\x00')
+                elif kind == 14:  # DISCONNECT
+                    break
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def _percentiles(values_ns):
+    if not values_ns:
+        return 'n/a'
+    ms = np.asarray(values_ns) / 1e6
+    return f"p50 {np.percentile(ms, 50):.1f} ms, p99 {np.percentile(ms, 99):.1f} ms, max {ms.max():.1f} ms"
+
+
+async def run(args):
+    broker = ForwardingBroker()
+    broker.start()
+
+    def client(name):
+        return LeadVilleMQTT(MQTTConfig(host='127.0.0.1', port=broker.port, client_id=name,
+                                        inbound_queue_size=65536))
+
+    merged = []
+    head = client('aggregator')
+    await head.connect()
+    aggregator = MatchAggregator(head, window_ms=args.window_ms, lateness_ms=args.detect_ms,
+                                 sync_interval_s=0.5,
+                                 on_event=lambda e: merged.append((e, time.time_ns())))
+    aggregator.start()
+
+    rng = random.Random(42)
+    skews = {f'bay{n:02d}': int(rng.uniform(-args.skew_ms, args.skew_ms) * 1e6) for n in range(args.bridges)}
+    bridges = []
+    for name, skew in skews.items():
+        mqtt = client(name)
+        await mqtt.connect()
+        publisher = MatchEventPublisher(mqtt, name, clock=lambda s=skew: time.time_ns() + s)
+        publisher.start()
+        bridges.append((publisher, mqtt))
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline and not all(
+            aggregator.clocks.get(name) is not None and aggregator.clocks[name].exchanges >= 3 for name in skews):
+        await asyncio.sleep(0.1)
+
+    async def shooter(publisher, skew):
+        local = random.Random(publisher.bridge_id)
+        end = time.monotonic() + args.duration
+        while time.monotonic() < end:
+            await asyncio.sleep(local.expovariate(args.rate))
+            true_ns = time.time_ns() - int(local.uniform(0, args.detect_ms) * 1e6)
+            publisher.publish('impact', {'true_ns': true_ns}, ts_ns=true_ns + skew)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(shooter(p, skews[p.bridge_id]) for p, _ in bridges))
+    published = sum(p.seq for p, _ in bridges)
+    drain_deadline = time.monotonic() + 5
+    while aggregator.merged < published and time.monotonic() < drain_deadline:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    stats = aggregator.stats()
+    aggregator.stop()
+    for publisher, mqtt in bridges:
+        publisher.stop()
+        mqtt.disconnect()
+    head.disconnect()
+
+    order_latency = [emitted - e.received_ns for e, emitted in merged]
+    e2e_latency = [emitted - e.data['true_ns'] for e, emitted in merged]
+    inversions, worst, latest = 0, 0, None
+    for e, _ in merged:
+        true_ns = e.data['true_ns']
+        if latest is not None and true_ns < latest:
+            inversions += 1
+            worst = max(worst, latest - true_ns)
+        latest = true_ns if latest is None else max(latest, true_ns)
+    offset_err = [abs(stats['bridges'][name]['offset_ms'] - skew / 1e6) for name, skew in skews.items()]
+
+    print(f"{args.bridges} bridges x {args.rate:g} impacts/s for {args.duration:g} s, "
+          f"skew up to ±{args.skew_ms:g} ms, detection delay up to {args.detect_ms:g} ms, "
+          f"window {args.window_ms:g} ms")
+    print(f"published {published}, merged {stats['merged']} ({stats['merged'] / elapsed:.0f} events/s), "
+          f"late {stats['late']}, forced {stats['forced']}, gaps {stats['gaps']}")
+    print(f"ordering latency:   {_percentiles(order_latency)}")
+    print(f"end-to-end latency: {_percentiles(e2e_latency)}")
+    print(f"true-order inversions: {inversions} (worst {worst / 1e6:.2f} ms)")
+    print(f"clock offset error: mean {np.mean(offset_err):.3f} ms, max {np.max(offset_err):.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--bridges', type=int, default=16)
+    parser.add_argument('--rate', type=float, default=20.0, help='Impacts per second per bridge')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--skew-ms', type=float, default=2000.0, help='Max clock skew per bridge')
+    parser.add_argument('--detect-ms', type=float, default=250.0, help='Max detection delay (lateness)')
+    parser.add_argument('--window-ms', type=float, default=500.0, help='Reorder window')
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
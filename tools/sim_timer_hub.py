@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+tools/sim_timer_hub.py
+
+Load test for TimerHub: many simulated timers feeding one merged stream.
+
+Each simulated timer is a BaseTimerAdapter whose "device callbacks" post Shot
+events stamped at callback time, like the AMG and SpecialPie BLE handlers.
+Half the timers fire from event-loop callbacks (bleak on Linux), half from
+their own threads (serial readers, other BLE backends). Shots arrive as a
+Poisson process at --rate per timer, in bursts of --burst frames.
+
+Reports merged events/s, merge latency (callback to the consumer) percentiles,
+receive-order inversions, backpressure waits and channel drops.
+
+Usage:
+    python tools/sim_timer_hub.py --timers 8 --rate 200 --duration 5
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+
+import numpy as np
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(repo_root, 'src'))
+
+from impact_bridge.timers import BaseTimerAdapter, ConnectionType, Shot, TimerHub, TimerInfo
+
+
+class SimulatedTimer(BaseTimerAdapter):
+    def __init__(self, name: str, threaded: bool):
+        super().__init__(name)
+        self.threaded = threaded
+        self.sent = 0
+        self._connected = True
+
+    async def connect(self, **kwargs) -> None:
+        pass
+
+    def info(self) -> TimerInfo:
+        return TimerInfo(model=self.name, firmware_version='sim', connection_type=ConnectionType.BLE)
+
+    def notify(self, count: int) -> None:
+        """One notification carrying ``count`` shots"""
+        for _ in range(count):
+            self.sent += 1
+            self._post_event(Shot(timestamp_ms=int(time.time() * 1000), raw={'t': time.perf_counter_ns()},
+                                  split_ms=None, shot_number=self.sent))
+
+
+async def run(args):
+    hub = TimerHub(max_pending=args.max_pending)
+    timers = []
+    for n in range(args.timers):
+        timer = SimulatedTimer(f"{'amg' if n % 2 else 'specialpie'}", threaded=bool(n % 2))
+        hub.add(f'bay{n + 1}', timer)
+        timers.append(timer)
+    await hub.start()
+
+    latencies = []
+    last_ms = None
+    out_of_order = 0
+
+    async def consume():
+        nonlocal last_ms, out_of_order
+        async for item in hub.events:
+            latencies.append(time.perf_counter_ns() - item.event.raw['t'])
+            if last_ms is not None and item.event.timestamp_ms < last_ms:
+                out_of_order += 1
+            last_ms = max(last_ms or 0, item.event.timestamp_ms)
+            if args.consumer_us:
+                time.sleep(args.consumer_us / 1e6)
+
+    loop = asyncio.get_running_loop()
+    end = time.monotonic() + args.duration
+
+    def thread_driver(timer, seed):
+        rng = random.Random(seed)
+        while time.monotonic() < end:
+            time.sleep(rng.expovariate(args.rate / args.burst))
+            timer.notify(args.burst)
+
+    async def loop_driver(timer, seed):
+        rng = random.Random(seed)
+        while time.monotonic() < end:
+            await asyncio.sleep(rng.expovariate(args.rate / args.burst))
+            timer.notify(args.burst)
+
+    consumer = asyncio.create_task(consume())
+    start = time.perf_counter()
+    threads = []
+    drivers = []
+    for n, timer in enumerate(timers):
+        if timer.threaded:
+            thread = threading.Thread(target=thread_driver, args=(timer, n), daemon=True)
+            thread.start()
+            threads.append(thread)
+        else:
+            drivers.append(asyncio.create_task(loop_driver(timer, n)))
+    await asyncio.gather(*drivers)
+    await loop.run_in_executor(None, lambda: [t.join() for t in threads])
+    await hub.stop()
+    await consumer
+    elapsed = time.perf_counter() - start
+
+    stats = hub.stats()
+    sent = sum(t.sent for t in timers)
+    dropped = sum(t['channel']['dropped'] for t in stats['timers'].values())
+    waits = sum(t['backpressure_waits'] for t in stats['timers'].values())
+    ms = np.asarray(latencies) / 1e6
+    print(f"{args.timers} timers x {args.rate:g} shots/s (bursts of {args.burst}) for {args.duration:g} s, "
+          f"half on threads")
+    print(f"sent {sent}, merged {stats['merged']} ({stats['merged'] / elapsed:.0f} events/s), "
+          f"dropped {dropped}, backpressure waits {waits}")
+    if len(ms):
+        print(f"merge latency: p50 {np.percentile(ms, 50):.3f} ms, p99 {np.percentile(ms, 99):.3f} ms, "
+              f"max {ms.max():.3f} ms")
+    print(f"receive-order inversions: {out_of_order} (hub counted {stats['inversions']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--timers', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=200.0, help='Shots per second per timer')
+    parser.add_argument('--burst', type=int, default=1, help='Shots per notification')
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--max-pending', type=int, default=256, help='Per-timer hub queue limit')
+    parser.add_argument('--consumer-us', type=float, default=0.0, help='Simulated consumer work per event')
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()